@@ -9,14 +9,30 @@ To create a custom workflow:
 3. Define your prompt and schema
 4. The workflow will be automatically discovered and appear in the UI
 
+Workflows that need several Gemini calls declare them as a step graph
+(build_steps / merge_steps) and the calls run concurrently where their
+dependencies allow.
+
 See docs/CUSTOM_WORKFLOWS.md for detailed documentation.
 """
 
+import asyncio
+import inspect
 from abc import ABC, abstractmethod
-from typing import Type, List, Optional
+from typing import Type, List, Optional, Tuple
 from pydantic import BaseModel
 import re
 
+from eon.analysis.map_reduce import MapReduceAnalyzer
+from eon.analysis.workflow_graph import (
+    WorkflowStep,
+    WorkflowGraphExecutor,
+    WorkflowGraphResult,
+    StepCheckpoint,
+    validate_steps,
+)
+from eon.data.sources.sec.sections import SECTION_ALIASES, select_sections
+
 
 class WorkflowValidationError(Exception):
     """Raised when workflow validation fails."""
@@ -44,6 +60,8 @@ class CustomWorkflow(ABC):
     - min_years: Minimum years required (1 for single-year, 3+ for multi-year)
     - prompt_template: The analysis prompt with {ticker} and {year} placeholders
     - schema: Pydantic model for structured output
+    - sections: Optional filing sections to send instead of the whole filing
+    - build_steps/merge_steps: Optional graph of sub-calls instead of one call
 
     See docs/CUSTOM_WORKFLOWS.md for detailed documentation and examples.
     """
@@ -56,6 +74,10 @@ class CustomWorkflow(ABC):
     category: str = "custom"
     max_years: int = 10  # Optional maximum years
 
+    # Filing sections the prompt needs, by name ("risk_factors", "mdna") or
+    # item ("1A", "7"). None sends the whole filing.
+    sections: Optional[Tuple[str, ...]] = None
+
     @property
     @abstractmethod
     def prompt_template(self) -> str:
@@ -213,6 +235,33 @@ class CustomWorkflow(ABC):
         except Exception as e:
             errors.append(f"Error accessing schema: {e}")
 
+        # Validate sections
+        if self.sections is not None:
+            if isinstance(self.sections, str):
+                errors.append("sections must be a tuple of section names, not a string")
+            else:
+                known = {name for aliases in SECTION_ALIASES.values() for name in aliases}
+                unknown = [
+                    name for name in self.sections
+                    if name.lower() not in known
+                    and not re.fullmatch(r'(?:I{1,2}-)?\d{1,2}[A-D]?', name.upper())
+                ]
+                if unknown:
+                    warnings.append(
+                        f"Unknown filing sections: {unknown}. "
+                        f"Use item numbers (\"1A\", \"7\") or names like {sorted(known)[:5]}."
+                    )
+
+        # Validate step graph
+        try:
+            steps = self.build_steps("TEST", 2024)
+            if steps is not None:
+                validate_steps(steps)
+                if type(self).merge_steps is CustomWorkflow.merge_steps:
+                    errors.append("build_steps() is defined but merge_steps() is not")
+        except Exception as e:
+            errors.append(f"Invalid step graph: {e}")
+
         # Raise if critical errors
         if errors:
             raise WorkflowValidationError(
@@ -251,18 +300,97 @@ class CustomWorkflow(ABC):
         """
         return self.prompt_template.format(ticker=ticker, year=year)
 
-    def analyze(self, ticker: str, year: int, text: str, provider) -> BaseModel:
+    def select_filing_text(self, text: str) -> str:
+        """
+        Reduce the filing text to the sections this workflow declares.
+
+        Section offsets are parsed once per filing and cached, so calling
+        this from several workflows on the same filing costs one parse.
+        Returns the text unchanged when no sections are declared or none
+        can be found in it.
+
+        Args:
+            text: Extracted filing text
+
+        Returns:
+            Text of the declared sections
+        """
+        return select_sections(text, self.sections)
+
+    def build_steps(self, ticker: str, year: int) -> Optional[List[WorkflowStep]]:
+        """
+        Declare the workflow's sub-calls as a dependency graph.
+
+        Return None (the default) for a single-call workflow. Otherwise
+        each WorkflowStep names its inputs; analyze() runs steps as soon
+        as their inputs are done, independent ones at the same time on
+        different keys, and hands every output to merge_steps().
+
+        Example:
+            def build_steps(self, ticker, year):
+                return [
+                    WorkflowStep("FACTS", Facts, lambda up: FACTS_PROMPT),
+                    WorkflowStep("RISKS", Risks, lambda up: RISKS_PROMPT),
+                    WorkflowStep(
+                        "VERDICT", Verdict,
+                        lambda up: VERDICT_PROMPT.format(facts=up["FACTS"], risks=up["RISKS"]),
+                        inputs=("FACTS", "RISKS"),
+                    ),
+                ]
+
+        Args:
+            ticker: Company ticker symbol
+            year: Fiscal year
+
+        Returns:
+            List of steps, or None for a single call
+        """
+        return None
+
+    def merge_steps(self, ticker: str, year: int, result: WorkflowGraphResult) -> BaseModel:
+        """
+        Combine the step outputs into an instance of self.schema.
+
+        Required when build_steps() returns steps. Failed and skipped steps
+        have a None output; failures are listed in result.errors.
+
+        Args:
+            ticker: Company ticker symbol
+            year: Fiscal year
+            result: Outputs of the step graph
+
+        Returns:
+            A validated Pydantic model instance matching self.schema.
+        """
+        raise NotImplementedError(f"{type(self).__name__} must implement merge_steps()")
+
+    def accepts_checkpoint(self) -> bool:
+        """Whether analyze() takes a step checkpoint (overrides may not)."""
+        return "checkpoint" in inspect.signature(self.analyze).parameters
+
+    def analyze(
+        self,
+        ticker: str,
+        year: int,
+        text: str,
+        provider,
+        checkpoint: Optional[StepCheckpoint] = None,
+    ) -> BaseModel:
         """
         Run the actual analysis for one (ticker, year, filing-text) tuple.
 
         Default behavior: format the workflow's prompt_template, append the
-        filing text, and make a single Gemini call against self.schema.
-        Identical to the legacy inline behavior in analysis_service.
-
-        Subclasses MAY override this to implement multi-call orchestration
-        (e.g. split a large analysis into several smaller Gemini calls and
-        merge the results before returning). Overrides MUST return an
-        instance of self.schema so downstream storage/UI continue to work.
+        filing text (only the declared sections, if any), and make a single
+        Gemini call against self.schema. A filing too long for the model
+        context is analyzed in chunks and reduced (see MapReduceAnalyzer).
+        Workflows that declare build_steps() run their step graph against
+        the filing instead and return merge_steps(); with a checkpoint,
+        steps that completed in an earlier attempt are not run again.
+
+        Subclasses MAY override this to implement other orchestration.
+        Overrides MUST return an instance of self.schema so downstream
+        storage/UI continue to work, and should pass text through
+        select_filing_text() to honour self.sections.
 
         Args:
             ticker: Company ticker symbol.
@@ -270,17 +398,61 @@ class CustomWorkflow(ABC):
             text: Already-extracted filing text (full 10-K body).
             provider: A GeminiProvider instance the analysis service
                 created with the appropriate api_key / rate_limiter.
+            checkpoint: Optional store for step outputs (step graphs only).
+
+        Returns:
+            A validated Pydantic model instance matching self.schema.
+        """
+        steps = self.build_steps(ticker, year)
+        if steps is not None:
+            graph = WorkflowGraphExecutor().run(
+                provider, steps,
+                context_text=f"Here's the filing content:\n\n{self.select_filing_text(text)}",
+                label=f"{self.name} {ticker} {year}",
+                checkpoint=checkpoint,
+            )
+            return self.merge_steps(ticker, year, graph)
+
+        prompt = self.format_prompt(ticker, year)
+        return MapReduceAnalyzer().generate(
+            provider, prompt, self.select_filing_text(text), schema=self.schema
+        )
+
+    async def analyze_async(
+        self,
+        ticker: str,
+        year: int,
+        text: str,
+        provider,
+        checkpoint: Optional[StepCheckpoint] = None,
+    ) -> BaseModel:
+        """
+        Async variant of analyze() for event-loop driven runs.
+
+        The default single-call workflow awaits the provider's
+        generate_with_retry_async, so no thread is held while the request
+        waits for quota or for Gemini. Workflows that override analyze()
+        with their own orchestration, or declare a step graph, run it in a
+        worker thread unless they also override this method.
+
+        Args:
+            ticker: Company ticker symbol.
+            year: Fiscal year.
+            text: Already-extracted filing text (full 10-K body).
+            provider: An LLM provider (AsyncGeminiProvider for native async).
+            checkpoint: Optional store for step outputs (step graphs only).
 
         Returns:
             A validated Pydantic model instance matching self.schema.
         """
+        if type(self).analyze is not CustomWorkflow.analyze or self.build_steps(ticker, year) is not None:
+            if checkpoint is None:
+                return await asyncio.to_thread(self.analyze, ticker, year, text, provider)
+            return await asyncio.to_thread(self.analyze, ticker, year, text, provider, checkpoint)
+
         prompt = self.format_prompt(ticker, year)
-        full_prompt = f"{prompt}\n\nHere's the filing content:\n\n{text}"
-        return provider.generate_with_retry(
-            prompt=full_prompt,
-            schema=self.schema,
-            max_retries=3,
-            retry_delay=10,
+        return await MapReduceAnalyzer().generate_async(
+            provider, prompt, self.select_filing_text(text), schema=self.schema
         )
 
     def __repr__(self) -> str:
@@ -37,6 +37,9 @@ The four calls:
                           scenarios, falsifiers, gap audit, signal ranking,
                           executive summary
 
+The calls are declared as a step graph (CustomWorkflow.build_steps), so
+each one starts as soon as the outputs it reads are available.
+
 The schema property of CSPPv26Analyzer still returns the merged
 CSPPv26AnalysisResult so anything that introspects workflows by their
 declared schema sees the original shape.
@@ -61,6 +64,7 @@ from typing import List, Literal, Optional, Any, Dict
 from pydantic import BaseModel, Field
 
 from custom_workflows.base import CustomWorkflow
+from eon.analysis.workflow_graph import WorkflowStep, WorkflowGraphResult
 from eon.core import get_logger
 from eon.core.exceptions import AIProviderError
 
@@ -1143,7 +1147,7 @@ class CSPPv26AnalysisResult(BaseModel):
     ai_infrastructure_relevant: bool = False
 
     # Metadata about the multi-call run. These fields are NEVER sent to
-    # Gemini (the analyze() override bypasses the default single-call
+    # Gemini (the step graph bypasses the default single-call
     # path), so defaults are safe here even though Gemini rejects schemas
     # with Pydantic defaults.
     analysis_partial: bool = False
@@ -1158,7 +1162,7 @@ class CSPPv26AnalysisResult(BaseModel):
 # will be Pydantic-validated.
 #
 # Each prompt uses {ticker} and {year} placeholders. The CSPPv26Analyzer
-# class's analyze() method calls .format() before each call.
+# class's build_steps() prompt builders call .format() before each call.
 # ===========================================================================
 
 
@@ -1645,8 +1649,8 @@ Earlier scoring output (so you can calibrate adjustments against the
 # ===========================================================================
 # WORKFLOW CLASS
 # ---------------------------------------------------------------------------
-# Overrides CustomWorkflow.analyze() to orchestrate the 4 calls and merge
-# the partial results into a CSPPv26AnalysisResult instance.
+# Declares the sub-calls as a step graph (CustomWorkflow.build_steps) and
+# merges the partial results into a CSPPv26AnalysisResult instance.
 # ===========================================================================
 
 
@@ -1659,7 +1663,7 @@ class CSPPv26Analyzer(CustomWorkflow):
 
     The schema property returns CSPPv26AnalysisResult for downstream
     compatibility, but the framework's default single-call flow is
-    bypassed in favor of the overridden analyze() method.
+    replaced by the step graph from build_steps().
     """
 
     name = "CSPP v2.6 - Causal Substrate Propagation"
@@ -1679,8 +1683,8 @@ class CSPPv26Analyzer(CustomWorkflow):
 
     @property
     def prompt_template(self) -> str:
-        # Required by the base class. Not used by the orchestrated
-        # analyze() path -- each sub-call uses its own prompt below.
+        # Required by the base class. Not used by the step graph --
+        # each sub-call uses its own prompt below.
         # We return the ORIENT prompt as a sensible default so the
         # validation in CustomWorkflow.validate_workflow() passes.
         return _PROMPT_ORIENT
@@ -1693,112 +1697,56 @@ class CSPPv26Analyzer(CustomWorkflow):
 
     # ---- orchestrated multi-call analysis ---------------------------------
 
-    def analyze(self, ticker: str, year: int, text: str, provider) -> CSPPv26AnalysisResult:
-        """Run the 4 sub-calls and merge into a CSPPv26AnalysisResult.
+    def build_steps(self, ticker: str, year: int) -> List[WorkflowStep]:
+        """Declare the sub-calls and what each one reads.
 
-        Each sub-call is independent -- if one fails, the others still run
-        and the merge produces a degraded result with _partial=True and
-        _failed_call set, so downstream code can surface the partial
-        analysis rather than silently losing the run.
+        Every call sees the filing (cached once per key as shared context)
+        plus the outputs of its inputs. A failed input reaches the prompt
+        as a short note, so the later calls still run and the merge can
+        produce a degraded result with _partial=True.
         """
-        filing_block = f"\n\nHere's the filing content:\n\n{text}"
-
-        # --- Call 1: ORIENT ----------------------------------------------
-        orient_obj: Optional[OrientResult] = None
-        orient_err: Optional[str] = None
-        try:
-            prompt = _PROMPT_ORIENT.format(ticker=ticker, year=year) + filing_block
-            orient_obj = provider.generate_with_retry(
-                prompt=prompt, schema=OrientResult,
-                max_retries=3, retry_delay=10,
-            )
-            logger.info(f"CSPP ORIENT call succeeded for {ticker} {year}")
-        except (AIProviderError, Exception) as e:
-            orient_err = str(e)
-            logger.error(f"CSPP ORIENT call failed for {ticker} {year}: {e}")
-
-        # --- Call 2: MAP -------------------------------------------------
-        map_obj: Optional[MapResult] = None
-        map_err: Optional[str] = None
-        try:
-            orient_ctx = (orient_obj.model_dump_json(indent=2) if orient_obj
-                          else "(ORIENT call failed; proceed without it)")
-            prompt = _PROMPT_MAP.format(
-                ticker=ticker, year=year, orient_context=orient_ctx,
-            ) + filing_block
-            map_obj = provider.generate_with_retry(
-                prompt=prompt, schema=MapResult,
-                max_retries=3, retry_delay=10,
+        def dump(obj: Optional[BaseModel], missing: str) -> str:
+            return obj.model_dump_json(indent=2) if obj else missing
+
+        def orient_prompt(up) -> str:
+            return _PROMPT_ORIENT.format(ticker=ticker, year=year)
+
+        def map_prompt(up) -> str:
+            return _PROMPT_MAP.format(
+                ticker=ticker, year=year,
+                orient_context=dump(up["ORIENT"], "(ORIENT call failed; proceed without it)"),
             )
-            logger.info(f"CSPP MAP call succeeded for {ticker} {year}")
-        except (AIProviderError, Exception) as e:
-            map_err = str(e)
-            logger.error(f"CSPP MAP call failed for {ticker} {year}: {e}")
-
-        # --- Call 3: SCORE -----------------------------------------------
-        score_obj: Optional[ScoreResult] = None
-        score_err: Optional[str] = None
-        try:
-            orient_ctx = (orient_obj.model_dump_json(indent=2) if orient_obj
-                          else "(ORIENT call failed)")
-            map_ctx = (map_obj.model_dump_json(indent=2) if map_obj
-                       else "(MAP call failed)")
-            prompt = _PROMPT_SCORE.format(
+
+        def score_prompt(up) -> str:
+            return _PROMPT_SCORE.format(
                 ticker=ticker, year=year,
-                orient_context=orient_ctx, map_context=map_ctx,
-            ) + filing_block
-            score_obj = provider.generate_with_retry(
-                prompt=prompt, schema=ScoreResult,
-                max_retries=3, retry_delay=10,
+                orient_context=dump(up["ORIENT"], "(ORIENT call failed)"),
+                map_context=dump(up["MAP"], "(MAP call failed)"),
             )
-            logger.info(f"CSPP SCORE call succeeded for {ticker} {year}")
-        except (AIProviderError, Exception) as e:
-            score_err = str(e)
-            logger.error(f"CSPP SCORE call failed for {ticker} {year}: {e}")
-
-        # --- Call 4 (conditional): AI INFRASTRUCTURE deep-dive ----------
-        # Only runs when ORIENT flagged this company as AI-stack relevant
-        # (~5-10% of US-listed companies). For the other 92-95%, the
-        # ai_infrastructure_analysis section stays None in the final
+
+        # Call 4 only runs when ORIENT flagged this company as AI-stack
+        # relevant (~5-10% of US-listed companies). For the other 92-95%,
+        # the ai_infrastructure_analysis section stays None in the final
         # result and no extra Gemini cost is incurred.
-        ai_infra_obj: Optional[AIInfrastructureAnalysis] = None
-        ai_infra_relevant = bool(
-            orient_obj and orient_obj.ai_infrastructure_relevant
-        )
-        if ai_infra_relevant and score_obj is not None:
-            try:
-                orient_ctx = orient_obj.model_dump_json(indent=2)
-                score_ctx = score_obj.model_dump_json(indent=2)
-                prompt = _PROMPT_AI_INFRA.format(
-                    ticker=ticker, year=year,
-                    orient_context=orient_ctx, score_context=score_ctx,
-                ) + filing_block
-                ai_infra_obj = provider.generate_with_retry(
-                    prompt=prompt, schema=AIInfrastructureAnalysis,
-                    max_retries=3, retry_delay=10,
-                )
-                logger.info(f"CSPP AI_INFRA call succeeded for {ticker} {year}")
-            except (AIProviderError, Exception) as e:
-                # Non-fatal -- AI infra is supplementary, not required.
-                logger.warning(
-                    f"CSPP AI_INFRA call failed for {ticker} {year}: {e}. "
-                    f"Falling back to base 3A/3B/3C scores."
-                )
+        def ai_infra_relevant(up) -> bool:
+            orient_obj = up["ORIENT"]
+            return bool(orient_obj and orient_obj.ai_infrastructure_relevant) and up["SCORE"] is not None
 
-        # --- Call 5: SYNTHESIZE -----------------------------------------
-        synth_obj: Optional[SynthesizeResult] = None
-        synth_err: Optional[str] = None
-        try:
-            orient_ctx = (orient_obj.model_dump_json(indent=2) if orient_obj
-                          else "(ORIENT call failed)")
-            map_ctx = (map_obj.model_dump_json(indent=2) if map_obj
-                       else "(MAP call failed)")
+        def ai_infra_prompt(up) -> str:
+            return _PROMPT_AI_INFRA.format(
+                ticker=ticker, year=year,
+                orient_context=up["ORIENT"].model_dump_json(indent=2),
+                score_context=up["SCORE"].model_dump_json(indent=2),
+            )
+
+        def synthesize_prompt(up) -> str:
+            score_obj = up["SCORE"]
             # Project master score from the (possibly adjusted) Call 3 +
             # AI INFRA so Call 5 can pick a consistent allocation tier.
             if score_obj is not None:
                 projected_master = _compute_master_score_from_components(
                     score_obj.component_scores,
-                    ai_infra=ai_infra_obj,
+                    ai_infra=up["AI_INFRA"],
                 )
                 score_ctx = (
                     score_obj.model_dump_json(indent=2)
@@ -1808,30 +1756,41 @@ class CSPPv26Analyzer(CustomWorkflow):
                 )
             else:
                 score_ctx = "(SCORE call failed; do your best to synthesize without component scores)"
-            prompt = _PROMPT_SYNTHESIZE.format(
+            return _PROMPT_SYNTHESIZE.format(
                 ticker=ticker, year=year,
-                orient_context=orient_ctx, map_context=map_ctx,
+                orient_context=dump(up["ORIENT"], "(ORIENT call failed)"),
+                map_context=dump(up["MAP"], "(MAP call failed)"),
                 score_context=score_ctx,
-            ) + filing_block
-            synth_obj = provider.generate_with_retry(
-                prompt=prompt, schema=SynthesizeResult,
-                max_retries=3, retry_delay=10,
             )
-            logger.info(f"CSPP SYNTHESIZE call succeeded for {ticker} {year}")
-        except (AIProviderError, Exception) as e:
-            synth_err = str(e)
-            logger.error(f"CSPP SYNTHESIZE call failed for {ticker} {year}: {e}")
-
-        # --- Merge -------------------------------------------------------
-        failed = []
-        if orient_obj is None:
-            failed.append("ORIENT")
-        if map_obj is None:
-            failed.append("MAP")
-        if score_obj is None:
-            failed.append("SCORE")
-        if synth_obj is None:
-            failed.append("SYNTHESIZE")
+
+        return [
+            WorkflowStep("ORIENT", OrientResult, orient_prompt),
+            WorkflowStep("MAP", MapResult, map_prompt, inputs=("ORIENT",)),
+            WorkflowStep("SCORE", ScoreResult, score_prompt, inputs=("ORIENT", "MAP")),
+            # Non-fatal -- AI infra is supplementary; without it the base
+            # 3A/3B/3C scores stand.
+            WorkflowStep(
+                "AI_INFRA", AIInfrastructureAnalysis, ai_infra_prompt,
+                inputs=("ORIENT", "SCORE"), condition=ai_infra_relevant, optional=True,
+            ),
+            WorkflowStep(
+                "SYNTHESIZE", SynthesizeResult, synthesize_prompt,
+                inputs=("ORIENT", "MAP", "SCORE", "AI_INFRA"),
+            ),
+        ]
+
+    def merge_steps(self, ticker: str, year: int, result: WorkflowGraphResult) -> CSPPv26AnalysisResult:
+        """Merge the sub-call outputs into a CSPPv26AnalysisResult."""
+        orient_obj = result.get("ORIENT")
+        map_obj = result.get("MAP")
+        score_obj = result.get("SCORE")
+        ai_infra_obj = result.get("AI_INFRA")
+        synth_obj = result.get("SYNTHESIZE")
+
+        failed = [
+            name for name in ("ORIENT", "MAP", "SCORE", "SYNTHESIZE")
+            if result.get(name) is None
+        ]
 
         if not failed:
             merged = _merge_results(
@@ -1848,7 +1807,8 @@ class CSPPv26Analyzer(CustomWorkflow):
             raise AIProviderError(
                 "CSPP v2.6: both SCORE and SYNTHESIZE calls failed; "
                 "cannot produce a meaningful result. "
-                f"Errors: SCORE={score_err}; SYNTHESIZE={synth_err}"
+                f"Errors: SCORE={result.errors.get('SCORE')}; "
+                f"SYNTHESIZE={result.errors.get('SYNTHESIZE')}"
             )
 
         merged = _merge_results(
@@ -113,6 +113,7 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 from custom_workflows.base import CustomWorkflow
+from eon.analysis.workflow_graph import WorkflowStep, WorkflowGraphExecutor
 from eon.core import get_logger
 from eon.core.exceptions import AIProviderError
 
@@ -1107,7 +1108,7 @@ class MoonshotOptionsFinder(CustomWorkflow):
 
     # ---- orchestrated two-call analysis ----------------------------------
 
-    def analyze(self, ticker: str, year: int, text: str, provider) -> MoonshotOptionsResult:
+    def analyze(self, ticker: str, year: int, text: str, provider, checkpoint=None) -> MoonshotOptionsResult:
         """Run DIAGNOSE then STRUCTURE and merge into a MoonshotOptionsResult.
 
         Each call is guarded: if DIAGNOSE fails we still attempt STRUCTURE with
@@ -1174,40 +1175,26 @@ class MoonshotOptionsFinder(CustomWorkflow):
                 used_live_options_chain,
             )
 
-        # --- Call 1: DIAGNOSE -------------------------------------------------
-        diag_obj: MoonshotDiagnosis | None = None
-        diag_err: str | None = None
-        try:
-            prompt = (
+        # --- Calls: DIAGNOSE -> STRUCTURE ---------------------------------------
+        # Declared as a step graph; STRUCTURE reads the diagnosis, so the two
+        # still run in order. Each call carries the filing inline and is
+        # bounded by what is left of the deadline.
+        def diagnose_prompt(up) -> str:
+            return (
                 _PROMPT_DIAGNOSE.format(ticker=ticker, year=year, form=form_label)
                 + market_section
                 + filing_block
             )
-            diag_obj = _call_with_deadline(
-                lambda: provider.generate_with_retry(
-                    prompt=prompt,
-                    schema=MoonshotDiagnosis,
-                    max_retries=3,
-                    retry_delay=10,
-                ),
-                _remaining(),
-            )
-            logger.info(f"Moonshot DIAGNOSE call succeeded for {ticker} {year}")
-        except (AIProviderError, Exception) as e:
-            diag_err = str(e)
-            logger.error(f"Moonshot DIAGNOSE call failed for {ticker} {year}: {e}")
-
-        # --- Call 2: STRUCTURE -----------------------------------------------
-        struct_obj: OptionsStructure | None = None
-        struct_err: str | None = None
-        try:
+
+        def structure_prompt(up) -> str:
+            diag = up["DIAGNOSE"]
             diag_ctx = (
-                diag_obj.model_dump_json(indent=2)
-                if diag_obj
+                diag.model_dump_json(indent=2)
+                if diag
                 else "(DIAGNOSE call failed -- design conservatively and lean PASS "
                 "unless the filing clearly shows an asymmetric setup)"
             )
-            prompt = (
+            return (
                 _PROMPT_STRUCTURE.format(
                     ticker=ticker,
                     year=year,
@@ -1216,19 +1203,24 @@ class MoonshotOptionsFinder(CustomWorkflow):
                 + market_section
                 + filing_block
             )
-            struct_obj = _call_with_deadline(
-                lambda: provider.generate_with_retry(
-                    prompt=prompt,
-                    schema=OptionsStructure,
-                    max_retries=3,
-                    retry_delay=10,
+
+        graph = WorkflowGraphExecutor().run(
+            provider,
+            [
+                WorkflowStep("DIAGNOSE", MoonshotDiagnosis, diagnose_prompt, use_context=False),
+                WorkflowStep(
+                    "STRUCTURE", OptionsStructure, structure_prompt,
+                    inputs=("DIAGNOSE",), use_context=False,
                 ),
-                _remaining(),
-            )
-            logger.info(f"Moonshot STRUCTURE call succeeded for {ticker} {year}")
-        except (AIProviderError, Exception) as e:
-            struct_err = str(e)
-            logger.error(f"Moonshot STRUCTURE call failed for {ticker} {year}: {e}")
+            ],
+            label=f"Moonshot {ticker} {year}",
+            call_wrapper=lambda call: _call_with_deadline(call, _remaining()),
+            checkpoint=checkpoint,
+        )
+        diag_obj: MoonshotDiagnosis | None = graph.get("DIAGNOSE")
+        struct_obj: OptionsStructure | None = graph.get("STRUCTURE")
+        diag_err: str | None = graph.errors.get("DIAGNOSE")
+        struct_err: str | None = graph.errors.get("STRUCTURE")
 
         result = self._merge(
             ticker,
@@ -10,7 +10,10 @@ from .api_config import APILimits, API_LIMITS, get_api_limits
 from .usage_tracker import APIUsageTracker, get_usage_tracker, reset_tracker
 from .key_manager import APIKeyManager
 from .rate_limiter import RateLimiter
+from .key_scheduler import KeyScheduler, get_key_scheduler, reset_key_scheduler
+from .token_estimator import TokenEstimator, get_token_estimator, reset_token_estimator
 from .request_queue import GeminiRequestQueue, get_gemini_request_queue, reset_gemini_request_queue
+from .response_cache import ResponseCache, get_response_cache, reset_response_cache, response_cache_enabled
 
 __all__ = [
     # Configuration
@@ -25,8 +28,19 @@ __all__ = [
     'APIKeyManager',
     # Rate Limiting
     'RateLimiter',
+    'KeyScheduler',
+    'get_key_scheduler',
+    'reset_key_scheduler',
+    'TokenEstimator',
+    'get_token_estimator',
+    'reset_token_estimator',
     # Request Queue (global serialization)
     'GeminiRequestQueue',
     'get_gemini_request_queue',
     'reset_gemini_request_queue',
+    # Response Cache
+    'ResponseCache',
+    'get_response_cache',
+    'reset_response_cache',
+    'response_cache_enabled',
 ]
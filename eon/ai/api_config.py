@@ -25,13 +25,19 @@ class APILimits:
     # Adjust this based on your API tier
     DAILY_LIMIT_PER_KEY: int = 20
 
-    # Mandatory sleep after each request (seconds)
-    # Gemini free tier has ~15 RPM limit, 65s ensures we stay under
+    # Fixed sleep after each request for RateLimiter.record_and_sleep (seconds)
+    # The Gemini request queue schedules by RPM/TPM quota instead
     SLEEP_AFTER_REQUEST: int = 65
 
-    # Requests per minute limit (for future use)
+    # Requests per minute allowed per key (token bucket, shared across processes)
+    # Set via EON_REQUESTS_PER_MINUTE env var to match your API tier
     REQUESTS_PER_MINUTE: int = 15
 
+    # Input tokens per minute allowed per key (token bucket, shared across processes)
+    # Free tier: 250k TPM for gemini-2.5-flash; paid tiers allow far more
+    # Set via EON_TOKENS_PER_MINUTE env var
+    TOKENS_PER_MINUTE: int = 250_000
+
     # Maximum concurrent requests per key
     MAX_CONCURRENT_PER_KEY: int = 1
 
@@ -62,6 +68,7 @@ class APILimits:
             'daily_limit_per_key': self.DAILY_LIMIT_PER_KEY,
             'sleep_after_request': self.SLEEP_AFTER_REQUEST,
             'requests_per_minute': self.REQUESTS_PER_MINUTE,
+            'tokens_per_minute': self.TOKENS_PER_MINUTE,
             'max_concurrent_per_key': self.MAX_CONCURRENT_PER_KEY,
             'max_concurrent_requests': self.MAX_CONCURRENT_REQUESTS,
             'reset_timezone': self.RESET_TIMEZONE,
@@ -83,22 +90,19 @@ class SECLimits:
     All values are configurable via environment variables.
     """
 
-    # Delay between SEC requests (seconds)
-    # Min: 0.5 (aggressive) | Recommended: 2.0 | Max: 10.0 (very conservative)
-    REQUEST_DELAY: float = 2.0
+    # Sustained SEC request rate shared by all processes (token bucket)
+    # Min: 0.5 (very conservative) | Recommended: 8 | Max: 10 (SEC limit)
+    REQUESTS_PER_SECOND: float = 8.0
+
+    # Requests that may be sent back-to-back before the rate applies
+    # Min: 1 (strict spacing) | Recommended: 8 | Max: 10
+    BURST: int = 8
 
     # Maximum concurrent SEC requests
     # Limits parallel downloads to avoid overwhelming SEC servers
     # Min: 1 (sequential) | Recommended: 5 | Max: 10 (aggressive)
     MAX_CONCURRENT_REQUESTS: int = 5
 
-    # Stagger delay between batch worker starts (seconds)
-    # Prevents thundering herd when multiple workers start batch processing
-    # With free tier's 250k tokens/minute limit, 60s ensures only 1 worker
-    # starts per minute, avoiding token limit issues with large 10-Ks
-    # Min: 0 (no stagger) | Recommended: 60 | Max: 120 (very conservative)
-    WORKER_STAGGER_DELAY: int = 60
-
     # Maximum parallel workers for batch processing
     # Limits how many companies are processed simultaneously
     # Set lower (2-3) for free tier to avoid token-per-minute limits
@@ -106,16 +110,22 @@ class SECLimits:
     # 0 = no limit (use all available API keys)
     MAX_PARALLEL_WORKERS: int = 3
 
+    # Companies whose filings batch runs download ahead of the LLM stage
+    # 0 = no prefetch (the extract stage downloads each company itself)
+    # Min: 0 | Recommended: 5 | Max: 20 (uses more disk ahead of time)
+    PREFETCH_LOOKAHEAD: int = 5
+
     # Directory for SEC lock files (same as Gemini for simplicity)
     LOCK_DIR: str = "data/api_usage"
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
         return {
-            'request_delay': self.REQUEST_DELAY,
+            'requests_per_second': self.REQUESTS_PER_SECOND,
+            'burst': self.BURST,
             'max_concurrent_requests': self.MAX_CONCURRENT_REQUESTS,
-            'worker_stagger_delay': self.WORKER_STAGGER_DELAY,
             'max_parallel_workers': self.MAX_PARALLEL_WORKERS,
+            'prefetch_lookahead': self.PREFETCH_LOOKAHEAD,
             'lock_dir': self.LOCK_DIR,
         }
 
@@ -131,6 +141,8 @@ def get_api_limits() -> APILimits:
     Environment variables:
         EON_KEY_WAIT_TIMEOUT: Seconds to wait for API key (default: 600)
         EON_MAX_CONCURRENT_REQUESTS: Max parallel API calls (default: 25)
+        EON_REQUESTS_PER_MINUTE: Requests per minute per key (default: 15)
+        EON_TOKENS_PER_MINUTE: Input tokens per minute per key (default: 250000)
 
     Returns:
         APILimits instance with configured values
@@ -141,6 +153,8 @@ def get_api_limits() -> APILimits:
         _api_limits_instance = APILimits(
             KEY_WAIT_TIMEOUT=int(os.getenv('EON_KEY_WAIT_TIMEOUT', 600)),
             MAX_CONCURRENT_REQUESTS=int(os.getenv('EON_MAX_CONCURRENT_REQUESTS', 25)),
+            REQUESTS_PER_MINUTE=int(os.getenv('EON_REQUESTS_PER_MINUTE', 15)),
+            TOKENS_PER_MINUTE=int(os.getenv('EON_TOKENS_PER_MINUTE', 250_000)),
         )
     return _api_limits_instance
 
@@ -154,18 +168,25 @@ def get_sec_limits() -> SECLimits:
     Get SEC limits from environment variables or use defaults.
 
     Environment variables:
-        EON_SEC_REQUEST_DELAY: Seconds between SEC requests (default: 2.0)
+        EON_SEC_REQUESTS_PER_SECOND: Sustained SEC request rate (default: 8)
+        EON_SEC_BURST: Back-to-back SEC requests allowed (default: 8)
+        EON_SEC_REQUEST_DELAY: Legacy; seconds between requests, used as
+            1/delay req/s when EON_SEC_REQUESTS_PER_SECOND is not set
         EON_SEC_MAX_CONCURRENT: Max parallel SEC requests (default: 5)
-        EON_SEC_WORKER_STAGGER_DELAY: Seconds between worker starts (default: 60)
         EON_MAX_PARALLEL_WORKERS: Max parallel batch workers (default: 3, 0=unlimited)
+        EON_SEC_PREFETCH_LOOKAHEAD: Companies prefetched ahead in batches (default: 5, 0=off)
 
     Returns:
         SECLimits instance with configured values
     """
     import os
+    requests_per_second = os.getenv('EON_SEC_REQUESTS_PER_SECOND')
+    if requests_per_second is None and os.getenv('EON_SEC_REQUEST_DELAY'):
+        requests_per_second = 1.0 / max(float(os.getenv('EON_SEC_REQUEST_DELAY')), 0.1)
     return SECLimits(
-        REQUEST_DELAY=float(os.getenv('EON_SEC_REQUEST_DELAY', 2.0)),
+        REQUESTS_PER_SECOND=float(requests_per_second or 8.0),
+        BURST=int(os.getenv('EON_SEC_BURST', 8)),
         MAX_CONCURRENT_REQUESTS=int(os.getenv('EON_SEC_MAX_CONCURRENT', 5)),
-        WORKER_STAGGER_DELAY=int(os.getenv('EON_SEC_WORKER_STAGGER_DELAY', 60)),
         MAX_PARALLEL_WORKERS=int(os.getenv('EON_MAX_PARALLEL_WORKERS', 3)),
+        PREFETCH_LOOKAHEAD=int(os.getenv('EON_SEC_PREFETCH_LOOKAHEAD', 5)),
     )
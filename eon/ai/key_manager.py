@@ -7,12 +7,13 @@ Uses the APIUsageTracker for persistent, thread-safe usage tracking across
 multiple processes and sessions.
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Sequence
 from datetime import datetime
 
 from eon.core import get_logger, ConfigurationError, mask_api_key
 from .api_config import get_api_limits
 from .usage_tracker import get_usage_tracker, APIUsageTracker
+from .key_scheduler import get_key_scheduler
 
 
 class APIKeyManager:
@@ -113,12 +114,19 @@ class APIKeyManager:
 
         return key
 
-    def reserve_key(self, wait_timeout: Optional[float] = None) -> Optional[str]:
+    def reserve_key(
+        self,
+        wait_timeout: Optional[float] = None,
+        estimated_tokens: int = 0
+    ) -> Optional[str]:
         """
         Atomically reserve and return the best available API key.
 
         This is the RECOMMENDED method for parallel/batch operations.
         It ensures each thread gets a unique key by using atomic reservation.
+        Among free keys it picks the one whose per-minute quota (requests and,
+        given estimated_tokens, tokens) frees up soonest (see KeyScheduler),
+        then the least used.
 
         If all keys are currently in use by other threads and wait_timeout > 0,
         this will wait for a key to be released before returning.
@@ -126,6 +134,8 @@ class APIKeyManager:
         Args:
             wait_timeout: Seconds to wait for a key (None = use config default,
                          0 = no waiting). Default reads from EON_KEY_WAIT_TIMEOUT.
+            estimated_tokens: Expected prompt tokens of the next request, so a
+                key with TPM room for it is preferred
 
         Returns:
             Reserved API key, or None if no keys available after timeout
@@ -137,7 +147,12 @@ class APIKeyManager:
         if wait_timeout is None:
             wait_timeout = self.limits.KEY_WAIT_TIMEOUT
 
-        key = self.tracker.reserve_and_get_key(self.api_keys, wait_timeout=wait_timeout)
+        scheduler = get_key_scheduler()
+        key = self.tracker.reserve_and_get_key(
+            self.api_keys,
+            wait_timeout=wait_timeout,
+            capacity_wait=lambda api_key: scheduler.time_until_available(api_key, estimated_tokens),
+        )
 
         if key is None:
             self.logger.error(
@@ -147,6 +162,32 @@ class APIKeyManager:
 
         return key
 
+    def pick_key(
+        self,
+        estimated_tokens: int = 0,
+        keys: Optional[Sequence[str]] = None
+    ) -> Optional[str]:
+        """
+        Pick the key whose per-minute quota frees up soonest, without reserving it.
+
+        For async callers that keep many requests in flight: each request
+        still waits for its key's RPM/TPM quota in the request queue, so
+        keys can be shared instead of held exclusively.
+
+        Args:
+            estimated_tokens: Expected prompt tokens of the next request
+            keys: Only pick from these keys, e.g. ones the caller has
+                reserved (default: all managed keys)
+
+        Returns:
+            An API key under its daily limit, or None if all are exhausted
+        """
+        candidates = self.get_available_keys()
+        if keys is not None:
+            allowed = set(keys)
+            candidates = [key for key in candidates if key in allowed]
+        return get_key_scheduler().pick_key(candidates, estimated_tokens)
+
     def release_key(self, api_key: str):
         """
         Release a previously reserved API key.
@@ -0,0 +1,413 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Per-key token-bucket scheduler for Gemini requests.
+
+Each API key gets two buckets - requests per minute (RPM) and tokens per
+minute (TPM) - whose state lives in a small JSON file next to the usage
+data, so every thread, process and CLI/UI instance draws from the same
+quota. A request takes one RPM token and its estimated prompt tokens from
+the TPM bucket; when either bucket is short, the caller sleeps (outside
+any lock) until the key has capacity again.
+
+The dispatcher side (time_until_available / pick_key) lets callers hand
+the next request to whichever key has capacity soonest, so throughput
+scales with each key's quota instead of with a fixed per-key sleep.
+
+Cross-platform compatible (Windows, macOS, Linux).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import portalocker
+
+from eon.core import get_logger, mask_api_key
+from eon.ai.api_config import get_api_limits
+
+
+class KeyScheduler:
+    """
+    Cross-process RPM + TPM token buckets, one pair per API key.
+
+    Both buckets hold a full minute of quota and refill continuously, so a
+    key can burst up to its per-minute limit and then settles at the
+    configured rate. The per-key file lock is held only while refilling
+    and taking tokens - never while sleeping or while a request runs.
+
+    State files: data/api_usage/gemini_bucket_{key_hash}.json
+    Lock files:  data/api_usage/gemini_request_{key_hash}.lock
+
+    Usage:
+        scheduler = KeyScheduler()
+
+        key = scheduler.pick_key(api_keys, tokens=12_000)
+        scheduler.acquire(key, tokens=12_000)  # Blocks until key has capacity
+        response = client.models.generate_content(...)
+    """
+
+    def __init__(
+        self,
+        lock_dir: Optional[Path] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[int] = None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            lock_dir: Directory for lock/state files (default: data/api_usage/)
+            requests_per_minute: Per-key request quota (default from config)
+            tokens_per_minute: Per-key input token quota (default from config)
+        """
+        limits = get_api_limits()
+
+        self.lock_dir = Path(lock_dir or limits.USAGE_DATA_DIR)
+        self.requests_per_minute = float(requests_per_minute or limits.REQUESTS_PER_MINUTE)
+        self.tokens_per_minute = int(tokens_per_minute or limits.TOKENS_PER_MINUTE)
+
+        if self.requests_per_minute <= 0 or self.tokens_per_minute <= 0:
+            raise ValueError("requests_per_minute and tokens_per_minute must be positive")
+
+        self._request_rate = self.requests_per_minute / 60.0
+        self._token_rate = self.tokens_per_minute / 60.0
+
+        # Per-key thread locks for within-process coordination (cheaper than
+        # the file lock), so updates on different keys don't block each other
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._key_locks_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'acquired': 0, 'waits': 0, 'wait_seconds': 0.0, 'penalties': 0}
+
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+
+        self.logger = get_logger(f"{__name__}.KeyScheduler")
+        self.logger.info(
+            f"Initialized KeyScheduler: {self.requests_per_minute:g} RPM, "
+            f"{self.tokens_per_minute:,} TPM per key, lock_dir={self.lock_dir}"
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def acquire(self, api_key: str, tokens: int = 0, timeout: Optional[float] = None) -> bool:
+        """
+        Take one request and `tokens` input tokens from a key's buckets.
+
+        Waits, without holding any lock, until the key has capacity.
+
+        Args:
+            api_key: API key the request will use
+            tokens: Estimated input tokens for the request
+            timeout: Maximum seconds to wait (None = wait as long as needed)
+
+        Returns:
+            True if capacity was taken, False on timeout
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        waited = 0.0
+
+        while True:
+            wait = self._next_wait(api_key, tokens, deadline, timeout)
+            if wait is None:
+                return False
+            if wait <= 0:
+                self._record(waited)
+                return True
+            # Another process may take the capacity first; then we simply wait again
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, api_key: str, tokens: int = 0, timeout: Optional[float] = None) -> bool:
+        """
+        Async variant of acquire(): waits with asyncio.sleep instead of blocking.
+
+        Each attempt to take capacity runs in a worker thread, since it
+        takes the key's thread lock and file lock, either of which may be
+        held by another thread or process.
+
+        Args:
+            api_key: API key the request will use
+            tokens: Estimated input tokens for the request
+            timeout: Maximum seconds to wait (None = wait as long as needed)
+
+        Returns:
+            True if capacity was taken, False on timeout
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        waited = 0.0
+
+        while True:
+            wait = await asyncio.to_thread(self._next_wait, api_key, tokens, deadline, timeout)
+            if wait is None:
+                return False
+            if wait <= 0:
+                self._record(waited)
+                return True
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def time_until_available(self, api_key: str, tokens: int = 0) -> float:
+        """
+        Seconds until a key could take a request of `tokens` input tokens.
+
+        Does not take anything from the buckets.
+
+        Args:
+            api_key: API key to check
+            tokens: Estimated input tokens for the request
+
+        Returns:
+            0 if the key has capacity now, otherwise seconds to wait
+        """
+        try:
+            return self._update(api_key, tokens, take=False)
+        except Exception as e:
+            self.logger.warning(f"Key scheduler error for {mask_api_key(api_key)}: {e}")
+            return 0.0
+
+    def pick_key(self, api_keys: Iterable[str], tokens: int = 0) -> Optional[str]:
+        """
+        Pick the key with the earliest available capacity.
+
+        Ties keep the order of api_keys, so callers can pre-sort by
+        preference (e.g. least used today).
+
+        Args:
+            api_keys: Candidate API keys
+            tokens: Estimated input tokens for the request
+
+        Returns:
+            The chosen key, or None if api_keys is empty
+        """
+        best_key, best_wait = None, float('inf')
+        for key in api_keys:
+            wait = self.time_until_available(key, tokens)
+            if wait < best_wait:
+                best_key, best_wait = key, wait
+                if wait <= 0:
+                    break
+        return best_key
+
+    def penalize(self, api_key: str, seconds: float):
+        """
+        Hold a key back after the API rejected it with a rate-limit error.
+
+        Empties the key's request bucket so no process sends on it for
+        `seconds` (e.g. the retryDelay the API returned).
+
+        Args:
+            api_key: API key that hit its limit
+            seconds: How long the key should rest
+        """
+        try:
+            with self._locked(api_key):
+                now = time.time()
+                requests, tokens = self._read_state(api_key, now)
+                requests = min(requests, 1.0 - seconds * self._request_rate)
+                self._write_state(api_key, requests, tokens, now)
+        except Exception as e:
+            self.logger.warning(f"Failed to penalize key {mask_api_key(api_key)}: {e}")
+            return
+
+        with self._stats_lock:
+            self._stats['penalties'] += 1
+        self.logger.info(f"Key {mask_api_key(api_key)} rate limited, resting {seconds:.0f}s")
+
+    def settle(self, api_key: str, charged_tokens: int, actual_tokens: Optional[int]):
+        """
+        Correct a key's TPM bucket once the real prompt size is known.
+
+        Refunds an over-estimate, or charges the shortfall of an
+        under-estimate so later requests on the key wait for it.
+
+        Args:
+            api_key: API key the request used
+            charged_tokens: Tokens taken at admission (the estimate)
+            actual_tokens: usage_metadata.prompt_token_count (None = unknown)
+        """
+        if actual_tokens is None or actual_tokens == charged_tokens:
+            return
+
+        try:
+            with self._locked(api_key):
+                now = time.time()
+                requests, tokens = self._read_state(api_key, now)
+                tokens = min(float(self.tokens_per_minute), tokens + charged_tokens - actual_tokens)
+                self._write_state(api_key, requests, tokens, now)
+        except Exception as e:
+            self.logger.warning(f"Failed to settle tokens for key {mask_api_key(api_key)}: {e}")
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get scheduler statistics (acquisitions, waits, total wait time, penalties)."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update(
+            requests_per_minute=self.requests_per_minute,
+            tokens_per_minute=self.tokens_per_minute,
+        )
+        return stats
+
+    def get_key_hash(self, api_key: str) -> str:
+        """Get a hash of the API key for lock/state file naming."""
+        return hashlib.sha256(api_key[:16].encode()).hexdigest()[:16]
+
+    # ------------------------------------------------------------------
+    # Bucket state
+    # ------------------------------------------------------------------
+
+    def _next_wait(
+        self,
+        api_key: str,
+        tokens: int,
+        deadline: Optional[float],
+        timeout: Optional[float]
+    ) -> Optional[float]:
+        """
+        Try to take capacity for one request.
+
+        Returns:
+            0 if taken, seconds to sleep before trying again,
+            or None if the deadline has passed
+        """
+        try:
+            wait = self._update(api_key, tokens, take=True)
+        except Exception as e:
+            self.logger.error(f"Key scheduler error for {mask_api_key(api_key)}: {e}")
+            # Allow the request rather than blocking on a broken state file
+            return 0.0
+
+        if wait > 0 and deadline is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                self.logger.warning(
+                    f"Timed out after {timeout:.0f}s waiting for capacity on key {mask_api_key(api_key)}"
+                )
+                return None
+            wait = min(wait, remaining)
+
+        if wait > 0:
+            self.logger.debug(f"Key {mask_api_key(api_key)} at quota, waiting {wait:.1f}s")
+        return wait
+
+    def _update(self, api_key: str, tokens: int, take: bool) -> float:
+        """
+        Refill a key's buckets and optionally take one request's worth.
+
+        Returns:
+            0 if the request fits (and was taken, if take=True),
+            otherwise seconds until it would fit
+        """
+        # A prompt larger than the whole TPM quota waits for a full bucket
+        cost = min(max(0, tokens), self.tokens_per_minute)
+
+        with self._locked(api_key):
+            now = time.time()
+            requests, available = self._read_state(api_key, now)
+
+            wait = max(
+                (1.0 - requests) / self._request_rate,
+                (cost - available) / self._token_rate,
+                0.0,
+            )
+            if wait <= 0 and take:
+                requests -= 1.0
+                available -= cost
+            if take:
+                self._write_state(api_key, requests, available, now)
+            return wait
+
+    @contextmanager
+    def _locked(self, api_key: str):
+        """Hold the key's thread lock and file lock."""
+        with self._lock_for(api_key):
+            with open(self._lock_path(api_key), 'a+') as f:
+                portalocker.lock(f, portalocker.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    portalocker.unlock(f)
+
+    def _lock_for(self, api_key: str) -> threading.Lock:
+        """Get the per-key thread lock, creating it on first use."""
+        with self._key_locks_lock:
+            lock = self._key_locks.get(api_key)
+            if lock is None:
+                lock = self._key_locks[api_key] = threading.Lock()
+            return lock
+
+    def _lock_path(self, api_key: str) -> Path:
+        return self.lock_dir / f"gemini_request_{self.get_key_hash(api_key)}.lock"
+
+    def _state_path(self, api_key: str) -> Path:
+        return self.lock_dir / f"gemini_bucket_{self.get_key_hash(api_key)}.json"
+
+    def _read_state(self, api_key: str, now: float) -> Tuple[float, float]:
+        """Read and refill (requests, tokens); a missing/corrupt file means full buckets."""
+        try:
+            state = json.loads(self._state_path(api_key).read_text())
+            requests, tokens = float(state['requests']), float(state['tokens'])
+            elapsed = max(0.0, now - float(state['updated']))  # Clamp for clock steps backwards
+        except (OSError, ValueError, KeyError, TypeError):
+            return self.requests_per_minute, float(self.tokens_per_minute)
+
+        requests = min(self.requests_per_minute, requests + elapsed * self._request_rate)
+        tokens = min(float(self.tokens_per_minute), tokens + elapsed * self._token_rate)
+        return requests, tokens
+
+    def _write_state(self, api_key: str, requests: float, tokens: float, updated: float):
+        """Write bucket state (atomic replace, so readers never see a partial file)."""
+        state_path = self._state_path(api_key)
+        tmp_path = state_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps({'requests': requests, 'tokens': tokens, 'updated': updated}))
+            os.replace(tmp_path, state_path)
+        except OSError as e:
+            self.logger.warning(f"Failed to write key bucket state: {e}")
+
+    def _record(self, waited: float):
+        with self._stats_lock:
+            self._stats['acquired'] += 1
+            if waited > 0:
+                self._stats['waits'] += 1
+                self._stats['wait_seconds'] += waited
+
+
+# Global singleton with thread-safe initialization
+_global_scheduler: Optional[KeyScheduler] = None
+_scheduler_creation_lock = threading.Lock()
+
+
+def get_key_scheduler() -> KeyScheduler:
+    """
+    Get the global key scheduler singleton.
+
+    Thread-safe singleton pattern using double-checked locking.
+
+    Returns:
+        The global KeyScheduler instance
+    """
+    global _global_scheduler
+
+    if _global_scheduler is None:
+        with _scheduler_creation_lock:
+            if _global_scheduler is None:
+                _global_scheduler = KeyScheduler()
+
+    return _global_scheduler
+
+
+def reset_key_scheduler():
+    """Reset the global key scheduler (mainly for testing)."""
+    global _global_scheduler
+    with _scheduler_creation_lock:
+        _global_scheduler = None
@@ -237,6 +237,28 @@ PERSPECTIVE_PROMPTS = {
     'contrarian': CONTRARIAN_PROMPT,
 }
 
+# Filing sections each perspective reads (names resolve per form, see
+# eon.data.sources.sec.sections). Exhibits, signatures and the cover/TOC
+# are left out; filings that can't be segmented are sent whole.
+BUFFETT_SECTIONS = (
+    'business', 'risk_factors', 'market_for_equity', 'mdna',
+    'financial_statements', 'executive_compensation', 'security_ownership',
+)
+TALEB_SECTIONS = (
+    'business', 'risk_factors', 'legal_proceedings', 'mdna', 'market_risk',
+    'financial_statements', 'security_ownership',
+)
+CONTRARIAN_SECTIONS = (
+    'business', 'risk_factors', 'mdna', 'market_risk', 'financial_statements',
+)
+
+PERSPECTIVE_SECTIONS = {
+    'multi': tuple(dict.fromkeys(BUFFETT_SECTIONS + TALEB_SECTIONS + CONTRARIAN_SECTIONS)),
+    'buffett': BUFFETT_SECTIONS,
+    'taleb': TALEB_SECTIONS,
+    'contrarian': CONTRARIAN_SECTIONS,
+}
+
 
 def get_perspective_prompt(name: str = 'multi') -> str:
     """
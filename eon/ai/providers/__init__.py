@@ -5,9 +5,37 @@ LLM provider implementations for EON.
 """
 
 from .base import LLMProvider
+from .context_cache import (
+    CachedContext,
+    ContextCacheRegistry,
+    get_context_cache_registry,
+    reset_context_cache_registry,
+)
 from .gemini import GeminiProvider
+from .gemini_async import AsyncGeminiProvider
+from .local import LocalProvider
+from .pool import (
+    ProviderPool,
+    get_provider_pool,
+    reset_provider_pool,
+    get_gemini_provider,
+    get_async_gemini_provider,
+    provider_for_free_key,
+)
 
 __all__ = [
     'LLMProvider',
     'GeminiProvider',
+    'AsyncGeminiProvider',
+    'LocalProvider',
+    'ProviderPool',
+    'get_provider_pool',
+    'reset_provider_pool',
+    'get_gemini_provider',
+    'get_async_gemini_provider',
+    'provider_for_free_key',
+    'CachedContext',
+    'ContextCacheRegistry',
+    'get_context_cache_registry',
+    'reset_context_cache_registry',
 ]
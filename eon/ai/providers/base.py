@@ -5,11 +5,14 @@ Abstract base class for LLM providers.
 Allows easy swapping between Gemini, OpenAI, Anthropic, etc.
 """
 
+import asyncio
+import threading
 from abc import ABC, abstractmethod
 from typing import Optional, Type, Union, Dict, Any
 from pydantic import BaseModel
 
 from eon.core import get_logger
+from .context_cache import CachedContext
 
 
 class LLMProvider(ABC):
@@ -39,6 +42,17 @@ class LLMProvider(ABC):
         self.config = kwargs
         self.logger = get_logger(f"{__name__}.{self.__class__.__name__}")
 
+        # Token accounting for this provider instance (see record_token_usage)
+        self._usage_lock = threading.Lock()
+        self.token_usage: Dict[str, int] = {
+            'requests': 0,
+            'prompt_tokens': 0,
+            'cached_tokens': 0,
+            'output_tokens': 0,
+            'contexts_created': 0,
+            'response_cache_hits': 0,
+        }
+
     @abstractmethod
     def generate(
         self,
@@ -52,7 +66,8 @@ class LLMProvider(ABC):
         Args:
             prompt: The prompt to send to the LLM
             schema: Optional Pydantic schema for structured output
-            **kwargs: Additional generation parameters
+            **kwargs: Additional generation parameters; ``context`` takes a
+                CachedContext from cache_context()
 
         Returns:
             - If schema is provided: Validated Pydantic model instance
@@ -89,6 +104,36 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def generate_with_retry_async(
+        self,
+        prompt: str,
+        schema: Optional[Type[BaseModel]] = None,
+        max_retries: int = 3,
+        **kwargs
+    ) -> Union[BaseModel, Dict[str, Any]]:
+        """
+        Async variant of generate_with_retry().
+
+        This default runs the blocking call in a worker thread; providers
+        with a native async client (AsyncGeminiProvider) override it.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            schema: Optional Pydantic schema for structured output
+            max_retries: Maximum number of retry attempts
+            **kwargs: Additional generation parameters
+
+        Returns:
+            - If schema is provided: Validated Pydantic model instance
+            - If schema is None: Dictionary with unstructured response
+
+        Raises:
+            AIProviderError: If all retries fail
+        """
+        return await asyncio.to_thread(
+            self.generate_with_retry, prompt, schema, max_retries=max_retries, **kwargs
+        )
+
     @abstractmethod
     def validate_api_key(self) -> bool:
         """
@@ -99,6 +144,72 @@ class LLMProvider(ABC):
         """
         pass
 
+    # ---- shared context -------------------------------------------------
+
+    def cache_context(self, text: str, ttl_seconds: Optional[int] = None) -> CachedContext:
+        """
+        Prepare context text (e.g. a filing) that several calls will share.
+
+        Pass the returned handle as ``context=`` to generate() /
+        generate_with_retry(); the prompt then only carries the call's
+        own instructions. This default implementation has no server-side
+        cache: the text is sent inline as a prompt prefix on every call.
+
+        Args:
+            text: Context text
+            ttl_seconds: How long a provider-side cache should live
+
+        Returns:
+            CachedContext handle
+        """
+        return CachedContext.inline(text, self.model, token_count=len(text) // 4)
+
+    def release_context(self, context: Optional[CachedContext]):  # noqa: B027
+        """
+        Free a context once its calls are done.
+
+        Intentionally a no-op, not abstract: inline contexts hold nothing
+        to free. Providers with a server-side cache (GeminiProvider)
+        override it to delete the cache.
+
+        Args:
+            context: Handle returned by cache_context()
+        """
+
+    @staticmethod
+    def with_context(prompt: str, context: Optional[CachedContext]) -> str:
+        """Build the full prompt for inline context: context first, as a stable shared prefix."""
+        if context is None:
+            return prompt
+        return f"{context.text}\n\n{prompt}"
+
+    # ---- token accounting --------------------------------------------------
+
+    def record_token_usage(
+        self,
+        prompt_tokens: int = 0,
+        cached_tokens: int = 0,
+        output_tokens: int = 0
+    ):
+        """
+        Add one request's token counts to this provider's totals.
+
+        Args:
+            prompt_tokens: Input tokens, including any served from a cache
+            cached_tokens: Part of prompt_tokens served from a cache
+            output_tokens: Generated tokens
+        """
+        with self._usage_lock:
+            self.token_usage['requests'] += 1
+            self.token_usage['prompt_tokens'] += prompt_tokens
+            self.token_usage['cached_tokens'] += cached_tokens
+            self.token_usage['output_tokens'] += output_tokens
+
+    def get_token_usage(self) -> Dict[str, int]:
+        """Get token totals for requests made through this provider."""
+        with self._usage_lock:
+            return dict(self.token_usage)
+
     def __repr__(self) -> str:
         """String representation."""
         return f"{self.__class__.__name__}(model={self.model})"
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Shared filing context for multi-call workflows.
+
+Workflows such as CSPP v2.6 ask several questions about the same filing.
+Instead of appending the whole 10-K to every prompt, they call
+``provider.cache_context(filing_text)`` once and pass the returned
+CachedContext to each ``generate`` call. Providers that support
+server-side caching upload the text once per (API key, model, filing
+hash) and reference it by name; the others send it inline as a stable
+prompt prefix, which still benefits from implicit prefix caching.
+
+Handles are kept in a process-wide registry so every provider instance
+using the same key can reuse an upload until it expires.
+"""
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from eon.core import get_logger
+
+
+def hash_content(text: str) -> str:
+    """Get a stable hash of context text (used as part of the cache key)."""
+    return hashlib.sha256(text.encode('utf-8', errors='replace')).hexdigest()
+
+
+def hash_api_key(api_key: str) -> str:
+    """Get a short hash of an API key, so keys are never stored in the registry."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+@dataclass
+class CachedContext:
+    """
+    Handle to context text shared by several generate calls.
+
+    Attributes:
+        text: The context text (always kept, for inline fallback)
+        content_hash: SHA-256 of text
+        model: Model the context was cached for
+        token_count: Estimated tokens in text
+        name: Provider-side cache name; None means the text is sent inline
+        expires_at: Epoch seconds when the provider drops the cache (0 = never)
+    """
+    text: str
+    content_hash: str
+    model: str
+    token_count: int
+    name: Optional[str] = None
+    expires_at: float = 0.0
+
+    @classmethod
+    def inline(cls, text: str, model: str, token_count: int) -> 'CachedContext':
+        """Create a handle for context that is sent as a prompt prefix."""
+        return cls(text=text, content_hash=hash_content(text), model=model, token_count=token_count)
+
+    @property
+    def is_remote(self) -> bool:
+        """True if the context lives in a provider-side cache."""
+        return self.name is not None
+
+    def is_expired(self, margin: float = 30.0) -> bool:
+        """True if a remote cache expires within `margin` seconds."""
+        return self.is_remote and self.expires_at > 0 and time.time() + margin >= self.expires_at
+
+
+class ContextCacheRegistry:
+    """
+    Process-wide map of (key hash, model, content hash) -> CachedContext.
+
+    Thread-safe. Only remote handles are stored; inline contexts cost
+    nothing to recreate.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str, str], CachedContext] = {}
+        self.logger = get_logger(f"{__name__}.ContextCacheRegistry")
+
+    def get(self, api_key: str, model: str, content_hash: str) -> Optional[CachedContext]:
+        """
+        Get a live cached context, dropping it if it has expired.
+
+        Args:
+            api_key: API key the cache was created with
+            model: Model name
+            content_hash: hash_content() of the context text
+
+        Returns:
+            The CachedContext, or None
+        """
+        entry_key = (hash_api_key(api_key), model, content_hash)
+        with self._lock:
+            context = self._entries.get(entry_key)
+            if context is not None and context.is_expired():
+                del self._entries[entry_key]
+                return None
+            return context
+
+    def put(self, api_key: str, context: CachedContext):
+        """Register a remote context for reuse."""
+        if not context.is_remote:
+            return
+        with self._lock:
+            self._entries[(hash_api_key(api_key), context.model, context.content_hash)] = context
+
+    def invalidate(self, api_key: str, context: CachedContext):
+        """Forget a context (deleted, or rejected by the provider)."""
+        with self._lock:
+            self._entries.pop((hash_api_key(api_key), context.model, context.content_hash), None)
+
+    def clear(self):
+        """Forget every context."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Global singleton with thread-safe initialization
+_global_registry: Optional[ContextCacheRegistry] = None
+_registry_creation_lock = threading.Lock()
+
+
+def get_context_cache_registry() -> ContextCacheRegistry:
+    """
+    Get the global context cache registry singleton.
+
+    Thread-safe singleton pattern using double-checked locking.
+
+    Returns:
+        The global ContextCacheRegistry instance
+    """
+    global _global_registry
+
+    if _global_registry is None:
+        with _registry_creation_lock:
+            if _global_registry is None:
+                _global_registry = ContextCacheRegistry()
+
+    return _global_registry
+
+
+def reset_context_cache_registry():
+    """Reset the global registry (mainly for testing)."""
+    global _global_registry
+    with _registry_creation_lock:
+        _global_registry = None
@@ -16,9 +16,13 @@ from google.genai import types
 from pydantic import BaseModel
 
 from eon.core import get_logger, AIProviderError
+from eon.core.exceptions import ContextLengthExceededError
 from .base import LLMProvider
+from .context_cache import CachedContext, get_context_cache_registry, hash_content
 from eon.ai.rate_limiter import RateLimiter
-from eon.ai.request_queue import get_gemini_request_queue
+from eon.ai.request_queue import get_gemini_request_queue, prompt_token_count
+from eon.ai.response_cache import get_response_cache
+from eon.ai.token_estimator import TokenEstimator, get_token_estimator
 
 
 class GeminiProvider(LLMProvider):
@@ -40,6 +44,13 @@ class GeminiProvider(LLMProvider):
         result = provider.generate(prompt)
     """
 
+    # Below this size an explicit cache isn't worth an extra call
+    # (Gemini's minimum is 1,024-4,096 tokens depending on the model)
+    MIN_CONTEXT_CACHE_TOKENS = 4096
+
+    # Lifetime of uploaded contexts; a multi-call workflow finishes well within it
+    CONTEXT_CACHE_TTL = 900
+
     def __init__(
         self,
         api_key: str,
@@ -48,6 +59,7 @@ class GeminiProvider(LLMProvider):
         thinking_level: Optional[str] = None,
         use_google_search: bool = False,
         rate_limiter: Optional[RateLimiter] = None,
+        use_response_cache: bool = False,
         **kwargs
     ):
         """
@@ -60,6 +72,9 @@ class GeminiProvider(LLMProvider):
             thinking_level: Thinking level for Gemini 3 models ("LOW", "MEDIUM", "HIGH")
             use_google_search: Enable Google Search tool for real-time web search
             rate_limiter: Optional rate limiter for API calls
+            use_response_cache: Serve repeated calls from the disk response
+                cache (pooled providers get the configured setting, see
+                response_cache_enabled)
             **kwargs: Additional configuration
         """
         super().__init__(api_key, model, **kwargs)
@@ -70,6 +85,8 @@ class GeminiProvider(LLMProvider):
         self.use_google_search = use_google_search
         self.rate_limiter = rate_limiter
 
+        self.use_response_cache = use_response_cache
+
         # Initialize Gemini client
         self.client = genai.Client(api_key=api_key)
 
@@ -81,18 +98,25 @@ class GeminiProvider(LLMProvider):
         self,
         prompt: str,
         schema: Optional[Type[BaseModel]] = None,
+        context: Optional[CachedContext] = None,
         **kwargs
     ) -> Union[BaseModel, Dict[str, Any]]:
         """
         Generate a response from Gemini.
 
-        Uses global request queue to serialize all API calls, ensuring rate limits
-        are not exceeded even when running multiple analyses in parallel.
+        Uses the global request queue, which schedules each call against the
+        key's RPM/TPM quota, so rate limits are not exceeded even when running
+        multiple analyses in parallel. A call identical to an earlier one
+        (same model, thinking config, schema, parameters, prompt and context)
+        is answered from the response cache without an API request.
 
         Args:
             prompt: The prompt to send
             schema: Optional Pydantic schema for structured output
-            **kwargs: Additional parameters (temperature, etc.)
+            context: Shared context from cache_context(), referenced by name
+                when cached server-side, otherwise sent as the prompt prefix
+            **kwargs: Additional parameters (temperature, etc.); pass
+                use_cache=False to bypass the response cache
 
         Returns:
             - If schema provided: Validated Pydantic model instance
@@ -101,7 +125,104 @@ class GeminiProvider(LLMProvider):
         Raises:
             AIProviderError: If generation fails
         """
-        # Build configuration
+        cache_key = self._response_cache_key(prompt, schema, context, kwargs)
+        if cache_key:
+            cached = self._cached_response(cache_key, schema)
+            if cached is not None:
+                return cached
+
+        config_params = self._build_config(schema)
+
+        try:
+            # Execute API call through the global queue (waits for key quota)
+            response = self._send(prompt, config_params, kwargs, context)
+            result = self._parse_response(response, schema)
+
+            # Record API usage (tokens included) and calibrate the estimator
+            self._record_usage(prompt, response, context)
+
+        except Exception as e:
+            raise self._generation_error(e) from e
+
+        if cache_key:
+            self._store_response(cache_key, result, response)
+        return result
+
+    # ---- response cache -------------------------------------------------
+
+    def _response_cache_key(
+        self,
+        prompt: str,
+        schema: Optional[Type[BaseModel]],
+        context: Optional[CachedContext],
+        kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Get the response cache key for a call (pops use_cache from kwargs).
+
+        Returns:
+            Cache key, or None if this call must not be cached (bypassed,
+            cache disabled, or Google Search grounding, whose answers change)
+        """
+        use_cache = kwargs.pop('use_cache', True)
+        if not (use_cache and self.use_response_cache) or self.use_google_search:
+            return None
+
+        return get_response_cache().make_key(
+            model=self.model,
+            prompt=prompt,
+            schema=schema,
+            thinking={'budget': self.thinking_budget, 'level': self.thinking_level},
+            context_hash=context.content_hash if context is not None else None,
+            params=kwargs,
+        )
+
+    def _cached_response(
+        self,
+        cache_key: str,
+        schema: Optional[Type[BaseModel]]
+    ) -> Optional[Union[BaseModel, Dict[str, Any]]]:
+        """
+        Look up a cached response and record the hit.
+
+        Hits count in this provider's token usage and in the key's usage
+        stats as cache hits; no request is recorded against the key's quota.
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        cache = get_response_cache()
+        entry = cache.get(cache_key)
+        if entry is None:
+            return None
+
+        try:
+            result = schema.model_validate(entry['result']) if schema else entry['result']
+        except Exception as e:
+            self.logger.warning(f"Discarding cached response that no longer validates: {e}")
+            cache.invalidate(cache_key)
+            return None
+
+        tokens_saved = entry.get('tokens', 0)
+        with self._usage_lock:
+            self.token_usage['response_cache_hits'] += 1
+        if self.rate_limiter:
+            self.rate_limiter.tracker.record_cache_hit(self.api_key, tokens_saved=tokens_saved)
+
+        self.logger.debug(f"Response cache hit ({tokens_saved:,} tokens saved)")
+        return result
+
+    def _store_response(self, cache_key: str, result: Union[BaseModel, Dict[str, Any]], response: Any):
+        """Store a validated response with the tokens it cost."""
+        tokens = getattr(getattr(response, 'usage_metadata', None), 'total_token_count', None)
+        get_response_cache().put(
+            cache_key,
+            result.model_dump(mode='json') if isinstance(result, BaseModel) else result,
+            tokens=tokens if isinstance(tokens, int) else 0,
+        )
+
+    def _build_config(self, schema: Optional[Type[BaseModel]]) -> Dict[str, Any]:
+        """Build GenerateContentConfig parameters (thinking, tools, output format)."""
         config_params = {}
 
         # Add thinking configuration (Gemini 2 vs Gemini 3)
@@ -127,101 +248,267 @@ class GeminiProvider(LLMProvider):
         # Add response format
         config_params['response_mime_type'] = "application/json"
 
-        # Use global request queue to serialize the API call
-        # This prevents concurrent requests from different threads/keys
+        if schema:
+            config_params['response_schema'] = schema
+        return config_params
+
+    def _parse_response(self, response: Any, schema: Optional[Type[BaseModel]]) -> Union[BaseModel, Dict[str, Any]]:
+        """Parse a generate_content response into the schema, or a dict."""
+        if schema:
+            # Structured output with Pydantic validation
+            result = schema.model_validate_json(response.text)
+            self.logger.debug(f"Successfully generated structured response ({schema.__name__})")
+            return result
+
+        # Unstructured JSON output
+        response_text = response.text.strip()
+
+        # Remove markdown code blocks if present
+        if response_text.startswith('```json'):
+            response_text = response_text.replace('```json', '', 1)
+        if response_text.endswith('```'):
+            response_text = response_text[:-3]
+
+        response_text = response_text.strip()
+
+        # Parse JSON
+        result = json.loads(response_text)
+        self.logger.debug("Successfully generated unstructured response")
+        return result
+
+    def _generation_error(self, e: Exception) -> AIProviderError:
+        """Map a failed generate call to AIProviderError (or ContextLengthExceededError)."""
+        if isinstance(e, json.JSONDecodeError):
+            error_msg = f"Failed to parse JSON response: {str(e)}"
+            self.logger.error(error_msg)
+            return AIProviderError(error_msg)
+
+        error_str = str(e).lower()
+        # Check for context length exceeded errors
+        # These can manifest as various error messages from the API
+        context_error_indicators = [
+            'token count',
+            'context length',
+            'maximum context',
+            'input too long',
+            'request payload size exceeds',
+            'exceeds the limit',
+            'too many tokens',
+            'content too large',
+        ]
+        if any(indicator in error_str for indicator in context_error_indicators):
+            error_msg = f"Input exceeds model context limit: {str(e)}"
+            self.logger.warning(error_msg)
+            return ContextLengthExceededError(error_msg)
+
+        error_msg = f"Gemini generation failed: {str(e)}"
+        self.logger.error(error_msg)
+        return AIProviderError(error_msg)
+
+    def _send(
+        self,
+        prompt: str,
+        config_params: Dict[str, Any],
+        kwargs: Dict[str, Any],
+        context: Optional[CachedContext]
+    ) -> Any:
+        """
+        Send one generate_content call through the global request queue.
+
+        A server-side context is referenced by name; if Gemini no longer has
+        it (expired or deleted), the handle is downgraded to inline and the
+        call is resent with the context as the prompt prefix.
+
+        Args:
+            prompt: The call's own prompt
+            config_params: GenerateContentConfig parameters
+            kwargs: Extra GenerateContentConfig parameters from the caller
+            context: Optional shared context
+
+        Returns:
+            The generate_content response
+        """
+        # Use global request queue to keep the key within its RPM/TPM quota
+        # across threads and processes
         request_queue = get_gemini_request_queue()
+        remote = context is not None and context.is_remote
 
         try:
-            if schema:
-                # Structured output with Pydantic validation
-                self.logger.debug(f"Generating with schema: {schema.__name__}")
-                config_params['response_schema'] = schema
-
-                # Execute API call through global queue for serialization
-                response = request_queue.execute_with_lock(
-                    request_func=self.client.models.generate_content,
-                    api_key=self.api_key,
-                    model=self.model,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(**config_params, **kwargs),
-                )
+            return request_queue.execute_with_lock(
+                self.client.models.generate_content,
+                self.api_key,
+                **self._request_args(prompt, config_params, kwargs, context),
+            )
+        except Exception as e:
+            if not (remote and self._drop_missing_cache(e, context)):
+                raise
 
-                # Parse and validate with Pydantic
-                result = schema.model_validate_json(response.text)
-                self.logger.debug("Successfully generated structured response")
+        return request_queue.execute_with_lock(
+            self.client.models.generate_content,
+            self.api_key,
+            **self._request_args(prompt, config_params, kwargs, context),
+        )
 
-                # Record API usage in rate limiter
-                # Note: Do NOT call record_and_sleep() because the request queue already
-                # handled the mandatory 65s sleep. Instead, record directly to the tracker.
-                if self.rate_limiter:
-                    self.rate_limiter.tracker.record_request(self.api_key, error=False)
+    def _request_args(
+        self,
+        prompt: str,
+        config_params: Dict[str, Any],
+        kwargs: Dict[str, Any],
+        context: Optional[CachedContext]
+    ) -> Dict[str, Any]:
+        """Build generate_content arguments (plus estimated_tokens for the queue)."""
+        if context is not None and context.is_remote:
+            return {
+                'estimated_tokens': self.count_tokens(prompt) + context.token_count,
+                'model': self.model,
+                'contents': prompt,
+                'config': types.GenerateContentConfig(**config_params, cached_content=context.name, **kwargs),
+            }
 
-                return result
+        contents = self.with_context(prompt, context)
+        return {
+            'estimated_tokens': self.count_tokens(contents),
+            'model': self.model,
+            'contents': contents,
+            'config': types.GenerateContentConfig(**config_params, **kwargs),
+        }
 
-            else:
-                # Unstructured JSON output
-                self.logger.debug("Generating unstructured response")
+    def _drop_missing_cache(self, error: Exception, context: CachedContext) -> bool:
+        """
+        Downgrade a context to inline if the error says its cache is gone.
 
-                # Execute API call through global queue for serialization
-                response = request_queue.execute_with_lock(
-                    request_func=self.client.models.generate_content,
-                    api_key=self.api_key,
-                    model=self.model,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(**config_params, **kwargs),
-                )
+        Returns:
+            True if the call should be resent inline
+        """
+        error_str = str(error).lower()
+        if 'cache' not in error_str or not any(
+            indicator in error_str for indicator in ('not found', 'expired', '404', '403', 'permission')
+        ):
+            return False
+
+        self.logger.warning(f"Cached context {context.name} unavailable ({error}); sending it inline")
+        get_context_cache_registry().invalidate(self.api_key, context)
+        context.name = None
+        return True
 
-                # Clean and parse JSON
-                response_text = response.text.strip()
+    def _record_usage(self, prompt: str, response: Any, context: Optional[CachedContext] = None):
+        """
+        Record a successful request and calibrate token estimates.
 
-                # Remove markdown code blocks if present
-                if response_text.startswith('```json'):
-                    response_text = response_text.replace('```json', '', 1)
-                if response_text.endswith('```'):
-                    response_text = response_text[:-3]
+        Note: Do NOT call record_and_sleep() because the request queue already
+        scheduled the call within the key's quota. Record directly to the tracker.
 
-                response_text = response_text.strip()
+        Args:
+            prompt: The prompt that was sent
+            response: generate_content response (carries usage_metadata)
+            context: Shared context the call used, if any
+        """
+        usage = getattr(response, 'usage_metadata', None)
+
+        def count(field: str) -> int:
+            value = getattr(usage, field, None)
+            return value if isinstance(value, int) else 0
+
+        # Gemini's prompt count includes cached context tokens
+        sent_chars = TokenEstimator.count_chars(prompt) + (len(context.text) if context else 0)
+        get_token_estimator().observe(self.model, sent_chars, prompt_token_count(response))
+        self.record_token_usage(
+            prompt_tokens=count('prompt_token_count'),
+            cached_tokens=count('cached_content_token_count'),
+            output_tokens=count('candidates_token_count'),
+        )
 
-                # Parse JSON
-                result = json.loads(response_text)
-                self.logger.debug("Successfully generated unstructured response")
+        if self.rate_limiter:
+            self.rate_limiter.tracker.record_request(
+                self.api_key,
+                error=False,
+                tokens=count('total_token_count'),
+            )
 
-                # Record API usage in rate limiter
-                # Note: Do NOT call record_and_sleep() because the request queue already
-                # handled the mandatory 65s sleep. Instead, record directly to the tracker.
-                if self.rate_limiter:
-                    self.rate_limiter.tracker.record_request(self.api_key, error=False)
+    # ---- shared context -------------------------------------------------
 
-                return result
+    def cache_context(self, text: str, ttl_seconds: Optional[int] = None) -> CachedContext:
+        """
+        Upload context text to Gemini's context cache, once per (key, model, text).
 
-        except json.JSONDecodeError as e:
-            error_msg = f"Failed to parse JSON response: {str(e)}"
-            self.logger.error(error_msg)
-            raise AIProviderError(error_msg) from e
+        Later generate calls that pass the handle reference the cache by
+        name instead of resending the text, so a filing shared by several
+        workflow calls is tokenized and billed at the full rate only once.
+        Small texts, Google Search mode and upload failures fall back to an
+        inline context (sent as the prompt prefix).
+
+        Args:
+            text: Context text (e.g. the filing)
+            ttl_seconds: Cache lifetime (default: CONTEXT_CACHE_TTL)
+
+        Returns:
+            CachedContext handle
+        """
+        token_count = self.count_tokens(text)
+        content_hash = hash_content(text)
+        registry = get_context_cache_registry()
+
+        existing = registry.get(self.api_key, self.model, content_hash)
+        if existing is not None:
+            self.logger.debug(f"Reusing cached context {existing.name}")
+            return existing
+
+        inline = CachedContext(text=text, content_hash=content_hash, model=self.model, token_count=token_count)
+        if token_count < self.MIN_CONTEXT_CACHE_TOKENS or self.use_google_search:
+            return inline
+
+        ttl_seconds = ttl_seconds or self.CONTEXT_CACHE_TTL
+        try:
+            cache = get_gemini_request_queue().execute_with_lock(
+                self.client.caches.create,
+                self.api_key,
+                estimated_tokens=token_count,
+                model=self.model,
+                config=types.CreateCachedContentConfig(
+                    contents=[text],
+                    ttl=f"{ttl_seconds}s",
+                    display_name=f"eon-{content_hash[:12]}",
+                ),
+            )
+        except Exception as e:
+            self.logger.warning(f"Context caching failed, sending context inline: {e}")
+            return inline
+
+        usage = getattr(cache, 'usage_metadata', None)
+        cached_tokens = getattr(usage, 'total_token_count', None)
+        context = CachedContext(
+            text=text,
+            content_hash=content_hash,
+            model=self.model,
+            token_count=cached_tokens if isinstance(cached_tokens, int) else token_count,
+            name=cache.name,
+            expires_at=time.time() + ttl_seconds,
+        )
+        registry.put(self.api_key, context)
+        with self._usage_lock:
+            self.token_usage['contexts_created'] += 1
+
+        self.logger.info(f"Cached {context.token_count:,}-token context as {cache.name} ({ttl_seconds}s)")
+        return context
+
+    def release_context(self, context: Optional[CachedContext]):
+        """
+        Delete a server-side context cache (storage is billed while it lives).
+
+        Args:
+            context: Handle returned by cache_context()
+        """
+        if context is None or not context.is_remote:
+            return
 
+        get_context_cache_registry().invalidate(self.api_key, context)
+        name, context.name = context.name, None
+        try:
+            get_gemini_request_queue().execute_with_lock(self.client.caches.delete, self.api_key, name=name)
+            self.logger.debug(f"Deleted cached context {name}")
         except Exception as e:
-            error_str = str(e).lower()
-            # Check for context length exceeded errors
-            # These can manifest as various error messages from the API
-            context_error_indicators = [
-                'token count',
-                'context length',
-                'maximum context',
-                'input too long',
-                'request payload size exceeds',
-                'exceeds the limit',
-                'too many tokens',
-                'content too large',
-            ]
-            if any(indicator in error_str for indicator in context_error_indicators):
-                from eon.core.exceptions import ContextLengthExceededError
-                error_msg = f"Input exceeds model context limit: {str(e)}"
-                self.logger.warning(error_msg)
-                raise ContextLengthExceededError(error_msg) from e
-
-            error_msg = f"Gemini generation failed: {str(e)}"
-            self.logger.error(error_msg)
-            raise AIProviderError(error_msg) from e
+            # It expires on its own; deleting only saves storage
+            self.logger.warning(f"Failed to delete cached context {name}: {e}")
 
     def _parse_retry_delay(self, error: Exception) -> Optional[int]:
         """
@@ -335,107 +622,24 @@ class GeminiProvider(LLMProvider):
             - If no schema: Dictionary with response
 
         Raises:
+            ContextLengthExceededError: If the input is too long (not retried)
             AIProviderError: If all retries fail
         """
-        last_error = None
-        non_rate_limit_attempts = 0
-        rate_limit_retries = 0
-        transient_retries = 0
-        last_transient_delay: Optional[float] = None
-        max_rate_limit_retries = 10  # Allow many rate-limit retries since we wait the specified time
-        max_transient_retries = max(max_retries, 5)
-        total_attempts = 0
-        max_total_attempts = max_retries + max_rate_limit_retries + max_transient_retries  # More generous for rate limits/transient
-        max_transient_delay = max(retry_delay * 8, 60)
-
-        while (
-            rate_limit_retries < max_rate_limit_retries
-            and total_attempts < max_total_attempts
-            and (non_rate_limit_attempts < max_retries or transient_retries < max_transient_retries)
-        ):
-            total_attempts += 1
+        budget = _RetryBudget(self, max_retries, retry_delay, buffer_seconds)
 
+        while budget.can_attempt():
+            budget.start_attempt()
             try:
-                self.logger.debug(f"Generation attempt {total_attempts} (non-rate-limit: {non_rate_limit_attempts + 1}/{max_retries})")
-                result = self.generate(prompt, schema, **kwargs)
-                return result
-
+                return self.generate(prompt, schema, **kwargs)
+            except ContextLengthExceededError:
+                # Resending the same prompt can't fit it; let callers fall back
+                raise
             except AIProviderError as e:
-                last_error = e
-                is_rate_limit = self._is_rate_limit_error(e)
-                is_transient_service = self._is_transient_service_error(e)
-
-                if is_rate_limit:
-                    last_category = "rate_limit"
-                    operator_action = None
-                    rate_limit_retries += 1
-                    # Parse API-suggested retry delay
-                    api_delay = self._parse_retry_delay(e)
-
-                    if api_delay:
-                        actual_delay = api_delay + buffer_seconds
-                        self.logger.debug(
-                            f"Rate limit hit ({rate_limit_retries}/{max_rate_limit_retries}). "
-                            f"API suggests {api_delay}s delay. "
-                            f"Waiting {actual_delay}s (with {buffer_seconds}s buffer)..."
-                        )
-                    else:
-                        # Fallback: use a longer delay for rate limits
-                        actual_delay = max(retry_delay * 2, 60) + buffer_seconds
-                        self.logger.debug(
-                            f"Rate limit hit ({rate_limit_retries}/{max_rate_limit_retries}). "
-                            f"Could not parse delay. Waiting {actual_delay}s..."
-                        )
-
-                    time.sleep(actual_delay)
-                    # Don't increment non_rate_limit_attempts - rate limit waits are "free"
-                elif self._is_transient_error(e):
-                    transient_retries += 1
-                    exponential_delay = retry_delay * (2 ** (transient_retries - 1))
-                    capped_delay = min(exponential_delay, max_transient_delay)
-                    jittered_delay = capped_delay * random.uniform(0.8, 1.2)
-                    last_transient_delay = jittered_delay
-
-                    self.logger.warning(
-                        "Transient error on attempt "
-                        f"{transient_retries}/{max_transient_retries}: {e}. "
-                        f"Retrying in {jittered_delay:.1f} seconds..."
-                    )
-
-                    if transient_retries < max_transient_retries:
-                        time.sleep(jittered_delay)
-                else:
-                    # Non-rate-limit error
-                    if is_transient_service:
-                        last_category = "service_unavailable"
-                        operator_action = "Suggested action: retry later or reduce concurrency."
-                    else:
-                        last_category = "other"
-                        operator_action = None
-                    non_rate_limit_attempts += 1
-                    self.logger.debug(
-                        f"Attempt {non_rate_limit_attempts}/{max_retries} failed: {e}. "
-                        f"Retrying in {retry_delay} seconds..."
-                    )
-
-                    if non_rate_limit_attempts < max_retries:
-                        time.sleep(retry_delay)
-
-        # All retries failed
-        error_msg = (
-            f"All retries exhausted. "
-            f"Non-rate-limit attempts: {non_rate_limit_attempts}/{max_retries}, "
-            f"Rate-limit retries: {rate_limit_retries}/{max_rate_limit_retries}, "
-            f"Transient retries: {transient_retries}/{max_transient_retries}. "
-            f"Last transient backoff delay: "
-            f"{f'{last_transient_delay:.1f}s' if last_transient_delay is not None else 'n/a'}. "
-            f"Last error: {last_error}"
-        )
-        self.logger.warning(
-            f"Generation failed after {total_attempts} attempts. "
-            f"Last error: {last_error}"
-        )
-        raise AIProviderError(error_msg) from last_error
+                delay = budget.delay_after(e)
+                if delay:
+                    time.sleep(delay)
+
+        raise budget.exhausted() from budget.last_error
 
     def validate_api_key(self) -> bool:
         """
@@ -478,10 +682,130 @@ class GeminiProvider(LLMProvider):
             Approximate token count
         """
         try:
-            # Gemini doesn't have a direct token counter, use rough estimate
-            # ~4 characters per token is a common heuristic
-            return len(text) // 4
+            # Counting exactly costs an API call; use the character-based
+            # estimate, calibrated from usage_metadata of earlier responses
+            return get_token_estimator().estimate(text, self.model)
 
         except Exception as e:
             self.logger.warning(f"Token counting failed: {e}")
             return 0
+
+
+class _RetryBudget:
+    """
+    Retry bookkeeping shared by generate_with_retry and generate_with_retry_async.
+
+    Rate-limit retries wait the API's retryDelay plus a buffer and don't
+    count against max_retries; transient server/connection errors back off
+    exponentially with jitter; other errors wait retry_delay.
+    """
+
+    # Allow many rate-limit retries since we wait the specified time
+    MAX_RATE_LIMIT_RETRIES = 10
+
+    def __init__(self, provider: 'GeminiProvider', max_retries: int, retry_delay: int, buffer_seconds: int):
+        self.provider = provider
+        self.logger = provider.logger
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.buffer_seconds = buffer_seconds
+
+        self.max_transient_retries = max(max_retries, 5)
+        # More generous for rate limits/transient
+        self.max_total_attempts = max_retries + self.MAX_RATE_LIMIT_RETRIES + self.max_transient_retries
+        self.max_transient_delay = max(retry_delay * 8, 60)
+
+        self.last_error: Optional[Exception] = None
+        self.non_rate_limit_attempts = 0
+        self.rate_limit_retries = 0
+        self.transient_retries = 0
+        self.last_transient_delay: Optional[float] = None
+        self.total_attempts = 0
+
+    def can_attempt(self) -> bool:
+        """True while some retry budget is left."""
+        return (
+            self.rate_limit_retries < self.MAX_RATE_LIMIT_RETRIES
+            and self.total_attempts < self.max_total_attempts
+            and (self.non_rate_limit_attempts < self.max_retries
+                 or self.transient_retries < self.max_transient_retries)
+        )
+
+    def start_attempt(self):
+        self.total_attempts += 1
+        self.logger.debug(
+            f"Generation attempt {self.total_attempts} "
+            f"(non-rate-limit: {self.non_rate_limit_attempts + 1}/{self.max_retries})"
+        )
+
+    def delay_after(self, error: AIProviderError) -> float:
+        """
+        Count a failed attempt.
+
+        Returns:
+            Seconds to wait before the next attempt (0 = don't wait)
+        """
+        self.last_error = error
+
+        if self.provider._is_rate_limit_error(error):
+            self.rate_limit_retries += 1
+            # Parse API-suggested retry delay
+            api_delay = self.provider._parse_retry_delay(error)
+
+            if api_delay:
+                delay = api_delay + self.buffer_seconds
+                self.logger.debug(
+                    f"Rate limit hit ({self.rate_limit_retries}/{self.MAX_RATE_LIMIT_RETRIES}). "
+                    f"API suggests {api_delay}s delay. "
+                    f"Waiting {delay}s (with {self.buffer_seconds}s buffer)..."
+                )
+            else:
+                # Fallback: use a longer delay for rate limits
+                delay = max(self.retry_delay * 2, 60) + self.buffer_seconds
+                self.logger.debug(
+                    f"Rate limit hit ({self.rate_limit_retries}/{self.MAX_RATE_LIMIT_RETRIES}). "
+                    f"Could not parse delay. Waiting {delay}s..."
+                )
+            # Don't increment non_rate_limit_attempts - rate limit waits are "free"
+            return delay
+
+        if self.provider._is_transient_error(error):
+            self.transient_retries += 1
+            exponential_delay = self.retry_delay * (2 ** (self.transient_retries - 1))
+            capped_delay = min(exponential_delay, self.max_transient_delay)
+            jittered_delay = capped_delay * random.uniform(0.8, 1.2)
+            self.last_transient_delay = jittered_delay
+
+            self.logger.warning(
+                "Transient error on attempt "
+                f"{self.transient_retries}/{self.max_transient_retries}: {error}. "
+                f"Retrying in {jittered_delay:.1f} seconds..."
+            )
+            return jittered_delay if self.transient_retries < self.max_transient_retries else 0
+
+        # Non-rate-limit error
+        self.non_rate_limit_attempts += 1
+        self.logger.debug(
+            f"Attempt {self.non_rate_limit_attempts}/{self.max_retries} failed: {error}. "
+            f"Retrying in {self.retry_delay} seconds..."
+        )
+        return self.retry_delay if self.non_rate_limit_attempts < self.max_retries else 0
+
+    def exhausted(self) -> AIProviderError:
+        """Build the error raised once every retry has failed."""
+        last_transient = (
+            f"{self.last_transient_delay:.1f}s" if self.last_transient_delay is not None else "n/a"
+        )
+        error_msg = (
+            f"All retries exhausted. "
+            f"Non-rate-limit attempts: {self.non_rate_limit_attempts}/{self.max_retries}, "
+            f"Rate-limit retries: {self.rate_limit_retries}/{self.MAX_RATE_LIMIT_RETRIES}, "
+            f"Transient retries: {self.transient_retries}/{self.max_transient_retries}. "
+            f"Last transient backoff delay: {last_transient}. "
+            f"Last error: {self.last_error}"
+        )
+        self.logger.warning(
+            f"Generation failed after {self.total_attempts} attempts. "
+            f"Last error: {self.last_error}"
+        )
+        return AIProviderError(error_msg)
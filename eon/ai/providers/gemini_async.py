@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native asyncio Gemini provider.
+
+AsyncGeminiProvider issues requests on the SDK's aio client and waits for
+key quota with asyncio.sleep, so one event loop can drive hundreds of
+in-flight company-years instead of parking an OS thread per request in
+the request queue. It is a GeminiProvider, so the blocking methods keep
+working and both paths share configuration, response parsing, error
+mapping, retry policy, context caching and usage accounting.
+
+Usage:
+    provider = AsyncGeminiProvider(api_key="your_key", model="gemini-2.5-flash")
+    result = await provider.generate_with_retry_async(prompt, schema=TenKAnalysis)
+"""
+
+import asyncio
+from typing import Optional, Type, Union, Dict, Any
+
+from pydantic import BaseModel
+
+from eon.core import AIProviderError
+from eon.core.exceptions import ContextLengthExceededError
+from eon.ai.request_queue import get_gemini_request_queue
+from .context_cache import CachedContext
+from .gemini import GeminiProvider, _RetryBudget
+
+
+class AsyncGeminiProvider(GeminiProvider):
+    """
+    Gemini provider with coroutine generate methods.
+
+    Example:
+        provider = AsyncGeminiProvider(api_key="your_key")
+        results = await asyncio.gather(*(
+            provider.generate_with_retry_async(prompt, schema=MySchema)
+            for prompt in prompts
+        ))
+    """
+
+    async def generate_async(
+        self,
+        prompt: str,
+        schema: Optional[Type[BaseModel]] = None,
+        context: Optional[CachedContext] = None,
+        **kwargs
+    ) -> Union[BaseModel, Dict[str, Any]]:
+        """
+        Async variant of generate() on the SDK's aio client.
+
+        Waits for key quota with asyncio.sleep, so a single event loop can
+        keep many requests in flight without a thread per request.
+
+        Args:
+            prompt: The prompt to send
+            schema: Optional Pydantic schema for structured output
+            context: Shared context from cache_context()
+            **kwargs: Additional parameters (temperature, etc.); pass
+                use_cache=False to bypass the response cache
+
+        Returns:
+            - If schema provided: Validated Pydantic model instance
+            - If no schema: Dictionary with response
+
+        Raises:
+            AIProviderError: If generation fails
+        """
+        cache_key = self._response_cache_key(prompt, schema, context, kwargs)
+        if cache_key:
+            cached = self._cached_response(cache_key, schema)
+            if cached is not None:
+                return cached
+
+        config_params = self._build_config(schema)
+        request_queue = get_gemini_request_queue()
+        remote = context is not None and context.is_remote
+
+        try:
+            try:
+                response = await request_queue.execute_async(
+                    self.client.aio.models.generate_content,
+                    self.api_key,
+                    **self._request_args(prompt, config_params, kwargs, context),
+                )
+            except Exception as e:
+                if not (remote and self._drop_missing_cache(e, context)):
+                    raise
+                response = await request_queue.execute_async(
+                    self.client.aio.models.generate_content,
+                    self.api_key,
+                    **self._request_args(prompt, config_params, kwargs, context),
+                )
+
+            result = self._parse_response(response, schema)
+            self._record_usage(prompt, response, context)
+
+        except Exception as e:
+            raise self._generation_error(e) from e
+
+        if cache_key:
+            self._store_response(cache_key, result, response)
+        return result
+
+    async def generate_with_retry_async(
+        self,
+        prompt: str,
+        schema: Optional[Type[BaseModel]] = None,
+        max_retries: int = 3,
+        retry_delay: int = 10,
+        buffer_seconds: int = 20,
+        **kwargs
+    ) -> Union[BaseModel, Dict[str, Any]]:
+        """
+        Async variant of generate_with_retry() (same retry policy).
+
+        Args:
+            prompt: The prompt to send
+            schema: Optional Pydantic schema for structured output
+            max_retries: Maximum number of retry attempts for non-rate-limit errors
+            retry_delay: Default seconds to wait between retries (fallback)
+            buffer_seconds: Additional buffer to add to API-suggested retry delay
+            **kwargs: Additional parameters
+
+        Returns:
+            - If schema provided: Validated Pydantic model instance
+            - If no schema: Dictionary with response
+
+        Raises:
+            ContextLengthExceededError: If the input is too long (not retried)
+            AIProviderError: If all retries fail
+        """
+        budget = _RetryBudget(self, max_retries, retry_delay, buffer_seconds)
+
+        while budget.can_attempt():
+            budget.start_attempt()
+            try:
+                return await self.generate_async(prompt, schema, **kwargs)
+            except ContextLengthExceededError:
+                # Resending the same prompt can't fit it; let callers fall back
+                raise
+            except AIProviderError as e:
+                delay = budget.delay_after(e)
+                if delay:
+                    await asyncio.sleep(delay)
+
+        raise budget.exhausted() from budget.last_error
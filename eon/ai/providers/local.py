@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Offline stand-in LLM provider.
+
+LocalProvider answers from a Python callable instead of an API, and
+mimics GeminiProvider's context caching and token accounting: contexts
+above a size threshold are "uploaded" once per (key, model, text) and
+later calls are billed the context as cached tokens. An optional input
+limit raises ContextLengthExceededError like an oversized Gemini request.
+Workflows, cached contexts, token accounting and the map-reduce fallback
+can therefore be exercised without a network or an API key.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Type, Union
+
+from pydantic import BaseModel
+
+from eon.core import AIProviderError
+from eon.core.exceptions import ContextLengthExceededError
+from .base import LLMProvider
+from .context_cache import CachedContext, get_context_cache_registry, hash_content
+
+
+# responder(prompt, schema, context) -> model instance or dict
+Responder = Callable[[str, Optional[Type[BaseModel]], Optional[CachedContext]], Any]
+
+
+class LocalProvider(LLMProvider):
+    """
+    LLM provider backed by a local responder function.
+
+    Example:
+        provider = LocalProvider(lambda prompt, schema, context: {"answer": 42})
+        context = provider.cache_context(filing_text)
+        provider.generate("Summarize the risks", context=context)
+        provider.get_token_usage()  # cached_tokens == context.token_count
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Responder] = None,
+        model: str = "local",
+        api_key: str = "local",
+        min_cache_tokens: int = 0,
+        max_input_tokens: Optional[int] = None,
+        **kwargs
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            responder: Callable returning the response for a call; without
+                one, calls return {} (or an empty schema instance)
+            model: Model name reported in handles and usage
+            api_key: Key the contexts are cached under
+            min_cache_tokens: Contexts smaller than this are sent inline
+            max_input_tokens: Model context limit; longer prompts raise
+                ContextLengthExceededError (None = unlimited)
+            **kwargs: Additional provider configuration
+        """
+        super().__init__(api_key=api_key, model=model, **kwargs)
+        self.responder = responder
+        self.min_cache_tokens = min_cache_tokens
+        self.max_input_tokens = max_input_tokens
+        self.calls: List[Dict[str, Any]] = []
+
+        self._lock = threading.Lock()
+        self._live: Set[str] = set()  # Names of contexts "held" server-side
+
+    @staticmethod
+    def count_tokens(text: str) -> int:
+        """Estimate tokens (~4 characters per token)."""
+        return len(text) // 4
+
+    def generate(
+        self,
+        prompt: str,
+        schema: Optional[Type[BaseModel]] = None,
+        context: Optional[CachedContext] = None,
+        **kwargs
+    ) -> Union[BaseModel, Dict[str, Any]]:
+        """
+        Answer a prompt with the responder and record its token usage.
+
+        Args:
+            prompt: The prompt to send
+            schema: Optional Pydantic schema for structured output
+            context: Shared context from cache_context()
+            **kwargs: Ignored generation parameters
+
+        Returns:
+            - If schema provided: Validated Pydantic model instance
+            - If no schema: Dictionary with response
+
+        Raises:
+            ContextLengthExceededError: If the prompt exceeds max_input_tokens
+            AIProviderError: If the responder fails or returns an invalid result
+        """
+        cached_tokens = 0
+        if context is not None and context.is_remote:
+            with self._lock:
+                live = context.name in self._live
+            if live:
+                cached_tokens = context.token_count
+            else:
+                # Same recovery as GeminiProvider: resend the context inline
+                self.logger.warning(f"Cached context {context.name} unavailable; sending it inline")
+                get_context_cache_registry().invalidate(self.api_key, context)
+                context.name = None
+
+        if cached_tokens:
+            prompt_tokens = cached_tokens + self.count_tokens(prompt)
+        else:
+            prompt_tokens = self.count_tokens(self.with_context(prompt, context))
+
+        if self.max_input_tokens is not None and prompt_tokens > self.max_input_tokens:
+            raise ContextLengthExceededError(
+                f"Input exceeds model context limit: {prompt_tokens:,} tokens "
+                f"(limit {self.max_input_tokens:,})"
+            )
+
+        try:
+            if self.responder is None:
+                result = schema.model_construct() if schema else {}
+            else:
+                result = self.responder(prompt, schema, context)
+            if schema and not isinstance(result, schema):
+                result = schema.model_validate(result)
+        except AIProviderError:
+            raise
+        except Exception as e:
+            raise AIProviderError(f"Local generation failed: {e}") from e
+
+        output_tokens = self.count_tokens(
+            result.model_dump_json() if isinstance(result, BaseModel) else str(result)
+        )
+        self.record_token_usage(prompt_tokens, cached_tokens, output_tokens)
+        with self._lock:
+            self.calls.append({
+                'prompt': prompt,
+                'schema': schema.__name__ if schema else None,
+                'context': context.name if context else None,
+                'prompt_tokens': prompt_tokens,
+                'cached_tokens': cached_tokens,
+            })
+        return result
+
+    def generate_with_retry(
+        self,
+        prompt: str,
+        schema: Optional[Type[BaseModel]] = None,
+        max_retries: int = 3,
+        **kwargs
+    ) -> Union[BaseModel, Dict[str, Any]]:
+        """Generate once; local calls have nothing transient to retry."""
+        kwargs.pop('retry_delay', None)
+        kwargs.pop('buffer_seconds', None)
+        return self.generate(prompt, schema, **kwargs)
+
+    def validate_api_key(self) -> bool:
+        """Local calls need no key."""
+        return True
+
+    def cache_context(self, text: str, ttl_seconds: Optional[int] = None) -> CachedContext:
+        """
+        "Upload" context once per (key, model, text) and return its handle.
+
+        Args:
+            text: Context text
+            ttl_seconds: Ignored; local contexts live until released
+
+        Returns:
+            CachedContext handle (inline if below min_cache_tokens)
+        """
+        content_hash = hash_content(text)
+        registry = get_context_cache_registry()
+
+        existing = registry.get(self.api_key, self.model, content_hash)
+        if existing is not None:
+            return existing
+
+        token_count = self.count_tokens(text)
+        if token_count < self.min_cache_tokens:
+            return CachedContext.inline(text, self.model, token_count)
+
+        context = CachedContext(
+            text=text,
+            content_hash=content_hash,
+            model=self.model,
+            token_count=token_count,
+            name=f"local/{content_hash[:12]}",
+        )
+        with self._lock:
+            self._live.add(context.name)
+        registry.put(self.api_key, context)
+        with self._usage_lock:
+            self.token_usage['contexts_created'] += 1
+        return context
+
+    def release_context(self, context: Optional[CachedContext]):
+        """
+        Drop a local context.
+
+        Args:
+            context: Handle returned by cache_context()
+        """
+        if context is None or not context.is_remote:
+            return
+        get_context_cache_registry().invalidate(self.api_key, context)
+        with self._lock:
+            self._live.discard(context.name)
+        context.name = None
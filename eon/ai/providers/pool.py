@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Process-wide pool of warm Gemini providers.
+
+Every GeminiProvider owns a genai.Client, and every client owns its own
+HTTP connection pool. Building a provider per filing or per year meant a
+new TCP + TLS handshake for every analysis. The pool hands out one
+provider per (API key, model, thinking config, search mode, usage
+tracker), so keep-alive connections are reused across analyses, years
+and threads. Providers are thread-safe: the client is, and per-call
+state lives in the request queue and usage tracker.
+
+Usage:
+    provider = get_gemini_provider(
+        api_key=api_key,
+        model="gemini-2.5-flash",
+        thinking_budget=4096,
+        rate_limiter=rate_limiter,
+    )
+    result = provider.generate_with_retry(prompt, schema=MySchema)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple, Type
+
+from eon.core import get_logger, get_config, mask_api_key, ConfigurationError
+from eon.ai.key_manager import APIKeyManager
+from eon.ai.rate_limiter import RateLimiter
+from eon.ai.response_cache import response_cache_enabled
+from .base import LLMProvider
+from .gemini import GeminiProvider
+from .gemini_async import AsyncGeminiProvider
+
+
+class ProviderPool:
+    """
+    LRU pool of GeminiProvider instances.
+
+    Thread-safe. When the pool is full, the least recently used provider
+    is evicted.
+    """
+
+    DEFAULT_MAX_SIZE = 64
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize the pool.
+
+        Args:
+            max_size: Maximum providers kept warm (one per key/config pair)
+        """
+        self.max_size = max(1, max_size)
+        self._lock = threading.Lock()
+        self._providers: 'OrderedDict[Tuple[Hashable, ...], GeminiProvider]' = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self.logger = get_logger(f"{__name__}.ProviderPool")
+
+    def get(
+        self,
+        api_key: str,
+        model: str = "gemini-2.5-flash",
+        thinking_budget: Optional[int] = None,
+        thinking_level: Optional[str] = None,
+        use_google_search: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        provider_class: Type[GeminiProvider] = GeminiProvider,
+        use_response_cache: Optional[bool] = None
+    ) -> GeminiProvider:
+        """
+        Get a warm provider for a key and configuration, creating it once.
+
+        Callers whose rate limiters record to the same usage tracker
+        share one provider.
+
+        Args:
+            api_key: Google AI API key
+            model: Model name
+            thinking_budget: Thinking budget for Gemini 2.x models
+            thinking_level: Thinking level for Gemini 3 models
+            use_google_search: Enable the Google Search tool
+            rate_limiter: Rate limiter whose tracker records usage
+            provider_class: GeminiProvider or AsyncGeminiProvider
+            use_response_cache: Serve repeated calls from the response cache
+                (default: the configured setting)
+
+        Returns:
+            GeminiProvider for this key and configuration
+        """
+        if use_response_cache is None:
+            use_response_cache = response_cache_enabled()
+        tracker = rate_limiter.tracker if rate_limiter is not None else None
+        # The pooled provider keeps its rate limiter (and so its tracker)
+        # alive, so the tracker's id stays unique while the entry exists
+        pool_key = (
+            provider_class, api_key, model, thinking_budget, thinking_level, use_google_search,
+            use_response_cache, id(tracker)
+        )
+
+        with self._lock:
+            provider = self._providers.get(pool_key)
+            if provider is not None:
+                self._providers.move_to_end(pool_key)
+                self._stats['hits'] += 1
+                return provider
+
+        # Build outside the lock; a racing thread may build the same one
+        provider = provider_class(
+            api_key=api_key,
+            model=model,
+            thinking_budget=thinking_budget,
+            thinking_level=thinking_level,
+            use_google_search=use_google_search,
+            rate_limiter=rate_limiter,
+            use_response_cache=use_response_cache,
+        )
+
+        with self._lock:
+            existing = self._providers.get(pool_key)
+            if existing is not None:
+                self._providers.move_to_end(pool_key)
+                self._stats['hits'] += 1
+                return existing
+
+            self._providers[pool_key] = provider
+            self._stats['misses'] += 1
+            while len(self._providers) > self.max_size:
+                # Evicted providers may still be in use; they are only
+                # dropped, and their connections close when collected
+                self._providers.popitem(last=False)
+                self._stats['evictions'] += 1
+
+        self.logger.debug(f"Pooled Gemini provider for key {mask_api_key(api_key)} ({model})")
+        return provider
+
+    def clear(self):
+        """Close and forget every pooled provider (callers must be done with them)."""
+        with self._lock:
+            providers = list(self._providers.values())
+            self._providers.clear()
+        for provider in providers:
+            self._close(provider)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get pool statistics (size, hits, misses, evictions)."""
+        with self._lock:
+            return {'size': len(self._providers), **self._stats}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._providers)
+
+    def _close(self, provider: GeminiProvider):
+        """Close a provider's HTTP connections."""
+        close = getattr(provider.client, 'close', None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as e:
+            self.logger.debug(f"Error closing Gemini client: {e}")
+
+
+# Global singleton with thread-safe initialization
+_global_pool: Optional[ProviderPool] = None
+_pool_creation_lock = threading.Lock()
+
+# Key manager over the configured keys, for provider_for_free_key
+_default_key_manager: Optional[APIKeyManager] = None
+
+
+def get_provider_pool() -> ProviderPool:
+    """
+    Get the global provider pool singleton.
+
+    Thread-safe singleton pattern using double-checked locking.
+
+    Returns:
+        The global ProviderPool instance
+    """
+    global _global_pool
+
+    if _global_pool is None:
+        with _pool_creation_lock:
+            if _global_pool is None:
+                _global_pool = ProviderPool()
+
+    return _global_pool
+
+
+def reset_provider_pool():
+    """Close pooled providers and reset the global pool (mainly for testing)."""
+    global _global_pool
+    with _pool_creation_lock:
+        if _global_pool is not None:
+            _global_pool.clear()
+        _global_pool = None
+
+
+def get_gemini_provider(api_key: str, **kwargs) -> GeminiProvider:
+    """
+    Get a pooled GeminiProvider (see ProviderPool.get for arguments).
+
+    Args:
+        api_key: Google AI API key
+        **kwargs: model, thinking_budget, thinking_level, use_google_search,
+            rate_limiter, use_response_cache
+
+    Returns:
+        GeminiProvider shared by every caller with the same configuration
+    """
+    return get_provider_pool().get(api_key, **kwargs)
+
+
+def get_async_gemini_provider(api_key: str, **kwargs) -> AsyncGeminiProvider:
+    """
+    Get a pooled AsyncGeminiProvider (see ProviderPool.get for arguments).
+
+    Args:
+        api_key: Google AI API key
+        **kwargs: model, thinking_budget, thinking_level, use_google_search,
+            rate_limiter, use_response_cache
+
+    Returns:
+        AsyncGeminiProvider shared by every caller with the same configuration
+    """
+    return get_provider_pool().get(api_key, provider_class=AsyncGeminiProvider, **kwargs)
+
+
+def provider_for_free_key(
+    provider: LLMProvider,
+    api_key_manager: Optional[APIKeyManager] = None,
+    estimated_tokens: int = 0
+) -> LLMProvider:
+    """
+    Get a pooled provider like `provider` on the key whose quota frees up soonest.
+
+    Used to spread the concurrent calls of one analysis (map-reduce chunks,
+    workflow steps) across keys. Non-Gemini providers come back unchanged,
+    as does a Gemini one when no keys are configured or its own key is best.
+
+    Args:
+        provider: Provider the analysis was started with
+        api_key_manager: Keys to pick from (default: the configured keys)
+        estimated_tokens: Expected prompt tokens of the call
+
+    Returns:
+        Provider to make the call with
+    """
+    if not isinstance(provider, GeminiProvider):
+        return provider
+
+    key_manager = api_key_manager or _get_default_key_manager()
+    if key_manager is None:
+        return provider
+    api_key = key_manager.pick_key(estimated_tokens=estimated_tokens)
+    if api_key is None or api_key == provider.api_key:
+        return provider
+
+    return get_provider_pool().get(
+        api_key,
+        model=provider.model,
+        thinking_budget=provider.thinking_budget,
+        thinking_level=provider.thinking_level,
+        rate_limiter=provider.rate_limiter,
+        provider_class=AsyncGeminiProvider if isinstance(provider, AsyncGeminiProvider) else GeminiProvider,
+        use_response_cache=provider.use_response_cache,
+    )
+
+
+def _get_default_key_manager() -> Optional[APIKeyManager]:
+    """Key manager over the configured keys, or None if none are configured."""
+    global _default_key_manager
+
+    if _default_key_manager is None:
+        with _pool_creation_lock:
+            if _default_key_manager is None:
+                try:
+                    _default_key_manager = APIKeyManager(get_config().google_api_keys)
+                except ConfigurationError:
+                    return None
+
+    return _default_key_manager
@@ -1,18 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """
-Request queue for Gemini API calls with per-key parallelization.
+Request queue for Gemini API calls with per-key quota scheduling.
 
 This module manages API request concurrency using:
-1. Per-key file locks - Ensures same key isn't used concurrently
-2. Global semaphore - Limits total concurrent requests across all keys
-
-This allows multiple API keys to make requests in parallel while:
-- Preventing the same key from concurrent use (rate limit protection)
-- Limiting overall concurrency to avoid overwhelming the API
-- Maintaining mandatory sleep between requests on each key
-
-Uses file-based locking (portalocker) for process-safe coordination across:
+1. Global semaphore - Limits total concurrent requests across all keys
+2. Per-key token buckets (KeyScheduler) - Keep each key within its
+   requests-per-minute and tokens-per-minute quota
+
+Requests go out as soon as their key has RPM and TPM capacity, so
+throughput scales with each key's quota instead of one request per key
+per fixed sleep. Bucket state is shared through files (portalocker), so
+limits hold across:
 - Single-threaded CLI
 - Multi-threaded UI
 - Multi-process batch processing
@@ -21,71 +20,103 @@ Uses file-based locking (portalocker) for process-safe coordination across:
 Cross-platform compatible (Windows, macOS, Linux).
 """
 
-import portalocker
-import hashlib
+import asyncio
+import re
 import time
 import threading
+import weakref
 from pathlib import Path
-from typing import Optional, Callable, Any, Dict
+from typing import Optional, Callable, Any, Awaitable, Dict, Iterable
 
 from eon.core import get_logger, mask_api_key
 from eon.ai.api_config import get_api_limits
+from eon.ai.key_scheduler import KeyScheduler
+
+
+def prompt_token_count(response: Any) -> Optional[int]:
+    """
+    Get the prompt token count Gemini reported for a response.
+
+    Args:
+        response: generate_content response (or any object)
+
+    Returns:
+        usage_metadata.prompt_token_count, or None if not reported
+    """
+    usage = getattr(response, 'usage_metadata', None)
+    count = getattr(usage, 'prompt_token_count', None)
+    return count if isinstance(count, int) else None
 
 
 class GeminiRequestQueue:
     """
-    Manages Gemini API request concurrency with per-key locking.
+    Manages Gemini API request concurrency with per-key quota scheduling.
 
-    Uses two levels of concurrency control:
+    Uses two levels of control:
     1. Global semaphore - Limits total concurrent requests (MAX_CONCURRENT_REQUESTS)
-    2. Per-key file locks - Prevents same key from concurrent use
+    2. Per-key RPM/TPM token buckets - Delay a request only until its key
+       has quota, without holding any lock while waiting or while the
+       request runs
 
-    This allows N keys to run N parallel requests (up to semaphore limit),
-    while ensuring each individual key respects rate limits.
+    On a 429 the key's bucket is emptied for the API's retryDelay, so
+    every process backs off that key while other keys keep working.
 
-    File-based locking works across:
-    - Multiple threads in same process
-    - Multiple processes (CLI batch mode)
-    - Different Python scripts running simultaneously
-
-    Lock files are created in data/api_usage/gemini_request_{key_hash}.lock
+    State files are created in data/api_usage/gemini_bucket_{key_hash}.json
 
     Usage:
         queue = get_gemini_request_queue()
+        api_key = queue.pick_key(api_keys, estimated_tokens=20_000)
         result = queue.execute_with_lock(
-            request_func=api_call,
-            api_key="key_xyz",
+            api_call,
+            api_key,
             *args,
+            estimated_tokens=20_000,
             **kwargs
         )
     """
 
+    # Rest applied to a key after a 429 without a parseable retryDelay
+    DEFAULT_RATE_LIMIT_BACKOFF = 60
+
     def __init__(
         self,
         lock_dir: Optional[Path] = None,
-        sleep_duration: Optional[int] = None,
-        max_concurrent: Optional[int] = None
+        max_concurrent: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[int] = None,
+        scheduler: Optional[KeyScheduler] = None
     ):
         """
-        Initialize the request queue with per-key locking.
+        Initialize the request queue.
 
         Args:
-            lock_dir: Directory for lock files (default: data/api_usage/)
-            sleep_duration: Seconds to sleep after each request (default from config)
+            lock_dir: Directory for lock/state files (default: data/api_usage/)
             max_concurrent: Max concurrent requests (default from config)
+            requests_per_minute: Per-key request quota (default from config)
+            tokens_per_minute: Per-key input token quota (default from config)
+            scheduler: Key scheduler to use (default: built from the above)
         """
         limits = get_api_limits()
 
         if lock_dir is None:
             lock_dir = Path(limits.USAGE_DATA_DIR)
 
-        self.lock_dir = lock_dir
-        self._sleep_duration = sleep_duration or limits.SLEEP_AFTER_REQUEST
+        self.lock_dir = Path(lock_dir)
         self._max_concurrent = max_concurrent or limits.MAX_CONCURRENT_REQUESTS
+        self.scheduler = scheduler or KeyScheduler(
+            lock_dir=self.lock_dir,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+        )
 
         # Global semaphore to limit total concurrent requests
         self._semaphore = threading.BoundedSemaphore(self._max_concurrent)
 
+        # Same limit for coroutine requests, one semaphore per event loop
+        self._loop_semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = (
+            weakref.WeakKeyDictionary()
+        )
+
         # Track per-key statistics
         self._key_stats: Dict[str, Dict[str, Any]] = {}
         self._stats_lock = threading.Lock()
@@ -94,50 +125,46 @@ class GeminiRequestQueue:
         self._total_requests = 0
         self._total_wait_time = 0.0
 
-        # Adaptive rate limiting: adjust sleep based on API response patterns
-        self._base_sleep = self._sleep_duration  # Original configured value
-        self._min_sleep = max(10, self._sleep_duration // 3)  # Floor: never go below 10s
-        self._consecutive_successes = 0
-        self._adaptive_lock = threading.Lock()
-
-        # Ensure lock directory exists
-        self.lock_dir.mkdir(parents=True, exist_ok=True)
-
         self.logger = get_logger(f"{__name__}.GeminiRequestQueue")
         self.logger.info(
-            f"Initialized GeminiRequestQueue with per-key locking in {lock_dir}"
+            f"Initialized GeminiRequestQueue: max_concurrent={self._max_concurrent}, "
+            f"{self.scheduler.requests_per_minute:g} RPM / "
+            f"{self.scheduler.tokens_per_minute:,} TPM per key, lock_dir={self.lock_dir}"
         )
-        self.logger.info(f"Max concurrent requests: {self._max_concurrent}")
-        self.logger.info(f"Sleep between requests (per key): {self._sleep_duration}s")
 
-    def _get_key_hash(self, api_key: str) -> str:
-        """Get a hash of the API key for lock file naming."""
-        return hashlib.sha256(api_key[:16].encode()).hexdigest()[:16]
+    def pick_key(self, api_keys: Iterable[str], estimated_tokens: int = 0) -> Optional[str]:
+        """
+        Pick the key that can take the next request soonest.
+
+        Args:
+            api_keys: Candidate API keys, in order of preference for ties
+            estimated_tokens: Estimated input tokens of the next request
 
-    def _get_lock_file_path(self, api_key: str) -> Path:
-        """Get the lock file path for a specific API key."""
-        key_hash = self._get_key_hash(api_key)
-        return self.lock_dir / f"gemini_request_{key_hash}.lock"
+        Returns:
+            The chosen key, or None if api_keys is empty
+        """
+        return self.scheduler.pick_key(api_keys, estimated_tokens)
 
     def execute_with_lock(
         self,
         request_func: Callable,
         api_key: str,
         *args,
+        estimated_tokens: int = 0,
         **kwargs
     ) -> Any:
         """
-        Execute an API request with per-key locking and global concurrency limit.
+        Execute an API request within the key's quota and the global concurrency limit.
 
         This method:
         1. Acquires a slot from the global semaphore (limits total concurrency)
-        2. Opens/creates the per-key lock file
-        3. Acquires exclusive lock for this key (blocks if key in use)
-        4. Executes the request function
-        5. Records metrics
-        6. Sleeps for mandatory duration (per-key, doesn't block other keys)
-        7. Releases the per-key lock
-        8. Releases the semaphore slot
+        2. Takes one request and estimated_tokens from the key's buckets,
+           waiting (lock-free) until the key has quota
+        3. Executes the request function
+        4. Records metrics and settles the key's TPM bucket with the actual
+           prompt size from the response's usage_metadata; on a 429, rests
+           the key for the API's retryDelay
+        5. Releases the semaphore slot
 
         Process-safe: Works across separate Python processes
         Thread-safe: Works across threads in same process
@@ -146,159 +173,150 @@ class GeminiRequestQueue:
             request_func: The function to call (the actual Gemini API call)
             api_key: The API key being used
             *args: Positional arguments to pass to request_func
+            estimated_tokens: Estimated input tokens, charged to the key's TPM bucket
             **kwargs: Keyword arguments to pass to request_func
 
         Returns:
             The return value from request_func
 
         Raises:
-            Any exception raised by request_func (after mandatory sleep)
+            Any exception raised by request_func
         """
         masked_key = mask_api_key(api_key)
-        key_hash = self._get_key_hash(api_key)
-        lock_file_path = self._get_lock_file_path(api_key)
-
-        # Ensure lock file exists
-        lock_file_path.touch(exist_ok=True)
-
         wait_start = time.time()
 
-        self.logger.debug(
-            f"Acquiring semaphore slot for key {masked_key} "
-            f"(max concurrent: {self._max_concurrent})"
-        )
-
         # Step 1: Acquire semaphore slot (limits total concurrency)
         self._semaphore.acquire()
-        semaphore_acquired = True
 
         try:
-            semaphore_wait = time.time() - wait_start
-            self.logger.debug(
-                f"Semaphore acquired for key {masked_key} "
-                f"(waited {semaphore_wait:.2f}s)"
-            )
-
-            # Step 2: Acquire per-key lock
-            self.logger.debug(f"Acquiring per-key lock for {masked_key}")
+            # Step 2: Wait for the key's RPM/TPM quota
+            self.scheduler.acquire(api_key, estimated_tokens)
+            waited = time.time() - wait_start
+            if waited > 1:
+                self.logger.debug(f"Waited {waited:.1f}s for quota on key {masked_key}")
+
+            # Step 3: Execute the actual API request
+            request_start = time.time()
+            try:
+                result = request_func(*args, **kwargs)
+            except Exception as e:
+                self._record_failure(api_key, waited, e)
+                raise
+
+            self._record_success(api_key, waited, time.time() - request_start, estimated_tokens, result)
+            return result
 
-            with open(lock_file_path, 'a+') as lock_file:
-                try:
-                    # Acquire exclusive lock for this specific key (cross-platform)
-                    portalocker.lock(lock_file, portalocker.LOCK_EX)
-
-                    lock_wait = time.time() - wait_start
-                    self.logger.debug(
-                        f"Per-key lock acquired for {masked_key} "
-                        f"(total wait {lock_wait:.2f}s)"
-                    )
-
-                    try:
-                        # Execute the actual API request
-                        request_start = time.time()
-                        result = request_func(*args, **kwargs)
-                        request_duration = time.time() - request_start
-
-                        # Update statistics
-                        self._update_stats(key_hash, masked_key, request_duration, False)
-
-                        # Adaptive sleep: reduce sleep after consecutive successes
-                        sleep_time = self._adaptive_sleep_success()
-
-                        self.logger.debug(
-                            f"Request complete for key {masked_key} "
-                            f"({request_duration:.2f}s), sleeping {sleep_time}s"
-                        )
-
-                        # Sleep per-key (doesn't block other keys)
-                        time.sleep(sleep_time)
-
-                        return result
+        finally:
+            self._semaphore.release()
 
-                    except Exception as e:
-                        # Update statistics for failed request
-                        self._update_stats(key_hash, masked_key, 0, True)
+    async def execute_async(
+        self,
+        request_func: Callable[..., Awaitable[Any]],
+        api_key: str,
+        *args,
+        estimated_tokens: int = 0,
+        **kwargs
+    ) -> Any:
+        """
+        Async variant of execute_with_lock() for coroutine API calls.
 
-                        # Adaptive sleep: increase sleep on rate limit errors
-                        error_str = str(e).lower()
-                        is_rate_limit = '429' in error_str or 'rate limit' in error_str
-                        sleep_time = self._adaptive_sleep_error(is_rate_limit)
+        Waits for the key's quota with asyncio.sleep, so one event loop can
+        keep many requests in flight without a thread per request. The
+        global concurrency limit applies per event loop.
 
-                        self.logger.warning(
-                            f"Request failed for key {masked_key}: {e}, "
-                            f"sleeping {sleep_time}s"
-                        )
+        Args:
+            request_func: Coroutine function to call (e.g. client.aio.models.generate_content)
+            api_key: The API key being used
+            *args: Positional arguments to pass to request_func
+            estimated_tokens: Estimated input tokens, charged to the key's TPM bucket
+            **kwargs: Keyword arguments to pass to request_func
 
-                        # Still sleep to avoid hammering API on errors
-                        time.sleep(sleep_time)
-                        raise
+        Returns:
+            The awaited return value from request_func
 
-                finally:
-                    # Release per-key lock (cross-platform)
-                    portalocker.unlock(lock_file)
-                    self.logger.debug(f"Released per-key lock for {masked_key}")
+        Raises:
+            Any exception raised by request_func
+        """
+        wait_start = time.time()
 
-        finally:
-            # Always release semaphore
-            if semaphore_acquired:
-                self._semaphore.release()
-                self.logger.debug(f"Released semaphore slot for key {masked_key}")
+        async with self._async_semaphore():
+            await self.scheduler.acquire_async(api_key, estimated_tokens)
+            waited = time.time() - wait_start
+            if waited > 1:
+                self.logger.debug(f"Waited {waited:.1f}s for quota on key {mask_api_key(api_key)}")
+
+            request_start = time.time()
+            try:
+                result = await request_func(*args, **kwargs)
+            except Exception as e:
+                # Settling and penalizing take the key's file lock - keep it off the loop
+                await asyncio.to_thread(self._record_failure, api_key, waited, e)
+                raise
+
+            await asyncio.to_thread(
+                self._record_success, api_key, waited, time.time() - request_start, estimated_tokens, result
+            )
+            return result
 
-    def _adaptive_sleep_success(self) -> int:
-        """
-        Calculate sleep duration after a successful request.
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        """Get the running event loop's concurrency semaphore."""
+        loop = asyncio.get_running_loop()
+        with self._stats_lock:
+            semaphore = self._loop_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self._max_concurrent)
+                self._loop_semaphores[loop] = semaphore
+            return semaphore
 
-        After 5 consecutive successes, gradually reduce sleep toward the minimum.
-        This allows faster processing when we're well within rate limits.
+    def _record_success(
+        self,
+        api_key: str,
+        waited: float,
+        duration: float,
+        estimated_tokens: int,
+        result: Any
+    ):
+        """Record a completed request and settle the key's TPM bucket."""
+        masked_key = mask_api_key(api_key)
+        self._update_stats(self.scheduler.get_key_hash(api_key), masked_key, duration, waited, False)
+
+        # Replace the estimate with the real prompt size in the key's TPM bucket
+        if estimated_tokens:
+            self.scheduler.settle(
+                api_key,
+                min(estimated_tokens, self.scheduler.tokens_per_minute),
+                prompt_token_count(result),
+            )
+        self.logger.debug(f"Request complete for key {masked_key} ({duration:.2f}s)")
 
-        Returns:
-            Sleep duration in seconds
-        """
-        with self._adaptive_lock:
-            self._consecutive_successes += 1
-            if self._consecutive_successes >= 5:
-                # Reduce by 5s for every 5 consecutive successes, down to min_sleep
-                reduction = (self._consecutive_successes // 5) * 5
-                self._sleep_duration = max(self._min_sleep, self._base_sleep - reduction)
-            return self._sleep_duration
-
-    def _adaptive_sleep_error(self, is_rate_limit: bool) -> int:
-        """
-        Calculate sleep duration after a failed request.
+    def _record_failure(self, api_key: str, waited: float, error: Exception):
+        """Record a failed request; on a 429, rest the key for the API's retryDelay."""
+        masked_key = mask_api_key(api_key)
+        self._update_stats(self.scheduler.get_key_hash(api_key), masked_key, 0, waited, True)
 
-        Rate limit errors reset sleep to base + 50% penalty.
-        Other errors reset to base duration.
+        error_str = str(error).lower()
+        if '429' in error_str or 'rate limit' in error_str or 'resource_exhausted' in error_str:
+            self.scheduler.penalize(api_key, self._retry_delay(error))
 
-        Args:
-            is_rate_limit: True if this was a 429/rate limit error
+        self.logger.warning(f"Request failed for key {masked_key}: {error}")
 
-        Returns:
-            Sleep duration in seconds
-        """
-        with self._adaptive_lock:
-            self._consecutive_successes = 0
-            if is_rate_limit:
-                # Penalty: 50% increase over base on rate limit hit
-                self._sleep_duration = int(self._base_sleep * 1.5)
-                self.logger.info(
-                    f"Rate limit hit: increased sleep to {self._sleep_duration}s "
-                    f"(base: {self._base_sleep}s)"
-                )
-            else:
-                # Non-rate-limit error: reset to base
-                self._sleep_duration = self._base_sleep
-            return self._sleep_duration
+    def _retry_delay(self, error: Exception) -> float:
+        """Seconds to rest a key after a 429 (the API's retryDelay when present)."""
+        match = re.search(r"['\"]retryDelay['\"]:\s*['\"](\d+(?:\.\d+)?)s?['\"]", str(error), re.IGNORECASE)
+        return float(match.group(1)) if match else self.DEFAULT_RATE_LIMIT_BACKOFF
 
     def _update_stats(
         self,
         key_hash: str,
         masked_key: str,
         duration: float,
+        wait_time: float,
         is_error: bool
     ):
         """Update per-key and global statistics."""
         with self._stats_lock:
             self._total_requests += 1
+            self._total_wait_time += wait_time
 
             if key_hash not in self._key_stats:
                 self._key_stats[key_hash] = {
@@ -317,16 +335,6 @@ class GeminiRequestQueue:
             if is_error:
                 stats['error_count'] += 1
 
-    def set_sleep_duration(self, seconds: int):
-        """
-        Update the mandatory sleep duration between requests.
-
-        Args:
-            seconds: Seconds to sleep between requests
-        """
-        self._sleep_duration = seconds
-        self.logger.info(f"Updated sleep duration to {seconds}s")
-
     def set_max_concurrent(self, max_concurrent: int):
         """
         Update the maximum concurrent requests.
@@ -339,6 +347,8 @@ class GeminiRequestQueue:
         """
         self._max_concurrent = max_concurrent
         self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        with self._stats_lock:
+            self._loop_semaphores.clear()
         self.logger.info(f"Updated max concurrent requests to {max_concurrent}")
 
     def get_stats(self) -> dict:
@@ -351,8 +361,9 @@ class GeminiRequestQueue:
         with self._stats_lock:
             return {
                 'total_requests': self._total_requests,
-                'sleep_duration': self._sleep_duration,
+                'total_wait_time': self._total_wait_time,
                 'max_concurrent': self._max_concurrent,
+                'scheduler': self.scheduler.get_stats(),
                 'lock_dir': str(self.lock_dir),
                 'per_key_stats': dict(self._key_stats),
             }
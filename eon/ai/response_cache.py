@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Disk-backed, content-addressed cache of LLM responses.
+
+Re-running a batch after a crash, re-running an unchanged workflow, or
+analyzing the same filing from both the UI and the CLI repeats Gemini
+calls whose answers are already known. ResponseCache stores each validated
+response under a hash of everything that determines it: model, thinking
+configuration, schema JSON, generation parameters, prompt and the hash of
+any shared context (the filing). A hit costs one small file read and no
+API quota.
+
+Entries are compact JSON compressed with zlib. Reads refresh an entry's
+mtime, and when the cache grows past its size budget the least recently
+used entries are deleted.
+
+Layout:
+    {cache_dir}/9c/9c41...0b.json.zz    # {"result": ..., "tokens": N}
+
+Usage:
+    cache = get_response_cache()
+    key = cache.make_key(model="gemini-2.5-flash", prompt=prompt, schema=MySchema)
+    entry = cache.get(key)
+    if entry is None:
+        result = call_llm(prompt)
+        cache.put(key, result.model_dump(mode='json'), tokens=used)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from eon.core import get_logger, get_config, ConfigurationError
+
+_ENTRY_SUFFIX = ".json.zz"
+
+
+class ResponseCache:
+    """
+    LRU-bounded store of LLM responses keyed by request content.
+
+    Thread-safe, and process-safe in the same way as TextCache: entries are
+    written atomically (tmp + rename), so concurrent writers of one key
+    just race to store the same answer.
+
+    Example:
+        cache = ResponseCache(cache_dir, max_bytes=512 * 1024 * 1024)
+        key = cache.make_key(model="gemini-2.5-flash", prompt=prompt)
+        entry = cache.get(key)   # {"result": ..., "tokens": N} or None
+    """
+
+    # After an eviction pass the cache is trimmed to this share of the budget,
+    # so the directory isn't rescanned on every write near the limit
+    EVICTION_TARGET = 0.9
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory for cached responses
+            max_bytes: Size budget for all entries (compressed bytes)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max(0, max_bytes)
+
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # Sized lazily on first write
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+        self.logger = get_logger(f"{__name__}.ResponseCache")
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt: str,
+        schema: Optional[Type[BaseModel]] = None,
+        thinking: Optional[Dict[str, Any]] = None,
+        context_hash: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Hash everything that determines a response into a cache key.
+
+        Args:
+            model: Model name
+            prompt: The call's own prompt
+            schema: Pydantic schema for structured output (its JSON schema
+                is hashed, so editing a field changes the key)
+            thinking: Thinking configuration (budget or level)
+            context_hash: SHA256 of the shared context (filing), if any
+            params: Extra generation parameters (temperature, etc.)
+
+        Returns:
+            Hex SHA256 key
+        """
+        parts = {
+            'model': model,
+            'thinking': thinking or {},
+            'schema': schema.model_json_schema() if schema else None,
+            'params': params or {},
+            'context': context_hash,
+            'prompt': hashlib.sha256(prompt.encode('utf-8')).hexdigest(),
+        }
+        encoded = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a cached response and mark it recently used.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            {"result": <JSON value>, "tokens": int}, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+            os.utime(path)
+        except FileNotFoundError:
+            self._bump('misses')
+            return None
+        except Exception as e:
+            # Corrupt or half-deleted entry - treat as a miss
+            self.logger.warning(f"Ignoring unreadable response cache entry {path.name}: {e}")
+            self._bump('misses')
+            return None
+
+        self._bump('hits')
+        return entry
+
+    def put(self, key: str, result: Any, tokens: int = 0) -> None:
+        """
+        Store a validated response.
+
+        Args:
+            key: Key from make_key()
+            result: JSON-serializable response (model_dump(mode='json') or dict)
+            tokens: Tokens the original call used (reported as saved on hits)
+        """
+        if self.max_bytes == 0:
+            return
+
+        data = zlib.compress(
+            json.dumps({'result': result, 'tokens': tokens}, separators=(',', ':')).encode('utf-8'), 6
+        )
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write response cache entry {path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self._bump('writes')
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, _, size in self._scan())
+            else:
+                self._total_bytes += len(data) - replaced
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def invalidate(self, key: str) -> None:
+        """
+        Remove a cached response.
+
+        Args:
+            key: Key from make_key()
+        """
+        self._entry_path(key).unlink(missing_ok=True)
+        with self._lock:
+            self._total_bytes = None
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            for path, _, _ in self._scan():
+                path.unlink(missing_ok=True)
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache counters (hits, misses, writes, evictions) and its size."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, _, size in self._scan())
+            stats['bytes'] = self._total_bytes
+        return stats
+
+    def _evict(self) -> None:
+        """Delete least recently used entries down to EVICTION_TARGET (caller holds _lock)."""
+        entries = self._scan()
+        # Other processes share the directory; start from what is on disk
+        total = sum(size for _, _, size in entries)
+        target = int(self.max_bytes * self.EVICTION_TARGET)
+
+        evicted = 0
+        for path, _, size in sorted(entries, key=lambda entry: entry[1]):
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+
+        self._total_bytes = total
+        if evicted:
+            with self._stats_lock:
+                self._stats['evictions'] += evicted
+            self.logger.debug(f"Evicted {evicted} cached responses ({total:,} bytes kept)")
+
+    def _scan(self) -> List[Tuple[Path, float, int]]:
+        """List (path, mtime, size) of every entry."""
+        entries = []
+        for path in self.cache_dir.glob(f"*/*{_ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{_ENTRY_SUFFIX}"
+
+    def _bump(self, counter: str) -> None:
+        with self._stats_lock:
+            self._stats[counter] += 1
+
+
+# Global singleton with thread-safe initialization
+_global_cache: Optional[ResponseCache] = None
+_cache_creation_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get the global response cache singleton (under the configured cache dir).
+
+    Returns:
+        The global ResponseCache instance
+    """
+    global _global_cache
+
+    if _global_cache is None:
+        with _cache_creation_lock:
+            if _global_cache is None:
+                config = get_config()
+                _global_cache = ResponseCache(
+                    config.get_cache_path("llm_responses"),
+                    max_bytes=config.llm_cache_max_mb * 1024 * 1024,
+                )
+
+    return _global_cache
+
+
+def response_cache_enabled() -> bool:
+    """
+    Whether the configured response cache is on.
+
+    Off when EON_ENABLE_CACHING=false, EON_LLM_CACHE_MAX_MB=0, or the app
+    configuration can't be loaded (e.g. a bare test environment).
+    """
+    try:
+        config = get_config()
+    except ConfigurationError:
+        return False
+    return config.enable_caching and config.llm_cache_max_mb > 0
+
+
+def reset_response_cache():
+    """Reset the global response cache (mainly for testing)."""
+    global _global_cache
+    with _cache_creation_lock:
+        _global_cache = None
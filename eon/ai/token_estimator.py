@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Fast prompt token estimates, calibrated against Gemini's reported usage.
+
+Counting tokens exactly costs an API call, so requests are admitted
+against the per-key TPM budget using a characters-per-token ratio. The
+ratio starts at the common ~4 chars/token heuristic and is corrected
+after every call from ``usage_metadata.prompt_token_count`` (one moving
+average per model), so estimates converge on how the model actually
+tokenizes SEC filings. Calibration is saved next to the usage data and
+shared by later runs.
+"""
+
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from eon.core import get_logger
+from eon.ai.api_config import get_api_limits
+
+
+class TokenEstimator:
+    """
+    Estimates prompt tokens from character counts, per model.
+
+    Example:
+        estimator = get_token_estimator()
+        tokens = estimator.estimate(prompt, model="gemini-2.5-flash")
+        response = client.models.generate_content(...)
+        estimator.observe("gemini-2.5-flash", len(prompt),
+                          response.usage_metadata.prompt_token_count)
+    """
+
+    DEFAULT_CHARS_PER_TOKEN = 4.0
+
+    # Estimates are padded slightly so admission errs on the safe side
+    SAFETY_MARGIN = 1.05
+
+    # Weight of each new observation in the moving average
+    SMOOTHING = 0.2
+
+    # Observations between writes of the calibration file
+    SAVE_EVERY = 10
+
+    def __init__(self, state_file: Optional[Path] = None):
+        """
+        Initialize the estimator.
+
+        Args:
+            state_file: Calibration file (default: data/api_usage/token_calibration.json)
+        """
+        if state_file is None:
+            state_file = Path(get_api_limits().USAGE_DATA_DIR) / "token_calibration.json"
+
+        self.state_file = Path(state_file)
+        self._lock = threading.Lock()
+        self._ratios: Dict[str, float] = {}
+        self._observations: Dict[str, int] = {}
+        self._unsaved = 0
+
+        self.logger = get_logger(f"{__name__}.TokenEstimator")
+        self._load()
+
+    def estimate(self, text: Any, model: Optional[str] = None) -> int:
+        """
+        Estimate the prompt tokens of text.
+
+        Args:
+            text: Prompt string (or list of strings/parts)
+            model: Model name, to use its calibrated ratio
+
+        Returns:
+            Estimated token count
+        """
+        chars = self.count_chars(text)
+        if chars == 0:
+            return 0
+        return math.ceil(chars / self.chars_per_token(model) * self.SAFETY_MARGIN)
+
+    def observe(self, model: str, chars: int, prompt_tokens: Optional[int]):
+        """
+        Calibrate a model's ratio from a completed request.
+
+        Args:
+            model: Model name
+            chars: Characters in the prompt that was sent
+            prompt_tokens: usage_metadata.prompt_token_count from the response
+        """
+        if not prompt_tokens or chars <= 0:
+            return
+
+        ratio = chars / prompt_tokens
+        with self._lock:
+            current = self._ratios.get(model)
+            self._ratios[model] = ratio if current is None else (
+                current + self.SMOOTHING * (ratio - current)
+            )
+            self._observations[model] = self._observations.get(model, 0) + 1
+            self._unsaved += 1
+            save = self._unsaved >= self.SAVE_EVERY or self._observations[model] == 1
+
+        if save:
+            self.save()
+
+    def chars_per_token(self, model: Optional[str] = None) -> float:
+        """Get the calibrated characters-per-token ratio for a model."""
+        with self._lock:
+            return self._ratios.get(model, self.DEFAULT_CHARS_PER_TOKEN)
+
+    @staticmethod
+    def count_chars(text: Any) -> int:
+        """Count characters in a prompt given as a string or list of parts."""
+        if text is None:
+            return 0
+        if isinstance(text, str):
+            return len(text)
+        if isinstance(text, (list, tuple)):
+            return sum(TokenEstimator.count_chars(part) for part in text)
+        return len(getattr(text, 'text', None) or '')
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get the calibrated ratio and observation count per model."""
+        with self._lock:
+            return {
+                model: {'chars_per_token': round(ratio, 3), 'observations': self._observations.get(model, 0)}
+                for model, ratio in self._ratios.items()
+            }
+
+    def save(self):
+        """Write calibration to disk (atomic replace)."""
+        with self._lock:
+            state = {
+                model: {'chars_per_token': ratio, 'observations': self._observations.get(model, 0)}
+                for model, ratio in self._ratios.items()
+            }
+            self._unsaved = 0
+
+        tmp_path = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(state, indent=2))
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            self.logger.warning(f"Failed to save token calibration: {e}")
+
+    def _load(self):
+        try:
+            state = json.loads(self.state_file.read_text())
+            for model, entry in state.items():
+                ratio = float(entry['chars_per_token'])
+                if ratio > 0:
+                    self._ratios[model] = ratio
+                    self._observations[model] = int(entry.get('observations', 0))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self.logger.warning(f"Ignoring unreadable token calibration {self.state_file}: {e}")
+
+
+# Global singleton with thread-safe initialization
+_global_estimator: Optional[TokenEstimator] = None
+_estimator_creation_lock = threading.Lock()
+
+
+def get_token_estimator() -> TokenEstimator:
+    """
+    Get the global token estimator singleton.
+
+    Thread-safe singleton pattern using double-checked locking.
+
+    Returns:
+        The global TokenEstimator instance
+    """
+    global _global_estimator
+
+    if _global_estimator is None:
+        with _estimator_creation_lock:
+            if _global_estimator is None:
+                _global_estimator = TokenEstimator()
+
+    return _global_estimator
+
+
+def reset_token_estimator():
+    """Reset the global token estimator (mainly for testing)."""
+    global _global_estimator
+    with _estimator_creation_lock:
+        _global_estimator = None
@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+SQLite store for per-key daily API usage.
+
+APIUsageTracker used to keep one JSON file per key holding 90 days of
+history plus a timestamp for every request. Picking a key meant opening,
+locking and parsing every key's file, and recording a request rewrote the
+whole file. This store keeps the same counters as rows in a single WAL-mode
+SQLite database:
+
+    key_usage_daily   one row per (key, day): requests, errors, tokens,
+                      cache hits, tokens saved, last request time
+    key_usage_totals  one row per key: lifetime counters
+
+Every update is a single UPSERT pair inside a BEGIN IMMEDIATE transaction,
+so concurrent threads, processes and CLI/UI instances never lose an
+increment. Reading today's counts for all keys is one indexed query.
+
+Connections are opened once per thread and reused.
+
+Usage:
+    store = UsageStore(usage_dir / "usage.db")
+    count = store.add("9c41...", "...abcd", "2026-10-16", now, requests=1, tokens=1200)
+    counts = store.get_request_counts("2026-10-16")   # {key_hash: requests}
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS key_usage_daily (
+    key_hash TEXT NOT NULL,
+    usage_date TEXT NOT NULL,
+    request_count INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    tokens INTEGER NOT NULL DEFAULT 0,
+    cache_hits INTEGER NOT NULL DEFAULT 0,
+    tokens_saved INTEGER NOT NULL DEFAULT 0,
+    last_request_at TEXT,
+    PRIMARY KEY (key_hash, usage_date)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_key_usage_daily_date
+    ON key_usage_daily(usage_date, key_hash, request_count);
+
+CREATE TABLE IF NOT EXISTS key_usage_totals (
+    key_hash TEXT PRIMARY KEY,
+    key_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    total_requests INTEGER NOT NULL DEFAULT 0,
+    total_errors INTEGER NOT NULL DEFAULT 0,
+    total_tokens INTEGER NOT NULL DEFAULT 0,
+    total_cache_hits INTEGER NOT NULL DEFAULT 0,
+    last_used_at TEXT
+);
+"""
+
+_DAILY_COLUMNS = ('request_count', 'errors', 'tokens', 'cache_hits', 'tokens_saved')
+
+
+class UsageStore:
+    """
+    Cross-process usage counters backed by one SQLite database.
+
+    Thread-safe: each thread gets its own long-lived connection, and
+    SQLite's write lock serializes updates between processes.
+
+    Example:
+        store = UsageStore(Path("data/api_usage/usage.db"))
+        store.add(key_hash, key_id, today, now, requests=1, errors=1)
+        store.get_day(key_hash, today)   # {'request_count': 1, 'errors': 1, ...}
+    """
+
+    def __init__(self, db_path: Path, timeout: float = 30.0):
+        """
+        Open (and create if needed) the usage database.
+
+        Args:
+            db_path: SQLite database file
+            timeout: Seconds to wait for another writer's lock
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode - writes open their own BEGIN IMMEDIATE transaction
+            conn = sqlite3.connect(
+                str(self.db_path), timeout=self.timeout, isolation_level=None,
+                check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close the calling thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def add(
+        self,
+        key_hash: str,
+        key_id: str,
+        usage_date: str,
+        now: str,
+        requests: int = 0,
+        errors: int = 0,
+        tokens: int = 0,
+        cache_hits: int = 0,
+        tokens_saved: int = 0
+    ) -> int:
+        """
+        Atomically add to a key's counters for one day and its lifetime totals.
+
+        Args:
+            key_hash: Key hash (row identity)
+            key_id: Masked key, for display
+            usage_date: Day the usage counts towards (YYYY-MM-DD)
+            now: ISO timestamp of the update
+            requests: Requests made
+            errors: Requests that failed
+            tokens: Tokens used
+            cache_hits: Responses served from the response cache
+            tokens_saved: Tokens those cached responses originally cost
+
+        Returns:
+            The key's request count for usage_date after the update
+        """
+        last_request_at = now if requests else None
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                """
+                INSERT INTO key_usage_daily
+                (key_hash, usage_date, request_count, errors, tokens, cache_hits, tokens_saved, last_request_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key_hash, usage_date) DO UPDATE SET
+                    request_count = request_count + excluded.request_count,
+                    errors = errors + excluded.errors,
+                    tokens = tokens + excluded.tokens,
+                    cache_hits = cache_hits + excluded.cache_hits,
+                    tokens_saved = tokens_saved + excluded.tokens_saved,
+                    last_request_at = COALESCE(excluded.last_request_at, last_request_at)
+                RETURNING request_count
+                """,
+                (key_hash, usage_date, requests, errors, tokens, cache_hits, tokens_saved, last_request_at)
+            ).fetchone()
+            conn.execute(
+                """
+                INSERT INTO key_usage_totals
+                (key_hash, key_id, created_at, total_requests, total_errors, total_tokens,
+                 total_cache_hits, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key_hash) DO UPDATE SET
+                    total_requests = total_requests + excluded.total_requests,
+                    total_errors = total_errors + excluded.total_errors,
+                    total_tokens = total_tokens + excluded.total_tokens,
+                    total_cache_hits = total_cache_hits + excluded.total_cache_hits,
+                    last_used_at = COALESCE(excluded.last_used_at, last_used_at)
+                """,
+                (key_hash, key_id, now, requests, errors, tokens, cache_hits, last_request_at)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return row['request_count']
+
+    def get_request_counts(self, usage_date: str) -> Dict[str, int]:
+        """
+        Get every key's request count for one day in a single query.
+
+        Args:
+            usage_date: Day (YYYY-MM-DD)
+
+        Returns:
+            Dict mapping key hash to request count (keys without usage are absent)
+        """
+        rows = self._connect().execute(
+            "SELECT key_hash, request_count FROM key_usage_daily WHERE usage_date = ?",
+            (usage_date,)
+        ).fetchall()
+        return {row['key_hash']: row['request_count'] for row in rows}
+
+    def get_day(self, key_hash: str, usage_date: str) -> Dict[str, Any]:
+        """
+        Get a key's counters for one day.
+
+        Args:
+            key_hash: Key hash
+            usage_date: Day (YYYY-MM-DD)
+
+        Returns:
+            Dict of daily counters (all zero if the key wasn't used that day)
+        """
+        row = self._connect().execute(
+            "SELECT * FROM key_usage_daily WHERE key_hash = ? AND usage_date = ?",
+            (key_hash, usage_date)
+        ).fetchone()
+        if row is None:
+            return {**{column: 0 for column in _DAILY_COLUMNS}, 'last_request_at': None}
+        return dict(row)
+
+    def get_totals(self, key_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a key's lifetime counters.
+
+        Args:
+            key_hash: Key hash
+
+        Returns:
+            Dict of totals, or None if the key has never been used
+        """
+        row = self._connect().execute(
+            "SELECT * FROM key_usage_totals WHERE key_hash = ?", (key_hash,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_history(self, key_hash: str, start_date: str, end_date: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a key's daily counters over a date range.
+
+        Args:
+            key_hash: Key hash
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+
+        Returns:
+            Dict mapping date to daily counters, for days with usage
+        """
+        rows = self._connect().execute(
+            """
+            SELECT * FROM key_usage_daily
+            WHERE key_hash = ? AND usage_date BETWEEN ? AND ?
+            """,
+            (key_hash, start_date, end_date)
+        ).fetchall()
+        return {row['usage_date']: dict(row) for row in rows}
+
+    def import_key(
+        self,
+        key_hash: str,
+        key_id: str,
+        created_at: str,
+        days: Iterable[Dict[str, Any]],
+        totals: Dict[str, Any]
+    ):
+        """
+        Merge existing usage history for a key (e.g. from a legacy JSON file).
+
+        Counters are added to any rows already present, in one transaction.
+
+        Args:
+            key_hash: Key hash
+            key_id: Masked key
+            created_at: When the key was first tracked
+            days: Daily counters, each with a 'date' plus any of the daily columns
+            totals: Lifetime counters (total_requests, total_errors, ...)
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for day in days:
+                conn.execute(
+                    """
+                    INSERT INTO key_usage_daily
+                    (key_hash, usage_date, request_count, errors, tokens, cache_hits, tokens_saved, last_request_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(key_hash, usage_date) DO UPDATE SET
+                        request_count = request_count + excluded.request_count,
+                        errors = errors + excluded.errors,
+                        tokens = tokens + excluded.tokens,
+                        cache_hits = cache_hits + excluded.cache_hits,
+                        tokens_saved = tokens_saved + excluded.tokens_saved,
+                        last_request_at = NULLIF(MAX(COALESCE(last_request_at, ''), COALESCE(excluded.last_request_at, '')), '')
+                    """,
+                    (key_hash, day['date'], *(day.get(c, 0) for c in _DAILY_COLUMNS), day.get('last_request_at'))
+                )
+            conn.execute(
+                """
+                INSERT INTO key_usage_totals
+                (key_hash, key_id, created_at, total_requests, total_errors, total_tokens,
+                 total_cache_hits, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key_hash) DO UPDATE SET
+                    created_at = MIN(created_at, excluded.created_at),
+                    total_requests = total_requests + excluded.total_requests,
+                    total_errors = total_errors + excluded.total_errors,
+                    total_tokens = total_tokens + excluded.total_tokens,
+                    total_cache_hits = total_cache_hits + excluded.total_cache_hits,
+                    last_used_at = NULLIF(MAX(COALESCE(last_used_at, ''), COALESCE(excluded.last_used_at, '')), '')
+                """,
+                (
+                    key_hash, key_id, created_at,
+                    totals.get('total_requests', 0), totals.get('total_errors', 0),
+                    totals.get('total_tokens', 0), totals.get('total_cache_hits', 0),
+                    totals.get('last_used_at'),
+                )
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete_before(self, usage_date: str) -> int:
+        """
+        Delete daily rows older than a date (lifetime totals are kept).
+
+        Args:
+            usage_date: First day to keep (YYYY-MM-DD)
+
+        Returns:
+            Number of rows deleted
+        """
+        cursor = self._connect().execute(
+            "DELETE FROM key_usage_daily WHERE usage_date < ?", (usage_date,)
+        )
+        return cursor.rowcount
+
+    def delete_keys(self, key_hashes: Optional[List[str]] = None):
+        """
+        Delete all usage for some keys, or for every key.
+
+        Args:
+            key_hashes: Keys to reset (None = all keys)
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if key_hashes is None:
+                conn.execute("DELETE FROM key_usage_daily")
+                conn.execute("DELETE FROM key_usage_totals")
+            else:
+                for key_hash in key_hashes:
+                    conn.execute("DELETE FROM key_usage_daily WHERE key_hash = ?", (key_hash,))
+                    conn.execute("DELETE FROM key_usage_totals WHERE key_hash = ?", (key_hash,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
@@ -1,93 +1,45 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """
-Persistent API usage tracker with file locking for parallel execution safety.
+Persistent API usage tracker with key reservation for parallel execution.
 
-Each API key has its own JSON file to track usage, avoiding conflicts
-when multiple processes/threads access the same key.
+Per-key daily counters live in one SQLite database (see usage_store), shared
+by every thread, process and CLI/UI instance; each update is an atomic
+UPSERT. Key selection reads only memory under the reservation lock: the
+tracker keeps today's request counts, refreshed from the store with a single
+query at most once per REFRESH_INTERVAL, and picks keys from a min-heap
+ordered by effective usage (today's requests plus in-flight reservations).
+Per-minute capacity (see KeyScheduler) is snapshotted on the same interval,
+by one thread at a time and outside the lock.
 
-Cross-platform compatible (Windows, macOS, Linux) using portalocker.
+Usage files from older versions (usage_{hash}.json) are imported into the
+database on first start and renamed to *.json.migrated.
+
+Cross-platform compatible (Windows, macOS, Linux).
 """
 
-import json
-import portalocker
+import heapq
 import hashlib
+import json
 import threading
 import time
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Set
-from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple
 
 from eon.core import get_logger, get_config, mask_api_key
 from .api_config import get_api_limits, API_LIMITS
-
-
-@dataclass
-class DailyUsage:
-    """Usage data for a single day."""
-    date: str
-    request_count: int = 0
-    timestamps: List[str] = field(default_factory=list)  # ISO timestamps of each request
-    errors: int = 0
-    last_request_at: Optional[str] = None
-
-
-@dataclass
-class KeyUsageData:
-    """Complete usage data for a single API key."""
-    key_id: str  # Masked key identifier (last 4 chars)
-    key_hash: str  # SHA256 hash for unique identification
-    created_at: str
-    daily_usage: Dict[str, DailyUsage] = field(default_factory=dict)
-    total_requests: int = 0
-    total_errors: int = 0
-    last_used_at: Optional[str] = None
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            'key_id': self.key_id,
-            'key_hash': self.key_hash,
-            'created_at': self.created_at,
-            'daily_usage': {
-                date: asdict(usage) for date, usage in self.daily_usage.items()
-            },
-            'total_requests': self.total_requests,
-            'total_errors': self.total_errors,
-            'last_used_at': self.last_used_at,
-        }
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'KeyUsageData':
-        """Create from dictionary."""
-        daily_usage = {}
-        for date, usage_data in data.get('daily_usage', {}).items():
-            daily_usage[date] = DailyUsage(
-                date=usage_data['date'],
-                request_count=usage_data.get('request_count', 0),
-                timestamps=usage_data.get('timestamps', []),
-                errors=usage_data.get('errors', 0),
-                last_request_at=usage_data.get('last_request_at'),
-            )
-
-        return cls(
-            key_id=data['key_id'],
-            key_hash=data['key_hash'],
-            created_at=data['created_at'],
-            daily_usage=daily_usage,
-            total_requests=data.get('total_requests', 0),
-            total_errors=data.get('total_errors', 0),
-            last_used_at=data.get('last_used_at'),
-        )
+from .usage_store import UsageStore
 
 
 class APIUsageTracker:
     """
     Thread-safe, persistent API usage tracker with key reservation.
 
-    Each API key's usage is stored in a separate JSON file with file locking
-    to ensure safe concurrent access from multiple processes/threads.
+    Usage is stored in data/api_usage/usage.db, so counts are shared across
+    processes. Today's request counts are cached in memory and refreshed
+    from the database at most once per REFRESH_INTERVAL seconds; requests
+    recorded by this instance are reflected immediately.
 
     IMPORTANT: For parallel/batch operations, use reserve_and_get_key() instead
     of get_least_used_key() to prevent multiple threads from getting the same key.
@@ -112,22 +64,45 @@ class APIUsageTracker:
         best_key = tracker.get_least_used_key(api_keys)
     """
 
+    # Seconds between reloads of today's counts from the shared database
+    REFRESH_INTERVAL = 1.0
+
     def __init__(self, usage_dir: Optional[Path] = None):
         """
         Initialize the usage tracker.
 
         Args:
-            usage_dir: Directory to store usage files. Defaults to data/api_usage/
+            usage_dir: Directory for the usage database. Defaults to data/api_usage/
         """
         self.logger = get_logger(f"{__name__}.APIUsageTracker")
         self.limits = get_api_limits()
 
         # Thread-safe key reservation tracking with wait/notify support
-        # Using Condition instead of Lock allows threads to wait for key availability
+        # Using Condition instead of Lock allows threads to wait for key availability.
+        # The condition's lock also guards the usage snapshot and the key heap below.
         self._reservation_condition = threading.Condition()
         self._reserved_keys: Set[str] = set()  # Keys currently in use by threads
         self._key_usage_counts: Dict[str, int] = {}  # In-flight request counts per key
 
+        # Today's request counts by key hash, as of _counts_loaded_at
+        self._counts: Dict[str, int] = {}
+        self._counts_date: Optional[str] = None
+        self._counts_loaded_at = 0.0
+
+        # Min-heap of (effective_usage, first_seen, key) for unreserved keys.
+        # Entries are invalidated lazily: one is current only while it matches
+        # _heap_usage[key], so an update is a push instead of a re-sort.
+        self._heap: List[Tuple[int, int, str]] = []
+        self._heap_usage: Dict[str, int] = {}
+        self._key_order: Dict[str, int] = {}  # Key -> first-seen position (tie-break)
+        self._key_hashes: Dict[str, str] = {}
+
+        # Wall-clock time each key regains per-minute capacity, as of
+        # _capacity_loaded_at (refreshed outside the reservation lock)
+        self._ready_at: Dict[str, float] = {}
+        self._capacity_loaded_at = 0.0
+        self._capacity_refreshing = False
+
         # Determine usage directory
         if usage_dir:
             self.usage_dir = Path(usage_dir)
@@ -138,6 +113,9 @@ class APIUsageTracker:
         # Create usage directory
         self.usage_dir.mkdir(parents=True, exist_ok=True)
 
+        self.store = UsageStore(self.usage_dir / "usage.db")
+        self._import_legacy_files()
+
         self.logger.info(
             f"APIUsageTracker initialized "
             f"(dir={self.usage_dir}, daily_limit={self.limits.DAILY_LIMIT_PER_KEY})"
@@ -148,79 +126,39 @@ class APIUsageTracker:
         return mask_api_key(api_key)
 
     def _get_key_hash(self, api_key: str) -> str:
-        """Get SHA256 hash of the key for unique file naming."""
-        return hashlib.sha256(api_key.encode()).hexdigest()[:16]
-
-    def _get_usage_file(self, api_key: str) -> Path:
-        """Get the usage file path for an API key."""
-        key_hash = self._get_key_hash(api_key)
-        return self.usage_dir / f"usage_{key_hash}.json"
-
-    def _load_usage_data(self, api_key: str) -> KeyUsageData:
+        """Get SHA256 hash of the key (its row identity in the store)."""
+        key_hash = self._key_hashes.get(api_key)
+        if key_hash is None:
+            key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+            self._key_hashes[api_key] = key_hash
+        return key_hash
+
+    def _import_legacy_files(self):
         """
-        Load usage data for a key from its JSON file.
+        Import per-key JSON usage files written by older versions.
 
-        Uses file locking for safe concurrent access.
+        Each file is claimed by renaming it before it is read, so when several
+        processes start at once exactly one of them imports it.
         """
-        usage_file = self._get_usage_file(api_key)
-        key_id = self._get_key_id(api_key)
-        key_hash = self._get_key_hash(api_key)
-
-        if not usage_file.exists():
-            # Create new usage data
-            return KeyUsageData(
-                key_id=key_id,
-                key_hash=key_hash,
-                created_at=datetime.now().isoformat(),
-            )
-
-        try:
-            with open(usage_file, 'r') as f:
-                # Acquire shared lock for reading (cross-platform)
-                portalocker.lock(f, portalocker.LOCK_SH)
-                try:
-                    # Seek to start in case portalocker shifted position (Windows quirk)
-                    f.seek(0)
-                    data = json.load(f)
-                    return KeyUsageData.from_dict(data)
-                finally:
-                    portalocker.unlock(f)
-        except (json.JSONDecodeError, KeyError, OSError, ValueError) as e:
-            self.logger.warning(f"Could not read usage file for key ...{key_id}, resetting: {e}")
-            return KeyUsageData(
-                key_id=key_id,
-                key_hash=key_hash,
-                created_at=datetime.now().isoformat(),
-            )
-
-    def _save_usage_data(self, api_key: str, data: KeyUsageData):
-        """
-        Save usage data to the JSON file.
-
-        Uses exclusive file locking for safe concurrent writes.
-        """
-        usage_file = self._get_usage_file(api_key)
-
-        # Write to temp file first, then rename (atomic operation)
-        temp_file = usage_file.with_suffix('.tmp')
-
-        try:
-            with open(temp_file, 'w') as f:
-                # Acquire exclusive lock for writing (cross-platform)
-                portalocker.lock(f, portalocker.LOCK_EX)
-                try:
-                    json.dump(data.to_dict(), f, indent=2)
-                finally:
-                    portalocker.unlock(f)
-
-            # Atomic rename
-            temp_file.rename(usage_file)
+        for usage_file in self.usage_dir.glob("usage_*.json"):
+            claimed = usage_file.with_name(usage_file.name + ".migrated")
+            try:
+                usage_file.replace(claimed)
+            except OSError:
+                continue  # Another process got there first
 
-        except Exception as e:
-            self.logger.error(f"Failed to save usage data: {e}")
-            if temp_file.exists():
-                temp_file.unlink()
-            raise
+            try:
+                data = json.loads(claimed.read_text())
+                days = [
+                    {**usage, 'date': date}
+                    for date, usage in data.get('daily_usage', {}).items()
+                ]
+                self.store.import_key(
+                    data['key_hash'], data['key_id'], data['created_at'], days, data
+                )
+                self.logger.info(f"Imported legacy usage file {usage_file.name}")
+            except (json.JSONDecodeError, KeyError, OSError, ValueError) as e:
+                self.logger.warning(f"Could not import legacy usage file {usage_file.name}: {e}")
 
     def _get_today(self) -> str:
         """
@@ -240,83 +178,162 @@ class APIUsageTracker:
             )
             return datetime.now().strftime('%Y-%m-%d')
 
-    def record_request(self, api_key: str, error: bool = False) -> bool:
+    def _refresh_counts(self, force: bool = False):
+        """
+        Reload today's request counts from the store if the snapshot is stale.
+
+        Caller must hold _reservation_condition.
+        """
+        now = time.monotonic()
+        fresh = now - self._counts_loaded_at < self.REFRESH_INTERVAL
+        if fresh and not force and self._counts_date is not None:
+            return
+
+        today = self._get_today()
+        try:
+            counts = self.store.get_request_counts(today)
+        except Exception as e:
+            self.logger.warning(f"Could not refresh usage counts, keeping previous snapshot: {e}")
+            self._counts_loaded_at = now
+            return
+
+        if today != self._counts_date:
+            # New quota day - every key starts over
+            self._heap = []
+            self._heap_usage = {}
+
+        self._counts = counts
+        self._counts_date = today
+        self._counts_loaded_at = now
+
+        # Re-rank keys whose usage changed (other processes, resets, a new day)
+        for key in self._key_order:
+            if key not in self._reserved_keys:
+                self._touch(key)
+
+    def _refresh_capacity(self, api_keys: List[str], capacity_wait: Callable[[str], float]):
+        """
+        Re-snapshot when each key regains per-minute capacity if the snapshot is stale.
+
+        capacity_wait may read bucket state from disk, so it runs without
+        _reservation_condition held and by one thread at a time; the others
+        keep ranking keys on the previous snapshot.
+        """
+        with self._reservation_condition:
+            now = time.monotonic()
+            fresh = now - self._capacity_loaded_at < self.REFRESH_INTERVAL
+            if self._capacity_refreshing or (fresh and all(key in self._ready_at for key in api_keys)):
+                return
+            self._capacity_refreshing = True
+
+        ready_at = {}
+        try:
+            for key in api_keys:
+                ready_at[key] = time.time() + capacity_wait(key)
+        finally:
+            with self._reservation_condition:
+                self._ready_at.update(ready_at)
+                self._capacity_loaded_at = now
+                self._capacity_refreshing = False
+
+    def _capacity_wait(self, api_key: str, now: float) -> float:
+        """Seconds until a key regains per-minute capacity, from the snapshot."""
+        return max(0.0, self._ready_at.get(api_key, now) - now)
+
+    def _effective_usage(self, api_key: str) -> int:
+        """Today's requests plus in-flight reservations for a key."""
+        return self._counts.get(self._get_key_hash(api_key), 0) + self._key_usage_counts.get(api_key, 0)
+
+    def _touch(self, api_key: str):
+        """
+        Make the key's heap entry match its current effective usage.
+
+        Caller must hold _reservation_condition.
+        """
+        if api_key not in self._key_order:
+            self._key_order[api_key] = len(self._key_order)
+
+        usage = self._effective_usage(api_key)
+        if self._heap_usage.get(api_key) == usage:
+            return
+
+        self._heap_usage[api_key] = usage
+        heapq.heappush(self._heap, (usage, self._key_order[api_key], api_key))
+
+        # Drop stale entries once they dominate the heap
+        if len(self._heap) > 4 * len(self._heap_usage) + 16:
+            self._heap = [(u, self._key_order[k], k) for k, u in self._heap_usage.items()]
+            heapq.heapify(self._heap)
+
+    def record_request(self, api_key: str, error: bool = False, tokens: int = 0) -> bool:
         """
         Record an API request for a key.
 
         Args:
             api_key: The API key that was used
             error: Whether the request resulted in an error
+            tokens: Tokens the request used (usage_metadata.total_token_count)
 
         Returns:
             True if recorded successfully
         """
-        usage_file = self._get_usage_file(api_key)
-        key_id = self._get_key_id(api_key)
+        key_hash = self._get_key_hash(api_key)
         today = self._get_today()
-        now = datetime.now().isoformat()
 
         try:
-            # Use exclusive lock for the entire read-modify-write operation (cross-platform)
-            with open(usage_file, 'a+') as f:
-                portalocker.lock(f, portalocker.LOCK_EX)
-                try:
-                    # Read existing data
-                    f.seek(0)
-                    content = f.read()
-
-                    if content:
-                        data = KeyUsageData.from_dict(json.loads(content))
-                    else:
-                        data = KeyUsageData(
-                            key_id=key_id,
-                            key_hash=self._get_key_hash(api_key),
-                            created_at=now,
-                        )
-
-                    # Update daily usage
-                    if today not in data.daily_usage:
-                        data.daily_usage[today] = DailyUsage(date=today)
-
-                    daily = data.daily_usage[today]
-                    daily.request_count += 1
-                    daily.timestamps.append(now)
-                    daily.last_request_at = now
-
-                    if error:
-                        daily.errors += 1
-                        data.total_errors += 1
-
-                    # Update totals
-                    data.total_requests += 1
-                    data.last_used_at = now
-
-                    # Write back
-                    f.seek(0)
-                    f.truncate()
-                    json.dump(data.to_dict(), f, indent=2)
-
-                finally:
-                    portalocker.unlock(f)
-
-            self.logger.debug(
-                f"Recorded request for key ...{key_id} "
-                f"(today: {data.daily_usage[today].request_count}/{self.limits.DAILY_LIMIT_PER_KEY})"
+            count = self.store.add(
+                key_hash, self._get_key_id(api_key), today, datetime.now().isoformat(),
+                requests=1, errors=int(error), tokens=tokens
             )
-            return True
-
         except Exception as e:
             self.logger.error(f"Failed to record request: {e}")
             return False
 
+        with self._reservation_condition:
+            if today == self._counts_date:
+                self._counts[key_hash] = count
+                if api_key in self._key_order and api_key not in self._reserved_keys:
+                    self._touch(api_key)
+
+        self.logger.debug(
+            f"Recorded request for key ...{self._get_key_id(api_key)} "
+            f"(today: {count}/{self.limits.DAILY_LIMIT_PER_KEY})"
+        )
+        return True
+
+    def record_cache_hit(self, api_key: str, tokens_saved: int = 0) -> bool:
+        """
+        Record a response served from the response cache.
+
+        No request reached the API, so the key's request count and token
+        totals (which drive its quotas) are left untouched.
+
+        Args:
+            api_key: The API key the call would have used
+            tokens_saved: Tokens the cached response originally cost
+
+        Returns:
+            True if recorded successfully
+        """
+        try:
+            self.store.add(
+                self._get_key_hash(api_key), self._get_key_id(api_key), self._get_today(),
+                datetime.now().isoformat(), cache_hits=1, tokens_saved=tokens_saved
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to record cache hit: {e}")
+            return False
+        return True
+
     def get_usage_today(self, api_key: str) -> int:
         """Get today's request count for a key."""
-        data = self._load_usage_data(api_key)
-        today = self._get_today()
+        with self._reservation_condition:
+            self._refresh_counts()
+            return self._counts.get(self._get_key_hash(api_key), 0)
 
-        if today in data.daily_usage:
-            return data.daily_usage[today].request_count
-        return 0
+    def get_tokens_today(self, api_key: str) -> int:
+        """Get today's token count for a key."""
+        return self.store.get_day(self._get_key_hash(api_key), self._get_today())['tokens']
 
     def get_remaining_today(self, api_key: str) -> int:
         """Get remaining requests for a key today."""
@@ -349,16 +366,18 @@ class APIUsageTracker:
         best_key = None
         min_usage = float('inf')
 
-        for key in api_keys:
-            usage = self.get_usage_today(key)
+        with self._reservation_condition:
+            self._refresh_counts()
+            for key in api_keys:
+                usage = self._counts.get(self._get_key_hash(key), 0)
 
-            # Skip exhausted keys
-            if usage >= self.limits.DAILY_LIMIT_PER_KEY:
-                continue
+                # Skip exhausted keys
+                if usage >= self.limits.DAILY_LIMIT_PER_KEY:
+                    continue
 
-            if usage < min_usage:
-                min_usage = usage
-                best_key = key
+                if usage < min_usage:
+                    min_usage = usage
+                    best_key = key
 
         if best_key:
             key_id = self._get_key_id(best_key)
@@ -368,20 +387,87 @@ class APIUsageTracker:
 
         return best_key
 
-    def reserve_and_get_key(self, api_keys: List[str], wait_timeout: float = 0) -> Optional[str]:
+    def _pop_best_key(self, api_keys: List[str], by_capacity: bool) -> Optional[str]:
+        """
+        Pop the best unreserved, unexhausted key off the heap.
+
+        Keys come off in (effective usage, first seen) order. Without
+        by_capacity the first valid one wins; with it, the first one whose
+        rounded wait in the capacity snapshot is zero does - the same key
+        the full (wait, usage) ranking would pick.
+
+        Caller must hold _reservation_condition.
+        """
+        now = time.time()
+        wanted = set(api_keys)
+        for key in api_keys:
+            if key not in self._key_order:
+                self._touch(key)
+
+        set_aside = []
+        delayed = []  # (wait, usage, first_seen, key)
+        best_key = None
+
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            usage, order, key = entry
+            if self._heap_usage.get(key) != usage:
+                continue  # Stale entry
+
+            if key not in wanted:
+                set_aside.append(entry)
+                continue
+
+            if usage >= self.limits.DAILY_LIMIT_PER_KEY:
+                # Exhausted - re-added by the next refresh if its count drops
+                del self._heap_usage[key]
+                continue
+
+            if by_capacity:
+                # Round the wait so keys that are free now tie and fall back to usage
+                wait = round(self._capacity_wait(key, now), 1)
+                if wait > 0:
+                    delayed.append((wait, usage, order, key))
+                    set_aside.append(entry)
+                    continue
+
+            best_key = key
+            break
+
+        if best_key is None and delayed:
+            best_key = min(delayed)[3]
+
+        for entry in set_aside:
+            if entry[2] != best_key:
+                heapq.heappush(self._heap, entry)
+
+        return best_key
+
+    def reserve_and_get_key(
+        self,
+        api_keys: List[str],
+        wait_timeout: float = 0,
+        capacity_wait: Optional[Callable[[str], float]] = None
+    ) -> Optional[str]:
         """
         Atomically reserve and return the best available API key.
 
         This is the RECOMMENDED method for parallel/batch operations.
         It ensures each thread gets a different key by:
         1. Locking the reservation mutex
-        2. Finding the least-used key that isn't currently reserved
+        2. Finding the best key that isn't currently reserved - the one with
+           the earliest free quota when capacity_wait is given, otherwise
+           (and on ties) the least-used one - from the in-memory key heap
         3. If no key available and wait_timeout > 0, waiting for one to be released
         4. Reserving it before releasing the lock
 
         Args:
             api_keys: List of API keys to choose from
             wait_timeout: Seconds to wait for a key to become available (0 = no wait)
+            capacity_wait: Optional callable returning seconds until a key has
+                per-minute quota again (e.g. KeyScheduler.time_until_available).
+                Called outside the lock at most once per key per
+                REFRESH_INTERVAL; keys are ranked on that snapshot.
 
         Returns:
             Reserved API key, or None if no keys available (after timeout)
@@ -394,40 +480,26 @@ class APIUsageTracker:
 
         deadline = time.time() + wait_timeout if wait_timeout > 0 else 0
 
-        with self._reservation_condition:
-            while True:
-                # Try to find the best available key
-                best_key = None
-                min_usage = float('inf')
-
-                for key in api_keys:
-                    # Skip keys already reserved by other threads
-                    if key in self._reserved_keys:
-                        continue
+        while True:
+            if capacity_wait:
+                self._refresh_capacity(api_keys, capacity_wait)
 
-                    usage = self.get_usage_today(key)
-
-                    # Also consider in-flight requests not yet recorded
-                    in_flight = self._key_usage_counts.get(key, 0)
-                    effective_usage = usage + in_flight
-
-                    # Skip exhausted keys
-                    if effective_usage >= self.limits.DAILY_LIMIT_PER_KEY:
-                        continue
-
-                    if effective_usage < min_usage:
-                        min_usage = effective_usage
-                        best_key = key
+            with self._reservation_condition:
+                self._refresh_counts()
+                best_key = self._pop_best_key(api_keys, capacity_wait is not None)
 
                 if best_key:
-                    # Reserve the key
+                    effective_usage = self._effective_usage(best_key)
+
+                    # Reserve the key (reserved keys stay off the heap until released)
                     self._reserved_keys.add(best_key)
                     self._key_usage_counts[best_key] = self._key_usage_counts.get(best_key, 0) + 1
+                    self._heap_usage.pop(best_key, None)
 
                     key_id = self._get_key_id(best_key)
                     self.logger.info(
                         f"Reserved key ...{key_id} "
-                        f"(effective usage: {min_usage}, reserved keys: {len(self._reserved_keys)})"
+                        f"(effective usage: {effective_usage}, reserved keys: {len(self._reserved_keys)})"
                     )
                     return best_key
 
@@ -483,6 +555,9 @@ class APIUsageTracker:
                     if self._key_usage_counts[api_key] <= 0:
                         del self._key_usage_counts[api_key]
 
+                # Back on the heap at its recorded usage
+                self._touch(api_key)
+
                 key_id = self._get_key_id(api_key)
                 self.logger.debug(
                     f"Released key ...{key_id} "
@@ -513,28 +588,31 @@ class APIUsageTracker:
         """
         stats = {}
         today = self._get_today()
+        limit = self.limits.DAILY_LIMIT_PER_KEY
 
         for key in api_keys:
-            data = self._load_usage_data(key)
+            key_hash = self._get_key_hash(key)
             key_id = self._get_key_id(key)
-
-            today_usage = data.daily_usage.get(today, DailyUsage(date=today))
+            today_usage = self.store.get_day(key_hash, today)
+            totals = self.store.get_totals(key_hash) or {}
+            used = today_usage['request_count']
 
             stats[f"...{key_id}"] = {
                 'key_id': key_id,
-                'used_today': today_usage.request_count,
-                'remaining_today': max(0, self.limits.DAILY_LIMIT_PER_KEY - today_usage.request_count),
-                'daily_limit': self.limits.DAILY_LIMIT_PER_KEY,
-                'percentage_used': round(
-                    (today_usage.request_count / self.limits.DAILY_LIMIT_PER_KEY) * 100, 1
-                ),
-                'errors_today': today_usage.errors,
-                'total_requests': data.total_requests,
-                'total_errors': data.total_errors,
-                'last_used': data.last_used_at,
-                'created': data.created_at,
-                'can_make_request': today_usage.request_count < self.limits.DAILY_LIMIT_PER_KEY,
-                'near_limit': today_usage.request_count >= (self.limits.DAILY_LIMIT_PER_KEY * self.limits.WARNING_THRESHOLD),
+                'used_today': used,
+                'remaining_today': max(0, limit - used),
+                'daily_limit': limit,
+                'percentage_used': round((used / limit) * 100, 1),
+                'errors_today': today_usage['errors'],
+                'tokens_today': today_usage['tokens'],
+                'cache_hits_today': today_usage['cache_hits'],
+                'tokens_saved_today': today_usage['tokens_saved'],
+                'total_requests': totals.get('total_requests', 0),
+                'total_errors': totals.get('total_errors', 0),
+                'last_used': totals.get('last_used_at'),
+                'created': totals.get('created_at', datetime.now().isoformat()),
+                'can_make_request': used < limit,
+                'near_limit': used >= (limit * self.limits.WARNING_THRESHOLD),
             }
 
         return stats
@@ -550,29 +628,26 @@ class APIUsageTracker:
         Returns:
             List of daily usage records
         """
-        data = self._load_usage_data(api_key)
-        history = []
-
         # Get date range
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
 
+        recorded = self.store.get_history(
+            self._get_key_hash(api_key),
+            start_date.strftime('%Y-%m-%d'),
+            end_date.strftime('%Y-%m-%d')
+        )
+        history = []
+
         current = start_date
         while current <= end_date:
             date_str = current.strftime('%Y-%m-%d')
-            if date_str in data.daily_usage:
-                daily = data.daily_usage[date_str]
-                history.append({
-                    'date': date_str,
-                    'request_count': daily.request_count,
-                    'errors': daily.errors,
-                })
-            else:
-                history.append({
-                    'date': date_str,
-                    'request_count': 0,
-                    'errors': 0,
-                })
+            daily = recorded.get(date_str, {})
+            history.append({
+                'date': date_str,
+                'request_count': daily.get('request_count', 0),
+                'errors': daily.get('errors', 0),
+            })
             current += timedelta(days=1)
 
         return history
@@ -594,34 +669,11 @@ class APIUsageTracker:
         """
         cutoff = (datetime.now() - timedelta(days=days_to_keep)).strftime('%Y-%m-%d')
 
-        for usage_file in self.usage_dir.glob("usage_*.json"):
-            try:
-                with open(usage_file, 'r+') as f:
-                    portalocker.lock(f, portalocker.LOCK_EX)
-                    try:
-                        data = KeyUsageData.from_dict(json.load(f))
-
-                        # Remove old daily usage entries
-                        dates_to_remove = [
-                            date for date in data.daily_usage.keys()
-                            if date < cutoff
-                        ]
-
-                        for date in dates_to_remove:
-                            del data.daily_usage[date]
-
-                        # Write back
-                        f.seek(0)
-                        f.truncate()
-                        json.dump(data.to_dict(), f, indent=2)
-
-                    finally:
-                        portalocker.unlock(f)
-
-                self.logger.debug(f"Cleaned up old data from {usage_file}")
-
-            except Exception as e:
-                self.logger.warning(f"Failed to clean up {usage_file}: {e}")
+        try:
+            deleted = self.store.delete_before(cutoff)
+            self.logger.debug(f"Cleaned up {deleted} daily usage rows before {cutoff}")
+        except Exception as e:
+            self.logger.warning(f"Failed to clean up old usage data: {e}")
 
     def cleanup_old_records(self, days: int = 90):
         """
@@ -634,15 +686,16 @@ class APIUsageTracker:
 
     def reset_key_usage(self, api_key: str):
         """Reset all usage data for a specific key."""
-        usage_file = self._get_usage_file(api_key)
-        if usage_file.exists():
-            usage_file.unlink()
-            self.logger.info(f"Reset usage for key ...{self._get_key_id(api_key)}")
+        self.store.delete_keys([self._get_key_hash(api_key)])
+        with self._reservation_condition:
+            self._refresh_counts(force=True)
+        self.logger.info(f"Reset usage for key ...{self._get_key_id(api_key)}")
 
     def reset_all_usage(self):
-        """Reset all usage data (delete all usage files)."""
-        for usage_file in self.usage_dir.glob("usage_*.json"):
-            usage_file.unlink()
+        """Reset all usage data."""
+        self.store.delete_keys()
+        with self._reservation_condition:
+            self._refresh_counts(force=True)
         self.logger.info("Reset all API usage data")
 
 
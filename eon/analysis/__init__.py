@@ -9,9 +9,28 @@ from .runner import (
     create_progress_callback,
     create_cancellation_check,
 )
+from .async_engine import AsyncAnalysisEngine, JobOutcome
+from .map_reduce import MapReduceAnalyzer, ChunkNotes, split_filing
+from .workflow_graph import (
+    WorkflowStep,
+    WorkflowGraphExecutor,
+    WorkflowGraphResult,
+    StepCheckpoint,
+    validate_steps,
+)
 
 __all__ = [
     "AnalysisRunner",
     "create_progress_callback",
     "create_cancellation_check",
+    "AsyncAnalysisEngine",
+    "JobOutcome",
+    "MapReduceAnalyzer",
+    "ChunkNotes",
+    "split_filing",
+    "WorkflowStep",
+    "WorkflowGraphExecutor",
+    "WorkflowGraphResult",
+    "StepCheckpoint",
+    "validate_steps",
 ]
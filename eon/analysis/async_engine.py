@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Event-loop driven analysis of many company-years.
+
+The threaded paths hold one OS thread per in-flight analysis while it
+waits for key quota and for Gemini. AsyncAnalysisEngine runs every
+company-year as a coroutine on one event loop instead: each job picks the
+key whose quota frees up soonest (optionally only among keys the caller
+has reserved), gets a pooled AsyncGeminiProvider and
+awaits its calls, so hundreds of analyses can be in flight while the
+request queue keeps every key within its RPM/TPM quota.
+
+AnalysisService uses it to fan a company's years out when
+EON_YEAR_CONCURRENCY > 1 (perspective and custom workflow analyses).
+
+Usage:
+    engine = AsyncAnalysisEngine(key_manager, rate_limiter, max_in_flight=200)
+    outcomes = engine.analyze_workflow(workflow, {("AAPL", 2024): text, ...})
+    for (ticker, year), outcome in outcomes.items():
+        if outcome.success:
+            save(ticker, year, outcome.result)
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from eon.core import get_logger, get_config
+from eon.core.exceptions import KeyQuotaExhaustedError
+from eon.ai import APIKeyManager, RateLimiter
+from eon.ai.providers import LLMProvider, get_async_gemini_provider
+
+# A job receives the provider for the key it was given
+JobFunc = Callable[[LLMProvider], Awaitable[Any]]
+
+
+@dataclass
+class JobOutcome:
+    """Result (or error) of one engine job."""
+    key: Hashable
+    result: Any = None
+    error: Optional[Exception] = None
+    seconds: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class AsyncAnalysisEngine:
+    """
+    Runs analysis jobs concurrently on one event loop.
+
+    Example:
+        engine = AsyncAnalysisEngine(key_manager, rate_limiter)
+        outcomes = engine.run([
+            ("AAPL", lambda provider: provider.generate_with_retry_async(prompt, schema=S)),
+        ])
+    """
+
+    def __init__(
+        self,
+        api_key_manager: APIKeyManager,
+        rate_limiter: Optional[RateLimiter] = None,
+        model: Optional[str] = None,
+        thinking_budget: Optional[int] = None,
+        max_in_flight: int = 100,
+        provider_factory: Optional[Callable[[str], LLMProvider]] = None,
+        api_keys: Optional[Sequence[str]] = None
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            api_key_manager: Manager for the API keys jobs are spread across
+            rate_limiter: Rate limiter whose tracker records usage
+            model: LLM model name (default from config)
+            thinking_budget: Thinking budget (default from config)
+            max_in_flight: Jobs running at the same time
+            provider_factory: Builds the provider for a key (default: pooled
+                AsyncGeminiProvider)
+            api_keys: Keys jobs may run on, e.g. ones the caller reserved
+                (default: any key under its daily limit)
+        """
+        config = get_config()
+        self.api_key_manager = api_key_manager
+        self.rate_limiter = rate_limiter
+        self.model = model or config.default_model
+        self.thinking_budget = thinking_budget or config.thinking_budget
+        self.max_in_flight = max(1, max_in_flight)
+        self.provider_factory = provider_factory or self._pooled_provider
+        self.api_keys: Optional[List[str]] = list(api_keys) if api_keys else None
+
+        self.logger = get_logger(f"{__name__}.AsyncAnalysisEngine")
+
+    def run(
+        self,
+        jobs: Iterable[Tuple[Hashable, JobFunc]],
+        on_outcome: Optional[Callable[[JobOutcome], None]] = None
+    ) -> Dict[Hashable, JobOutcome]:
+        """
+        Run jobs to completion (blocking entry point).
+
+        Args:
+            jobs: (key, job) pairs; job(provider) returns an awaitable
+            on_outcome: Called on the calling thread as each job finishes (see run_async)
+
+        Returns:
+            Mapping of key -> JobOutcome
+        """
+        return asyncio.run(self.run_async(jobs, on_outcome))
+
+    async def run_async(
+        self,
+        jobs: Iterable[Tuple[Hashable, JobFunc]],
+        on_outcome: Optional[Callable[[JobOutcome], None]] = None
+    ) -> Dict[Hashable, JobOutcome]:
+        """
+        Run jobs on the current event loop, at most max_in_flight at a time.
+
+        A failing job is recorded in its outcome and does not stop the others.
+        If on_outcome raises, the jobs still waiting or running are cancelled
+        and the exception propagates.
+
+        Args:
+            jobs: (key, job) pairs; job(provider) returns an awaitable
+            on_outcome: Called with each JobOutcome as its job finishes
+
+        Returns:
+            Mapping of key -> JobOutcome
+        """
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+
+        async def bounded(key: Hashable, job: JobFunc) -> JobOutcome:
+            async with in_flight:
+                return await self._run_job(key, job)
+
+        began = time.perf_counter()
+        tasks = [asyncio.ensure_future(bounded(key, job)) for key, job in jobs]
+        outcomes = []
+        try:
+            for finished in asyncio.as_completed(tasks):
+                outcome = await finished
+                outcomes.append(outcome)
+                if on_outcome is not None:
+                    on_outcome(outcome)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        succeeded = sum(1 for outcome in outcomes if outcome.success)
+        self.logger.info(
+            f"Completed {succeeded}/{len(outcomes)} analyses in {time.perf_counter() - began:.1f}s "
+            f"(max {self.max_in_flight} in flight)"
+        )
+        return {outcome.key: outcome for outcome in outcomes}
+
+    def analyze_workflow(self, workflow, filings: Dict[Tuple[str, int], str]) -> Dict[Hashable, JobOutcome]:
+        """
+        Run a CustomWorkflow over many (ticker, year) filings.
+
+        Args:
+            workflow: CustomWorkflow instance
+            filings: Mapping of (ticker, year) -> extracted filing text
+
+        Returns:
+            Mapping of (ticker, year) -> JobOutcome whose result is the
+            workflow's schema instance
+        """
+        def job(ticker: str, year: int, text: str) -> JobFunc:
+            return lambda provider: workflow.analyze_async(ticker, year, text, provider)
+
+        return self.run(
+            ((ticker, year), job(ticker, year, text)) for (ticker, year), text in filings.items()
+        )
+
+    async def _run_job(self, key: Hashable, job: JobFunc) -> JobOutcome:
+        began = time.perf_counter()
+        try:
+            # pick_key takes the scheduler's file locks - keep them off the loop
+            pick_kwargs = {'keys': self.api_keys} if self.api_keys else {}
+            api_key = await asyncio.to_thread(self.api_key_manager.pick_key, **pick_kwargs)
+            if api_key is None:
+                raise KeyQuotaExhaustedError("All API keys have exhausted their daily quota.")
+            result = await job(self.provider_factory(api_key))
+            return JobOutcome(key, result=result, seconds=time.perf_counter() - began)
+        except Exception as e:
+            self.logger.warning(f"Analysis {key} failed: {e}")
+            return JobOutcome(key, error=e, seconds=time.perf_counter() - began)
+
+    def _pooled_provider(self, api_key: str) -> LLMProvider:
+        return get_async_gemini_provider(
+            api_key=api_key,
+            model=self.model,
+            thinking_budget=self.thinking_budget,
+            rate_limiter=self.rate_limiter,
+        )
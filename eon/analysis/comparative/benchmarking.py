@@ -17,7 +17,7 @@ from typing import Optional, Dict, Any, Union
 
 from eon.core import get_logger, get_config, AnalysisError
 from eon.ai import APIKeyManager, RateLimiter
-from eon.ai.providers import GeminiProvider
+from eon.ai.providers import get_gemini_provider
 from eon.analysis.fundamental.models.success_factors import CompanySuccessFactors
 from eon.analysis.fundamental.models.excellent_company_factors import ExcellentCompanyFactors
 from .models.benchmark_comparison import BenchmarkComparison
@@ -206,8 +206,8 @@ class BenchmarkComparator:
         try:
             self.logger.debug(f"Using API key: {api_key[:10]}...")
 
-            # Create provider with rate limiter
-            provider = GeminiProvider(
+            # Get a pooled provider (reuses the key's warm HTTP connections)
+            provider = get_gemini_provider(
                 api_key=api_key,
                 model=self.model,
                 thinking_budget=self.thinking_budget,
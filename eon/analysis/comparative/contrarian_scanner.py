@@ -13,7 +13,7 @@ from pydantic import BaseModel, Field
 
 from eon.core import get_logger, AnalysisError
 from eon.ai import APIKeyManager, RateLimiter
-from eon.ai.providers.gemini import GeminiProvider
+from eon.ai.providers import get_gemini_provider
 
 logger = get_logger(__name__)
 
@@ -187,7 +187,7 @@ Return ONLY a valid JSON object with NO additional text before or after.
                 return None
 
             try:
-                provider = GeminiProvider(
+                provider = get_gemini_provider(
                     api_key=api_key,
                     rate_limiter=self.rate_limiter
                 )
@@ -12,11 +12,12 @@ from pathlib import Path
 from typing import Optional, Type, Dict, List
 from pydantic import BaseModel
 
-from eon.core import get_logger, get_config, AnalysisError, ExtractionError, mask_api_key
-from eon.data.sources.sec import PDFExtractor
+from eon.core import get_logger, get_config, AnalysisError, ExtractionError, mask_api_key, IExtractor
+from eon.data.sources.sec import HTMLExtractor, CachingExtractor
 from eon.ai import APIKeyManager, RateLimiter
-from eon.ai.providers import GeminiProvider
+from eon.ai.providers import get_gemini_provider
 from eon.ai.prompts.fundamental import DEFAULT_10K_PROMPT, format_prompt
+from ..map_reduce import MapReduceAnalyzer
 from .schemas import TenKAnalysis
 
 
@@ -54,7 +55,8 @@ class FundamentalAnalyzer:
         model: str = None,
         thinking_budget: int = None,
         use_structured_output: bool = True,
-        api_key: str = None
+        api_key: str = None,
+        extractor: Optional[IExtractor] = None
     ):
         """
         Initialize the fundamental analyzer.
@@ -66,6 +68,9 @@ class FundamentalAnalyzer:
             thinking_budget: Thinking budget (default from config)
             use_structured_output: Use Pydantic structured output
             api_key: Optional pre-reserved API key (for batch queue optimization)
+            extractor: Filing text extractor (defaults to HTMLExtractor, which
+                also reads PDFs, behind the shared extracted-text cache
+                unless config.enable_caching is off)
         """
         self.api_key_manager = api_key_manager
         self.rate_limiter = rate_limiter
@@ -77,8 +82,15 @@ class FundamentalAnalyzer:
         self.model = model or config.default_model
         self.thinking_budget = thinking_budget or config.thinking_budget
 
-        # Initialize PDF extractor
-        self.pdf_extractor = PDFExtractor()
+        # Initialize filing text extractor
+        if extractor is None:
+            extractor = HTMLExtractor()
+            if config.enable_caching:
+                extractor = CachingExtractor(extractor)
+        self.pdf_extractor = extractor
+
+        # Fallback for filings longer than the model context
+        self.map_reducer = MapReduceAnalyzer(api_key_manager)
 
         # Logger
         self.logger = get_logger(f"{__name__}.FundamentalAnalyzer")
@@ -133,7 +145,7 @@ class FundamentalAnalyzer:
             # Stage 3: AI analysis with schema
             self.logger.debug(f"Stage 3: Running AI analysis")
             schema = schema or TenKAnalysis
-            result = self._analyze_with_ai(prompt, schema)
+            result = self._analyze_with_ai(prompt, text, schema)
 
             # Stage 4: Save results (optional)
             if output_dir and result:
@@ -233,7 +245,7 @@ class FundamentalAnalyzer:
         custom_prompt: Optional[str] = None
     ) -> str:
         """
-        Construct full prompt with company context and content.
+        Construct the prompt with company context (the content is appended when sent).
 
         Args:
             ticker: Company ticker
@@ -242,7 +254,7 @@ class FundamentalAnalyzer:
             custom_prompt: Optional custom prompt template
 
         Returns:
-            Complete prompt string
+            Formatted prompt string
         """
         # Use custom or default prompt template
         prompt_template = custom_prompt or DEFAULT_10K_PROMPT
@@ -250,31 +262,29 @@ class FundamentalAnalyzer:
         # Format with company name and year
         formatted_prompt = format_prompt(prompt_template, ticker, year)
 
-        # Append the filing content
-        full_prompt = (
-            f"{formatted_prompt}\n\n"
-            f"Here's the 10-K content to analyze:\n\n"
-            f"{content}"
-        )
-
-        token_estimate = len(full_prompt) // 4
+        total_chars = len(formatted_prompt) + len(content)
         self.logger.debug(
-            f"Constructed prompt: {len(full_prompt):,} chars "
-            f"(~{token_estimate:,} tokens)"
+            f"Constructed prompt: {total_chars:,} chars with content "
+            f"(~{total_chars // 4:,} tokens)"
         )
 
-        return full_prompt
+        return formatted_prompt
 
     def _analyze_with_ai(
         self,
         prompt: str,
+        content: str,
         schema: Type[BaseModel]
     ) -> Optional[BaseModel]:
         """
         Run AI analysis with structured output.
 
+        A filing too long for the model context is analyzed in chunks
+        spread over the available keys, then reduced into the schema.
+
         Args:
-            prompt: Complete prompt
+            prompt: Formatted prompt
+            content: Filing text to analyze
             schema: Pydantic schema for output
 
         Returns:
@@ -298,20 +308,21 @@ class FundamentalAnalyzer:
             masked_key = mask_api_key(api_key)
             self.logger.debug(f"Using reserved API key: {masked_key}")
 
-            # Create provider with rate limiter
-            provider = GeminiProvider(
+            # Get a pooled provider (reuses the key's warm HTTP connections)
+            provider = get_gemini_provider(
                 api_key=api_key,
                 model=self.model,
                 thinking_budget=self.thinking_budget,
                 rate_limiter=self.rate_limiter
             )
 
-            # Generate with retry
-            result = provider.generate_with_retry(
-                prompt=prompt,
+            # Generate with retry (map-reduce if the filing is too long)
+            result = self.map_reducer.generate(
+                provider,
+                prompt,
+                content,
                 schema=schema if self.use_structured_output else None,
-                max_retries=3,
-                retry_delay=10
+                text_label="Here's the 10-K content to analyze:"
             )
             # Usage is recorded by GeminiProvider.generate() — do not double-count
 
@@ -26,7 +26,7 @@ from pydantic import BaseModel
 
 from eon.core import get_logger, get_config, AnalysisError, mask_api_key
 from eon.ai import APIKeyManager, RateLimiter
-from eon.ai.providers import GeminiProvider
+from eon.ai.providers import get_gemini_provider
 from .models.success_factors import CompanySuccessFactors
 from .models.excellent_company_factors import ExcellentCompanyFactors
 from .prompts.success_factors import SUCCESS_FACTORS_PROMPT
@@ -307,8 +307,8 @@ class _BaseSuccessAnalyzer:
             masked_key = mask_api_key(api_key)
             self.logger.debug(f"Using reserved API key: {masked_key}")
 
-            # Create provider with rate limiter
-            provider = GeminiProvider(
+            # Get a pooled provider (reuses the key's warm HTTP connections)
+            provider = get_gemini_provider(
                 api_key=api_key,
                 model=self.model,
                 thinking_budget=self.thinking_budget,
@@ -0,0 +1,449 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Map-reduce fallback for filings that exceed the model context.
+
+Large-cap 10-Ks can be longer than the model accepts, and a request
+classified as ContextLengthExceededError used to fail the whole year.
+MapReduceAnalyzer first tries the normal single call; when it is too
+long, the filing is split into token-bounded chunks on section
+boundaries, each chunk gets an extraction pass (run concurrently, spread
+over the available keys), and the per-chunk notes are reduced into the
+requested schema with one final call.
+
+Usage:
+    analyzer = MapReduceAnalyzer(api_key_manager)
+    result = analyzer.generate(provider, instructions, filing_text, schema=TenKAnalysis)
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Type
+
+from pydantic import BaseModel, Field
+
+from eon.core import get_logger, get_config
+from eon.core.exceptions import ContextLengthExceededError
+from eon.ai import APIKeyManager
+from eon.ai.providers import LLMProvider, provider_for_free_key
+from eon.ai.token_estimator import get_token_estimator
+from eon.data.sources.sec.sections import get_section_cache
+
+# How a filing is introduced in single-call prompts
+DEFAULT_TEXT_LABEL = "Here's the filing content:"
+
+# Reduce rounds before the notes are sent as they are
+MAX_REDUCE_DEPTH = 3
+
+# A chunk still too long for the model is halved down to this size
+_MIN_CHUNK_CHARS = 20_000
+
+MAP_PROMPT = """You are assisting with the analysis described below. The filing is too long to read in one pass, so you are reading part {index} of {total} ({label}).
+
+ANALYSIS THIS PART FEEDS INTO:
+{instructions}
+
+From THIS PART ONLY, extract everything the analysis above will need: facts, figures (with units and periods), trends, risks, management statements, and anything unusual or contradictory. Quote numbers exactly as written. Do not write the final analysis, and do not guess about parts of the filing you cannot see.
+"""
+
+REDUCE_PREAMBLE = """The filing was too long to send in one request, so it was read in {total} parts and the notes below were extracted from each part. Base your analysis on these notes; treat them as the filing content."""
+
+
+class ChunkNotes(BaseModel):
+    """Extraction-pass output for one chunk of a filing."""
+    summary: str = Field(description="What this part of the filing covers, in 2-3 sentences")
+    facts: List[str] = Field(
+        default_factory=list,
+        description="Facts, risks and statements relevant to the analysis, one per item"
+    )
+    figures: List[str] = Field(
+        default_factory=list,
+        description="Figures with units and periods, e.g. 'Net sales FY2024: $391.0B (+2% YoY)'"
+    )
+
+
+@dataclass
+class FilingChunk:
+    """A token-bounded slice of a filing."""
+    label: str      # "Items 1, 1A" / "Item 8 (part 2 of 3)"
+    text: str
+
+
+def split_filing(text: str, max_chars: int) -> List[FilingChunk]:
+    """
+    Split filing text into chunks of at most max_chars.
+
+    Consecutive item sections are packed together while they fit; a
+    section larger than a chunk is split on paragraph, then line,
+    boundaries. Text without recognizable sections is split the same way.
+
+    Args:
+        text: Extracted filing text
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        Chunks in filing order
+    """
+    index = get_section_cache().get_index(text)
+
+    # (label, text) for the preamble and each section
+    segments = []
+    if index.sections:
+        first = index.sections[0].start
+        if text[:first].strip():
+            segments.append(("cover", text[:first]))
+        for section in index.sections:
+            segments.append((f"Item {section.key}", text[section.start:section.end]))
+    else:
+        segments.append(("filing", text))
+
+    chunks: List[FilingChunk] = []
+    labels: List[str] = []
+    parts: List[str] = []
+    size = 0
+
+    def flush():
+        nonlocal labels, parts, size
+        if parts:
+            chunks.append(FilingChunk(label=_join_labels(labels), text="".join(parts)))
+        labels, parts, size = [], [], 0
+
+    for label, segment in segments:
+        if len(segment) > max_chars:
+            flush()
+            pieces = _split_text(segment, max_chars)
+            for i, piece in enumerate(pieces, 1):
+                chunks.append(FilingChunk(label=f"{label} (part {i} of {len(pieces)})", text=piece))
+            continue
+        if size + len(segment) > max_chars:
+            flush()
+        labels.append(label)
+        parts.append(segment)
+        size += len(segment)
+    flush()
+
+    return chunks
+
+
+def _join_labels(labels: List[str]) -> str:
+    items = [label[len("Item "):] for label in labels if label.startswith("Item ")]
+    others = [label for label in labels if not label.startswith("Item ")]
+    if items:
+        others.append(("Item " if len(items) == 1 else "Items ") + ", ".join(items))
+    return ", ".join(others)
+
+
+def _split_text(text: str, max_chars: int) -> List[str]:
+    """Split text into pieces of at most max_chars on the coarsest boundary available."""
+    for separator in ("\n\n", "\n", ". "):
+        units = text.split(separator)
+        units = [unit + separator for unit in units[:-1]] + units[-1:]
+        if all(len(unit) <= max_chars for unit in units):
+            break
+    else:
+        return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+    pieces: List[str] = []
+    current = ""
+    for unit in units:
+        if current and len(current) + len(unit) > max_chars:
+            pieces.append(current)
+            current = ""
+        current += unit
+    if current.strip():
+        pieces.append(current)
+    return pieces
+
+
+class MapReduceAnalyzer:
+    """
+    Runs an analysis as one call, or in map-reduce passes when the filing is too long.
+
+    Chunk extraction calls run concurrently. With Gemini providers each
+    chunk goes to the key whose quota frees up soonest (keys are picked,
+    not reserved, like the async engine); other providers run every chunk
+    through the provider they were given.
+
+    Example:
+        analyzer = MapReduceAnalyzer(key_manager)
+        result = analyzer.generate(provider, prompt, text, schema=BuffettAnalysis)
+
+        # Offline, with a fake provider
+        result = MapReduceAnalyzer(chunk_tokens=5_000).map_reduce(
+            LocalProvider(responder), prompt, text, schema=BuffettAnalysis
+        )
+    """
+
+    def __init__(
+        self,
+        api_key_manager: Optional[APIKeyManager] = None,
+        chunk_tokens: Optional[int] = None,
+        max_workers: int = 8,
+        max_retries: int = 3,
+        retry_delay: int = 10
+    ):
+        """
+        Initialize the analyzer.
+
+        Args:
+            api_key_manager: Keys to spread chunk calls over (default: the
+                configured keys, for Gemini providers)
+            chunk_tokens: Input tokens per chunk (default from config)
+            max_workers: Maximum concurrent chunk calls
+            max_retries: Retries per call (passed to generate_with_retry)
+            retry_delay: Default seconds between retries
+        """
+        self.api_key_manager = api_key_manager
+        self._chunk_tokens = chunk_tokens
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self.logger = get_logger(f"{__name__}.MapReduceAnalyzer")
+
+    @property
+    def chunk_tokens(self) -> int:
+        """Input tokens per chunk (read from config on first use)."""
+        if self._chunk_tokens is None:
+            self._chunk_tokens = get_config().map_reduce_chunk_tokens
+        return self._chunk_tokens
+
+    # ---- single call with fallback --------------------------------------
+
+    def generate(
+        self,
+        provider: LLMProvider,
+        instructions: str,
+        text: str,
+        schema: Optional[Type[BaseModel]] = None,
+        text_label: str = DEFAULT_TEXT_LABEL
+    ) -> BaseModel:
+        """
+        Analyze text in one call, falling back to map-reduce if it is too long.
+
+        Args:
+            provider: Provider for the single call (and the reduce call)
+            instructions: Formatted analysis prompt, without the filing
+            text: Filing text
+            schema: Pydantic schema for the result
+            text_label: Line introducing the filing in the single-call prompt
+
+        Returns:
+            Validated schema instance (dict without a schema)
+
+        Raises:
+            AIProviderError: If the analysis fails
+        """
+        try:
+            return provider.generate_with_retry(
+                prompt=f"{instructions}\n\n{text_label}\n\n{text}",
+                schema=schema,
+                max_retries=self.max_retries,
+                retry_delay=self.retry_delay,
+            )
+        except ContextLengthExceededError as e:
+            self.logger.warning(f"Filing exceeds model context ({len(text):,} chars), using map-reduce: {e}")
+        return self.map_reduce(provider, instructions, text, schema)
+
+    async def generate_async(
+        self,
+        provider: LLMProvider,
+        instructions: str,
+        text: str,
+        schema: Optional[Type[BaseModel]] = None,
+        text_label: str = DEFAULT_TEXT_LABEL
+    ) -> BaseModel:
+        """Async variant of generate()."""
+        try:
+            return await provider.generate_with_retry_async(
+                prompt=f"{instructions}\n\n{text_label}\n\n{text}",
+                schema=schema,
+                max_retries=self.max_retries,
+                retry_delay=self.retry_delay,
+            )
+        except ContextLengthExceededError as e:
+            self.logger.warning(f"Filing exceeds model context ({len(text):,} chars), using map-reduce: {e}")
+        return await self.map_reduce_async(provider, instructions, text, schema)
+
+    # ---- map-reduce -----------------------------------------------------
+
+    def map_reduce(
+        self,
+        provider: LLMProvider,
+        instructions: str,
+        text: str,
+        schema: Optional[Type[BaseModel]] = None
+    ) -> BaseModel:
+        """
+        Analyze text in chunks and reduce the notes into the schema.
+
+        Args:
+            provider: Provider for the reduce call (and chunks, without other keys)
+            instructions: Formatted analysis prompt, without the filing
+            text: Filing text
+            schema: Pydantic schema for the result
+
+        Returns:
+            Validated schema instance (dict without a schema)
+
+        Raises:
+            AIProviderError: If any chunk or the reduce call fails
+        """
+        notes = text
+        total = 0
+        for depth in range(MAX_REDUCE_DEPTH):
+            chunks = self._split(notes, provider)
+            if depth and len(chunks) == 1:
+                break
+            total = len(chunks)
+            self.logger.info(f"Map-reduce pass {depth + 1}: {total} chunks")
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as executor:
+                results = list(executor.map(
+                    lambda args: self._map_chunk(provider, instructions, *args),
+                    [(chunk, i, total) for i, chunk in enumerate(chunks, 1)],
+                ))
+            notes = self._format_notes(chunks, results)
+            if len(chunks) == 1:
+                break
+
+        return provider.generate_with_retry(
+            prompt=self._reduce_prompt(instructions, notes, total),
+            schema=schema,
+            max_retries=self.max_retries,
+            retry_delay=self.retry_delay,
+        )
+
+    async def map_reduce_async(
+        self,
+        provider: LLMProvider,
+        instructions: str,
+        text: str,
+        schema: Optional[Type[BaseModel]] = None
+    ) -> BaseModel:
+        """Async variant of map_reduce(); chunk calls are awaited concurrently."""
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run(chunk: FilingChunk, index: int, total: int) -> ChunkNotes:
+            async with semaphore:
+                return await self._map_chunk_async(provider, instructions, chunk, index, total)
+
+        notes = text
+        total = 0
+        for depth in range(MAX_REDUCE_DEPTH):
+            chunks = self._split(notes, provider)
+            if depth and len(chunks) == 1:
+                break
+            total = len(chunks)
+            self.logger.info(f"Map-reduce pass {depth + 1}: {total} chunks")
+            results = await asyncio.gather(*(
+                run(chunk, i, total) for i, chunk in enumerate(chunks, 1)
+            ))
+            notes = self._format_notes(chunks, results)
+            if len(chunks) == 1:
+                break
+
+        return await provider.generate_with_retry_async(
+            prompt=self._reduce_prompt(instructions, notes, total),
+            schema=schema,
+            max_retries=self.max_retries,
+            retry_delay=self.retry_delay,
+        )
+
+    def _map_chunk(
+        self,
+        provider: LLMProvider,
+        instructions: str,
+        chunk: FilingChunk,
+        index: int,
+        total: int
+    ) -> ChunkNotes:
+        """Run the extraction pass for one chunk, halving it if it is still too long."""
+        chunk_provider = provider_for_free_key(provider, self.api_key_manager, self.chunk_tokens)
+        try:
+            return chunk_provider.generate_with_retry(
+                prompt=self._map_prompt(instructions, chunk, index, total),
+                schema=ChunkNotes,
+                max_retries=self.max_retries,
+                retry_delay=self.retry_delay,
+            )
+        except ContextLengthExceededError:
+            halves = self._halve(chunk)
+            if not halves:
+                raise
+            return self._merge_notes([
+                self._map_chunk(provider, instructions, half, index, total) for half in halves
+            ])
+
+    async def _map_chunk_async(
+        self,
+        provider: LLMProvider,
+        instructions: str,
+        chunk: FilingChunk,
+        index: int,
+        total: int
+    ) -> ChunkNotes:
+        """Async variant of _map_chunk()."""
+        # Picking a key takes the scheduler's file locks - keep them off the loop
+        chunk_provider = await asyncio.to_thread(
+            provider_for_free_key, provider, self.api_key_manager, self.chunk_tokens
+        )
+        try:
+            return await chunk_provider.generate_with_retry_async(
+                prompt=self._map_prompt(instructions, chunk, index, total),
+                schema=ChunkNotes,
+                max_retries=self.max_retries,
+                retry_delay=self.retry_delay,
+            )
+        except ContextLengthExceededError:
+            halves = self._halve(chunk)
+            if not halves:
+                raise
+            return self._merge_notes([
+                await self._map_chunk_async(provider, instructions, half, index, total)
+                for half in halves
+            ])
+
+    # ---- helpers --------------------------------------------------------
+
+    def _split(self, text: str, provider: LLMProvider) -> List[FilingChunk]:
+        chars_per_token = get_token_estimator().chars_per_token(provider.model)
+        return split_filing(text, int(self.chunk_tokens * chars_per_token))
+
+    @staticmethod
+    def _halve(chunk: FilingChunk) -> Optional[List[FilingChunk]]:
+        if len(chunk.text) < 2 * _MIN_CHUNK_CHARS:
+            return None
+        pieces = _split_text(chunk.text, len(chunk.text) // 2 + 1)
+        if len(pieces) < 2:
+            return None
+        return [FilingChunk(label=chunk.label, text=piece) for piece in pieces]
+
+    @staticmethod
+    def _merge_notes(notes: List[ChunkNotes]) -> ChunkNotes:
+        return ChunkNotes(
+            summary=" ".join(n.summary for n in notes),
+            facts=[fact for n in notes for fact in n.facts],
+            figures=[figure for n in notes for figure in n.figures],
+        )
+
+    @staticmethod
+    def _map_prompt(instructions: str, chunk: FilingChunk, index: int, total: int) -> str:
+        prompt = MAP_PROMPT.format(index=index, total=total, label=chunk.label, instructions=instructions)
+        return f"{prompt}\n\nPart {index} of {total} ({chunk.label}):\n\n{chunk.text}"
+
+    @staticmethod
+    def _format_notes(chunks: List[FilingChunk], results: List[ChunkNotes]) -> str:
+        blocks = []
+        for i, (chunk, notes) in enumerate(zip(chunks, results, strict=True), 1):
+            lines = [f"PART {i} ({chunk.label})", notes.summary]
+            lines.extend(f"- {fact}" for fact in notes.facts)
+            if notes.figures:
+                lines.append("Figures:")
+                lines.extend(f"- {figure}" for figure in notes.figures)
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
+
+    @staticmethod
+    def _reduce_prompt(instructions: str, notes: str, total: int) -> str:
+        return f"{instructions}\n\n{REDUCE_PREAMBLE.format(total=total)}\n\n{notes}"
@@ -9,22 +9,25 @@ Analyzes companies through:
 - Contrarian View (variant perception)
 """
 
+import asyncio
 from pathlib import Path
-from typing import Optional, Union, Dict
+from typing import Optional, Union, Dict, Tuple
 from pydantic import BaseModel
 
-from eon.core import get_logger, get_config, AnalysisError, mask_api_key
+from eon.core import get_logger, get_config, AnalysisError, mask_api_key, IExtractor
 from eon.core.exceptions import KeyQuotaExhaustedError
-from eon.data.sources.sec import PDFExtractor
+from eon.data.sources.sec import HTMLExtractor, CachingExtractor, select_sections
 from eon.ai import APIKeyManager, RateLimiter
-from eon.ai.providers import GeminiProvider
+from eon.ai.providers import GeminiProvider, get_gemini_provider, get_async_gemini_provider
 from eon.ai.prompts.perspectives import (
     MULTI_PERSPECTIVE_PROMPT,
     BUFFETT_PROMPT,
     TALEB_PROMPT,
     CONTRARIAN_PROMPT,
+    PERSPECTIVE_SECTIONS,
     format_perspective_prompt
 )
+from ..map_reduce import MapReduceAnalyzer
 from .schemas import (
     BuffettAnalysis,
     TalebAnalysis,
@@ -32,6 +35,9 @@ from .schemas import (
     SimplifiedAnalysis
 )
 
+# How the filing is introduced after the perspective prompt
+_TEXT_LABEL = "Here's the 10-K content to analyze:"
+
 
 class PerspectiveAnalyzer:
     """
@@ -59,13 +65,22 @@ class PerspectiveAnalyzer:
         )
     """
 
+    # Perspective name -> (prompt template, output schema)
+    PERSPECTIVES = {
+        "multi": (MULTI_PERSPECTIVE_PROMPT, SimplifiedAnalysis),
+        "buffett": (BUFFETT_PROMPT, BuffettAnalysis),
+        "taleb": (TALEB_PROMPT, TalebAnalysis),
+        "contrarian": (CONTRARIAN_PROMPT, ContrarianAnalysis),
+    }
+
     def __init__(
         self,
         api_key_manager: APIKeyManager,
         rate_limiter: RateLimiter,
         model: str = None,
         thinking_budget: int = None,
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        extractor: Optional[IExtractor] = None
     ):
         """
         Initialize the perspective analyzer.
@@ -75,6 +90,10 @@ class PerspectiveAnalyzer:
             rate_limiter: Rate limiter for API calls
             model: LLM model name (default from config)
             thinking_budget: Thinking budget (default from config)
+            api_key: Optional pre-reserved API key
+            extractor: Filing text extractor (defaults to HTMLExtractor, which
+                also reads PDFs, behind the shared extracted-text cache
+                unless config.enable_caching is off)
         """
         self.api_key_manager = api_key_manager
         self.rate_limiter = rate_limiter
@@ -85,8 +104,15 @@ class PerspectiveAnalyzer:
         self.model = model or config.default_model
         self.thinking_budget = thinking_budget or config.thinking_budget
 
-        # Initialize PDF extractor
-        self.pdf_extractor = PDFExtractor()
+        # Initialize filing text extractor
+        if extractor is None:
+            extractor = HTMLExtractor()
+            if config.enable_caching:
+                extractor = CachingExtractor(extractor)
+        self.pdf_extractor = extractor
+
+        # Fallback for filings longer than the model context
+        self.map_reducer = MapReduceAnalyzer(api_key_manager)
 
         self.logger = get_logger(f"{__name__}.PerspectiveAnalyzer")
 
@@ -260,27 +286,14 @@ class PerspectiveAnalyzer:
             # Extract text from PDF
             self.logger.debug("Extracting text from PDF")
             text = self.pdf_extractor.extract_text(pdf_path)
-
-            if not text or len(text.strip()) < 100:
-                raise AnalysisError(
-                    f"PDF extraction failed or insufficient text "
-                    f"({len(text) if text else 0} chars)"
-                )
-
-            # Construct prompt
-            self.logger.debug("Constructing prompt")
-            formatted_prompt = format_perspective_prompt(
-                prompt_template, ticker, year
-            )
-            full_prompt = (
-                f"{formatted_prompt}\n\n"
-                f"Here's the 10-K content to analyze:\n\n"
-                f"{text}"
+            instructions, text = self._prepare_inputs(
+                text, prompt_template, ticker, year,
+                sections=PERSPECTIVE_SECTIONS.get(perspective_name)
             )
 
             # Run AI analysis
             self.logger.debug(f"Running {perspective_name} analysis with AI")
-            result = self._analyze_with_ai(full_prompt, schema)
+            result = self._analyze_with_ai(instructions, text, schema)
 
             # Save results if requested
             if output_dir and result:
@@ -295,26 +308,120 @@ class PerspectiveAnalyzer:
             return result
 
         except Exception as e:
-            provider_name = GeminiProvider.__name__
-            error_msg = (
-                "AI analysis failed "
-                f"for ticker={ticker} year={year} "
-                f"perspective={perspective_name} "
-                f"provider={provider_name}: {e}"
+            raise self._analysis_error(e, ticker, year, perspective_name) from e
+
+    async def analyze_async(
+        self,
+        pdf_path: Path,
+        ticker: str,
+        year: int,
+        perspective: str = "multi",
+        output_dir: Optional[Path] = None
+    ) -> Optional[BaseModel]:
+        """
+        Async variant of the analyze_* methods, for event-loop driven runs.
+
+        Text extraction runs in a worker thread; the Gemini call is awaited
+        on AsyncGeminiProvider, so many company-years can be in flight on
+        one loop. Keys are picked by available quota rather than reserved
+        exclusively (a pre-reserved key is used as-is).
+
+        Args:
+            pdf_path: Path to PDF file
+            ticker: Company ticker
+            year: Fiscal year
+            perspective: "multi", "buffett", "taleb" or "contrarian"
+            output_dir: Optional directory to save JSON results
+
+        Returns:
+            Analysis result as Pydantic model
+
+        Raises:
+            AnalysisError: If analysis fails
+        """
+        if perspective not in self.PERSPECTIVES:
+            raise AnalysisError(f"Unknown perspective: {perspective}")
+        prompt_template, schema = self.PERSPECTIVES[perspective]
+
+        try:
+            text = await asyncio.to_thread(self.pdf_extractor.extract_text, pdf_path)
+            instructions, text = self._prepare_inputs(
+                text, prompt_template, ticker, year,
+                sections=PERSPECTIVE_SECTIONS.get(perspective)
             )
-            self.logger.error(error_msg)
-            raise AnalysisError(error_msg) from e
+
+            result = await self._analyze_with_ai_async(instructions, text, schema)
+
+            if output_dir and result:
+                await asyncio.to_thread(
+                    self._save_result, result, ticker, year, output_dir, perspective
+                )
+
+            self.logger.info(
+                f"Successfully analyzed {ticker} {year} "
+                f"({perspective} perspective)"
+            )
+            return result
+
+        except Exception as e:
+            raise self._analysis_error(e, ticker, year, perspective) from e
+
+    def _prepare_inputs(
+        self,
+        text: str,
+        prompt_template: str,
+        ticker: str,
+        year: int,
+        sections: Optional[tuple] = None
+    ) -> Tuple[str, str]:
+        """Check extracted text; return the formatted prompt and the perspective's sections."""
+        if not text or len(text.strip()) < 100:
+            raise AnalysisError(
+                f"PDF extraction failed or insufficient text "
+                f"({len(text) if text else 0} chars)"
+            )
+
+        selected = select_sections(text, sections)
+        if len(selected) < len(text):
+            self.logger.debug(
+                f"Sending {len(selected):,} of {len(text):,} chars "
+                f"({', '.join(sections)})"
+            )
+
+        # Construct prompt
+        self.logger.debug("Constructing prompt")
+        formatted_prompt = format_perspective_prompt(
+            prompt_template, ticker, year
+        )
+        return formatted_prompt, selected
+
+    def _analysis_error(self, e: Exception, ticker: str, year: int, perspective_name: str) -> AnalysisError:
+        """Wrap a failure with the ticker/year/perspective context."""
+        provider_name = GeminiProvider.__name__
+        error_msg = (
+            "AI analysis failed "
+            f"for ticker={ticker} year={year} "
+            f"perspective={perspective_name} "
+            f"provider={provider_name}: {e}"
+        )
+        self.logger.error(error_msg)
+        return AnalysisError(error_msg)
 
     def _analyze_with_ai(
         self,
         prompt: str,
+        text: str,
         schema: type[BaseModel]
     ) -> Optional[BaseModel]:
         """
         Run AI analysis with structured output.
 
+        A filing too long for the model context is analyzed in chunks
+        spread over the available keys, then reduced into the schema.
+
         Args:
-            prompt: Complete prompt
+            prompt: Formatted perspective prompt
+            text: Filing text to analyze
             schema: Pydantic schema for output
 
         Returns:
@@ -339,20 +446,17 @@ class PerspectiveAnalyzer:
             masked_key = mask_api_key(api_key)
             self.logger.debug(f"Using reserved API key: {masked_key}")
 
-            # Create provider with rate limiter
-            provider = GeminiProvider(
+            # Get a pooled provider (reuses the key's warm HTTP connections)
+            provider = get_gemini_provider(
                 api_key=api_key,
                 model=self.model,
                 thinking_budget=self.thinking_budget,
                 rate_limiter=self.rate_limiter
             )
 
-            # Generate with retry
-            result = provider.generate_with_retry(
-                prompt=prompt,
-                schema=schema,
-                max_retries=3,
-                retry_delay=10
+            # Generate with retry (map-reduce if the filing is too long)
+            result = self.map_reducer.generate(
+                provider, prompt, text, schema=schema, text_label=_TEXT_LABEL
             )
             # Usage is recorded by GeminiProvider.generate() — do not double-count
 
@@ -366,6 +470,48 @@ class PerspectiveAnalyzer:
             if not key_was_pre_reserved:
                 self.api_key_manager.release_key(api_key)
 
+    async def _analyze_with_ai_async(
+        self,
+        prompt: str,
+        text: str,
+        schema: type[BaseModel]
+    ) -> Optional[BaseModel]:
+        """
+        Async variant of _analyze_with_ai().
+
+        Args:
+            prompt: Formatted perspective prompt
+            text: Filing text to analyze
+            schema: Pydantic schema for output
+
+        Returns:
+            Validated Pydantic model instance
+        """
+        api_key = self._pre_reserved_key or await asyncio.to_thread(
+            self.api_key_manager.pick_key, estimated_tokens=(len(prompt) + len(text)) // 4
+        )
+        if api_key is None:
+            raise KeyQuotaExhaustedError(
+                "All API keys have exhausted their daily quota. "
+                "Batch will wait until midnight PST for quota reset."
+            )
+
+        try:
+            self.logger.debug(f"Using API key: {mask_api_key(api_key)}")
+
+            provider = get_async_gemini_provider(
+                api_key=api_key,
+                model=self.model,
+                thinking_budget=self.thinking_budget,
+                rate_limiter=self.rate_limiter
+            )
+            return await self.map_reducer.generate_async(
+                provider, prompt, text, schema=schema, text_label=_TEXT_LABEL
+            )
+
+        except Exception as e:
+            raise AnalysisError(str(e)) from e
+
     def _save_result(
         self,
         result: BaseModel,
@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Dependency-graph execution for multi-call custom workflows.
+
+Workflows such as CSPP make several Gemini calls per filing, each feeding
+later ones. Written as a hand-coded chain, every call waits for the one
+before it even when it does not use its output, and all of them share one
+key. Here a workflow declares its calls as WorkflowSteps (inputs, schema,
+optional condition) and WorkflowGraphExecutor runs every step as soon as
+its inputs are done: independent steps run at the same time, on different
+keys, so a filing takes as long as its critical path.
+
+A failed step does not stop the graph. Its output is None, its error is
+recorded, and the steps that depend on it still run and decide for
+themselves how to proceed. This matches how the hand-written workflows
+degrade.
+
+With a StepCheckpoint, each step's validated output is persisted as it
+completes (workflow_step_outputs). A retry of the same filing restores
+those outputs and only runs the steps that are missing, instead of paying
+for every filing-sized call again.
+
+Usage:
+    steps = [
+        WorkflowStep("ORIENT", OrientResult, lambda up: ORIENT_PROMPT),
+        WorkflowStep("MAP", MapResult, lambda up: map_prompt(up["ORIENT"]), inputs=("ORIENT",)),
+    ]
+    result = WorkflowGraphExecutor().run(provider, steps, context_text=filing_text)
+    result.outputs["MAP"]
+"""
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+
+from eon.core import get_logger
+from eon.ai import APIKeyManager
+from eon.ai.providers import (
+    LLMProvider,
+    CachedContext,
+    provider_for_free_key,
+)
+
+# Outputs of a step's inputs, by step name (None if that step failed or was skipped)
+Upstream = Dict[str, Optional[BaseModel]]
+
+
+@dataclass(frozen=True)
+class WorkflowStep:
+    """One LLM call in a workflow graph."""
+    name: str
+    schema: Type[BaseModel]
+    prompt: Callable[[Upstream], str]                   # builds the prompt from input outputs
+    inputs: Tuple[str, ...] = ()                        # steps that must finish first
+    condition: Optional[Callable[[Upstream], bool]] = None  # False skips the step
+    use_context: bool = True                            # send the shared context (the filing)
+    optional: bool = False                              # failure is a warning, not an error
+    max_retries: int = 3
+    retry_delay: int = 10
+
+
+@dataclass
+class WorkflowGraphResult:
+    """Outputs of a graph run."""
+    outputs: Dict[str, Optional[BaseModel]] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+
+    def get(self, name: str) -> Optional[BaseModel]:
+        """Output of a step, or None if it failed or was skipped."""
+        return self.outputs.get(name)
+
+
+def validate_steps(steps: Sequence[WorkflowStep]) -> List[WorkflowStep]:
+    """
+    Check a step graph and return its steps in dependency order.
+
+    Steps with no ordering between them keep their declared order.
+
+    Args:
+        steps: Steps of one workflow
+
+    Returns:
+        The steps, topologically sorted
+
+    Raises:
+        ValueError: On duplicate names, unknown inputs or a cycle
+    """
+    by_name: Dict[str, WorkflowStep] = {}
+    for step in steps:
+        if step.name in by_name:
+            raise ValueError(f"Duplicate workflow step '{step.name}'")
+        by_name[step.name] = step
+
+    for step in steps:
+        unknown = [name for name in step.inputs if name not in by_name]
+        if unknown:
+            raise ValueError(f"Step '{step.name}' depends on unknown step(s) {unknown}")
+
+    ordered: List[WorkflowStep] = []
+    placed = set()
+    while len(ordered) < len(steps):
+        ready = [
+            step for step in steps
+            if step.name not in placed and all(name in placed for name in step.inputs)
+        ]
+        if not ready:
+            cycle = sorted(step.name for step in steps if step.name not in placed)
+            raise ValueError(f"Workflow steps have a dependency cycle among {cycle}")
+        for step in ready:
+            ordered.append(step)
+            placed.add(step.name)
+    return ordered
+
+
+class StepCheckpoint:
+    """
+    Persisted step outputs for one workflow run over one filing.
+
+    The ID is derived from the workflow, ticker, year, model and the
+    filing text, so a retry of the same analysis finds the outputs of the
+    previous attempt while a different filing or model starts clean.
+    Checkpoint writes are best effort: a database error is logged and the
+    analysis carries on.
+    """
+
+    def __init__(self, store, checkpoint_id: str, workflow_name: str):
+        """
+        Initialize checkpoint.
+
+        Args:
+            store: DatabaseRepository (WorkflowStepsMixin operations)
+            checkpoint_id: Stable checkpoint ID (see make_id)
+            workflow_name: Custom workflow ID
+        """
+        self.store = store
+        self.checkpoint_id = checkpoint_id
+        self.workflow_name = workflow_name
+        self.logger = get_logger(__name__)
+
+    @staticmethod
+    def make_id(workflow_name: str, ticker: str, year: int, model: str, text: str) -> str:
+        """Build the checkpoint ID for a workflow run over a filing."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        return f"{workflow_name}:{ticker}:{year}:{model}:{digest}"
+
+    def load(self, steps: Sequence[WorkflowStep]) -> Dict[str, BaseModel]:
+        """
+        Start (or reopen) the checkpoint and return the outputs already saved.
+
+        Outputs that no longer validate against their step's schema are
+        dropped, so the step runs again.
+
+        Args:
+            steps: Steps of the workflow
+
+        Returns:
+            Dict mapping step name to restored output
+        """
+        try:
+            self.store.start_workflow_checkpoint(
+                self.checkpoint_id, self.workflow_name, [step.name for step in steps]
+            )
+            saved = self.store.get_workflow_step_outputs(self.checkpoint_id)
+        except Exception as e:
+            self.logger.warning(f"Could not read checkpoint {self.checkpoint_id}: {e}")
+            return {}
+
+        restored = {}
+        for step in steps:
+            if step.name not in saved:
+                continue
+            try:
+                restored[step.name] = step.schema.model_validate_json(saved[step.name])
+            except Exception as e:
+                self.logger.warning(f"Discarding checkpointed {step.name} output: {e}")
+        return restored
+
+    def save(self, step: WorkflowStep, output: BaseModel):
+        """Persist a completed step's output."""
+        try:
+            self.store.save_workflow_step_output(self.checkpoint_id, step.name, output.model_dump_json())
+        except Exception as e:
+            self.logger.warning(f"Could not checkpoint {step.name} output: {e}")
+
+    def log(self, step_name: str, level: str, message: str):
+        """Record a step event in workflow_step_logs."""
+        try:
+            self.store.log_workflow_step(self.checkpoint_id, step_name, level, message)
+        except Exception as e:
+            self.logger.warning(f"Could not log {step_name} event: {e}")
+
+    def finish(self, result: "WorkflowGraphResult"):
+        """Mark the checkpoint completed, or failed if any step failed."""
+        try:
+            self.store.finish_workflow_checkpoint(
+                self.checkpoint_id,
+                "failed" if result.errors else "completed",
+                errors=result.errors or None,
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not finish checkpoint {self.checkpoint_id}: {e}")
+
+
+class _SharedContexts:
+    """The shared context uploaded once per provider (key) used in a run."""
+
+    def __init__(self, text: Optional[str]):
+        self.text = text
+        self._contexts: Dict[int, Tuple[LLMProvider, CachedContext]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: LLMProvider) -> Optional[CachedContext]:
+        if self.text is None:
+            return None
+        with self._lock:
+            if id(provider) not in self._contexts:
+                self._contexts[id(provider)] = (provider, provider.cache_context(self.text))
+            return self._contexts[id(provider)][1]
+
+    def release(self):
+        for provider, context in self._contexts.values():
+            provider.release_context(context)
+        self._contexts.clear()
+
+
+class WorkflowGraphExecutor:
+    """
+    Run a workflow's steps concurrently, in dependency order.
+
+    The first step to start uses the provider the caller passed; steps
+    started while another is running go to the Gemini key with the
+    earliest free quota, so independent calls do not queue on one key.
+    The shared context is cached once per key used.
+    """
+
+    def __init__(
+        self,
+        api_key_manager: Optional[APIKeyManager] = None,
+        max_workers: int = 4,
+    ):
+        """
+        Initialize executor.
+
+        Args:
+            api_key_manager: Key manager for spreading steps across keys
+                (default: built from config when first needed)
+            max_workers: Most steps running at the same time
+        """
+        self.api_key_manager = api_key_manager
+        self.max_workers = max_workers
+        self.logger = get_logger(__name__)
+
+    def run(
+        self,
+        provider: LLMProvider,
+        steps: Sequence[WorkflowStep],
+        context_text: Optional[str] = None,
+        label: str = "workflow",
+        call_wrapper: Optional[Callable[[Callable[[], Any]], Any]] = None,
+        checkpoint: Optional[StepCheckpoint] = None,
+    ) -> WorkflowGraphResult:
+        """
+        Run all steps and collect their outputs.
+
+        Steps whose output is in the checkpoint are not run again; each
+        step that succeeds here is saved to it.
+
+        Args:
+            provider: Provider for the first step (and all steps without other keys)
+            steps: Steps to run
+            context_text: Text shared by every step with use_context (the filing)
+            label: Name used in log messages, e.g. "CSPP AAPL 2024"
+            call_wrapper: Optional wrapper around each provider call, e.g. to
+                enforce a deadline
+            checkpoint: Optional store for step outputs across attempts
+
+        Returns:
+            WorkflowGraphResult with every step's output, error or skip
+
+        Raises:
+            ValueError: If the step graph is invalid
+        """
+        ordered = validate_steps(steps)
+        result = WorkflowGraphResult()
+        contexts = _SharedContexts(context_text)
+        done = set()
+        running: Dict[Any, str] = {}
+
+        if checkpoint is not None:
+            restored = checkpoint.load(ordered)
+            if restored:
+                self.logger.info(f"{label}: restored {', '.join(restored)} from checkpoint")
+            result.outputs.update(restored)
+            done.update(restored)
+
+        def start_ready_steps(executor: ThreadPoolExecutor):
+            progressed = True
+            while progressed:
+                progressed = False
+                for step in ordered:
+                    if step.name in done or step.name in running.values():
+                        continue
+                    if not all(name in done for name in step.inputs):
+                        continue
+                    upstream = {name: result.outputs.get(name) for name in step.inputs}
+                    if step.condition is not None and not step.condition(upstream):
+                        self.logger.info(f"{label}: {step.name} skipped")
+                        result.outputs[step.name] = None
+                        result.skipped.append(step.name)
+                        done.add(step.name)
+                        progressed = True
+                        continue
+                    step_provider = provider_for_free_key(provider, self.api_key_manager) if running else provider
+                    future = executor.submit(
+                        self._run_step, step, step_provider, upstream, contexts, call_wrapper
+                    )
+                    running[future] = step.name
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(ordered)))) as executor:
+                start_ready_steps(executor)
+                while running:
+                    finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        step = next(s for s in ordered if s.name == name)
+                        try:
+                            result.outputs[name] = future.result()
+                            self.logger.info(f"{label}: {name} call succeeded")
+                            if checkpoint is not None:
+                                checkpoint.save(step, result.outputs[name])
+                        except Exception as e:
+                            result.outputs[name] = None
+                            result.errors[name] = str(e)
+                            level = "WARNING" if step.optional else "ERROR"
+                            log = self.logger.warning if step.optional else self.logger.error
+                            log(f"{label}: {name} call failed: {e}")
+                            if checkpoint is not None:
+                                checkpoint.log(name, level, str(e))
+                        done.add(name)
+                    start_ready_steps(executor)
+        finally:
+            contexts.release()
+
+        if checkpoint is not None:
+            checkpoint.finish(result)
+        return result
+
+    def _run_step(
+        self,
+        step: WorkflowStep,
+        provider: LLMProvider,
+        upstream: Upstream,
+        contexts: _SharedContexts,
+        call_wrapper: Optional[Callable[[Callable[[], Any]], Any]],
+    ) -> BaseModel:
+        prompt = step.prompt(upstream)
+        context = contexts.get(provider) if step.use_context else None
+
+        def call():
+            return provider.generate_with_retry(
+                prompt=prompt,
+                schema=step.schema,
+                context=context,
+                max_retries=step.max_retries,
+                retry_delay=step.retry_delay,
+            )
+
+        return call_wrapper(call) if call_wrapper else call()
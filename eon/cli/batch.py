@@ -24,6 +24,9 @@ Usage:
 
     # List incomplete batches
     eon batch --list-incomplete
+
+    # Work on one batch from 3 processes (run each in its own terminal)
+    eon batch worker --batch-id <id> --workers 3
 """
 
 import click
@@ -58,6 +61,7 @@ _log_level_configured = False
 _batch_service: Optional[BatchQueueService] = None
 _current_batch_id: Optional[str] = None
 _shutdown_requested = False
+_worker_mode = False  # `eon batch worker` stops only this process
 
 
 def _signal_handler(signum, frame):
@@ -74,7 +78,10 @@ def _signal_handler(signum, frame):
     console.print("[yellow]Press Ctrl+C again to force quit[/yellow]")
 
     if _batch_service and _current_batch_id:
-        _batch_service.stop_batch(_current_batch_id)
+        if _worker_mode:
+            _batch_service.stop_worker()
+        else:
+            _batch_service.stop_batch(_current_batch_id)
 
 
 def _setup_signal_handlers():
@@ -95,6 +102,7 @@ def _build_progress_display(
 
     # Use shared service methods instead of raw SQL
     running_items = batch_service.get_running_items(batch_id)
+    worker_processes = batch_service.get_batch_workers(batch_id)
     recent_completed = batch_service.get_recent_completed(batch_id, limit=3)
     recent_failed = batch_service.get_recent_failed(batch_id, limit=3)
 
@@ -163,6 +171,11 @@ def _build_progress_display(
         "Est. Completion", est_str,
         "Years/Company", f"{num_years}"
     )
+    if len(worker_processes) > 1:
+        summary_table.add_row(
+            "Processes", f"[cyan]{len(worker_processes)}[/cyan]",
+            "", ""
+        )
 
     elements.append(summary_table)
     elements.append(Text(""))
@@ -214,6 +227,39 @@ def _build_progress_display(
         elements.append(workers_table)
         elements.append(Text(""))
 
+    # === WORKER PROCESSES ===
+    if len(worker_processes) > 1:
+        processes_table = Table(
+            title="[bold cyan]Worker Processes[/bold cyan]",
+            show_header=True,
+            header_style="bold",
+            box=None,
+            padding=(0, 1)
+        )
+        processes_table.add_column("Shard", width=7)
+        processes_table.add_column("PID", width=8)
+        processes_table.add_column("Host", width=16)
+        processes_table.add_column("Keys", width=5)
+        processes_table.add_column("Active", width=7)
+        processes_table.add_column("Done", width=6)
+        processes_table.add_column("Failed", width=7)
+        processes_table.add_column("Heartbeat", width=10)
+
+        for worker in worker_processes:
+            processes_table.add_row(
+                f"{worker['shard_index'] + 1}/{worker['shard_count']}",
+                str(worker['pid']),
+                (worker.get('hostname') or '')[:15],
+                str(worker['num_keys']),
+                f"[cyan]{worker['active_items']}[/cyan]",
+                f"[green]{worker['items_completed']}[/green]",
+                f"[red]{worker['items_failed']}[/red]",
+                format_duration(start=worker['last_heartbeat_at']) + " ago"
+            )
+
+        elements.append(processes_table)
+        elements.append(Text(""))
+
     # === RECENT ACTIVITY ===
     if recent_completed or recent_failed:
         activity_table = Table(
@@ -281,14 +327,32 @@ def _display_batch_progress(batch_service: BatchQueueService, batch_id: str, num
             panel = _build_progress_display(batch_service, batch_id, num_years)
             live.update(panel)
 
-            # Check if batch is complete
+            # Check if batch is complete (or this process's worker has exited)
             if status['status'] in ('completed', 'failed', 'stopped'):
                 break
+            if not batch_service.is_worker_alive():
+                break
 
             time.sleep(2)  # Update every 2 seconds
 
 
-@click.command()
+class _DefaultCommandGroup(click.Group):
+    """Group that runs its default subcommand when no subcommand is named."""
+
+    default_command = "run"
+
+    def parse_args(self, ctx, args):
+        if not args or args[0] not in self.commands:
+            args = [self.default_command] + list(args)
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=_DefaultCommandGroup)
+def batch():
+    """Multi-day batch processing (runs 'eon batch run' unless 'worker' is given)."""
+
+
+@batch.command("run")
 @click.argument("ticker-file", type=click.Path(exists=True), required=False)
 @click.option("--years", "-y", default=5, show_default=True,
               help="Number of years to analyze per company")
@@ -311,7 +375,7 @@ def _display_batch_progress(batch_service: BatchQueueService, batch_id: str, num
               type=click.Choice(['none', 'min', 'verbose'], case_sensitive=False),
               help="Console logging level (none=quiet, min=warnings only, verbose=all). "
                    "File logging is always enabled for debugging.")
-def batch(
+def batch_run(
     ticker_file: Optional[str],
     years: int,
     name: Optional[str],
@@ -409,6 +473,10 @@ def batch(
     \b
     # Resume specific batch by ID
     eon batch -r abc12345-1234-5678-abcd-123456789abc
+
+    \b
+    # Add more processes to a running batch (see 'eon batch worker --help')
+    eon batch worker --batch-id abc12345-1234-5678-abcd-123456789abc --workers 3
     """
     global _batch_service, _current_batch_id
 
@@ -598,3 +666,95 @@ def batch(
                 console.print(f"\n[yellow]Batch ended with status: {final_status['status']}[/yellow]")
     else:
         console.print("[red]Failed to start batch[/red]")
+
+
+@batch.command("worker")
+@click.option("--batch-id", "-b", required=True,
+              help="Batch to work on (full ID, see 'eon batch -l')")
+@click.option("--workers", "-w", default=1, show_default=True, type=click.IntRange(min=1),
+              help="Number of worker processes splitting the API keys between them")
+@click.option("--shard-index", "-s", default=None, type=click.IntRange(min=0),
+              help="Key shard for this process, 0-based (default: lowest free shard)")
+@click.option("--log-level", "-L", default="none", show_default=True,
+              type=click.Choice(['none', 'min', 'verbose'], case_sensitive=False),
+              help="Console logging level (none=quiet, min=warnings only, verbose=all). "
+                   "File logging is always enabled for debugging.")
+def batch_worker(batch_id: str, workers: int, shard_index: Optional[int], log_level: str):
+    """
+    Work on an existing batch alongside other processes.
+
+    Each process claims pending companies with an atomic lease, so no
+    company is analyzed twice. With --workers N the API keys are split
+    into N shards and each process takes one, so processes never compete
+    for a key. If a process dies, the others pick up its companies once
+    its heartbeat goes stale (about a minute).
+
+    Stopping one process (Ctrl+C) leaves the others running; the batch is
+    marked stopped when the last one exits. Pause/stop from the UI or
+    'eon batch' applies to every process.
+
+    \b
+    # Three processes, one third of the keys each (one per terminal)
+    eon batch worker --batch-id <id> --workers 3
+    eon batch worker --batch-id <id> --workers 3
+    eon batch worker --batch-id <id> --workers 3
+    """
+    global _batch_service, _current_batch_id, _worker_mode
+
+    setup_cli_logging(console_mode=log_level.lower())
+
+    db = DatabaseRepository()
+    _batch_service = BatchQueueService(db)
+
+    status = _batch_service.get_batch_status(batch_id)
+    if not status:
+        console.print(f"[red]Batch {batch_id} not found.[/red]")
+        return
+
+    _current_batch_id = batch_id
+    _worker_mode = True
+    _setup_signal_handlers()
+
+    try:
+        started = _batch_service.start_worker(batch_id, shard_count=workers, shard_index=shard_index)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return
+    if not started:
+        console.print(f"[yellow]Nothing to do for batch {batch_id[:8]} (status: {status['status']})[/yellow]")
+        return
+
+    own = next(
+        (w for w in _batch_service.get_batch_workers(batch_id) if w['worker_id'] == _batch_service.worker_id),
+        None
+    )
+    console.print(Panel.fit(
+        f"[bold cyan]Batch Worker[/bold cyan]\n"
+        f"Name: {status['name']}\n"
+        f"Batch ID: {batch_id[:16]}...\n"
+        f"Shard: {own['shard_index'] + 1 if own else '?'}/{workers}\n"
+        f"API keys: {own['num_keys'] if own else '?'}\n"
+        f"Progress: {status['completed_tickers']}/{status['total_tickers']} companies\n\n"
+        f"[dim]Press Ctrl+C to stop this worker only[/dim]",
+        title="EON Batch Worker"
+    ))
+
+    _display_batch_progress(_batch_service, batch_id, status.get('num_years', 5))
+
+    # Wait for in-flight companies to be handed back before exiting
+    _batch_service.stop_worker()
+
+    final_status = _batch_service.get_batch_status(batch_id)
+    own = next(
+        (w for w in _batch_service.get_batch_workers(batch_id, include_stopped=True)
+         if w['worker_id'] == _batch_service.worker_id),
+        None
+    )
+    if final_status and own:
+        console.print(Panel.fit(
+            f"[bold]Worker finished[/bold] (batch status: {final_status['status']})\n"
+            f"Completed by this worker: {own['items_completed']}\n"
+            f"Failed in this worker: {own['items_failed']}\n"
+            f"Batch progress: {final_status['completed_tickers']}/{final_status['total_tickers']}",
+            title="EON Batch Worker"
+        ))
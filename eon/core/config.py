@@ -70,6 +70,38 @@ class EonConfig(BaseSettings):
         description="Seconds to sleep after each API request (rate limiting)"
     )
 
+    year_concurrency: int = Field(
+        default=1,
+        ge=1,
+        le=32,
+        description=(
+            "Years of one company analyzed at the same time, each on its own "
+            "API key or, for perspective and custom workflow analyses, on one "
+            "event loop sharing keys by quota (1 = one year after another)"
+        )
+    )
+
+    batch_fetch_workers: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Batch queue threads downloading SEC filings (hold no API key)"
+    )
+
+    batch_extract_workers: int = Field(
+        default=2,
+        ge=1,
+        le=32,
+        description="Batch queue threads converting filings and extracting text (hold no API key)"
+    )
+
+    batch_claim_size: int = Field(
+        default=5,
+        ge=1,
+        le=100,
+        description="Pending batch items a worker claims per database round trip"
+    )
+
     # AI Settings
     default_model: str = Field(
         default="gemini-3.5-flash",
@@ -85,6 +117,22 @@ class EonConfig(BaseSettings):
         default=True,
         description="Use Pydantic structured output for AI responses"
     )
+    llm_cache_max_mb: int = Field(
+        default=512,
+        ge=0,
+        description=(
+            "Disk budget for cached LLM responses; least recently used entries "
+            "are evicted beyond it (0 disables the response cache)"
+        )
+    )
+    map_reduce_chunk_tokens: int = Field(
+        default=150_000,
+        ge=4_000,
+        description=(
+            "Input tokens per chunk when a filing exceeds the model context "
+            "and is analyzed in parts (map-reduce fallback)"
+        )
+    )
 
     # Storage Settings
     storage_backend: str = Field(
@@ -112,6 +160,31 @@ class EonConfig(BaseSettings):
         default=True,
         description="Run browser in headless mode"
     )
+    browser_pool_size: int = Field(
+        default=2,
+        ge=1,
+        le=16,
+        description="Maximum concurrent Chrome browsers shared by PDF conversions"
+    )
+    browser_max_pages: int = Field(
+        default=50,
+        ge=1,
+        description="Pages a pooled browser renders before it is restarted"
+    )
+
+    # Filing Extraction Settings
+    filing_text_source: str = Field(
+        default="html",
+        pattern="^(html|pdf)$",
+        description=(
+            "How filings are turned into text: 'html' extracts the EDGAR HTML "
+            "directly (no browser), 'pdf' renders with headless Chrome first"
+        )
+    )
+    keep_pdf_artifacts: bool = Field(
+        default=False,
+        description="Also render a PDF copy of each filing when filing_text_source is 'html'"
+    )
 
     # Notification Settings
     discord_progress_interval: int = Field(
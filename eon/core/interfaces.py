@@ -157,14 +157,14 @@ class IDownloader(Protocol):
 
 
 class IExtractor(Protocol):
-    """Protocol for PDF text extraction."""
+    """Protocol for filing text extraction (PDF, HTML or text)."""
 
     def extract_text(self, pdf_path: Path) -> str:
         """
-        Extract text from a PDF file.
+        Extract text from a filing document.
 
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the filing document
 
         Returns:
             Extracted text content
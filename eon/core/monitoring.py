@@ -12,7 +12,7 @@ import shutil
 import subprocess
 import signal
 from pathlib import Path
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Iterable, Optional, Tuple, List
 from datetime import datetime
 
 from eon.core.logging import get_logger
@@ -205,7 +205,11 @@ class ProcessMonitor:
             return True
         return False
 
-    def cleanup_chrome_processes(self, max_age_minutes: int = 60) -> int:
+    def cleanup_chrome_processes(
+        self,
+        max_age_minutes: int = 60,
+        exclude_pids: Optional[Iterable[int]] = None
+    ) -> int:
         """
         Clean up orphaned Chrome/Chromium processes.
 
@@ -215,6 +219,8 @@ class ProcessMonitor:
 
         Args:
             max_age_minutes: Only kill processes older than this
+            exclude_pids: Processes to leave alone, along with their
+                descendants (e.g. chromedriver PIDs of pooled browsers)
 
         Returns:
             Number of processes cleaned up
@@ -229,10 +235,20 @@ class ProcessMonitor:
 
         current_time = datetime.now().timestamp()
 
+        protected = set()
+        for pid in exclude_pids or ():
+            protected.add(pid)
+            try:
+                protected.update(child.pid for child in psutil.Process(pid).children(recursive=True))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
         try:
             for proc in psutil.process_iter(['pid', 'name', 'create_time', 'cmdline']):
                 try:
                     pinfo = proc.info
+                    if pinfo['pid'] in protected:
+                        continue
                     name = pinfo.get('name', '').lower()
 
                     # Check if it's a Chrome-related process
@@ -397,15 +413,16 @@ def check_disk_space(data_dir: Optional[Path] = None) -> Tuple[bool, str]:
 
 
 # Convenience function for Chrome cleanup
-def cleanup_orphaned_chrome(max_age_minutes: int = 60) -> int:
+def cleanup_orphaned_chrome(max_age_minutes: int = 60, exclude_pids: Optional[Iterable[int]] = None) -> int:
     """
     Clean up orphaned Chrome processes.
 
     Args:
         max_age_minutes: Only kill processes older than this
+        exclude_pids: Processes (and their descendants) to leave alone
 
     Returns:
         Number of processes cleaned up
     """
     monitor = ProcessMonitor()
-    return monitor.cleanup_chrome_processes(max_age_minutes)
+    return monitor.cleanup_chrome_processes(max_age_minutes, exclude_pids=exclude_pids)
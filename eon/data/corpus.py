@@ -13,6 +13,7 @@ from datetime import datetime, timedelta
 from eon.core import get_logger, get_config
 
 if TYPE_CHECKING:
+    from eon.core import IExtractor
     from eon.data.sources.sec import SECDownloader
 
 
@@ -21,9 +22,10 @@ class CorpusManager:
     Manages a corpus of SEC filings with intelligent caching.
 
     Features:
-    - Checks if documents already exist as PDFs
+    - Checks if documents already exist (as text or PDFs)
     - Detects new filings since last cache
-    - Uses cached PDFs instead of re-downloading
+    - Uses cached documents instead of re-downloading
+    - Reads cached documents through a pluggable text extractor
 
     Example:
         corpus = CorpusManager(db, downloader)
@@ -36,18 +38,29 @@ class CorpusManager:
 
         # Get filings (uses cache when possible)
         pdfs, new_metadata = corpus.get_filings_smart("AAPL", "10-K", num_filings=5)
+
+        # Read a cached filing as text
+        text = corpus.get_filing_text("AAPL", 2024, "10-K")
     """
 
-    def __init__(self, db, downloader: Optional["SECDownloader"] = None):
+    def __init__(
+        self,
+        db,
+        downloader: Optional["SECDownloader"] = None,
+        extractor: Optional["IExtractor"] = None
+    ):
         """
         Initialize corpus manager.
 
         Args:
             db: Database repository with FileCacheMixin
             downloader: SEC downloader instance (creates default if not provided)
+            extractor: Text extractor for cached filings (defaults to a cached
+                HTMLExtractor, which reads text, HTML and PDF files)
         """
         self.db = db
         self._downloader = downloader
+        self._extractor = extractor
         self.config = get_config()
         self.logger = get_logger(f"{__name__}.CorpusManager")
 
@@ -59,6 +72,42 @@ class CorpusManager:
             self._downloader = SECDownloader()
         return self._downloader
 
+    @property
+    def extractor(self) -> "IExtractor":
+        """Lazy-load extractor to avoid circular imports."""
+        if self._extractor is None:
+            from eon.data.sources.sec import HTMLExtractor, CachingExtractor
+            extractor = HTMLExtractor()
+            if get_config().enable_caching:
+                extractor = CachingExtractor(extractor, db=self.db)
+            self._extractor = extractor
+        return self._extractor
+
+    def get_filing_text(
+        self,
+        ticker: str,
+        fiscal_year: int,
+        filing_type: str
+    ) -> Optional[str]:
+        """
+        Get the text of a cached filing.
+
+        Args:
+            ticker: Company ticker symbol
+            fiscal_year: Fiscal year of the filing
+            filing_type: Filing type (10-K, 10-Q, etc.)
+
+        Returns:
+            Extracted text, or None if the filing is not cached on disk
+
+        Raises:
+            ExtractionError: If the cached file can't be read
+        """
+        cached = self.db.get_cached_file(ticker.upper(), fiscal_year, filing_type)
+        if not cached or not Path(cached).exists():
+            return None
+        return self.extractor.extract_text(Path(cached))
+
     def check_for_new_filings(
         self,
         ticker: str,
@@ -6,7 +6,39 @@ SEC Edgar data source integration.
 
 from .downloader import SECDownloader
 from .converter import SECConverter
-from .extractor import PDFExtractor
+from .browser_pool import (
+    BrowserPool,
+    BrowserSession,
+    get_browser_pool,
+    reset_browser_pool,
+    wait_until_rendered,
+)
+from .extractor import PDFExtractor, PageText, ExtractionStats
+from .html_extractor import HTMLExtractor
+from .prefetch import FilingPrefetcher, PrefetchResult
+from .sections import (
+    FilingSection,
+    SectionIndex,
+    SectionCache,
+    parse_sections,
+    select_sections,
+    get_section_cache,
+    reset_section_cache,
+)
+from .submissions_cache import SubmissionsCache
+from .text_cache import (
+    TextCache,
+    CachingExtractor,
+    compute_file_hash,
+    get_text_cache,
+    reset_text_cache,
+)
+from .ticker_index import (
+    TickerIndex,
+    get_ticker_index,
+    reset_ticker_index,
+)
+from .rate_limiter import SECRateLimiter
 from .request_queue import (
     SECRequestQueue,
     get_sec_request_queue,
@@ -16,7 +48,34 @@ from .request_queue import (
 __all__ = [
     "SECDownloader",
     "SECConverter",
+    "BrowserPool",
+    "BrowserSession",
+    "get_browser_pool",
+    "reset_browser_pool",
+    "wait_until_rendered",
     "PDFExtractor",
+    "PageText",
+    "ExtractionStats",
+    "HTMLExtractor",
+    "FilingPrefetcher",
+    "PrefetchResult",
+    "FilingSection",
+    "SectionIndex",
+    "SectionCache",
+    "parse_sections",
+    "select_sections",
+    "get_section_cache",
+    "reset_section_cache",
+    "SubmissionsCache",
+    "TextCache",
+    "CachingExtractor",
+    "compute_file_hash",
+    "get_text_cache",
+    "reset_text_cache",
+    "TickerIndex",
+    "get_ticker_index",
+    "reset_ticker_index",
+    "SECRateLimiter",
     "SECRequestQueue",
     "get_sec_request_queue",
     "reset_sec_request_queue",
@@ -0,0 +1,431 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Shared pool of warm headless Chrome sessions for HTML -> PDF rendering.
+
+Starting Chrome costs seconds and hundreds of MB, and a browser per
+analysis thread makes batch memory grow with concurrency. This pool keeps
+at most N browsers for the whole process, hands them out with a
+checkout/return API, health-checks them on checkout and recycles each one
+after K rendered pages so leaks in long-lived renderers stay bounded.
+
+Usage:
+    pool = get_browser_pool()
+    with pool.session() as session:
+        session.driver.get(file_url)
+        wait_until_rendered(session.driver, timeout=15)
+        result = session.driver.execute_cdp_cmd("Page.printToPDF", settings)
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from eon.core import get_logger, get_config, ConversionError
+
+
+# True once the document, its images and its web fonts have finished loading
+_RENDER_READY_JS = """
+return document.readyState === 'complete'
+    && Array.from(document.images).every(function (img) { return img.complete; })
+    && (!document.fonts || document.fonts.status === 'loaded');
+"""
+
+
+def create_chrome_driver(
+    chrome_driver_path: Optional[str] = None,
+    headless: bool = True,
+    page_load_timeout: int = 60,
+    script_timeout: int = 120
+):
+    """
+    Start a Chrome WebDriver configured for PDF rendering.
+
+    Args:
+        chrome_driver_path: Optional path to ChromeDriver executable
+        headless: Run browser in headless mode
+        page_load_timeout: Timeout for page loads in seconds
+        script_timeout: Timeout for script execution in seconds
+
+    Returns:
+        Selenium Chrome WebDriver
+
+    Raises:
+        ConversionError: If the browser can't be started
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+    try:
+        options = ChromeOptions()
+
+        if headless:
+            options.add_argument("--headless")
+
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_experimental_option('excludeSwitches', ['enable-logging'])
+
+        if chrome_driver_path and os.path.exists(chrome_driver_path):
+            service = ChromeService(executable_path=chrome_driver_path)
+        else:
+            service = ChromeService()
+        driver = webdriver.Chrome(service=service, options=options)
+
+        # Set timeouts to prevent hanging
+        driver.set_page_load_timeout(page_load_timeout)
+        driver.set_script_timeout(script_timeout)
+        return driver
+
+    except Exception as e:
+        raise ConversionError(f"Error setting up WebDriver: {str(e)}") from e
+
+
+def wait_until_rendered(driver, timeout: float, poll_interval: float = 0.1) -> bool:
+    """
+    Wait until the loaded page is ready to print.
+
+    Polls document.readyState plus image and font loading instead of
+    sleeping a fixed time; local filings are usually ready immediately.
+
+    Args:
+        driver: Selenium WebDriver with a page loaded
+        timeout: Maximum seconds to wait
+        poll_interval: Seconds between readiness checks
+
+    Returns:
+        True if the page became ready, False if the timeout expired
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if driver.execute_script(_RENDER_READY_JS):
+                return True
+        except Exception:
+            # Page may still be navigating; keep polling until the deadline
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll_interval)
+
+
+class BrowserSession:
+    """A pooled browser plus its usage counters."""
+
+    def __init__(self, driver, generation: int):
+        self.driver = driver
+        self.generation = generation
+        self.pages_rendered = 0
+        self.created_at = time.time()
+
+    def is_healthy(self) -> bool:
+        """Check that the browser still responds to commands."""
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @property
+    def pid(self) -> Optional[int]:
+        """PID of the chromedriver process (Chrome runs as its children), if known."""
+        try:
+            return self.driver.service.process.pid
+        except AttributeError:
+            return None
+
+    def quit(self) -> None:
+        """Shut the browser down, ignoring errors from dead sessions."""
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    """
+    Bounded pool of reusable browser sessions.
+
+    Thread-safe. At most ``size`` browsers exist at once; callers wait for a
+    free one instead of launching more. Sessions are replaced when they fail
+    a health check, are returned as unhealthy, or reach
+    ``max_pages_per_session`` renders.
+
+    Example:
+        pool = BrowserPool(size=2, max_pages_per_session=50)
+        session = pool.checkout()
+        try:
+            ...
+        finally:
+            pool.checkin(session)
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages_per_session: int = 50,
+        driver_factory: Optional[Callable[[], Any]] = None,
+        checkout_timeout: float = 300.0
+    ):
+        """
+        Initialize the browser pool.
+
+        Args:
+            size: Maximum number of concurrent browsers
+            max_pages_per_session: Renders before a browser is recycled
+            driver_factory: Callable creating a WebDriver (default: Chrome
+                configured from EonConfig)
+            checkout_timeout: Seconds to wait for a free browser
+        """
+        self.size = max(1, size)
+        self.max_pages_per_session = max(1, max_pages_per_session)
+        self.checkout_timeout = checkout_timeout
+        self._driver_factory = driver_factory or self._default_driver_factory
+
+        self._condition = threading.Condition()
+        self._idle: List[BrowserSession] = []
+        self._sessions: Set[BrowserSession] = set()  # idle + checked out
+        self._total = 0  # idle + checked out + being created
+        self._generation = 0
+
+        self._stats = {'created': 0, 'recycled': 0, 'unhealthy': 0, 'checkouts': 0}
+
+        self.logger = get_logger(f"{__name__}.BrowserPool")
+
+    def checkout(self, timeout: Optional[float] = None) -> BrowserSession:
+        """
+        Take a healthy browser session from the pool.
+
+        Args:
+            timeout: Seconds to wait for a free browser (default: pool setting)
+
+        Returns:
+            A BrowserSession; hand it back with checkin()
+
+        Raises:
+            ConversionError: If no browser frees up in time or one can't be started
+        """
+        deadline = time.monotonic() + (self.checkout_timeout if timeout is None else timeout)
+
+        while True:
+            with self._condition:
+                while not self._idle and self._total >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise ConversionError(
+                            f"No browser available after waiting for {self.size} pooled sessions"
+                        )
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    session = self._idle.pop()
+                else:
+                    session = None
+                    self._total += 1
+                generation = self._generation
+
+            if session is None:
+                return self._create_session(generation)
+
+            if session.is_healthy():
+                self._bump('checkouts')
+                return session
+
+            # Dead browser: drop it and try again (may create a fresh one)
+            self.logger.warning("Pooled browser failed health check, replacing it")
+            self._bump('unhealthy')
+            self._discard(session)
+
+    def checkin(self, session: BrowserSession, healthy: bool = True, pages: int = 1) -> None:
+        """
+        Return a session to the pool.
+
+        Args:
+            session: Session obtained from checkout()
+            healthy: False if the browser errored/timed out and should be replaced
+            pages: Pages rendered during this checkout (counts toward recycling)
+        """
+        session.pages_rendered += pages
+
+        with self._condition:
+            stale = session.generation != self._generation
+        if not healthy:
+            self._bump('unhealthy')
+            self._discard(session)
+            return
+        if stale or session.pages_rendered >= self.max_pages_per_session:
+            if not stale:
+                self._bump('recycled')
+                self.logger.debug(
+                    f"Recycling browser after {session.pages_rendered} pages"
+                )
+            self._discard(session)
+            return
+
+        try:
+            session.driver.get("about:blank")  # Drop the previous document's memory
+        except Exception:
+            self._bump('unhealthy')
+            self._discard(session)
+            return
+
+        with self._condition:
+            self._idle.append(session)
+            self._condition.notify()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[BrowserSession]:
+        """
+        Context manager around checkout()/checkin().
+
+        Exceptions inside the block mark the browser unhealthy so it is
+        replaced rather than reused.
+        """
+        session = self.checkout(timeout)
+        healthy = False
+        try:
+            yield session
+            healthy = True
+        finally:
+            self.checkin(session, healthy=healthy)
+
+    def close(self) -> None:
+        """
+        Quit all idle browsers.
+
+        Sessions currently checked out are quit when they are returned. The
+        pool stays usable and starts new browsers on demand.
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._generation += 1
+            self._condition.notify_all()
+
+        for session in idle:
+            self._forget(session)
+            session.quit()
+        if idle:
+            self.logger.info(f"Closed {len(idle)} pooled browser(s)")
+
+    def recycle_idle(self) -> int:
+        """
+        Quit idle browsers to reclaim their memory, leaving checked-out ones alone.
+
+        Unlike close(), browsers in use keep running and go back to the
+        pool as usual when their conversion finishes.
+
+        Returns:
+            Number of browsers quit
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._condition.notify_all()
+
+        for session in idle:
+            self._forget(session)
+            session.quit()
+        if idle:
+            self.logger.info(f"Recycled {len(idle)} idle pooled browser(s)")
+        return len(idle)
+
+    def get_browser_pids(self) -> List[int]:
+        """
+        Get the chromedriver PIDs of every live pooled browser, idle or checked out.
+
+        Returns:
+            PIDs, for excluding pooled browsers from orphaned-process cleanup
+        """
+        with self._condition:
+            sessions = list(self._sessions)
+        return [pid for pid in (session.pid for session in sessions) if pid is not None]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get pool counters (sizes, creations, recycles, health failures)."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats.update(idle=len(self._idle), total=self._total, size=self.size)
+        return stats
+
+    def _create_session(self, generation: int) -> BrowserSession:
+        """Start a browser for a reserved slot (slot is released on failure)."""
+        try:
+            self.logger.info("Starting pooled Chrome browser...")
+            driver = self._driver_factory()
+        except Exception as e:
+            with self._condition:
+                self._total -= 1
+                self._condition.notify()
+            if isinstance(e, ConversionError):
+                raise
+            raise ConversionError(f"Error starting pooled browser: {e}") from e
+
+        self._bump('created')
+        self._bump('checkouts')
+        session = BrowserSession(driver, generation)
+        with self._condition:
+            self._sessions.add(session)
+        return session
+
+    def _discard(self, session: BrowserSession) -> None:
+        """Quit a session and free its slot."""
+        self._forget(session)
+        session.quit()
+        with self._condition:
+            self._total -= 1
+            self._condition.notify()
+
+    def _forget(self, session: BrowserSession) -> None:
+        with self._condition:
+            self._sessions.discard(session)
+
+    def _bump(self, counter: str) -> None:
+        with self._condition:
+            self._stats[counter] += 1
+
+    @staticmethod
+    def _default_driver_factory():
+        config = get_config()
+        return create_chrome_driver(
+            chrome_driver_path=config.chrome_driver_path,
+            headless=config.headless_browser,
+        )
+
+
+# Global singleton with thread-safe initialization
+_global_pool: Optional[BrowserPool] = None
+_pool_creation_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Get the global browser pool singleton (sized from EonConfig).
+
+    Returns:
+        The global BrowserPool instance
+    """
+    global _global_pool
+
+    if _global_pool is None:
+        with _pool_creation_lock:
+            if _global_pool is None:
+                config = get_config()
+                _global_pool = BrowserPool(
+                    size=config.browser_pool_size,
+                    max_pages_per_session=config.browser_max_pages,
+                )
+
+    return _global_pool
+
+
+def reset_browser_pool():
+    """Close and reset the global browser pool."""
+    global _global_pool
+    with _pool_creation_lock:
+        if _global_pool is not None:
+            _global_pool.close()
+        _global_pool = None
@@ -1,24 +1,29 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """
-HTML to PDF converter for SEC filings using Selenium.
+HTML to PDF/text converter for SEC filings.
+
+PDFs are rendered by headless Chrome sessions borrowed from a shared
+BrowserPool; plain text is extracted natively by HTMLExtractor, which
+needs no browser at all.
 Extracted and refactored from standardized_sec_ai/tenk_processor.py
 """
 
 import os
 import base64
-import time
 import shutil
 import subprocess
 import platform
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Sequence
+
+from eon.core import get_logger, get_config, ConversionError, ExtractionError
+
+from .browser_pool import BrowserPool, create_chrome_driver, get_browser_pool, wait_until_rendered
+from .html_extractor import HTMLExtractor
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
 
-from eon.core import get_logger, get_config, ConversionError
+OUTPUT_FORMATS = ('pdf', 'text')
 
 
 def cleanup_orphaned_chrome_processes(logger=None) -> int:
@@ -88,12 +93,18 @@ def cleanup_orphaned_chrome_processes(logger=None) -> int:
 
 class SECConverter:
     """
-    Handles conversion of HTML SEC filings to PDF using headless Chrome.
+    Handles conversion of HTML SEC filings to PDF and/or plain text.
     Supports all filing types (10-K, 10-Q, DEF 14A, 8-K, etc.)
 
+    Chrome is only used when a PDF is actually requested, so text-only
+    conversion runs without a browser. Browsers come from the process-wide
+    BrowserPool, so converters are cheap to create and never own a browser
+    between conversions.
+
     Example:
         converter = SECConverter()
         pdfs = converter.convert("AAPL", input_path, output_path, filing_type="10-K")
+        texts = converter.convert("AAPL", input_path, output_path, output_formats=("text",))
         converter.close()
     """
 
@@ -104,25 +115,35 @@ class SECConverter:
         page_load_timeout: int = 60,
         script_timeout: int = 120,
         pdf_timeout: int = 180,
-        conversion_retries: int = 2
+        conversion_retries: int = 2,
+        browser_pool: Optional[BrowserPool] = None
     ):
         """
         Initialize the HTML to PDF converter.
 
         Args:
-            chrome_driver_path: Optional path to ChromeDriver executable
+            chrome_driver_path: Optional path to ChromeDriver executable. If it
+                (or headless) differs from the configuration, the converter
+                uses a private single-browser pool instead of the shared one.
             headless: Run browser in headless mode (default: True)
             page_load_timeout: Timeout for page loads in seconds (default: 60)
             script_timeout: Timeout for script execution in seconds (default: 120)
             pdf_timeout: Timeout for PDF generation in seconds (default: 180)
             conversion_retries: Number of retries for failed conversions (default: 2)
+            browser_pool: Browser pool to render with (default: global pool)
         """
         config = get_config()
 
         self.chrome_driver_path = chrome_driver_path or config.chrome_driver_path
         self.headless = headless if headless is not None else config.headless_browser
         self.logger = get_logger(f"{__name__}.SECConverter")
-        self.driver = None
+        self.html_extractor = HTMLExtractor()
+
+        self._browser_pool = browser_pool
+        self._owns_pool = (
+            browser_pool is None
+            and (chrome_driver_path is not None or self.headless != config.headless_browser)
+        )
 
         # Timeout configuration
         self.page_load_timeout = page_load_timeout
@@ -138,55 +159,21 @@ class SECConverter:
             "preferCSSPageSize": True,
         }
 
-    def _setup_driver(self):
-        """Set up Selenium WebDriver with Chrome and proper timeouts."""
-        if self.driver:
-            return self.driver
-
-        self.logger.info("Setting up Chrome browser...")
-        try:
-            options = ChromeOptions()
-
-            if self.headless:
-                options.add_argument("--headless")
-
-            options.add_argument("--disable-gpu")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_experimental_option('excludeSwitches', ['enable-logging'])
-
-            if self.chrome_driver_path and os.path.exists(self.chrome_driver_path):
-                service = ChromeService(executable_path=self.chrome_driver_path)
-                self.driver = webdriver.Chrome(service=service, options=options)
+    @property
+    def browser_pool(self) -> BrowserPool:
+        """Pool that PDF rendering borrows browsers from (created lazily)."""
+        if self._browser_pool is None:
+            if self._owns_pool:
+                self._browser_pool = BrowserPool(
+                    size=1,
+                    driver_factory=lambda: create_chrome_driver(
+                        self.chrome_driver_path, self.headless,
+                        self.page_load_timeout, self.script_timeout
+                    ),
+                )
             else:
-                service = ChromeService()
-                self.driver = webdriver.Chrome(service=service, options=options)
-
-            # Set timeouts to prevent hanging
-            self.driver.set_page_load_timeout(self.page_load_timeout)
-            self.driver.set_script_timeout(self.script_timeout)
-
-            self.logger.info(
-                f"Browser setup complete (timeouts: page={self.page_load_timeout}s, "
-                f"script={self.script_timeout}s)"
-            )
-            return self.driver
-
-        except Exception as e:
-            error_msg = f"Error setting up WebDriver: {str(e)}"
-            self.logger.error(error_msg)
-            raise ConversionError(error_msg) from e
-
-    def _restart_driver(self):
-        """Restart the WebDriver to recover from timeout/crash."""
-        self.logger.info("Restarting WebDriver...")
-        try:
-            if self.driver:
-                self.driver.quit()
-        except Exception as e:
-            self.logger.warning(f"Error closing driver during restart: {e}")
-        self.driver = None
-        return self._setup_driver()
+                self._browser_pool = get_browser_pool()
+        return self._browser_pool
 
     def _convert_html_to_pdf(self, html_path: Path, pdf_path: Path, restart_on_failure: bool = True) -> bool:
         """
@@ -195,56 +182,61 @@ class SECConverter:
         Args:
             html_path: Path to HTML file
             pdf_path: Path for output PDF
-            restart_on_failure: If True, restart driver on timeout errors
+            restart_on_failure: If True, replace the browser on timeout errors
 
         Returns:
             True if successful, False otherwise
         """
-        if not self.driver:
-            self.driver = self._setup_driver()
-            if not self.driver:
-                return False
+        try:
+            session = self.browser_pool.checkout()
+        except ConversionError as e:
+            self.logger.error(f"Could not get a browser for {html_path.name}: {e}")
+            return False
 
+        healthy = True
         try:
+            driver = session.driver
+            driver.set_page_load_timeout(self.page_load_timeout)
+            driver.set_script_timeout(self.script_timeout)
+
             # Load HTML file
             file_url = f"file:///{str(html_path.absolute()).replace(os.path.sep, '/')}"
             self.logger.debug(f"Loading HTML: {file_url}")
 
             try:
-                self.driver.get(file_url)
+                driver.get(file_url)
             except Exception as e:
                 error_str = str(e).lower()
                 if 'timeout' in error_str or 'timed out' in error_str:
                     self.logger.error(f"Page load timeout for {html_path.name}: {e}")
-                    if restart_on_failure:
-                        self._restart_driver()
+                    healthy = not restart_on_failure
                     return False
                 raise
 
-            # Dynamic wait based on file size (larger files need more render time)
+            # Wait until the document, images and fonts have loaded. The cap
+            # scales with file size (3s minimum, 15s for very large files)
+            # but is rarely reached - local filings are usually ready at once.
             try:
                 file_size_kb = html_path.stat().st_size / 1024
-                # Scale wait time: 3s minimum, up to 15s for very large files
-                wait_time = min(max(3, int(file_size_kb / 100)), 15)
-                self.logger.debug(f"Waiting {wait_time}s for page render (file size: {file_size_kb:.1f}KB)")
+                max_wait = min(max(3, int(file_size_kb / 100)), 15)
             except Exception:
-                wait_time = 5  # Fallback if we can't get file size
-            time.sleep(wait_time)
+                max_wait = 5  # Fallback if we can't get file size
+            if not wait_until_rendered(driver, timeout=max_wait):
+                self.logger.warning(
+                    f"{html_path.name} not fully rendered after {max_wait}s, printing anyway"
+                )
 
             # Convert to PDF
             try:
-                result = self.driver.execute_cdp_cmd("Page.printToPDF", self.pdf_settings)
+                result = driver.execute_cdp_cmd("Page.printToPDF", self.pdf_settings)
             except Exception as e:
                 error_str = str(e).lower()
                 if 'timeout' in error_str or 'timed out' in error_str or 'connectionpool' in error_str:
                     self.logger.error(f"PDF generation timeout for {html_path.name}: {e}")
-                    if restart_on_failure:
-                        self._restart_driver()
+                    healthy = not restart_on_failure
                     return False
                 raise
 
-            self.driver.get("about:blank")  # Clear page
-
             # Decode and save PDF
             pdf_data = base64.b64decode(result['data'])
             pdf_path.parent.mkdir(parents=True, exist_ok=True)
@@ -260,6 +252,47 @@ class SECConverter:
                 pdf_path.unlink()  # Remove partial file
             return False
 
+        finally:
+            self.browser_pool.checkin(session, healthy=healthy)
+
+    def _convert_html_to_text(self, html_path: Path, text_path: Path) -> bool:
+        """
+        Extract a single filing to a UTF-8 text file (no browser involved).
+
+        Args:
+            html_path: Path to HTML file or full-submission.txt
+            text_path: Path for output text file
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            text = self.html_extractor.extract_text(html_path)
+        except ExtractionError as e:
+            self.logger.error(f"Error extracting {html_path.name}: {e}")
+            return False
+
+        if not text:
+            return False
+
+        text_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return True
+
+    def _convert_with_retries(self, html_path: Path, pdf_path: Path) -> bool:
+        """Convert HTML to PDF, retrying (with driver restarts) on failure."""
+        for attempt in range(self.conversion_retries + 1):
+            if self._convert_html_to_pdf(html_path, pdf_path):
+                return True
+            if attempt < self.conversion_retries:
+                self.logger.warning(
+                    f"Conversion failed for {pdf_path.name}, "
+                    f"retrying ({attempt + 1}/{self.conversion_retries})..."
+                )
+                # Browser replacement happens inside _convert_html_to_pdf on timeout
+        return False
+
     @staticmethod
     def _get_filing_year_from_accession(accession_str: str) -> Optional[int]:
         """
@@ -316,32 +349,47 @@ class SECConverter:
         output_path: Optional[Path] = None,
         cleanup_originals: bool = True,
         filing_type: str = "10-K",
-        filing_metadata: Optional[List[Dict]] = None
+        filing_metadata: Optional[List[Dict]] = None,
+        output_formats: Sequence[str] = ("pdf",)
     ) -> List[Dict[str, Any]]:
         """
-        Convert downloaded SEC filings to PDF.
+        Convert downloaded SEC filings to PDF and/or plain text.
 
         Args:
             ticker: Stock ticker symbol
             input_path: Path to downloaded filings (contains accession dirs)
-            output_path: Optional custom output path for PDFs
+            output_path: Optional custom output path for converted files
             cleanup_originals: Whether to delete original HTML files after conversion
             filing_type: Type of SEC filing (e.g., '10-K', '10-Q', 'DEF 14A')
             filing_metadata: Optional list of filing metadata from SEC API
                             (used to get filing_date for unique filenames)
+            output_formats: Files to produce per filing, 'pdf' and/or 'text'.
+                            The first format is the primary artifact: if it
+                            fails the filing is skipped, while failures of the
+                            others are only logged.
 
         Returns:
-            List of dicts with 'pdf_path', 'year', 'filing_date', and 'ticker'
+            List of dicts with 'file_path' (primary artifact), 'pdf_path' and/or
+            'text_path', 'year', 'filing_date', 'ticker' and 'accession_number'
             for each converted filing
+
+        Raises:
+            ValueError: If output_formats is empty or contains an unknown format
         """
         ticker = ticker.upper()
 
+        output_formats = tuple(output_formats)
+        if not output_formats or any(fmt not in OUTPUT_FORMATS for fmt in output_formats):
+            raise ValueError(f"output_formats must be a non-empty subset of {OUTPUT_FORMATS}")
+
         if output_path is None:
             output_path = input_path.parent / "PDF_Filings"
 
         output_path.mkdir(parents=True, exist_ok=True)
 
-        self.logger.info(f"Converting {filing_type} filings for {ticker} to PDF")
+        self.logger.info(
+            f"Converting {filing_type} filings for {ticker} to {'/'.join(output_formats)}"
+        )
         self.logger.info(f"Input: {input_path}")
         self.logger.info(f"Output: {output_path}")
 
@@ -394,39 +442,45 @@ class SECConverter:
             # Universal naming: use filing_date if available, otherwise fallback
             if filing_date:
                 # Format: TICKER_FILING-TYPE_YYYY-MM-DD.pdf
-                pdf_filename = f"{ticker}_{safe_filing_type}_{filing_date}.pdf"
+                file_stem = f"{ticker}_{safe_filing_type}_{filing_date}"
             else:
                 # Fallback: use year + accession suffix for uniqueness
                 accession_suffix = accession_dir.name.split('-')[-1] if '-' in accession_dir.name else accession_dir.name[-4:]
-                pdf_filename = f"{ticker}_{safe_filing_type}_{year}_{accession_suffix}.pdf"
-
-            pdf_path = output_path / pdf_filename
-
-            self.logger.info(f"Converting filing to PDF: {pdf_filename}")
+                file_stem = f"{ticker}_{safe_filing_type}_{year}_{accession_suffix}"
+
+            artifacts = {}
+            for fmt in output_formats:
+                if fmt == 'text':
+                    target = output_path / f"{file_stem}.txt"
+                    self.logger.info(f"Extracting filing to text: {target.name}")
+                    ok = self._convert_html_to_text(html_file, target)
+                else:
+                    target = output_path / f"{file_stem}.pdf"
+                    self.logger.info(f"Converting filing to PDF: {target.name}")
+                    ok = self._convert_with_retries(html_file, target)
 
-            # Retry logic for failed conversions
-            success = False
-            for attempt in range(self.conversion_retries + 1):
-                if self._convert_html_to_pdf(html_file, pdf_path):
-                    success = True
+                if ok:
+                    artifacts[fmt] = target
+                elif fmt == output_formats[0]:
                     break
                 else:
-                    if attempt < self.conversion_retries:
-                        self.logger.warning(
-                            f"Conversion failed for {pdf_filename}, "
-                            f"retrying ({attempt + 1}/{self.conversion_retries})..."
-                        )
-                        # Driver restart happens inside _convert_html_to_pdf on timeout
-
-            if success:
-                self.logger.info(f"Successfully converted: {pdf_filename}")
-                converted_pdfs.append({
-                    'pdf_path': pdf_path,
+                    self.logger.warning(f"Optional {fmt} artifact failed for {file_stem}")
+
+            primary = artifacts.get(output_formats[0])
+            if primary:
+                self.logger.info(f"Successfully converted: {primary.name}")
+                info = {
+                    'file_path': primary,
                     'year': year,
                     'filing_date': filing_date,
                     'ticker': ticker,
                     'accession_number': accession_dir.name
-                })
+                }
+                if 'pdf' in artifacts:
+                    info['pdf_path'] = artifacts['pdf']
+                if 'text' in artifacts:
+                    info['text_path'] = artifacts['text']
+                converted_pdfs.append(info)
 
                 # Cleanup original if requested
                 if cleanup_originals:
@@ -435,8 +489,10 @@ class SECConverter:
                         self.logger.info(f"Deleted original folder: {accession_dir.name}")
                     except Exception as e:
                         self.logger.warning(f"Could not delete {accession_dir.name}: {str(e)}")
+            elif output_formats[0] == 'pdf':
+                self.logger.error(f"Failed to convert {file_stem}.pdf after {self.conversion_retries + 1} attempts")
             else:
-                self.logger.error(f"Failed to convert {pdf_filename} after {self.conversion_retries + 1} attempts")
+                self.logger.error(f"Failed to extract text for {file_stem}")
 
         self.logger.info(f"Converted {len(converted_pdfs)} filings for {ticker}")
         return converted_pdfs
@@ -476,10 +532,16 @@ class SECConverter:
         return results
 
     def close(self):
-        """Close the WebDriver."""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+        """
+        Release browser resources.
+
+        Shared pool browsers stay warm for other converters; only a private
+        pool (custom driver path/headless setting) is shut down.
+        """
+        # __init__ may have failed before these were set (close() runs from __del__)
+        browser_pool = getattr(self, '_browser_pool', None)
+        if getattr(self, '_owns_pool', False) and browser_pool is not None:
+            browser_pool.close()
             self.logger.info("Browser closed")
 
     def __del__(self):
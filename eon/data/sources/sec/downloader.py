@@ -3,15 +3,31 @@
 """
 SEC Edgar downloader for 10-K filings.
 Extracted and refactored from standardized_sec_ai/tenk_processor.py
+
+Filing documents are fetched straight from the EDGAR archive through the
+shared SECRequestQueue (pooled connections, cross-process token bucket),
+using the cached submissions document to find them. Files are laid out
+as before:
+
+    {base_path}/sec-edgar-filings/{TICKER or CIK}/{form}/{accession}/primary-document.html
 """
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Set, Tuple
-from sec_edgar_downloader import Downloader
 import requests
 
 from eon.core import get_logger, DownloadError, is_annual_filing, is_quarterly_filing
+from eon.ai.api_config import get_sec_limits
+from eon.data.sources.sec.prefetch import FilingPrefetcher
 from eon.data.sources.sec.request_queue import get_sec_request_queue
+from eon.data.sources.sec.ticker_index import TickerIndex, get_ticker_index
+from eon.data.sources.sec.submissions_cache import SubmissionsCache
+
+
+ARCHIVE_URL = "https://www.sec.gov/Archives/edgar/data/{cik}/{accession}/{document}"
 
 
 class SECDownloader:
@@ -30,7 +46,9 @@ class SECDownloader:
         self,
         company_name: str = "Research Script",
         user_email: str = "user@example.com",
-        base_path: Optional[Path] = None
+        base_path: Optional[Path] = None,
+        ticker_index: Optional[TickerIndex] = None,
+        submissions_cache: Optional[SubmissionsCache] = None
     ):
         """
         Initialize the SEC downloader.
@@ -39,9 +57,12 @@ class SECDownloader:
             company_name: Your company/script name for SEC compliance
             user_email: Your email for SEC compliance (required by SEC)
             base_path: Base directory for downloads (default: ./data/raw/sec_filings)
+            ticker_index: Ticker -> CIK index (default: shared process-wide index)
+            submissions_cache: Submissions JSON cache (default: {base_path}/submissions)
         """
         self.company_name = company_name
         self.user_email = user_email
+        self.ticker_index = ticker_index if ticker_index is not None else get_ticker_index()
 
         if base_path is None:
             from eon.core import get_config
@@ -53,6 +74,17 @@ class SECDownloader:
         self.base_path.mkdir(parents=True, exist_ok=True)
         self.logger = get_logger(f"{__name__}.SECDownloader")
 
+        # One submissions document per company serves every metadata method
+        self.submissions = submissions_cache or SubmissionsCache(
+            cache_dir=self.base_path / "submissions",
+            request_func=lambda url, headers: self._make_sec_request(url, headers),
+            headers={
+                'User-Agent': f'{self.company_name} {self.user_email}',
+                'Accept-Encoding': 'gzip, deflate',
+                'Host': 'data.sec.gov'
+            }
+        )
+
     def _make_sec_request(
         self,
         url: str,
@@ -76,10 +108,96 @@ class SECDownloader:
         Raises:
             requests.RequestException: If the request fails
         """
-        queue = get_sec_request_queue()
-        return queue.execute_with_lock(
-            lambda: requests.get(url, headers=headers, timeout=timeout)
+        return get_sec_request_queue().get(url, headers=headers, timeout=timeout)
+
+    def _fetch_filings(
+        self,
+        identifier: str,
+        cik: str,
+        filing_type: str,
+        num_filings: int
+    ) -> int:
+        """
+        Download the most recent filings of a type into the local layout.
+
+        Documents already on disk are skipped. Downloads run concurrently
+        (up to EON_SEC_MAX_CONCURRENT); the request queue keeps the
+        combined rate within SEC limits.
+
+        Args:
+            identifier: Directory name for the company (ticker or padded CIK)
+            cik: Zero-padded CIK
+            filing_type: Type of filing (amendments are not included)
+            num_filings: Number of recent filings to download
+
+        Returns:
+            Number of filings available locally after the download
+        """
+        filings = self._find_filings(cik, filing_type, num_filings, include_amends=False)
+        if not filings:
+            return 0
+
+        target_dir = self.get_filing_path(identifier, filing_type)
+        workers = max(1, min(len(filings), get_sec_limits().MAX_CONCURRENT_REQUESTS))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sec-fetch") as pool:
+            results = list(pool.map(
+                lambda filing: self._fetch_filing(cik, filing, target_dir), filings
+            ))
+
+        return sum(results)
+
+    def _fetch_filing(self, cik: str, filing: Dict, target_dir: Path) -> bool:
+        """
+        Download one filing's primary document.
+
+        Filings without a primary document (pre-2001 text filings) fall
+        back to the complete submission text file.
+
+        Args:
+            cik: Zero-padded CIK
+            filing: Filing metadata from _find_filings()
+            target_dir: Directory holding one folder per accession number
+
+        Returns:
+            True if the filing is available locally
+        """
+        accession = filing['accession_number']
+        if not accession:
+            return False
+
+        primary = (filing.get('primary_document') or '').rsplit('/', 1)[-1]
+        if primary:
+            # Same naming as before: primary-document.html / .txt / .xml
+            suffix = Path(primary).suffix.lower() or '.html'
+            if suffix == '.htm':
+                suffix = '.html'
+            document, save_name = primary, f"primary-document{suffix}"
+        else:
+            document, save_name = f"{accession}.txt", "full-submission.txt"
+
+        save_path = target_dir / accession / save_name
+        if save_path.exists():
+            return True
+
+        url = ARCHIVE_URL.format(
+            cik=cik.lstrip('0'), accession=accession.replace('-', ''), document=document
         )
+        headers = {'User-Agent': f'{self.company_name} {self.user_email}'}
+
+        try:
+            response = self._make_sec_request(url, headers, timeout=60)
+            response.raise_for_status()
+
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = save_path.with_name(f".{save_name}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(response.content)
+            os.replace(tmp_path, save_path)
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"Error downloading filing {accession}: {e}")
+            return False
 
     def download(
         self,
@@ -105,21 +223,14 @@ class SECDownloader:
         self.logger.info(f"Downloading {num_filings} {filing_type} filings for {ticker}")
 
         try:
-            dl = Downloader(
-                self.company_name,
-                self.user_email,
-                str(self.base_path)
-            )
-
-            num_downloaded = dl.get(
-                filing_type,
-                ticker,
-                limit=num_filings,
-                download_details=True
-            )
+            cik = self._get_cik_from_ticker(ticker)
+            if not cik:
+                raise DownloadError(f"Could not find CIK for ticker {ticker}")
+
+            num_downloaded = self._fetch_filings(ticker, cik, filing_type, num_filings)
 
             if num_downloaded > 0:
-                filing_path = self.base_path / "sec-edgar-filings" / ticker / filing_type
+                filing_path = self.get_filing_path(ticker, filing_type)
                 self.logger.info(f"Downloaded {num_downloaded} filings to {filing_path}")
                 return filing_path
             else:
@@ -185,6 +296,9 @@ class SECDownloader:
         """
         Download filings for multiple tickers.
 
+        Companies are downloaded concurrently (see FilingPrefetcher); the
+        shared request queue keeps the combined rate within SEC limits.
+
         Args:
             tickers: List of stock ticker symbols
             num_filings: Number of recent filings to download per ticker
@@ -193,15 +307,18 @@ class SECDownloader:
         Returns:
             Dictionary mapping ticker -> filing path (or None if failed)
         """
-        results = {}
+        prefetched = FilingPrefetcher(
+            self,
+            filing_type=filing_type,
+            num_filings=num_filings,
+            max_concurrent=get_sec_limits().MAX_CONCURRENT_REQUESTS
+        ).prefetch(tickers)
 
-        for ticker in tickers:
-            try:
-                filing_path = self.download(ticker, num_filings, filing_type)
-                results[ticker] = filing_path
-            except DownloadError as e:
-                self.logger.error(f"Failed to download {ticker}: {e}")
-                results[ticker] = None
+        results = {}
+        for ticker, result in prefetched.items():
+            if result.error:
+                self.logger.error(f"Failed to download {ticker}: {result.error}")
+            results[ticker] = result.filing_path
 
         successful = sum(1 for path in results.values() if path is not None)
         self.logger.info(
@@ -214,8 +331,8 @@ class SECDownloader:
         """
         Query SEC API to get all available filing types for a ticker.
 
-        This queries the SEC EDGAR company submissions endpoint to retrieve
-        all filing types that have been filed by the company.
+        This reads the SEC EDGAR company submissions document (cached) to
+        retrieve all filing types that have been filed by the company.
 
         Args:
             ticker: Stock ticker symbol
@@ -232,44 +349,17 @@ class SECDownloader:
 
         try:
             # First, get the CIK (Central Index Key) for the ticker
-            # SEC provides a ticker-to-CIK mapping file
             cik = self._get_cik_from_ticker(ticker)
 
             if not cik:
                 raise DownloadError(f"Could not find CIK for ticker {ticker}")
 
-            # Query the company submissions endpoint
-            headers = {
-                'User-Agent': f'{self.company_name} {self.user_email}',
-                'Accept-Encoding': 'gzip, deflate',
-                'Host': 'data.sec.gov'
-            }
-
-            url = f"https://data.sec.gov/submissions/CIK{cik}.json"
-            self.logger.debug(f"Fetching submissions from {url}")
-
-            response = self._make_sec_request(url, headers)
-            response.raise_for_status()
-
-            data = response.json()
-
-            # Extract filing types from recent filings
-            filing_types: Dict[str, int] = {}
+            result = self._count_filing_types(self._get_submissions(cik))
 
-            if 'filings' in data and 'recent' in data['filings']:
-                recent = data['filings']['recent']
-                if 'form' in recent:
-                    for form in recent['form']:
-                        filing_types[form] = filing_types.get(form, 0) + 1
-
-            if not filing_types:
+            if not result:
                 self.logger.warning(f"No filings found for {ticker}")
                 return []
 
-            # Sort by frequency (most common first)
-            sorted_types = sorted(filing_types.items(), key=lambda x: x[1], reverse=True)
-            result = [form for form, _ in sorted_types]
-
             self.logger.info(f"Found {len(result)} filing types for {ticker}: {result[:10]}")
             return result
 
@@ -282,10 +372,104 @@ class SECDownloader:
             self.logger.error(error_msg)
             raise DownloadError(error_msg) from e
 
+    def _get_submissions(self, cik: str) -> Dict:
+        """
+        Get the (cached) SEC submissions document for a CIK.
+
+        Args:
+            cik: CIK number (will be zero-padded)
+
+        Returns:
+            Parsed submissions JSON
+
+        Raises:
+            DownloadError: If SEC has no submissions for the CIK
+            requests.RequestException: If SEC can't be reached and nothing is cached
+        """
+        data = self.submissions.get(cik)
+        if data is None:
+            raise DownloadError(f"CIK {cik} not found in SEC database")
+        return data
+
+    @staticmethod
+    def _count_filing_types(data: Dict) -> List[str]:
+        """Get filing types from recent filings, most common first."""
+        filing_types: Dict[str, int] = {}
+
+        recent = data.get('filings', {}).get('recent', {})
+        for form in recent.get('form', []):
+            filing_types[form] = filing_types.get(form, 0) + 1
+
+        sorted_types = sorted(filing_types.items(), key=lambda x: x[1], reverse=True)
+        return [form for form, _ in sorted_types]
+
+    def _find_filings(
+        self,
+        cik: str,
+        filing_type: str,
+        limit: int,
+        include_amends: bool = True
+    ) -> List[Dict]:
+        """
+        Collect filing metadata for a filing type, newest first.
+
+        Reads recent filings first and only pages into the older-history
+        shards (filings.files) if the limit hasn't been reached.
+
+        Args:
+            cik: Zero-padded CIK
+            filing_type: Type of filing (e.g., 10-K, 10-Q, 8-K)
+            limit: Maximum number of filings to return
+            include_amends: Also match amendments (e.g. 10-K/A)
+
+        Returns:
+            List of filing metadata dicts
+        """
+        filing_type_upper = filing_type.upper()
+        fiscal_year_end = self._get_submissions(cik).get('fiscalYearEnd') or '1231'  # MMDD format
+
+        filings = []
+        for table in self.submissions.iter_filing_tables(cik):
+            forms = table.get('form', [])
+            filing_dates = table.get('filingDate', [])
+            report_dates = table.get('reportDate', [])
+            accession_numbers = table.get('accessionNumber', [])
+            primary_docs = table.get('primaryDocument', [])
+
+            for i, form in enumerate(forms):
+                # Match filing type (handle amendments like 10-K/A)
+                if form.upper() == filing_type_upper or (
+                    include_amends and form.upper() == f"{filing_type_upper}/A"
+                ):
+                    if i >= len(report_dates) or not report_dates[i]:
+                        continue
+
+                    report_date = report_dates[i]
+                    fiscal_year = self._get_fiscal_year(report_date, fiscal_year_end)
+                    fiscal_quarter = self._get_fiscal_quarter(report_date, fiscal_year_end, filing_type_upper)
+
+                    filings.append({
+                        'accession_number': accession_numbers[i] if i < len(accession_numbers) else None,
+                        'filing_date': filing_dates[i] if i < len(filing_dates) else None,
+                        'report_date': report_date,
+                        'fiscal_year': fiscal_year,
+                        'fiscal_quarter': fiscal_quarter,
+                        'primary_document': primary_docs[i] if i < len(primary_docs) else None,
+                        'form': form
+                    })
+
+                    if len(filings) >= limit:
+                        return filings
+
+        return filings
+
     def _get_cik_from_ticker(self, ticker: str) -> Optional[str]:
         """
         Get CIK (Central Index Key) from ticker symbol.
 
+        Uses the shared ticker index, which only downloads
+        company_tickers.json when its local copy is missing or stale.
+
         Args:
             ticker: Stock ticker symbol
 
@@ -295,26 +479,10 @@ class SECDownloader:
         ticker = ticker.upper()
 
         try:
-            headers = {
-                'User-Agent': f'{self.company_name} {self.user_email}',
-                'Accept-Encoding': 'gzip, deflate',
-                'Host': 'www.sec.gov'
-            }
-
-            # Use the company tickers endpoint
-            url = "https://www.sec.gov/files/company_tickers.json"
-
-            response = self._make_sec_request(url, headers)
-            response.raise_for_status()
-
-            data = response.json()
-
-            # Search for the ticker in the data
-            for key, company in data.items():
-                if company.get('ticker', '').upper() == ticker:
-                    cik = str(company.get('cik_str', ''))
-                    # Pad CIK to 10 digits
-                    return cik.zfill(10)
+            self.ticker_index.ensure_loaded(self._fetch_company_tickers)
+            cik = self.ticker_index.get_cik(ticker)
+            if cik:
+                return cik
 
             self.logger.warning(f"Ticker {ticker} not found in SEC database")
             return None
@@ -323,6 +491,44 @@ class SECDownloader:
             self.logger.error(f"Error getting CIK for {ticker}: {str(e)}")
             return None
 
+    def _fetch_company_tickers(self) -> Dict:
+        """
+        Download SEC's company_tickers.json (ticker -> CIK mapping).
+
+        Returns:
+            Parsed JSON payload keyed by row number
+        """
+        headers = {
+            'User-Agent': f'{self.company_name} {self.user_email}',
+            'Accept-Encoding': 'gzip, deflate',
+            'Host': 'www.sec.gov'
+        }
+
+        url = "https://www.sec.gov/files/company_tickers.json"
+        self.logger.info("Refreshing ticker index from SEC company_tickers.json")
+
+        response = self._make_sec_request(url, headers)
+        response.raise_for_status()
+        return response.json()
+
+    def search_companies(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Fuzzy search for companies by ticker or name.
+
+        Args:
+            query: Ticker or (partial) company name, e.g. "berkshire"
+            limit: Maximum number of matches
+
+        Returns:
+            List of dicts with 'ticker', 'cik' and 'company_name'
+        """
+        try:
+            self.ticker_index.ensure_loaded(self._fetch_company_tickers)
+        except Exception as e:
+            self.logger.error(f"Error loading ticker index: {str(e)}")
+            return []
+        return self.ticker_index.search(query, limit=limit)
+
     def get_filing_path(self, ticker: str, filing_type: str = "10-K") -> Path:
         """
         Get the path where filings for a ticker would be stored.
@@ -381,60 +587,13 @@ class SECDownloader:
             - primary_document: Main document filename
         """
         ticker = ticker.upper()
-        filing_type_upper = filing_type.upper()
 
         try:
             cik = self._get_cik_from_ticker(ticker)
             if not cik:
                 raise DownloadError(f"Could not find CIK for ticker {ticker}")
 
-            headers = {
-                'User-Agent': f'{self.company_name} {self.user_email}',
-                'Accept-Encoding': 'gzip, deflate',
-                'Host': 'data.sec.gov'
-            }
-
-            url = f"https://data.sec.gov/submissions/CIK{cik}.json"
-
-            response = self._make_sec_request(url, headers)
-            response.raise_for_status()
-
-            data = response.json()
-            fiscal_year_end = data.get('fiscalYearEnd', '1231')  # MMDD format
-
-            if 'filings' not in data or 'recent' not in data['filings']:
-                return []
-
-            recent = data['filings']['recent']
-            forms = recent.get('form', [])
-            filing_dates = recent.get('filingDate', [])
-            report_dates = recent.get('reportDate', [])
-            accession_numbers = recent.get('accessionNumber', [])
-            primary_docs = recent.get('primaryDocument', [])
-
-            filings = []
-            for i, form in enumerate(forms):
-                # Match filing type (handle amendments like 10-K/A)
-                if form.upper() == filing_type_upper or form.upper() == f"{filing_type_upper}/A":
-                    if i >= len(report_dates) or not report_dates[i]:
-                        continue
-
-                    report_date = report_dates[i]
-                    fiscal_year = self._get_fiscal_year(report_date, fiscal_year_end)
-                    fiscal_quarter = self._get_fiscal_quarter(report_date, fiscal_year_end, filing_type_upper)
-
-                    filings.append({
-                        'accession_number': accession_numbers[i] if i < len(accession_numbers) else None,
-                        'filing_date': filing_dates[i] if i < len(filing_dates) else None,
-                        'report_date': report_date,
-                        'fiscal_year': fiscal_year,
-                        'fiscal_quarter': fiscal_quarter,
-                        'primary_document': primary_docs[i] if i < len(primary_docs) else None,
-                        'form': form
-                    })
-
-                    if len(filings) >= limit:
-                        break
+            filings = self._find_filings(cik, filing_type, limit)
 
             self.logger.info(f"Found {len(filings)} {filing_type} filings for {ticker}")
             return filings
@@ -530,19 +689,7 @@ class SECDownloader:
             if not cik:
                 return None
 
-            headers = {
-                'User-Agent': f'{self.company_name} {self.user_email}',
-                'Accept-Encoding': 'gzip, deflate',
-                'Host': 'data.sec.gov'
-            }
-
-            url = f"https://data.sec.gov/submissions/CIK{cik}.json"
-
-            response = self._make_sec_request(url, headers)
-            response.raise_for_status()
-
-            data = response.json()
-            return data.get('fiscalYearEnd', '1231')
+            return self._get_submissions(cik).get('fiscalYearEnd', '1231')
 
         except Exception as e:
             self.logger.error(f"Error getting fiscal year end for {ticker}: {str(e)}")
@@ -577,24 +724,14 @@ class SECDownloader:
         cik_padded = cik.zfill(10)
 
         try:
-            headers = {
-                'User-Agent': f'{self.company_name} {self.user_email}',
-                'Accept-Encoding': 'gzip, deflate',
-                'Host': 'data.sec.gov'
-            }
-
-            url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
             self.logger.info(f"Fetching company info for CIK {cik_padded}")
 
-            response = self._make_sec_request(url, headers)
+            data = self.submissions.get(cik_padded)
 
-            if response.status_code == 404:
+            if data is None:
                 self.logger.warning(f"CIK {cik} not found in SEC database")
                 return None
 
-            response.raise_for_status()
-            data = response.json()
-
             return {
                 'cik': cik_padded,
                 'company_name': data.get('name', 'Unknown'),
@@ -636,23 +773,11 @@ class SECDownloader:
         self.logger.info(f"Downloading {num_filings} {filing_type} filings for CIK {cik_padded}")
 
         try:
-            dl = Downloader(
-                self.company_name,
-                self.user_email,
-                str(self.base_path)
-            )
-
-            # The sec_edgar_downloader library accepts CIK as the identifier
-            num_downloaded = dl.get(
-                filing_type,
-                cik_padded,
-                limit=num_filings,
-                download_details=True
-            )
+            num_downloaded = self._fetch_filings(cik_padded, cik_padded, filing_type, num_filings)
 
             if num_downloaded > 0:
                 # Filings are stored under CIK directory
-                filing_path = self.base_path / "sec-edgar-filings" / cik_padded / filing_type
+                filing_path = self.get_filing_path_by_cik(cik_padded, filing_type)
                 self.logger.info(f"Downloaded {num_downloaded} filings to {filing_path}")
                 return filing_path
             else:
@@ -718,55 +843,9 @@ class SECDownloader:
             List of filing metadata dicts
         """
         cik_padded = cik.zfill(10)
-        filing_type_upper = filing_type.upper()
 
         try:
-            headers = {
-                'User-Agent': f'{self.company_name} {self.user_email}',
-                'Accept-Encoding': 'gzip, deflate',
-                'Host': 'data.sec.gov'
-            }
-
-            url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
-
-            response = self._make_sec_request(url, headers)
-            response.raise_for_status()
-
-            data = response.json()
-            fiscal_year_end = data.get('fiscalYearEnd', '1231')
-
-            if 'filings' not in data or 'recent' not in data['filings']:
-                return []
-
-            recent = data['filings']['recent']
-            forms = recent.get('form', [])
-            filing_dates = recent.get('filingDate', [])
-            report_dates = recent.get('reportDate', [])
-            accession_numbers = recent.get('accessionNumber', [])
-            primary_docs = recent.get('primaryDocument', [])
-
-            filings = []
-            for i, form in enumerate(forms):
-                if form.upper() == filing_type_upper or form.upper() == f"{filing_type_upper}/A":
-                    if i >= len(report_dates) or not report_dates[i]:
-                        continue
-
-                    report_date = report_dates[i]
-                    fiscal_year = self._get_fiscal_year(report_date, fiscal_year_end)
-                    fiscal_quarter = self._get_fiscal_quarter(report_date, fiscal_year_end, filing_type_upper)
-
-                    filings.append({
-                        'accession_number': accession_numbers[i] if i < len(accession_numbers) else None,
-                        'filing_date': filing_dates[i] if i < len(filing_dates) else None,
-                        'report_date': report_date,
-                        'fiscal_year': fiscal_year,
-                        'fiscal_quarter': fiscal_quarter,
-                        'primary_document': primary_docs[i] if i < len(primary_docs) else None,
-                        'form': form
-                    })
-
-                    if len(filings) >= limit:
-                        break
+            filings = self._find_filings(cik_padded, filing_type, limit)
 
             self.logger.info(f"Found {len(filings)} {filing_type} filings for CIK {cik_padded}")
             return filings
@@ -789,34 +868,12 @@ class SECDownloader:
         self.logger.info(f"Querying available filing types for CIK {cik_padded}")
 
         try:
-            headers = {
-                'User-Agent': f'{self.company_name} {self.user_email}',
-                'Accept-Encoding': 'gzip, deflate',
-                'Host': 'data.sec.gov'
-            }
+            result = self._count_filing_types(self._get_submissions(cik_padded))
 
-            url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
-
-            response = self._make_sec_request(url, headers)
-            response.raise_for_status()
-
-            data = response.json()
-
-            filing_types: Dict[str, int] = {}
-
-            if 'filings' in data and 'recent' in data['filings']:
-                recent = data['filings']['recent']
-                if 'form' in recent:
-                    for form in recent['form']:
-                        filing_types[form] = filing_types.get(form, 0) + 1
-
-            if not filing_types:
+            if not result:
                 self.logger.warning(f"No filings found for CIK {cik_padded}")
                 return []
 
-            sorted_types = sorted(filing_types.items(), key=lambda x: x[1], reverse=True)
-            result = [form for form, _ in sorted_types]
-
             self.logger.info(f"Found {len(result)} filing types for CIK {cik_padded}: {result[:10]}")
             return result
 
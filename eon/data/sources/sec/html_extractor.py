@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native text extractor for SEC filings (HTML, iXBRL and full-submission.txt).
+
+Turns EDGAR primary documents straight into clean text without the
+HTML -> headless Chrome -> PDF -> PyPDF2 round trip. Tables are kept as
+one row per line with cells joined by " | " (or tabs), which preserves
+financial statements far better than PDF text extraction.
+
+PDF paths are delegated to PDFExtractor, so filings cached as PDFs by
+earlier runs stay readable through the same extractor.
+
+Example:
+    extractor = HTMLExtractor()
+    text = extractor.extract_text(Path("primary-document.html"))
+"""
+
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from eon.core import get_logger, ExtractionError
+
+from .extractor import PDFExtractor
+
+
+TABLE_FORMATS = ('pipe', 'tsv')
+
+# Tags that start a new line in the rendered text
+_BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'center', 'dd', 'div',
+    'dl', 'dt', 'figcaption', 'figure', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5',
+    'h6', 'header', 'hr', 'li', 'ol', 'p', 'pre', 'section', 'ul',
+}
+
+# Tags whose content is never rendered (ix:header holds hidden iXBRL facts)
+_SKIP_TAGS = {'script', 'style', 'title', 'noscript', 'ix:header'}
+
+# Cells SEC tables split off from their numbers: "$" | "1,234" | ")"
+_LEADING_FRAGMENTS = {'$', '(', '($', '$('}
+_TRAILING_FRAGMENTS = {')', '%', ')%', '%)'}
+
+_DOCUMENT_RE = re.compile(r'<DOCUMENT>(.*?)</DOCUMENT>', re.S | re.I)
+_TEXT_RE = re.compile(r'<TEXT>(.*?)</TEXT>', re.S | re.I)
+_HTML_HINT_RE = re.compile(r'<(html|body|div|p|font|span|td)\b', re.I)
+_SGML_LAYOUT_TAGS_RE = re.compile(r'</?(PAGE|S|C|TABLE|CAPTION|FN)>', re.I)
+
+
+class _FilingHTMLParser(HTMLParser):
+    """Streaming HTML -> text renderer with table support."""
+
+    def __init__(self, table_format: str = 'pipe'):
+        super().__init__(convert_charrefs=True)
+        self._separator = '\t' if table_format == 'tsv' else ' | '
+        self._out: List[str] = []
+        self._tables: List[Dict] = []
+        self._skip_depth = 0
+        self._pre_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+
+        if tag == 'table':
+            self._tables.append({'rows': [], 'row': None, 'cell': None})
+        elif tag == 'tr' and self._tables:
+            self._close_row()
+            self._tables[-1]['row'] = []
+        elif tag in ('td', 'th') and self._tables:
+            table = self._tables[-1]
+            self._close_cell()
+            if table['row'] is None:
+                table['row'] = []
+            table['cell'] = []
+        elif tag in _BLOCK_TAGS:
+            if tag == 'pre':
+                self._pre_depth += 1
+            self._newline()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth:
+            return
+
+        if tag in ('td', 'th') and self._tables:
+            self._close_cell()
+        elif tag == 'tr' and self._tables:
+            self._close_row()
+        elif tag == 'table' and self._tables:
+            self._close_table()
+        elif tag in _BLOCK_TAGS and tag not in ('br', 'hr'):
+            if tag == 'pre':
+                self._pre_depth = max(0, self._pre_depth - 1)
+            self._newline()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if not self._pre_depth:
+            data = re.sub(r'\s+', ' ', data)
+        self._sink().append(data)
+
+    def get_text(self) -> str:
+        """Finish parsing and return the rendered text."""
+        self.close()
+        while self._tables:
+            self._close_table()
+        return ''.join(self._out)
+
+    def _sink(self) -> List[str]:
+        """Buffer that text currently belongs to (open cell or document)."""
+        if self._tables:
+            table = self._tables[-1]
+            if table['cell'] is None:
+                if table['row'] is None:
+                    table['row'] = []
+                table['cell'] = []
+            return table['cell']
+        return self._out
+
+    def _newline(self):
+        # Cells render on a single line, so block breaks become spaces there
+        self._sink().append(' ' if self._tables else '\n')
+
+    def _close_cell(self):
+        table = self._tables[-1]
+        if table['cell'] is not None:
+            table['row'].append(' '.join(''.join(table['cell']).split()))
+            table['cell'] = None
+
+    def _close_row(self):
+        table = self._tables[-1]
+        self._close_cell()
+        if table['row'] is not None:
+            cells = _merge_cells(table['row'])
+            if cells:
+                table['rows'].append(cells)
+            table['row'] = None
+
+    def _close_table(self):
+        self._close_row()
+        table = self._tables.pop()
+        lines = [self._separator.join(cells) for cells in table['rows']]
+        if not lines:
+            return
+        if self._tables:
+            # Nested layout table: flatten into the enclosing cell
+            self._sink().append(' ' + ' '.join(lines) + ' ')
+        else:
+            self._out.append('\n' + '\n'.join(lines) + '\n')
+
+
+def _merge_cells(cells: List[str]) -> List[str]:
+    """
+    Drop empty spacer cells and re-attach split-off currency/sign fragments.
+
+    SEC tables typically render "$ (1,234)" as four cells: "$", "(1,234", ")"
+    plus empty padding cells. Merging them keeps each value in one column.
+    """
+    merged: List[str] = []
+    for cell in cells:
+        if not cell:
+            continue
+        if merged and cell in _TRAILING_FRAGMENTS:
+            merged[-1] += cell
+        elif merged and merged[-1] in _LEADING_FRAGMENTS:
+            merged[-1] += cell
+        else:
+            merged.append(cell)
+    return merged
+
+
+def _tidy(text: str) -> str:
+    """Trim lines, collapse runs of spaces and blank lines."""
+    lines = []
+    blank = False
+    for line in text.replace('\xa0', ' ').splitlines():
+        line = re.sub(r' {2,}', ' ', line).strip()
+        if not line:
+            if lines and not blank:
+                lines.append('')
+            blank = True
+            continue
+        lines.append(line)
+        blank = False
+    return '\n'.join(lines).strip()
+
+
+def html_to_text(html: str, table_format: str = 'pipe') -> str:
+    """
+    Render an HTML (or inline XBRL) document as plain text.
+
+    Args:
+        html: HTML source
+        table_format: 'pipe' (cells joined by " | ") or 'tsv' (tab-separated)
+
+    Returns:
+        Clean text with one table row per line
+    """
+    parser = _FilingHTMLParser(table_format=table_format)
+    parser.feed(html)
+    return _tidy(parser.get_text())
+
+
+def submission_primary_document(submission: str) -> str:
+    """
+    Get the primary document body from an EDGAR full-submission.txt bundle.
+
+    The bundle concatenates every document (primary filing, exhibits,
+    graphics, XBRL) as <DOCUMENT> blocks; by EDGAR convention the first
+    block is the primary document.
+
+    Args:
+        submission: Raw full-submission.txt contents
+
+    Returns:
+        Contents of the first document's <TEXT> block, or the input
+        unchanged if it is not an SGML bundle
+    """
+    document = _DOCUMENT_RE.search(submission)
+    if not document:
+        return submission
+    body = _TEXT_RE.search(document.group(1))
+    return body.group(1) if body else document.group(1)
+
+
+class HTMLExtractor:
+    """
+    Extracts text from SEC filing documents without a browser.
+
+    Handles primary-document HTML/iXBRL, full-submission.txt SGML bundles
+    (both HTML and pre-2001 plain-text filings), and PDFs via PDFExtractor.
+    Implements the IExtractor protocol.
+
+    Example:
+        extractor = HTMLExtractor(table_format="tsv")
+        text = extractor.extract_text(filing_path)
+    """
+
+    # Part of the extracted-text cache key: bump whenever a change alters
+    # the text produced for the same filing (PDFs included, via PDFExtractor)
+    VERSION = 1
+
+    def __init__(self, table_format: str = 'pipe', pdf_extractor: Optional[PDFExtractor] = None):
+        """
+        Initialize the HTML extractor.
+
+        Args:
+            table_format: 'pipe' or 'tsv' rendering for table rows
+            pdf_extractor: Extractor used for .pdf paths (created lazily)
+        """
+        if table_format not in TABLE_FORMATS:
+            raise ValueError(f"table_format must be one of {TABLE_FORMATS}, got {table_format!r}")
+
+        self.table_format = table_format
+        self._pdf_extractor = pdf_extractor
+        self.logger = get_logger(f"{__name__}.HTMLExtractor")
+
+    def extract_text(self, file_path: Path) -> Optional[str]:
+        """
+        Extract text from a filing document.
+
+        Args:
+            file_path: Path to an .htm/.html, .txt (full submission) or .pdf file
+
+        Returns:
+            Extracted text or None if the document has no text
+
+        Raises:
+            ExtractionError: If the file is missing or can't be parsed
+        """
+        file_path = Path(file_path)
+
+        if file_path.suffix.lower() == '.pdf':
+            if self._pdf_extractor is None:
+                self._pdf_extractor = PDFExtractor()
+            return self._pdf_extractor.extract_text(file_path)
+
+        if not file_path.exists():
+            raise ExtractionError(f"Filing not found: {file_path}")
+
+        try:
+            self.logger.info(f"Extracting text from {file_path.name}")
+            text = self.extract_from_string(self._read(file_path))
+        except ExtractionError:
+            raise
+        except Exception as e:
+            error_msg = f"Error extracting text from {file_path.name}: {str(e)}"
+            self.logger.error(error_msg)
+            raise ExtractionError(error_msg) from e
+
+        self.logger.info(f"Extracted {len(text):,} characters from {file_path.name}")
+
+        if not text:
+            self.logger.warning(f"No text extracted from {file_path.name}")
+            return None
+
+        return text
+
+    def extract_from_string(self, content: str) -> str:
+        """
+        Extract text from raw filing contents.
+
+        Args:
+            content: HTML document or full-submission.txt contents
+
+        Returns:
+            Extracted text (may be empty)
+        """
+        body = submission_primary_document(content)
+
+        if _HTML_HINT_RE.search(body[:100_000]):
+            return html_to_text(body, table_format=self.table_format)
+
+        # Pre-HTML EDGAR filings are preformatted text; keep the column
+        # alignment and only drop the SGML layout markers
+        text = _SGML_LAYOUT_TAGS_RE.sub('', body)
+        lines = [line.rstrip() for line in text.replace('\xa0', ' ').splitlines()]
+        return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+    @staticmethod
+    def _read(file_path: Path) -> str:
+        """Read a filing, falling back to Latin-1 for legacy encodings."""
+        raw = file_path.read_bytes()
+        try:
+            return raw.decode('utf-8')
+        except UnicodeDecodeError:
+            return raw.decode('latin-1')
@@ -0,0 +1,350 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Asyncio prefetcher that downloads SEC filings ahead of analysis.
+
+Batch runs used to download each company's filings inside the worker
+that analyzes it, so LLM workers sat idle on SEC I/O. The prefetcher
+resolves CIKs, pulls submissions and downloads primary documents for a
+whole ticker list on an event loop, several companies at a time, and
+keeps at most ``lookahead`` companies on disk ahead of the consumer.
+Requests still go through the shared SECRequestQueue, so the combined
+rate stays within SEC limits.
+
+SECDownloader is synchronous (pooled requests session), so each company
+runs in a worker thread via asyncio.to_thread; the event loop only
+schedules and bounds the work.
+
+Usage:
+    # One-shot: download everything, return when done
+    results = FilingPrefetcher(downloader).prefetch(["AAPL", "MSFT"])
+
+    # Pipelined: download ahead while a consumer works through the list
+    prefetcher = FilingPrefetcher(downloader, lookahead=5)
+    prefetcher.start(tickers)
+    for ticker in tickers:
+        prefetcher.wait_for(ticker, timeout=300)
+        prefetcher.mark_consumed(ticker)
+        analyze(ticker)
+    prefetcher.stop()
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from eon.core import get_logger, IDownloader, is_annual_filing, is_quarterly_filing
+
+
+@dataclass
+class PrefetchResult:
+    """Outcome of prefetching one company's filings."""
+    identifier: str
+    filing_path: Optional[Path] = None
+    metadata: List[Dict] = field(default_factory=list)
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.filing_path is not None and self.error is None
+
+
+def filings_to_request(filing_type: str, num_years: int) -> int:
+    """
+    Number of filings AnalysisService downloads to cover num_years.
+
+    Mirrors its download sizing (one filing per year plus a buffer,
+    four per year for quarterly filings, capped at 20) so prefetched
+    documents are exactly the ones the analysis will look for.
+    """
+    if is_annual_filing(filing_type) or is_quarterly_filing(filing_type):
+        count = num_years * (4 if is_quarterly_filing(filing_type) else 1)
+        return min(count + 5, 20)
+    return num_years
+
+
+class FilingPrefetcher:
+    """
+    Downloads filings for many companies concurrently, ahead of use.
+
+    Thread-safe: start()/wait_for()/mark_consumed() may be called from any
+    thread; the event loop runs in its own daemon thread.
+
+    Example:
+        prefetcher = FilingPrefetcher(SECDownloader(), filing_type="10-K", num_years=5)
+        results = prefetcher.prefetch(["AAPL", "MSFT", "GOOGL"])
+    """
+
+    def __init__(
+        self,
+        downloader: IDownloader,
+        filing_type: str = "10-K",
+        num_years: int = 5,
+        input_mode: str = 'ticker',
+        max_concurrent: int = 4,
+        lookahead: int = 8,
+        num_filings: Optional[int] = None
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            downloader: SEC downloader (shared by all prefetch tasks)
+            filing_type: Filing type to download
+            num_years: Years of filings the analysis will need
+            input_mode: 'ticker' or 'cik' - how identifiers are interpreted
+            max_concurrent: Companies downloading at the same time
+            lookahead: Companies kept downloaded ahead of the consumer
+                (pipelined mode only)
+            num_filings: Filings per company (default: derived from num_years)
+        """
+        self.downloader = downloader
+        self.filing_type = filing_type
+        self.num_filings = num_filings or filings_to_request(filing_type, num_years)
+        self.input_mode = input_mode
+        self.max_concurrent = max(1, max_concurrent)
+        self.lookahead = max(1, lookahead)
+
+        self._lock = threading.Lock()
+        self._results: Dict[str, PrefetchResult] = {}
+        self._started: Dict[str, threading.Event] = {}  # identifier -> done event
+        self._consumed: set = set()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._window: Optional[asyncio.Semaphore] = None
+        self._stopping = False
+
+        self.logger = get_logger(f"{__name__}.FilingPrefetcher")
+
+    # ------------------------------------------------------------------
+    # One-shot mode
+    # ------------------------------------------------------------------
+
+    def prefetch(self, identifiers: Iterable[str]) -> Dict[str, PrefetchResult]:
+        """
+        Download filings for every identifier and wait for completion.
+
+        Args:
+            identifiers: Tickers (or CIKs in 'cik' mode)
+
+        Returns:
+            Mapping of identifier -> PrefetchResult
+        """
+        return asyncio.run(self.prefetch_async(identifiers))
+
+    async def prefetch_async(self, identifiers: Iterable[str]) -> Dict[str, PrefetchResult]:
+        """
+        Async variant of prefetch() for callers already in an event loop.
+
+        Args:
+            identifiers: Tickers (or CIKs in 'cik' mode)
+
+        Returns:
+            Mapping of identifier -> PrefetchResult
+        """
+        identifiers = self._normalize(identifiers)
+        in_flight = asyncio.Semaphore(self.max_concurrent)
+
+        async def bounded(identifier: str) -> PrefetchResult:
+            async with in_flight:
+                return await self._fetch(identifier)
+
+        began = time.perf_counter()
+        results = await asyncio.gather(*(bounded(i) for i in identifiers))
+
+        succeeded = sum(1 for r in results if r.success)
+        self.logger.info(
+            f"Prefetched {self.filing_type} filings for {succeeded}/{len(results)} companies "
+            f"in {time.perf_counter() - began:.1f}s"
+        )
+        return {result.identifier: result for result in results}
+
+    # ------------------------------------------------------------------
+    # Pipelined mode
+    # ------------------------------------------------------------------
+
+    def start(self, identifiers: Iterable[str]) -> None:
+        """
+        Start downloading in the background, in list order.
+
+        At most ``lookahead`` companies are downloaded but not yet
+        consumed; call mark_consumed() as the consumer picks each one up.
+
+        Args:
+            identifiers: Tickers (or CIKs), in the order they'll be consumed
+        """
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Prefetcher is already running")
+
+        identifiers = self._normalize(identifiers)
+        self._stopping = False
+        self._loop = asyncio.new_event_loop()
+        self._window = asyncio.Semaphore(self.lookahead)
+        self._thread = threading.Thread(
+            target=self._run_pipeline,
+            args=(identifiers,),
+            daemon=True,
+            name="FilingPrefetcher"
+        )
+        self._thread.start()
+        self.logger.info(
+            f"Prefetching {len(identifiers)} companies in the background "
+            f"(lookahead {self.lookahead}, {self.max_concurrent} concurrent)"
+        )
+
+    def wait_for(self, identifier: str, timeout: Optional[float] = None) -> Optional[PrefetchResult]:
+        """
+        Wait for an identifier's prefetch if it is in progress.
+
+        Returns immediately when the identifier was never scheduled or
+        hasn't started yet - the caller then downloads it itself.
+
+        Args:
+            identifier: Ticker or CIK
+            timeout: Maximum seconds to wait
+
+        Returns:
+            PrefetchResult if the prefetch finished, otherwise None
+        """
+        identifier = self._key(identifier)
+        with self._lock:
+            done = self._started.get(identifier)
+        if done is None or not done.wait(timeout):
+            return None
+        with self._lock:
+            return self._results.get(identifier)
+
+    def mark_consumed(self, identifier: str) -> None:
+        """
+        Tell the prefetcher the consumer has picked up an identifier.
+
+        Frees one lookahead slot so the next company can start downloading.
+        Unknown or repeated identifiers are ignored.
+
+        Args:
+            identifier: Ticker or CIK
+        """
+        identifier = self._key(identifier)
+        with self._lock:
+            if identifier in self._consumed:
+                return
+            self._consumed.add(identifier)
+            if identifier not in self._started:
+                return  # Never took a lookahead slot; the scheduler will skip it
+            loop, window = self._loop, self._window
+        if loop is not None and window is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(window.release)
+            except RuntimeError:
+                pass  # Loop finished between the check and the call
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop scheduling new downloads and wait for the loop to finish.
+
+        Downloads already running finish in their worker threads.
+
+        Args:
+            timeout: Seconds to wait for the background thread
+        """
+        self._stopping = True
+        loop, window = self._loop, self._window
+        if loop is not None and window is not None and not loop.is_closed():
+            try:
+                # Wake the scheduler if it is waiting for a lookahead slot
+                loop.call_soon_threadsafe(window.release)
+            except RuntimeError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def get_results(self) -> Dict[str, PrefetchResult]:
+        """Get results for every identifier prefetched so far."""
+        with self._lock:
+            return dict(self._results)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _run_pipeline(self, identifiers: List[str]) -> None:
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._pipeline(identifiers))
+        except Exception as e:
+            self.logger.error(f"Prefetch pipeline failed: {e}")
+        finally:
+            self._loop.close()
+
+    async def _pipeline(self, identifiers: List[str]) -> None:
+        in_flight = asyncio.Semaphore(self.max_concurrent)
+        tasks = []
+
+        async def bounded(identifier: str):
+            async with in_flight:
+                await self._fetch(identifier)
+
+        for identifier in identifiers:
+            with self._lock:
+                if identifier in self._consumed or identifier in self._started:
+                    continue
+
+            await self._window.acquire()
+            if self._stopping:
+                break
+
+            with self._lock:
+                if identifier in self._consumed:
+                    # The consumer got here first and downloads it itself
+                    skip = True
+                else:
+                    skip = False
+                    self._started[identifier] = threading.Event()
+            if skip:
+                self._window.release()
+                continue
+            tasks.append(asyncio.ensure_future(bounded(identifier)))
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _fetch(self, identifier: str) -> PrefetchResult:
+        """Download one company in a worker thread and record the result."""
+        with self._lock:
+            done = self._started.setdefault(identifier, threading.Event())
+
+        began = time.perf_counter()
+        try:
+            if self.input_mode == 'cik':
+                filing_path, metadata = await asyncio.to_thread(
+                    self.downloader.download_with_metadata_by_cik,
+                    identifier, self.num_filings, self.filing_type
+                )
+            else:
+                filing_path, metadata = await asyncio.to_thread(
+                    self.downloader.download_with_metadata,
+                    identifier, self.num_filings, self.filing_type
+                )
+            result = PrefetchResult(identifier, filing_path, metadata or [])
+        except Exception as e:
+            self.logger.warning(f"Prefetch failed for {identifier}: {e}")
+            result = PrefetchResult(identifier, error=str(e))
+
+        result.seconds = time.perf_counter() - began
+        with self._lock:
+            self._results[identifier] = result
+        done.set()
+        return result
+
+    def _key(self, identifier: str) -> str:
+        identifier = identifier.strip().upper()
+        return identifier.zfill(10) if self.input_mode == 'cik' else identifier
+
+    def _normalize(self, identifiers: Iterable[str]) -> List[str]:
+        """Normalize identifiers, dropping duplicates but keeping order."""
+        return list(dict.fromkeys(self._key(i) for i in identifiers if i and i.strip()))
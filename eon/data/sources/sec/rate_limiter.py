@@ -4,70 +4,75 @@
 Global SEC API rate limiter for cross-process coordination.
 
 Ensures compliance with SEC EDGAR rate limits (10 requests/second)
-across multiple parallel workers by using file-based locking.
+across multiple parallel workers with a token bucket whose state lives in
+a shared file. The file lock is only held for the few microseconds it
+takes to refill and take a token - never while sleeping or while a
+request is in flight - so callers in every process can burst up to the
+configured rate.
 """
 
+import json
+import os
 import time
 import threading
 import portalocker
 from pathlib import Path
-from datetime import datetime
 from typing import Optional
 
 from eon.core import get_logger, get_config
+from eon.ai.api_config import get_sec_limits
 
 
 class SECRateLimiter:
     """
-    Global rate limiter for SEC EDGAR API requests.
+    Cross-process token-bucket rate limiter for SEC EDGAR requests.
 
-    SEC EDGAR has a rate limit of 10 requests per second. With 25 parallel
-    workers, we need global coordination to avoid hitting this limit.
-
-    Uses file-based locking for cross-process safety, similar to the
-    Gemini request queue approach.
+    The bucket holds up to ``burst`` tokens and refills at
+    ``requests_per_second``. Each request takes one token; when the bucket
+    is empty, callers sleep (outside the lock) until the next token is due.
 
     Features:
     - Configurable requests per second (default: 8, leaving buffer)
-    - File-based locking for cross-process coordination
+    - Bursts up to the bucket size without any waiting
+    - Shared state file + file lock for cross-process coordination
     - Thread-safe within a process
-    - Automatic request spacing
 
     Usage:
         limiter = SECRateLimiter()
 
         # Before making SEC request:
-        limiter.acquire()  # Blocks until request is allowed
-        try:
-            # Make SEC request
-            response = requests.get(sec_url)
-        finally:
-            limiter.release()  # Record request completion
+        limiter.acquire()  # Blocks until a token is available
+        response = session.get(sec_url)
 
         # Or use context manager:
         with limiter:
-            response = requests.get(sec_url)
+            response = session.get(sec_url)
     """
 
     # SEC allows 10 req/sec, we use 8 to leave buffer
     DEFAULT_REQUESTS_PER_SECOND = 8
-    MIN_INTERVAL_SECONDS = 1.0 / DEFAULT_REQUESTS_PER_SECOND  # 0.125 seconds
 
     def __init__(
         self,
-        requests_per_second: int = DEFAULT_REQUESTS_PER_SECOND,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        burst: Optional[int] = None,
         lock_dir: Optional[Path] = None
     ):
         """
         Initialize SEC rate limiter.
 
         Args:
-            requests_per_second: Maximum requests per second (default: 8)
-            lock_dir: Directory for lock file (default: data/api_usage/)
+            requests_per_second: Sustained request rate (default: 8)
+            burst: Bucket size - requests allowed back-to-back (default: one
+                second's worth of requests)
+            lock_dir: Directory for lock/state files (default: data/api_usage/)
         """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+
         self.logger = get_logger(f"{__name__}.SECRateLimiter")
-        self.requests_per_second = requests_per_second
-        self.min_interval = 1.0 / requests_per_second
+        self.requests_per_second = float(requests_per_second)
+        self.burst = max(1, int(burst if burst is not None else requests_per_second))
 
         # Determine lock directory
         if lock_dir:
@@ -78,82 +83,63 @@ class SECRateLimiter:
 
         self._lock_dir.mkdir(parents=True, exist_ok=True)
         self._lock_file = self._lock_dir / "sec_request.lock"
-        self._timestamp_file = self._lock_dir / "sec_last_request.txt"
+        self._state_file = self._lock_dir / "sec_token_bucket.json"
 
-        # Thread lock for within-process coordination
+        # Thread lock for within-process coordination (cheaper than the file lock)
         self._thread_lock = threading.Lock()
 
+        self._stats_lock = threading.Lock()
+        self._stats = {'acquired': 0, 'waits': 0, 'wait_seconds': 0.0}
+
         # Ensure lock file exists
         self._lock_file.touch(exist_ok=True)
 
         self.logger.info(
             f"SECRateLimiter initialized "
-            f"(max {requests_per_second} req/sec, interval {self.min_interval:.3f}s)"
+            f"({self.requests_per_second:g} req/sec, burst {self.burst})"
         )
 
     def acquire(self, timeout: float = 30.0) -> bool:
         """
-        Acquire permission to make a SEC request.
-
-        Blocks until it's safe to make a request according to rate limits.
-        Uses both thread-local lock and file-based lock for coordination.
+        Take one token, waiting for the bucket to refill if it is empty.
 
         Args:
             timeout: Maximum seconds to wait (default: 30)
 
         Returns:
-            True if acquired, False if timeout
+            True if a token was taken, False on timeout
         """
-        start_time = time.time()
+        deadline = time.time() + timeout
+        waited = 0.0
 
         while True:
-            # Check timeout
-            elapsed = time.time() - start_time
-            if elapsed >= timeout:
-                self.logger.warning(f"SEC rate limiter timeout after {timeout}s")
-                return False
-
             try:
-                with open(self._lock_file, 'r+') as f:
-                    # Acquire exclusive lock
-                    portalocker.lock(f, portalocker.LOCK_EX | portalocker.LOCK_NB)
-
-                    try:
-                        # Check last request time
-                        last_request = self._read_last_request_time()
-                        now = time.time()
-
-                        if last_request:
-                            time_since_last = now - last_request
-                            if time_since_last < self.min_interval:
-                                # Need to wait
-                                wait_time = self.min_interval - time_since_last
-                                portalocker.unlock(f)
-                                time.sleep(wait_time)
-                                continue
-
-                        # Update last request time
-                        self._write_last_request_time(now)
-                        return True
-
-                    finally:
-                        portalocker.unlock(f)
-
-            except portalocker.LockException:
-                # Lock held by another process, wait briefly
-                time.sleep(0.01)
-                continue
-
+                wait = self._try_take()
             except Exception as e:
                 self.logger.error(f"SEC rate limiter error: {e}")
                 # Fall through and allow request to avoid blocking
                 return True
 
+            if wait <= 0:
+                self._record(waited)
+                return True
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                self.logger.warning(f"SEC rate limiter timeout after {timeout}s")
+                return False
+
+            # Sleep without holding any lock; other processes may take the
+            # next token first, in which case we simply wait again
+            pause = min(wait, remaining)
+            time.sleep(pause)
+            waited += pause
+
     def release(self):
         """
         Release the rate limiter (no-op for this implementation).
 
-        The timing is handled in acquire(), so release is a no-op.
+        Tokens are consumed in acquire(), so release is a no-op.
         Kept for API consistency with context manager usage.
         """
         pass
@@ -168,23 +154,61 @@ class SECRateLimiter:
         self.release()
         return False
 
-    def _read_last_request_time(self) -> Optional[float]:
-        """Read last request timestamp from file."""
+    def get_stats(self) -> dict:
+        """Get limiter statistics (tokens taken, waits, total wait time)."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update(requests_per_second=self.requests_per_second, burst=self.burst)
+        return stats
+
+    def _try_take(self) -> float:
+        """
+        Refill the shared bucket and take a token if one is available.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until the next token
+        """
+        with self._thread_lock:
+            with open(self._lock_file, 'r+') as f:
+                portalocker.lock(f, portalocker.LOCK_EX)
+                try:
+                    now = time.time()
+                    tokens, updated = self._read_state(now)
+                    # Clamp for clock steps backwards
+                    tokens = min(self.burst, tokens + max(0.0, now - updated) * self.requests_per_second)
+
+                    if tokens >= 1:
+                        self._write_state(tokens - 1, now)
+                        return 0.0
+
+                    self._write_state(tokens, now)
+                    return (1 - tokens) / self.requests_per_second
+                finally:
+                    portalocker.unlock(f)
+
+    def _read_state(self, now: float):
+        """Read (tokens, updated_at); a missing/corrupt file means a full bucket."""
         try:
-            if self._timestamp_file.exists():
-                content = self._timestamp_file.read_text().strip()
-                if content:
-                    return float(content)
-        except (ValueError, IOError):
-            pass
-        return None
-
-    def _write_last_request_time(self, timestamp: float):
-        """Write last request timestamp to file."""
+            state = json.loads(self._state_file.read_text())
+            return float(state['tokens']), float(state['updated'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return float(self.burst), now
+
+    def _write_state(self, tokens: float, updated: float):
+        """Write bucket state (atomic replace, so readers never see a partial file)."""
+        tmp_path = self._state_file.with_suffix(f".{os.getpid()}.tmp")
         try:
-            self._timestamp_file.write_text(str(timestamp))
-        except IOError as e:
-            self.logger.warning(f"Failed to write SEC timestamp: {e}")
+            tmp_path.write_text(json.dumps({'tokens': tokens, 'updated': updated}))
+            os.replace(tmp_path, self._state_file)
+        except OSError as e:
+            self.logger.warning(f"Failed to write SEC token bucket state: {e}")
+
+    def _record(self, waited: float):
+        with self._stats_lock:
+            self._stats['acquired'] += 1
+            if waited > 0:
+                self._stats['waits'] += 1
+                self._stats['wait_seconds'] += waited
 
     def wait_if_needed(self):
         """
@@ -206,13 +230,18 @@ def get_sec_rate_limiter() -> SECRateLimiter:
     """
     Get or create the global SEC rate limiter instance.
 
-    Thread-safe singleton pattern.
+    Thread-safe singleton pattern. Rate and burst come from get_sec_limits().
     """
     global _sec_limiter_instance
     if _sec_limiter_instance is None:
         with _sec_limiter_lock:
             if _sec_limiter_instance is None:
-                _sec_limiter_instance = SECRateLimiter()
+                limits = get_sec_limits()
+                _sec_limiter_instance = SECRateLimiter(
+                    requests_per_second=limits.REQUESTS_PER_SECOND,
+                    burst=limits.BURST,
+                    lock_dir=Path(limits.LOCK_DIR),
+                )
     return _sec_limiter_instance
 
 
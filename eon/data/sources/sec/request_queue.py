@@ -3,86 +3,143 @@
 """
 SEC EDGAR request queue with cross-process rate limiting.
 
-Uses file-based locking (portalocker) for process-safe coordination across:
+All SEC traffic (metadata JSON and filing documents) goes through one
+pooled HTTP session per process - keep-alive connections and gzip - and
+a shared token-bucket limiter (SECRateLimiter) that coordinates across:
 - Single-threaded CLI
 - Multi-threaded UI
 - Multi-process batch processing
 - Mixed CLI + UI execution
 
-SEC's fair access policy recommends no more than 10 requests per second.
-This module provides configurable delays and concurrency limits to prevent
-overwhelming SEC servers during batch processing with multiple workers.
+SEC's fair access policy allows no more than 10 requests per second.
+The limiter lets callers burst up to the configured rate; no lock is held
+while a request is in flight or while waiting for a token.
 
 Cross-platform compatible (Windows, macOS, Linux).
 """
 
-import portalocker
 import time
 import threading
 from pathlib import Path
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict
 
-from eon.core import get_logger
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from eon.core import get_logger, DownloadError
 from eon.ai.api_config import get_sec_limits
+from eon.data.sources.sec.rate_limiter import SECRateLimiter
+
+
+def create_sec_session(pool_size: int = 10) -> requests.Session:
+    """
+    Create a pooled HTTP session for SEC EDGAR.
+
+    Connections are kept alive and reused across requests and responses
+    are gzip-compressed. Only failed connections are retried here; 429/5xx
+    responses are retried by SECRequestQueue.get so that every attempt
+    takes a rate limiter token.
+
+    Args:
+        pool_size: Connections kept per host
+
+    Returns:
+        Configured requests.Session
+    """
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        status=0,
+        backoff_factor=1.0,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    return session
+
+
+# Responses worth retrying: SEC throttling and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
 
 
 class SECRequestQueue:
     """
     Manages SEC EDGAR request rate limiting with cross-process safety.
 
-    Uses two levels of concurrency control:
-    1. Global semaphore - Limits total concurrent SEC requests
-    2. Single file lock - Ensures sequential access to SEC API
+    Uses two levels of control:
+    1. Global semaphore - Limits concurrent SEC requests in this process
+    2. Token bucket - Limits the request rate across all processes
 
     Unlike the Gemini queue (which uses per-key locks), SEC uses a single
-    global lock since it's a public API without API keys. This ensures
-    all workers across all processes respect the configured delay.
-
-    File-based locking works across:
-    - Multiple threads in same process
-    - Multiple processes (CLI batch mode)
-    - Different Python scripts running simultaneously
+    global bucket since it's a public API without API keys. The bucket's
+    file lock is only held while taking a token, so requests themselves
+    run in parallel.
 
-    Lock file is created at: data/api_usage/sec_edgar_request.lock
+    State files are created in: data/api_usage/
 
     Usage:
         queue = get_sec_request_queue()
-        result = queue.execute_with_lock(
-            request_func=download_func,
-            *args,
-            **kwargs
-        )
+        response = queue.get(url, headers={'User-Agent': 'Name email'})
+
+        # Or wrap any callable:
+        result = queue.execute_with_lock(download_func, *args, **kwargs)
     """
 
     def __init__(
         self,
         lock_dir: Optional[Path] = None,
-        request_delay: Optional[float] = None,
-        max_concurrent: Optional[int] = None
+        requests_per_second: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+        burst: Optional[int] = None,
+        rate_limiter: Optional[SECRateLimiter] = None,
+        session: Optional[requests.Session] = None,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        acquire_timeout: float = 30.0
     ):
         """
         Initialize SEC request queue with rate limiting.
 
         Args:
-            lock_dir: Directory for lock files (default: data/api_usage/)
-            request_delay: Seconds to wait after each request (default from config)
+            lock_dir: Directory for lock/state files (default: data/api_usage/)
+            requests_per_second: Sustained request rate (default from config)
             max_concurrent: Max concurrent requests (default from config)
+            burst: Requests allowed back-to-back (default from config)
+            rate_limiter: Limiter to use (default: built from the above)
+            session: HTTP session to use (default: pooled SEC session)
+            max_retries: Retries for 429/5xx responses in get()
+            backoff_factor: Retry delay is backoff_factor * 2**attempt seconds
+                unless the response sends Retry-After
+            acquire_timeout: Max seconds to wait for a rate limiter token
         """
         limits = get_sec_limits()
 
         if lock_dir is None:
             lock_dir = Path(limits.LOCK_DIR)
 
-        self.lock_dir = lock_dir
-        self._request_delay = request_delay if request_delay is not None else limits.REQUEST_DELAY
+        self.lock_dir = Path(lock_dir)
         self._max_concurrent = max_concurrent if max_concurrent is not None else limits.MAX_CONCURRENT_REQUESTS
 
+        self.rate_limiter = rate_limiter or SECRateLimiter(
+            requests_per_second=requests_per_second if requests_per_second is not None else limits.REQUESTS_PER_SECOND,
+            burst=burst if burst is not None else limits.BURST,
+            lock_dir=self.lock_dir,
+        )
+        self.session = session or create_sec_session(pool_size=self._max_concurrent)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.acquire_timeout = acquire_timeout
+
         # Global semaphore for concurrency control
         self._semaphore = threading.BoundedSemaphore(self._max_concurrent)
 
-        # Single lock file for all SEC requests (simpler than per-key like Gemini)
-        self._lock_file_path = self.lock_dir / "sec_edgar_request.lock"
-
         # Statistics tracking
         self._stats_lock = threading.Lock()
         self._total_requests = 0
@@ -90,15 +147,67 @@ class SECRequestQueue:
         self._total_wait_time = 0.0
         self._last_request_time = 0.0
 
-        # Ensure lock directory exists
-        self.lock_dir.mkdir(parents=True, exist_ok=True)
-
         self.logger = get_logger(f"{__name__}.SECRequestQueue")
         self.logger.info(
             f"Initialized SECRequestQueue: max_concurrent={self._max_concurrent}, "
-            f"request_delay={self._request_delay}s, lock_dir={self.lock_dir}"
+            f"rate={self.rate_limiter.requests_per_second:g} req/s "
+            f"(burst {self.rate_limiter.burst}), lock_dir={self.lock_dir}"
         )
 
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Rate-limited GET through the pooled session.
+
+        429 and 5xx responses are retried with backoff (honouring
+        Retry-After). Each attempt goes back through execute_with_lock, so
+        retries take their own token and count against the shared rate.
+
+        Args:
+            url: SEC URL to request
+            headers: Request headers (must include User-Agent for SEC compliance)
+            timeout: Request timeout in seconds
+            **kwargs: Passed to requests.Session.get (e.g. stream=True)
+
+        Returns:
+            Response object (the last one if every retry was throttled)
+
+        Raises:
+            requests.RequestException: If the request fails
+            DownloadError: If no rate limiter token became available in time
+        """
+        attempt = 0
+        while True:
+            response = self.execute_with_lock(
+                self.session.get, url, headers=headers, timeout=timeout, **kwargs
+            )
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                return response
+
+            delay = self._retry_delay(response, attempt)
+            self.logger.warning(
+                f"SEC returned {response.status_code} for {url}, "
+                f"retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})"
+            )
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait before retrying, from Retry-After or exponential backoff."""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), 60.0)
+            except ValueError:
+                pass  # HTTP-date form - fall back to backoff
+        return self.backoff_factor * (2 ** attempt)
+
     def execute_with_lock(
         self,
         request_func: Callable,
@@ -109,12 +218,10 @@ class SECRequestQueue:
         Execute a SEC request with rate limiting and concurrency control.
 
         This method:
-        1. Acquires a slot from the global semaphore (limits total concurrency)
-        2. Acquires the cross-process file lock (ensures sequential SEC access)
+        1. Acquires a slot from the global semaphore (limits concurrency)
+        2. Takes a token from the shared bucket (waits, lock-free, if empty)
         3. Executes the request function
         4. Records timing and updates stats
-        5. Sleeps for configured delay (mandatory)
-        6. Releases locks
 
         Process-safe: Works across separate Python processes
         Thread-safe: Works across threads in same process
@@ -128,96 +235,44 @@ class SECRequestQueue:
             The return value from request_func
 
         Raises:
-            Any exception raised by request_func (after mandatory delay)
+            DownloadError: If no rate limiter token became available in time
+            Any exception raised by request_func
         """
         wait_start = time.time()
 
-        self.logger.debug(
-            f"Acquiring semaphore slot (max concurrent: {self._max_concurrent})"
-        )
-
-        # Step 1: Acquire semaphore slot
         self._semaphore.acquire()
-        semaphore_acquired = True
-
         try:
-            semaphore_wait = time.time() - wait_start
-            self.logger.debug(f"Semaphore acquired (waited {semaphore_wait:.2f}s)")
-
-            # Ensure lock file exists
-            self._lock_file_path.touch(exist_ok=True)
-
-            # Step 2: Acquire file lock for cross-process coordination
-            self.logger.debug("Acquiring SEC global file lock")
-
-            with open(self._lock_file_path, 'a+') as lock_file:
-                try:
-                    # Acquire exclusive lock (blocks if another process holds it) - cross-platform
-                    portalocker.lock(lock_file, portalocker.LOCK_EX)
-
-                    lock_wait = time.time() - wait_start
-                    self.logger.debug(f"File lock acquired (total wait {lock_wait:.2f}s)")
-
-                    try:
-                        # Step 3: Execute the request
-                        request_start = time.time()
-                        result = request_func(*args, **kwargs)
-                        request_duration = time.time() - request_start
-
-                        # Update statistics
-                        self._update_stats(request_duration, is_error=False)
-
-                        self.logger.debug(
-                            f"SEC request complete ({request_duration:.2f}s), "
-                            f"sleeping {self._request_delay}s"
-                        )
-
-                        # Step 4: Mandatory delay after request
-                        time.sleep(self._request_delay)
-
-                        return result
-
-                    except Exception as e:
-                        # Update stats for failed request
-                        self._update_stats(0, is_error=True)
-
-                        self.logger.warning(
-                            f"SEC request failed: {e}, still sleeping {self._request_delay}s"
-                        )
-
-                        # Still sleep to avoid hammering SEC on errors
-                        time.sleep(self._request_delay)
-                        raise
-
-                finally:
-                    # Release file lock (cross-platform)
-                    portalocker.unlock(lock_file)
-                    self.logger.debug("Released SEC file lock")
+            if not self.rate_limiter.acquire(timeout=self.acquire_timeout):
+                self._update_stats(time.time() - wait_start, is_error=True)
+                raise DownloadError(
+                    f"Timed out after {self.acquire_timeout:g}s waiting for the SEC rate limiter"
+                )
+            waited = time.time() - wait_start
+            if waited > 0.5:
+                self.logger.debug(f"Waited {waited:.2f}s for SEC request slot")
+
+            try:
+                result = request_func(*args, **kwargs)
+            except Exception as e:
+                self._update_stats(waited, is_error=True)
+                self.logger.warning(f"SEC request failed: {e}")
+                raise
+
+            self._update_stats(waited, is_error=False)
+            return result
 
         finally:
-            # Always release semaphore
-            if semaphore_acquired:
-                self._semaphore.release()
-                self.logger.debug("Released semaphore slot")
+            self._semaphore.release()
 
-    def _update_stats(self, duration: float, is_error: bool):
+    def _update_stats(self, wait_time: float, is_error: bool):
         """Update request statistics."""
         with self._stats_lock:
             self._total_requests += 1
+            self._total_wait_time += wait_time
             self._last_request_time = time.time()
             if is_error:
                 self._total_errors += 1
 
-    def set_request_delay(self, seconds: float):
-        """
-        Update the delay between SEC requests.
-
-        Args:
-            seconds: Seconds to wait after each request
-        """
-        self._request_delay = seconds
-        self.logger.info(f"Updated SEC request delay to {seconds}s")
-
     def set_max_concurrent(self, max_concurrent: int):
         """
         Update maximum concurrent SEC requests.
@@ -232,6 +287,10 @@ class SECRequestQueue:
         self._semaphore = threading.BoundedSemaphore(max_concurrent)
         self.logger.info(f"Updated SEC max concurrent to {max_concurrent}")
 
+    def close(self):
+        """Close pooled HTTP connections."""
+        self.session.close()
+
     def get_stats(self) -> dict:
         """
         Get queue statistics.
@@ -243,7 +302,9 @@ class SECRequestQueue:
             return {
                 'total_requests': self._total_requests,
                 'total_errors': self._total_errors,
-                'request_delay': self._request_delay,
+                'total_wait_time': self._total_wait_time,
+                'requests_per_second': self.rate_limiter.requests_per_second,
+                'burst': self.rate_limiter.burst,
                 'max_concurrent': self._max_concurrent,
                 'lock_dir': str(self.lock_dir),
                 'last_request_time': self._last_request_time,
@@ -284,4 +345,6 @@ def reset_sec_request_queue():
     """
     global _global_queue
     with _queue_creation_lock:
+        if _global_queue is not None:
+            _global_queue.close()
         _global_queue = None
@@ -0,0 +1,428 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Item-level section parser for 10-K, 10-Q and 20-F filings.
+
+Analyzers used to send the whole extracted filing to the model: exhibits,
+signatures, XBRL residue and every financial statement note included.
+This module finds the "Item N." headings once per filing, caches the
+section offsets, and lets callers keep only the items they need, which
+cuts input tokens per call (more companies fit in each key's TPM budget)
+and keeps bloated filings under the context limit.
+
+Sections are requested by item ("1A", "7", for 10-Qs "I-2", "II-1A") or
+by name ("risk_factors", "mdna"), which maps to the right item for each
+form. Text that can't be segmented (other forms, unusual layouts) is
+passed through whole.
+
+Usage:
+    text = select_sections(filing_text, ("business", "risk_factors", "mdna"))
+
+    index = get_section_cache().get_index(filing_text)
+    index.find("7A")    # FilingSection(key="7A", title="Quantitative and ...", start=..., end=...)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from eon.core import get_logger, get_config
+
+# Bump when parsing changes so cached offsets from older parsers are ignored
+PARSER_VERSION = 1
+
+FORM_TYPES = ("10-K", "10-Q", "20-F")
+
+# Section name -> item key, per form
+SECTION_ALIASES: Dict[str, Dict[str, str]] = {
+    "10-K": {
+        "business": "1",
+        "risk_factors": "1A",
+        "unresolved_staff_comments": "1B",
+        "cybersecurity": "1C",
+        "properties": "2",
+        "legal_proceedings": "3",
+        "market_for_equity": "5",
+        "mdna": "7",
+        "market_risk": "7A",
+        "financial_statements": "8",
+        "controls": "9A",
+        "governance": "10",
+        "executive_compensation": "11",
+        "security_ownership": "12",
+        "related_transactions": "13",
+        "accountant_fees": "14",
+        "exhibits": "15",
+    },
+    "10-Q": {
+        "financial_statements": "I-1",
+        "mdna": "I-2",
+        "market_risk": "I-3",
+        "controls": "I-4",
+        "legal_proceedings": "II-1",
+        "risk_factors": "II-1A",
+        "market_for_equity": "II-2",
+        "exhibits": "II-6",
+    },
+    "20-F": {
+        # 20-F risk factors are Item 3.D, inside Key Information
+        "risk_factors": "3",
+        "business": "4",
+        "unresolved_staff_comments": "4A",
+        "mdna": "5",
+        "governance": "6",
+        "executive_compensation": "6",
+        "security_ownership": "7",
+        "related_transactions": "7",
+        "financial_statements": "8",
+        "market_risk": "11",
+        "controls": "15",
+        "accountant_fees": "16C",
+        "exhibits": "19",
+    },
+}
+
+# Item key -> item that holds its content when the item itself is only a
+# cross-reference (10-K filers often put the statements after Item 15)
+_OVERFLOW_ITEMS: Dict[str, Dict[str, str]] = {
+    "10-K": {"8": "15"},
+    "20-F": {"8": "18"},
+}
+
+# An item this short is treated as a cross-reference, not content
+_MIN_SECTION_CHARS = 2000
+
+# "Item 1A. Risk Factors", "ITEM 7 - MANAGEMENT'S ...", "Item 8. | Financial ... | 45"
+_ITEM_RE = re.compile(
+    r"^[ \t|]*(?:PART\s+(?:IV|I{1,3})\s*[,.\-–—]?\s*)?ITEM\s+(\d{1,2}[A-D]?)\b"
+    r"(?=\s*(?:[.:\-–—|]|$|(?-i:[A-Z\"“'])))\s*[.:\-–—|]?\s*(.*)$",
+    re.IGNORECASE,
+)
+_PART_RE = re.compile(r"^[ \t|]*PART\s+(IV|I{1,3})\b", re.IGNORECASE)
+_FORM_RE = re.compile(r"FORM\s+(10-K|10-Q|20-F)", re.IGNORECASE)
+
+# Headings are short lines; longer ones are prose that happens to start with "Item"
+_MAX_HEADING_CHARS = 200
+
+
+@dataclass
+class FilingSection:
+    """One item of a filing, as character offsets into the extracted text."""
+    key: str        # "1A"; 10-Q items carry their part: "II-1A"
+    title: str
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+
+@dataclass
+class SectionIndex:
+    """Section offsets for one filing text."""
+    form_type: Optional[str]
+    text_length: int
+    sections: List[FilingSection] = field(default_factory=list)
+
+    def find(self, key: str) -> Optional[FilingSection]:
+        """Get a section by item key ("7A") or name ("market_risk")."""
+        key = self.resolve(key)
+        for section in self.sections:
+            if section.key == key:
+                return section
+        return None
+
+    def resolve(self, name: str) -> str:
+        """Map a section name to this form's item key (item keys pass through)."""
+        aliases = SECTION_ALIASES.get(self.form_type or "", {})
+        return aliases.get(name.lower(), name.upper())
+
+    def select(self, names: Iterable[str]) -> List[FilingSection]:
+        """
+        Get the sections for the requested names, in filing order.
+
+        An item that is only a cross-reference (e.g. a 10-K Item 8 that
+        points to the statements after Item 15) brings in the item that
+        holds the content.
+
+        Args:
+            names: Item keys and/or section names
+
+        Returns:
+            Matching sections (missing ones are skipped)
+        """
+        overflow = _OVERFLOW_ITEMS.get(self.form_type or "", {})
+        wanted = set()
+        for name in names:
+            section = self.find(name)
+            if section is None:
+                continue
+            wanted.add(section.key)
+            if section.length < _MIN_SECTION_CHARS and section.key in overflow:
+                wanted.add(overflow[section.key])
+
+        return [section for section in self.sections if section.key in wanted]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'form_type': self.form_type,
+            'text_length': self.text_length,
+            'sections': [asdict(section) for section in self.sections],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SectionIndex':
+        """Create from dictionary."""
+        return cls(
+            form_type=data.get('form_type'),
+            text_length=data['text_length'],
+            sections=[FilingSection(**section) for section in data.get('sections', [])],
+        )
+
+
+def detect_form_type(text: str) -> Optional[str]:
+    """
+    Detect the form from a filing's cover page.
+
+    Args:
+        text: Extracted filing text
+
+    Returns:
+        "10-K", "10-Q", "20-F", or None if the cover page names none of them
+    """
+    match = _FORM_RE.search(text[:20000])
+    return match.group(1).upper() if match else None
+
+
+def parse_sections(text: str, form_type: Optional[str] = None) -> SectionIndex:
+    """
+    Find item sections in extracted filing text.
+
+    Every "Item N." heading line is a candidate. The table of contents and
+    cross-references produce candidates too, so for each item the
+    candidate followed by the most text (before the next heading) is
+    taken as the real section start. Each section runs to the start of the
+    next one; the last runs to the end of the text.
+
+    Args:
+        text: Extracted filing text
+        form_type: "10-K", "10-Q" or "20-F" (default: detected from text)
+
+    Returns:
+        SectionIndex (with no sections if no headings were found)
+    """
+    form_type = form_type or detect_form_type(text)
+    use_parts = form_type == "10-Q"
+
+    # (offset, key, title) of every heading line
+    candidates: List[Tuple[int, str, str]] = []
+    part = "I"
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped and len(stripped) <= _MAX_HEADING_CHARS:
+            part_match = _PART_RE.match(stripped)
+            if part_match:
+                part = part_match.group(1).upper()
+            item_match = _ITEM_RE.match(stripped)
+            if item_match:
+                item = item_match.group(1).upper()
+                key = f"{part}-{item}" if use_parts else item
+                title = item_match.group(2).split("|")[0].strip(" .:-–—\t")
+                candidates.append((offset, key, title))
+        offset += len(line)
+
+    # Keep, per item, the candidate with the longest run of text after it
+    best: Dict[str, Tuple[int, int, str]] = {}
+    for i, (start, key, title) in enumerate(candidates):
+        span = (candidates[i + 1][0] if i + 1 < len(candidates) else len(text)) - start
+        if key not in best or span > best[key][1]:
+            best[key] = (start, span, title)
+
+    starts = sorted((start, key, title) for key, (start, _, title) in best.items())
+    sections = [
+        FilingSection(
+            key=key,
+            title=title,
+            start=start,
+            end=starts[i + 1][0] if i + 1 < len(starts) else len(text),
+        )
+        for i, (start, key, title) in enumerate(starts)
+    ]
+    return SectionIndex(form_type=form_type, text_length=len(text), sections=sections)
+
+
+class SectionCache:
+    """
+    Section offsets per filing text, parsed once.
+
+    Offsets are keyed by the text's SHA256 and kept in memory (LRU) and on
+    disk as small JSON files, so every analyzer, perspective and process
+    that reads the same filing reuses one parse.
+
+    Example:
+        index = SectionCache(cache_dir).get_index(text)
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, memory_entries: int = 256):
+        """
+        Initialize the section cache.
+
+        Args:
+            cache_dir: Directory for cached offsets (None = memory only)
+            memory_entries: Indexes kept in memory
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.memory_entries = max(1, memory_entries)
+
+        self._lock = threading.Lock()
+        self._memory: 'OrderedDict[str, SectionIndex]' = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0}
+
+        self.logger = get_logger(f"{__name__}.SectionCache")
+
+    def get_index(self, text: str, form_type: Optional[str] = None) -> SectionIndex:
+        """
+        Get section offsets for a filing text, parsing it on a miss.
+
+        Args:
+            text: Extracted filing text
+            form_type: "10-K", "10-Q" or "20-F" (default: detected from text)
+
+        Returns:
+            SectionIndex for the text
+        """
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        key = f"{digest}-{form_type or 'auto'}-v{PARSER_VERSION}"
+
+        with self._lock:
+            index = self._memory.get(key)
+            if index is not None:
+                self._memory.move_to_end(key)
+                self._stats['hits'] += 1
+                return index
+
+        index = self._read(key)
+        if index is None:
+            index = parse_sections(text, form_type)
+            self._write(key, index)
+            with self._lock:
+                self._stats['misses'] += 1
+            self.logger.debug(
+                f"Parsed {len(index.sections)} sections from {index.form_type or 'unknown form'} "
+                f"({len(text):,} chars)"
+            )
+        else:
+            with self._lock:
+                self._stats['hits'] += 1
+
+        with self._lock:
+            self._memory[key] = index
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+        return index
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[SectionIndex]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return SectionIndex.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable section cache entry {key[:12]}: {e}")
+            return None
+
+    def _write(self, key: str, index: SectionIndex):
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index.to_dict(), f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write section cache entry {key[:12]}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+
+def select_sections(
+    text: str,
+    sections: Optional[Iterable[str]],
+    form_type: Optional[str] = None
+) -> str:
+    """
+    Keep only the requested sections of a filing.
+
+    Sections are joined in filing order, each starting at its own "Item"
+    heading. The whole text is returned when no sections are requested or
+    none of them can be found (unsupported form, unusual layout), so
+    callers never get less than they would have without section selection.
+
+    Args:
+        text: Extracted filing text
+        sections: Item keys and/or section names (None = whole filing)
+        form_type: "10-K", "10-Q" or "20-F" (default: detected from text)
+
+    Returns:
+        Text of the selected sections
+    """
+    if not text or not sections:
+        return text
+
+    index = get_section_cache().get_index(text, form_type)
+    selected = index.select(sections)
+    if not selected:
+        return text
+
+    return "\n\n".join(text[section.start:section.end].strip() for section in selected)
+
+
+# Global singleton with thread-safe initialization
+_global_cache: Optional[SectionCache] = None
+_cache_creation_lock = threading.Lock()
+
+
+def get_section_cache() -> SectionCache:
+    """
+    Get the global section cache singleton (under the configured cache dir).
+
+    Returns:
+        The global SectionCache instance
+    """
+    global _global_cache
+
+    if _global_cache is None:
+        with _cache_creation_lock:
+            if _global_cache is None:
+                _global_cache = SectionCache(get_config().get_cache_path("sections"))
+
+    return _global_cache
+
+
+def reset_section_cache():
+    """Reset the global section cache (mainly for testing)."""
+    global _global_cache
+    with _cache_creation_lock:
+        _global_cache = None
@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Disk-backed cache for SEC submissions JSON (data.sec.gov/submissions).
+
+Every metadata call on SECDownloader (available filings, filing types,
+fiscal year end, company info) needs the same CIK{cik}.json document.
+This cache fetches it once, keeps it in memory and on disk, and
+revalidates with ETag/Last-Modified once it is older than max_age, so a
+company costs one SEC round-trip instead of one per method.
+
+Older filing history lives in separate shard files listed under
+``filings.files``; those are fetched lazily (only when a caller pages
+past the recent filings) and cached on disk indefinitely since
+historical shards don't change.
+
+Layout:
+    {cache_dir}/CIK0000320193.json                    # main document + validators
+    {cache_dir}/CIK0000320193-submissions-001.json    # history shard
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import requests
+
+from eon.core import get_logger
+
+
+SUBMISSIONS_URL = "https://data.sec.gov/submissions/{name}"
+
+
+class SubmissionsCache:
+    """
+    Memoized, conditionally revalidated SEC submissions documents.
+
+    Thread-safe: concurrent requests for the same CIK share one fetch.
+    Process-safe for readers: files are written atomically (tmp + rename).
+
+    Example:
+        cache = SubmissionsCache(cache_dir, request_func=downloader._make_sec_request,
+                                 headers=headers)
+        data = cache.get("320193")
+        for table in cache.iter_filing_tables("320193"):
+            ...  # recent filings first, then older history shards
+    """
+
+    DEFAULT_MAX_AGE_SECONDS = 3600
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        request_func: Callable[[str, Dict[str, str]], requests.Response],
+        headers: Dict[str, str],
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS
+    ):
+        """
+        Initialize the submissions cache.
+
+        Args:
+            cache_dir: Directory for cached JSON documents
+            request_func: Rate-limited request function (url, headers) -> Response
+            headers: Base request headers (User-Agent etc.)
+            max_age_seconds: Serve cached data without revalidation for this long
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._request_func = request_func
+        self._headers = dict(headers)
+        self.max_age_seconds = max_age_seconds
+
+        self._memo: Dict[str, Dict[str, Any]] = {}
+        self._memo_lock = threading.Lock()
+        self._cik_locks: Dict[str, threading.Lock] = {}
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'revalidated': 0, 'fetched': 0, 'shards_fetched': 0}
+
+        self.logger = get_logger(f"{__name__}.SubmissionsCache")
+
+    def get(self, cik: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the submissions document for a CIK.
+
+        Args:
+            cik: CIK number (will be zero-padded)
+
+        Returns:
+            Parsed submissions JSON, or None if SEC has no such CIK (404)
+
+        Raises:
+            requests.RequestException: If SEC can't be reached and nothing is cached
+        """
+        cik = cik.zfill(10)
+
+        with self._lock_for(cik):
+            entry = self._memo.get(cik) or self._read_entry(self._main_path(cik))
+
+            if entry and (time.time() - entry.get('fetched_at', 0)) < self.max_age_seconds:
+                self._memo[cik] = entry
+                self._bump('hits')
+                return entry['data']
+
+            entry = self._fetch_main(cik, entry)
+            if entry is None:
+                return None
+
+            self._memo[cik] = entry
+            return entry['data']
+
+    def iter_filing_tables(self, cik: str) -> Iterator[Dict[str, list]]:
+        """
+        Iterate over filing tables, newest first.
+
+        Yields ``filings.recent`` first, then each older history shard from
+        ``filings.files``. Shards are only downloaded when the caller keeps
+        iterating, so callers that stop early never pay for history.
+
+        Args:
+            cik: CIK number (will be zero-padded)
+
+        Yields:
+            Column-oriented filing tables (form, filingDate, reportDate, ...)
+        """
+        data = self.get(cik)
+        if not data or 'filings' not in data:
+            return
+
+        filings = data['filings']
+        if 'recent' in filings:
+            yield filings['recent']
+
+        for shard in filings.get('files', []):
+            name = shard.get('name')
+            if not name:
+                continue
+            table = self._get_shard(name)
+            if table:
+                yield table
+
+    def invalidate(self, cik: Optional[str] = None) -> None:
+        """
+        Drop in-memory entries so the next get() revalidates.
+
+        Args:
+            cik: CIK to invalidate, or None for all
+        """
+        with self._memo_lock:
+            if cik is None:
+                self._memo.clear()
+            else:
+                self._memo.pop(cik.zfill(10), None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache hit/fetch counters."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _fetch_main(self, cik: str, cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Fetch (or conditionally revalidate) the main submissions document."""
+        headers = dict(self._headers)
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        url = SUBMISSIONS_URL.format(name=f"CIK{cik}.json")
+        try:
+            response = self._request_func(url, headers)
+        except requests.RequestException as e:
+            if cached:
+                self.logger.warning(f"SEC unreachable for CIK {cik}, serving cached submissions: {e}")
+                return cached
+            raise
+
+        if response.status_code == 304 and cached:
+            cached['fetched_at'] = time.time()
+            self._write_entry(self._main_path(cik), cached)
+            self._bump('revalidated')
+            return cached
+
+        if response.status_code == 404:
+            return None
+
+        response.raise_for_status()
+
+        entry = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'data': response.json(),
+        }
+        self._write_entry(self._main_path(cik), entry)
+        self._bump('fetched')
+        return entry
+
+    def _get_shard(self, name: str) -> Optional[Dict[str, list]]:
+        """Get an older-history shard, downloading it on first use."""
+        path = self.cache_dir / name
+        entry = self._read_entry(path)
+        if entry:
+            return entry['data']
+
+        with self._lock_for(name):
+            entry = self._read_entry(path)
+            if entry:
+                return entry['data']
+
+            response = self._request_func(SUBMISSIONS_URL.format(name=name), self._headers)
+            if response.status_code == 404:
+                self.logger.warning(f"Submissions shard {name} not found")
+                return None
+            response.raise_for_status()
+
+            entry = {'fetched_at': time.time(), 'data': response.json()}
+            self._write_entry(path, entry)
+            self._bump('shards_fetched')
+            return entry['data']
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        """Get the per-document lock (so concurrent callers share one fetch)."""
+        with self._memo_lock:
+            lock = self._cik_locks.get(key)
+            if lock is None:
+                lock = self._cik_locks[key] = threading.Lock()
+            return lock
+
+    def _main_path(self, cik: str) -> Path:
+        return self.cache_dir / f"CIK{cik}.json"
+
+    def _read_entry(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Read a cached entry from disk, ignoring missing or corrupt files."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry if isinstance(entry, dict) and 'data' in entry else None
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable submissions cache file {path.name}: {e}")
+            return None
+
+    def _write_entry(self, path: Path, entry: Dict[str, Any]) -> None:
+        """Write an entry atomically so other processes never see partial JSON."""
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write submissions cache file {path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _bump(self, counter: str) -> None:
+        with self._stats_lock:
+            self._stats[counter] += 1
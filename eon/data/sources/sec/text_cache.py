@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache for extracted filing text.
+
+Every analysis type and workflow reads the same 200-400 page filings, and
+extracting them (PyPDF2 in particular) is the slowest local step of a run.
+This cache stores the extracted text once per source file, keyed by the
+file's SHA256 (the same value recorded in file_cache.file_hash), so later
+runs never parse the source again. Entries are also keyed by the
+extractor that produced them (class, VERSION and table_format), so
+changing extraction never serves text rendered the old way.
+
+Entries are compressed with zstd or lz4 when installed, falling back to
+zlib, and are read back through mmap.
+
+Layout:
+    {cache_dir}/3f/3fa2...e1.zst            # compressed UTF-8 text named by source hash
+    {cache_dir}/3f/3fa2...e1.9c41...d0.zst  # ...plus a digest of the extractor variant
+
+Usage:
+    extractor = CachingExtractor(HTMLExtractor(), db=db)
+    text = extractor.extract_text(filing_path)   # parses once, then cache hits
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+from eon.core import get_logger, get_config, IExtractor
+
+
+# codec name -> (file extension, compress, decompress)
+_CODECS: Dict[str, Tuple[str, Callable, Callable]] = {}
+if ZSTD_AVAILABLE:
+    _CODECS['zstd'] = (
+        '.zst',
+        lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+if LZ4_AVAILABLE:
+    _CODECS['lz4'] = ('.lz4', lz4.frame.compress, lz4.frame.decompress)
+_CODECS['zlib'] = ('.zz', lambda data: zlib.compress(data, 6), zlib.decompress)
+
+DEFAULT_CODEC = next(iter(_CODECS))
+
+
+def compute_file_hash(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA256 hex digest of a file.
+
+    Args:
+        file_path: File to hash
+        chunk_size: Read size in bytes
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TextCache:
+    """
+    Compressed, content-addressed store of extracted text.
+
+    Thread-safe: concurrent requests for the same source share one
+    extraction. Process-safe: entries are written atomically (tmp + rename)
+    and are immutable once written.
+
+    Example:
+        cache = TextCache(cache_dir)
+        text = cache.get_or_extract(pdf_path, PDFExtractor().extract_text)
+    """
+
+    def __init__(self, cache_dir: Path, codec: Optional[str] = None):
+        """
+        Initialize the text cache.
+
+        Args:
+            cache_dir: Directory for cached text
+            codec: 'zstd', 'lz4' or 'zlib' (default: best available)
+
+        Raises:
+            ValueError: If the codec is unknown or its library isn't installed
+        """
+        codec = codec or DEFAULT_CODEC
+        if codec not in _CODECS:
+            raise ValueError(
+                f"Compression codec {codec!r} is not available "
+                f"(available: {', '.join(_CODECS)})"
+            )
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.codec = codec
+
+        self._lock = threading.Lock()
+        self._hash_locks: Dict[str, threading.Lock] = {}
+        # (path, size, mtime_ns) -> sha256, so unchanged files are hashed once
+        self._hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+        self.logger = get_logger(f"{__name__}.TextCache")
+
+    def file_hash(self, file_path: Path) -> str:
+        """
+        Get the SHA256 of a file, memoized while the file is unchanged.
+
+        Args:
+            file_path: Source file
+
+        Returns:
+            Hex digest string
+        """
+        stat = os.stat(file_path)
+        key = (str(Path(file_path).resolve()), stat.st_size, stat.st_mtime_ns)
+        cached = self._hash_memo.get(key)
+        if cached:
+            return cached
+
+        digest = compute_file_hash(file_path)
+        with self._lock:
+            self._hash_memo[key] = digest
+        return digest
+
+    def get(self, file_hash: str, variant: str = "") -> Optional[str]:
+        """
+        Read cached text for a source hash.
+
+        Args:
+            file_hash: SHA256 of the source file
+            variant: Identifies how the text was extracted (see CachingExtractor)
+
+        Returns:
+            Cached text, or None on a miss
+        """
+        for path, decompress in self._candidates(self._entry_key(file_hash, variant)):
+            try:
+                with open(path, 'rb') as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        return decompress(mapped).decode('utf-8')
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                # Empty or corrupt entry - treat as a miss (codec errors vary by library)
+                self.logger.warning(f"Ignoring unreadable text cache entry {path.name}: {e}")
+                continue
+        return None
+
+    def put(self, file_hash: str, text: str, variant: str = "") -> None:
+        """
+        Store extracted text for a source hash.
+
+        Args:
+            file_hash: SHA256 of the source file
+            text: Extracted text
+            variant: Identifies how the text was extracted (see CachingExtractor)
+        """
+        ext, compress, _ = _CODECS[self.codec]
+        path = self._entry_path(self._entry_key(file_hash, variant), ext)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_suffix(f"{ext}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(compress(text.encode('utf-8')))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write text cache entry {path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def get_or_extract(
+        self,
+        file_path: Path,
+        extract_func: Callable[[Path], Optional[str]],
+        file_hash: Optional[str] = None,
+        variant: str = ""
+    ) -> Optional[str]:
+        """
+        Get text for a file, extracting and caching it on a miss.
+
+        Args:
+            file_path: Source file (PDF, HTML or text)
+            extract_func: Extraction function used on a miss
+            file_hash: Known SHA256 of the file (skips hashing)
+            variant: Identifies how extract_func renders text (see CachingExtractor)
+
+        Returns:
+            Extracted text (None if extraction produced nothing)
+        """
+        file_hash = file_hash or self.file_hash(file_path)
+
+        text = self.get(file_hash, variant)
+        if text is not None:
+            self._bump('hits')
+            return text
+
+        with self._lock_for(self._entry_key(file_hash, variant)):
+            # Another thread may have extracted while we waited
+            text = self.get(file_hash, variant)
+            if text is not None:
+                self._bump('hits')
+                return text
+
+            self._bump('misses')
+            text = extract_func(file_path)
+            if text:
+                self.put(file_hash, text, variant)
+            return text
+
+    def invalidate(self, file_hash: str) -> None:
+        """
+        Remove cached text for a source hash, for every extractor variant.
+
+        Args:
+            file_hash: SHA256 of the source file
+        """
+        for path in (self.cache_dir / file_hash[:2]).glob(f"{file_hash}.*"):
+            path.unlink(missing_ok=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _candidates(self, key: str):
+        """Yield (path, decompress) for every codec we can read, preferred first."""
+        order = [self.codec] + [c for c in _CODECS if c != self.codec]
+        for codec in order:
+            ext, _, decompress = _CODECS[codec]
+            yield self._entry_path(key, ext), decompress
+
+    @staticmethod
+    def _entry_key(file_hash: str, variant: str) -> str:
+        if not variant:
+            return file_hash
+        return f"{file_hash}.{hashlib.sha256(variant.encode('utf-8')).hexdigest()[:16]}"
+
+    def _entry_path(self, key: str, ext: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{ext}"
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._hash_locks.get(key)
+            if lock is None:
+                lock = self._hash_locks[key] = threading.Lock()
+            return lock
+
+    def _bump(self, counter: str) -> None:
+        with self._stats_lock:
+            self._stats[counter] += 1
+
+
+class CachingExtractor:
+    """
+    IExtractor wrapper that reads every filing through a TextCache.
+
+    If a database with FileCacheMixin is attached, the hash stored in
+    file_cache.file_hash is reused while the file's size and mtime still
+    match the ones recorded with it (and backfilled otherwise), so cache
+    hits don't even need to re-hash the source file.
+
+    Entries are keyed by the wrapped extractor's class, VERSION and
+    table_format as well as the source hash.
+
+    Example:
+        extractor = CachingExtractor(HTMLExtractor(), db=db)
+        text = extractor.extract_text(Path("AAPL_10-K_2024-11-01.pdf"))
+    """
+
+    def __init__(self, extractor: IExtractor, cache: Optional[TextCache] = None, db=None):
+        """
+        Initialize the caching extractor.
+
+        Args:
+            extractor: Underlying extractor used on cache misses
+            cache: Text cache (defaults to the global cache)
+            db: Optional database repository with FileCacheMixin
+        """
+        self.extractor = extractor
+        self._cache = cache
+        self.db = db
+        self.variant = self._variant(extractor)
+        self.logger = get_logger(f"{__name__}.CachingExtractor")
+
+    @property
+    def cache(self) -> TextCache:
+        """Lazy-load the global text cache."""
+        if self._cache is None:
+            self._cache = get_text_cache()
+        return self._cache
+
+    def extract_text(self, file_path: Path) -> Optional[str]:
+        """
+        Extract text, serving repeated reads of the same content from cache.
+
+        Args:
+            file_path: Path to the filing document
+
+        Returns:
+            Extracted text or None
+
+        Raises:
+            ExtractionError: If the underlying extractor fails
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            # Let the underlying extractor raise its usual error
+            return self.extractor.extract_text(file_path)
+
+        return self.cache.get_or_extract(
+            file_path,
+            self.extractor.extract_text,
+            file_hash=self._lookup_hash(file_path),
+            variant=self.variant
+        )
+
+    @staticmethod
+    def _variant(extractor: IExtractor) -> str:
+        """Describe how an extractor renders text, for the cache key."""
+        cls = type(extractor)
+        return "|".join([
+            f"{cls.__module__}.{cls.__qualname__}",
+            f"v{getattr(cls, 'VERSION', 0)}",
+            str(getattr(extractor, 'table_format', '')),
+        ])
+
+    def _lookup_hash(self, file_path: Path) -> Optional[str]:
+        """Get the file hash from file_cache, re-hashing if the file changed since."""
+        if self.db is None:
+            return None
+        try:
+            stat = file_path.stat()
+            stored = self.db.get_file_hash(
+                str(file_path), file_size=stat.st_size, mtime_ns=stat.st_mtime_ns
+            )
+            if stored:
+                return stored
+            file_hash = self.cache.file_hash(file_path)
+            self.db.set_file_hash(
+                str(file_path), file_hash, file_size=stat.st_size, mtime_ns=stat.st_mtime_ns
+            )
+            return file_hash
+        except Exception as e:
+            self.logger.debug(f"Could not use stored file hash for {file_path.name}: {e}")
+            return None
+
+
+# Global singleton with thread-safe initialization
+_global_cache: Optional[TextCache] = None
+_cache_creation_lock = threading.Lock()
+
+
+def get_text_cache() -> TextCache:
+    """
+    Get the global text cache singleton (under the configured cache dir).
+
+    Returns:
+        The global TextCache instance
+    """
+    global _global_cache
+
+    if _global_cache is None:
+        with _cache_creation_lock:
+            if _global_cache is None:
+                _global_cache = TextCache(get_config().get_cache_path("text"))
+
+    return _global_cache
+
+
+def reset_text_cache():
+    """Reset the global text cache (mainly for testing)."""
+    global _global_cache
+    with _cache_creation_lock:
+        _global_cache = None
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+In-memory ticker -> CIK index backed by SEC's company_tickers.json.
+
+The SEC publishes a single ~10k-entry mapping of tickers to CIKs. Downloading
+it for every lookup costs several MB plus the mandatory SEC request delay, so
+this module loads it once per process, keeps it in dictionaries for O(1)
+lookups, and persists it to the database (sec_ticker_index table) so other
+processes can reuse it until the TTL expires.
+
+Usage:
+    index = get_ticker_index()
+    index.ensure_loaded(fetch_func=downloader._fetch_company_tickers)
+    cik = index.get_cik("AAPL")                 # '0000320193'
+    matches = index.search("berkshire hathaway")
+"""
+
+import difflib
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from eon.core import get_logger
+
+
+# Common corporate suffixes stripped before fuzzy name matching
+_NAME_SUFFIXES = {
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'ltd',
+    'limited', 'plc', 'llc', 'lp', 'sa', 'ag', 'nv', 'the', 'holdings',
+    'holding', 'group',
+}
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Normalize a company name for fuzzy matching.
+
+    Lowercases, drops punctuation and common corporate suffixes
+    (e.g. "Apple Inc." -> "apple").
+
+    Args:
+        name: Raw company name
+
+    Returns:
+        Normalized name string
+    """
+    words = re.sub(r"[^a-z0-9 ]+", " ", name.lower()).split()
+    kept = [w for w in words if w not in _NAME_SUFFIXES]
+    return " ".join(kept or words)
+
+
+class TickerIndex:
+    """
+    Process-wide ticker/CIK/company name index with TTL-based refresh.
+
+    Load order on first use (or once the TTL expires):
+    1. Database (sec_ticker_index table) if attached and fresh
+    2. SEC company_tickers.json via the supplied fetch function, which
+       is then persisted to the database for other processes
+
+    All lookups are dictionary hits; loading happens at most once per TTL
+    no matter how many threads ask concurrently.
+    """
+
+    DEFAULT_TTL_HOURS = 24.0
+
+    def __init__(self, db=None, ttl_hours: float = DEFAULT_TTL_HOURS):
+        """
+        Initialize the ticker index.
+
+        Args:
+            db: Optional database repository with CIKCacheMixin for persistence
+            ttl_hours: Hours before the index is considered stale
+        """
+        self.db = db
+        self.ttl_hours = ttl_hours
+
+        self._lock = threading.Lock()
+        self._by_ticker: Dict[str, Dict[str, Any]] = {}
+        self._by_cik: Dict[str, List[str]] = {}
+        self._normalized_names: Dict[str, str] = {}  # normalized name -> cik
+        self._loaded_at: Optional[float] = None
+
+        self.logger = get_logger(f"{__name__}.TickerIndex")
+
+    def attach_db(self, db) -> None:
+        """
+        Attach a database repository for persistence (first one wins).
+
+        Args:
+            db: Database repository with CIKCacheMixin
+        """
+        if self.db is None and db is not None:
+            self.db = db
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the index has never been loaded or is past its TTL."""
+        if self._loaded_at is None:
+            return True
+        return (time.time() - self._loaded_at) > self.ttl_hours * 3600
+
+    def __len__(self) -> int:
+        return len(self._by_ticker)
+
+    def ensure_loaded(self, fetch_func: Optional[Callable[[], Dict]] = None) -> None:
+        """
+        Load the index if it is empty or stale.
+
+        Args:
+            fetch_func: Callable returning the parsed company_tickers.json
+                payload. Only called when the database has no fresh copy.
+
+        Raises:
+            Exception: Whatever fetch_func raised, if there is no earlier
+                copy to fall back to
+        """
+        if not self.is_stale:
+            return
+
+        with self._lock:
+            # Another thread may have loaded while we waited
+            if not self.is_stale:
+                return
+
+            entries = self._load_from_db()
+            if not entries and fetch_func is not None:
+                try:
+                    entries = self._parse_company_tickers(fetch_func())
+                except Exception as e:
+                    if not self._by_ticker:
+                        raise
+                    self.logger.warning(f"Ticker index refresh failed, keeping stale index: {e}")
+                    self._loaded_at = time.time()  # Don't retry on every lookup until the next TTL
+                    return
+                else:
+                    self._persist(entries)
+
+            if entries:
+                self._build(entries)
+            elif self._by_ticker:
+                # Refresh failed - keep serving the old copy rather than nothing
+                self.logger.warning("Ticker index refresh returned no data, keeping stale index")
+                self._loaded_at = time.time()
+
+    def invalidate(self) -> None:
+        """Mark the index as stale so the next lookup reloads it."""
+        self._loaded_at = None
+
+    def get_cik(self, ticker: str) -> Optional[str]:
+        """
+        Look up the CIK for a ticker.
+
+        Args:
+            ticker: Stock ticker symbol (case-insensitive)
+
+        Returns:
+            CIK zero-padded to 10 digits, or None if not found
+        """
+        entry = self._by_ticker.get(ticker.upper().strip())
+        return entry['cik'] if entry else None
+
+    def get_entry(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the full index entry for a ticker.
+
+        Returns:
+            Dict with 'ticker', 'cik' and 'company_name', or None
+        """
+        entry = self._by_ticker.get(ticker.upper().strip())
+        return dict(entry) if entry else None
+
+    def get_tickers_for_cik(self, cik: str) -> List[str]:
+        """
+        Get all tickers listed under a CIK (e.g. GOOG and GOOGL).
+
+        Args:
+            cik: CIK number (will be zero-padded)
+
+        Returns:
+            List of ticker symbols, empty if unknown
+        """
+        return list(self._by_cik.get(cik.zfill(10), []))
+
+    def search(self, query: str, limit: int = 10, cutoff: float = 0.6) -> List[Dict[str, Any]]:
+        """
+        Fuzzy search for companies by ticker or name.
+
+        Ranking: exact ticker, then name prefix, then name substring,
+        then close matches by similarity ratio.
+
+        Args:
+            query: Ticker or (partial) company name
+            limit: Maximum number of results
+            cutoff: Minimum similarity (0-1) for close matches
+
+        Returns:
+            List of index entries (dicts with 'ticker', 'cik', 'company_name')
+        """
+        query = query.strip()
+        if not query:
+            return []
+
+        ciks: List[str] = []
+
+        def add(cik: str):
+            if cik not in ciks:
+                ciks.append(cik)
+
+        exact = self._by_ticker.get(query.upper())
+        if exact:
+            add(exact['cik'])
+
+        needle = normalize_company_name(query)
+        if needle:
+            prefix = [c for n, c in self._normalized_names.items() if n.startswith(needle)]
+            contains = [c for n, c in self._normalized_names.items()
+                        if needle in n and not n.startswith(needle)]
+            for cik in prefix + contains:
+                add(cik)
+
+            if len(ciks) < limit:
+                close = difflib.get_close_matches(
+                    needle, list(self._normalized_names.keys()), n=limit, cutoff=cutoff
+                )
+                for name in close:
+                    add(self._normalized_names[name])
+
+        results = []
+        for cik in ciks[:limit]:
+            tickers = self._by_cik.get(cik, [])
+            if tickers:
+                results.append(self.get_entry(tickers[0]))
+        return results
+
+    def _build(self, entries: List[Dict[str, Any]]) -> None:
+        """Rebuild lookup dictionaries from a list of entries."""
+        by_ticker: Dict[str, Dict[str, Any]] = {}
+        by_cik: Dict[str, List[str]] = {}
+        names: Dict[str, str] = {}
+
+        for entry in entries:
+            ticker = entry['ticker'].upper()
+            cik = entry['cik'].zfill(10)
+            name = entry.get('company_name') or ''
+            by_ticker[ticker] = {'ticker': ticker, 'cik': cik, 'company_name': name}
+            by_cik.setdefault(cik, []).append(ticker)
+            if name:
+                names.setdefault(normalize_company_name(name), cik)
+
+        self._by_ticker = by_ticker
+        self._by_cik = by_cik
+        self._normalized_names = names
+        self._loaded_at = time.time()
+
+        self.logger.info(f"Ticker index loaded: {len(by_ticker)} tickers, {len(by_cik)} companies")
+
+    def _load_from_db(self) -> List[Dict[str, Any]]:
+        """Load a fresh index from the database, if one is attached."""
+        if self.db is None:
+            return []
+        try:
+            return self.db.get_ticker_index(max_age_hours=self.ttl_hours)
+        except Exception as e:
+            self.logger.warning(f"Could not load ticker index from database: {e}")
+            return []
+
+    def _persist(self, entries: List[Dict[str, Any]]) -> None:
+        """Persist the index to the database, if one is attached."""
+        if self.db is None or not entries:
+            return
+        try:
+            self.db.replace_ticker_index(entries)
+        except Exception as e:
+            self.logger.warning(f"Could not persist ticker index: {e}")
+
+    @staticmethod
+    def _parse_company_tickers(data: Optional[Dict]) -> List[Dict[str, Any]]:
+        """
+        Parse SEC company_tickers.json into index entries.
+
+        The payload is keyed by row number:
+            {"0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."}, ...}
+        """
+        if not data:
+            return []
+        entries = []
+        for company in data.values():
+            ticker = str(company.get('ticker', '')).upper()
+            cik = str(company.get('cik_str', ''))
+            if ticker and cik:
+                entries.append({
+                    'ticker': ticker,
+                    'cik': cik.zfill(10),
+                    'company_name': company.get('title'),
+                })
+        return entries
+
+
+# Global singleton with thread-safe initialization
+_global_index: Optional[TickerIndex] = None
+_index_creation_lock = threading.Lock()
+
+
+def get_ticker_index(db=None) -> TickerIndex:
+    """
+    Get the global ticker index singleton.
+
+    Args:
+        db: Optional database repository to attach for persistence
+
+    Returns:
+        The global TickerIndex instance
+    """
+    global _global_index
+
+    if _global_index is None:
+        with _index_creation_lock:
+            if _global_index is None:
+                _global_index = TickerIndex()
+
+    if db is not None:
+        _global_index.attach_db(db)
+
+    return _global_index
+
+
+def reset_ticker_index():
+    """Reset the global ticker index (mainly for testing)."""
+    global _global_index
+    with _index_creation_lock:
+        _global_index = None
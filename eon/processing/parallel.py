@@ -18,7 +18,6 @@ from datetime import datetime
 
 from eon.core import get_logger, get_config
 from eon.ai import APIKeyManager, RateLimiter
-from eon.ai.api_config import get_sec_limits
 from eon.data.sources.sec import SECDownloader, SECConverter
 from eon.processing.progress import ProgressTracker
 
@@ -32,8 +31,7 @@ def _process_single_company(
     session_id: str,
     progress_dir: Path,
     output_dir: Path,
-    analysis_function: str = None,
-    stagger_delay: float = 0
+    analysis_function: str = None
 ) -> Dict[str, Any]:
     """
     Worker function to process a single company.
@@ -48,7 +46,6 @@ def _process_single_company(
         progress_dir: Progress tracking directory
         output_dir: Output directory for results
         analysis_function: Optional custom analysis function name
-        stagger_delay: Seconds to wait before starting (prevents SEC thundering herd)
 
     Returns:
         Dictionary with processing results
@@ -62,11 +59,6 @@ def _process_single_company(
 
     logger = get_logger(f"{__name__}.worker.{ticker}")
 
-    # Apply stagger delay to prevent thundering herd on SEC EDGAR API
-    if stagger_delay > 0:
-        logger.info(f"Worker for {ticker} waiting {stagger_delay}s (staggered start)")
-        time.sleep(stagger_delay)
-
     result = {
         "ticker": ticker,
         "success": False,
@@ -225,14 +217,10 @@ class ParallelProcessor:
         # Initialize progress tracker
         self.tracker = ProgressTracker(session_id, self.progress_dir)
 
-        # SEC rate limiting configuration for staggered worker starts
-        sec_limits = get_sec_limits()
-        self._worker_stagger_delay = sec_limits.WORKER_STAGGER_DELAY
-
         self.logger = get_logger(f"{__name__}.ParallelProcessor")
         self.logger.info(
             f"Initialized parallel processor: {self.max_workers} workers, "
-            f"session {session_id}, stagger_delay={self._worker_stagger_delay}s"
+            f"session {session_id}"
         )
 
     def process_batch(
@@ -284,17 +272,12 @@ class ParallelProcessor:
 
         # Use ProcessPoolExecutor for parallel processing
         with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks with staggered starts to prevent SEC thundering herd
+            # Submit all tasks; SEC and Gemini request queues pace the traffic
             futures = []
-            worker_count = 0
             for worker_id, ticker_batch in enumerate(ticker_batches):
                 api_key = self.api_keys[worker_id % len(self.api_keys)]
 
                 for ticker in ticker_batch:
-                    # Calculate stagger delay based on worker order
-                    stagger_delay = worker_count * self._worker_stagger_delay
-                    worker_count += 1
-
                     future = executor.submit(
                         _process_single_company,
                         ticker=ticker,
@@ -302,8 +285,7 @@ class ParallelProcessor:
                         num_filings=num_filings,
                         session_id=self.session_id,
                         progress_dir=self.progress_dir,
-                        output_dir=output_dir,
-                        stagger_delay=stagger_delay
+                        output_dir=output_dir
                     )
                     futures.append((ticker, future))
 
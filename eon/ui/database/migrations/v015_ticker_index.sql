@@ -0,0 +1,14 @@
+-- Migration v015: Persistent ticker -> CIK index
+-- Purpose: Keep SEC's company_tickers.json locally so ticker lookups don't
+-- re-download the whole file (several MB, behind the SEC lock) on every call.
+-- Company names are also seeded into cik_company_cache for CIK lookups.
+
+CREATE TABLE IF NOT EXISTS sec_ticker_index (
+    ticker TEXT PRIMARY KEY,
+    cik TEXT NOT NULL,                      -- Zero-padded to 10 digits
+    company_name TEXT,
+    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_ticker_index_cik ON sec_ticker_index(cik);
+CREATE INDEX IF NOT EXISTS idx_ticker_index_indexed_at ON sec_ticker_index(indexed_at);
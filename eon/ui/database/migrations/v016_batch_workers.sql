@@ -0,0 +1,28 @@
+-- Migration v016: Batch worker registry
+-- Purpose: Several `eon batch worker` processes can work on one batch. Each
+-- registers a row here and heartbeats it; status views aggregate the live
+-- rows, and items leased by a worker whose heartbeat stopped go back to
+-- pending without waiting for the item lease to expire.
+
+CREATE TABLE IF NOT EXISTS batch_workers (
+    worker_id TEXT PRIMARY KEY,
+    batch_id TEXT NOT NULL,
+    pid INTEGER,
+    hostname TEXT,
+    shard_index INTEGER NOT NULL DEFAULT 0,  -- This worker's slice of the API keys
+    shard_count INTEGER NOT NULL DEFAULT 1,
+    num_keys INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'running',  -- running, stopped
+    started_at TIMESTAMP,
+    last_heartbeat_at TIMESTAMP,
+    items_completed INTEGER NOT NULL DEFAULT 0,
+    items_failed INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (batch_id) REFERENCES batch_jobs(batch_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_batch_workers_batch
+ON batch_workers (batch_id, status, last_heartbeat_at);
+
+-- Lease recovery looks up running items by the worker holding them
+CREATE INDEX IF NOT EXISTS idx_batch_items_lease_owner
+ON batch_items (lease_owner) WHERE status = 'running';
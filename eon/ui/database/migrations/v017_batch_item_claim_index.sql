@@ -0,0 +1,9 @@
+-- Migration v017: Index for bulk claiming of batch items
+-- Purpose: Workers claim the next few pending items of a batch with a single
+-- UPDATE ... RETURNING ordered by priority. v013 meant to add this index but
+-- reused the name of v007's (batch_id, priority DESC, id) index, so its
+-- IF NOT EXISTS skipped it. The id column is the rowid, so the claim's
+-- subquery is answered from the index alone.
+
+CREATE INDEX IF NOT EXISTS idx_batch_items_claim
+ON batch_items (batch_id, status, priority DESC, id);
@@ -0,0 +1,8 @@
+-- Migration v018: Source file size/mtime next to file_cache.file_hash
+-- Purpose: The extracted-text cache reuses the stored hash instead of
+-- re-hashing a filing. Recording the size and mtime the hash was computed
+-- for lets it notice a re-downloaded file and hash it again rather than
+-- serving text extracted from the old copy.
+
+ALTER TABLE file_cache ADD COLUMN file_size INTEGER;
+ALTER TABLE file_cache ADD COLUMN file_mtime_ns INTEGER;
@@ -17,6 +17,7 @@ from .statistics import StatisticsMixin
 from .api_usage import APIUsageMixin
 from .cik_cache import CIKCacheMixin
 from .synthesis import SynthesisMixin
+from .workflow_steps import WorkflowStepsMixin
 
 __all__ = [
     "AnalysisRunsMixin",
@@ -29,4 +30,5 @@ __all__ = [
     "APIUsageMixin",
     "CIKCacheMixin",
     "SynthesisMixin",
+    "WorkflowStepsMixin",
 ]
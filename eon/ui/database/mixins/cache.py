@@ -62,6 +62,63 @@ class FileCacheMixin:
         row = self._execute_with_retry(query, (ticker.upper(), fiscal_year, filing_type), fetch_one=True)
         return row['file_path'] if row else None
 
+    def get_file_hash(
+        self,
+        file_path: str,
+        file_size: Optional[int] = None,
+        mtime_ns: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Get the stored SHA256 of a cached file.
+
+        Args:
+            file_path: Path of the cached file
+            file_size: Current size in bytes; if given with mtime_ns, the
+                hash is only returned when it was recorded for this size/mtime
+            mtime_ns: Current modification time in nanoseconds
+
+        Returns:
+            Hex digest, or None if unknown or recorded for different contents
+        """
+        query = """
+            SELECT file_hash, file_size, file_mtime_ns
+            FROM file_cache
+            WHERE file_path = ? AND file_hash IS NOT NULL
+            LIMIT 1
+        """
+        row = self._execute_with_retry(query, (file_path,), fetch_one=True)
+        if not row:
+            return None
+        if file_size is not None and mtime_ns is not None:
+            if row['file_size'] != file_size or row['file_mtime_ns'] != mtime_ns:
+                return None
+        return row['file_hash']
+
+    def set_file_hash(
+        self,
+        file_path: str,
+        file_hash: str,
+        file_size: Optional[int] = None,
+        mtime_ns: Optional[int] = None
+    ) -> int:
+        """
+        Record the SHA256 of a cached file (backfills rows cached without one).
+
+        Args:
+            file_path: Path of the cached file
+            file_hash: Hex digest of the file contents
+            file_size: Size in bytes the hash was computed for
+            mtime_ns: Modification time in nanoseconds the hash was computed for
+
+        Returns:
+            Number of rows updated
+        """
+        query = """
+            UPDATE file_cache SET file_hash = ?, file_size = ?, file_mtime_ns = ?
+            WHERE file_path = ?
+        """
+        return self._execute_with_retry(query, (file_hash, file_size, mtime_ns, file_path))
+
     def get_cached_file_by_date(
         self,
         ticker: str,
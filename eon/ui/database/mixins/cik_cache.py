@@ -10,7 +10,7 @@ from typing import Optional, List, Dict, Any
 
 
 class CIKCacheMixin:
-    """Mixin for CIK to company mapping cache operations."""
+    """Mixin for CIK to company mapping cache and ticker index operations."""
 
     def cache_cik_company(
         self,
@@ -71,6 +71,70 @@ class CIKCacheMixin:
             return result
         return None
 
+    def replace_ticker_index(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Replace the persisted ticker -> CIK index in a single transaction.
+
+        Company names are also seeded into cik_company_cache for CIKs that
+        aren't cached yet (existing, richer records are left untouched).
+
+        Args:
+            entries: List of dicts with 'ticker', 'cik' and 'company_name'
+
+        Returns:
+            Number of index rows written
+        """
+        now = datetime.utcnow().isoformat()
+        rows = [
+            (e['ticker'].upper(), e['cik'].zfill(10), e.get('company_name'), now)
+            for e in entries
+            if e.get('ticker') and e.get('cik')
+        ]
+
+        # One transaction, so readers never see a half-rebuilt index
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM sec_ticker_index")
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO sec_ticker_index
+                (ticker, cik, company_name, indexed_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                rows
+            )
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO cik_company_cache (cik, company_name, cached_at)
+                VALUES (?, ?, ?)
+                """,
+                [(cik, name, now) for _, cik, name, _ in rows if name]
+            )
+
+        return len(rows)
+
+    def get_ticker_index(self, max_age_hours: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get the persisted ticker -> CIK index.
+
+        Args:
+            max_age_hours: If set, return an empty list when the index is
+                older than this (so callers know to refresh it)
+
+        Returns:
+            List of dicts with 'ticker', 'cik', 'company_name', 'indexed_at'
+        """
+        if max_age_hours is not None:
+            query = """
+                SELECT MAX(indexed_at) as indexed_at FROM sec_ticker_index
+                WHERE julianday('now') - julianday(indexed_at) <= ? / 24.0
+            """
+            row = self._execute_with_retry(query, (max_age_hours,), fetch_one=True)
+            if not row or not row['indexed_at']:
+                return []
+
+        query = "SELECT ticker, cik, company_name, indexed_at FROM sec_ticker_index"
+        return self._execute_with_retry(query, fetch_all=True)
+
     def create_analysis_run_with_cik(
         self,
         run_id: str,
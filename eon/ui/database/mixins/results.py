@@ -6,7 +6,6 @@ Analysis results database operations mixin.
 
 import json
 import logging
-import sqlite3
 from typing import Optional, List, Dict, Any
 
 
@@ -125,24 +124,21 @@ class AnalysisResultsMixin:
         params = [ticker.upper(), analysis_type, filing_type] + years + [max_age_days]
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-
-                # Get most recent result per year
-                results = {}
-                for row in cursor.fetchall():
-                    year = row['fiscal_year']
-                    if year not in results:  # Keep first (most recent) result
-                        results[year] = {
-                            'year': year,
-                            'type': row['result_type'],
-                            'data': json.loads(row['result_json']),
-                            'cached_at': row['completed_at']
-                        }
-
-                return results
+            rows = self._execute_with_retry(query, tuple(params), fetch_all=True)
+
+            # Get most recent result per year
+            results = {}
+            for row in rows:
+                year = row['fiscal_year']
+                if year not in results:  # Keep first (most recent) result
+                    results[year] = {
+                        'year': year,
+                        'type': row['result_type'],
+                        'data': json.loads(row['result_json']),
+                        'cached_at': row['completed_at']
+                    }
+
+            return results
         except Exception as e:
             logger.warning(f"Error checking for existing results: {e}")
             return {}
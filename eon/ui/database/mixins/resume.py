@@ -6,7 +6,6 @@ Resume functionality database operations mixin.
 
 import json
 import logging
-import sqlite3
 from datetime import datetime
 from typing import List, Dict, Any
 
@@ -100,35 +99,32 @@ class ResumeMixin:
         """
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(query, (stale_minutes,))
-
-                runs = []
-                for row in cursor.fetchall():
-                    years_analyzed = json.loads(row['years_analyzed']) if row['years_analyzed'] else []
-                    completed_years = json.loads(row['completed_years']) if row['completed_years'] else []
-                    remaining_years = [y for y in years_analyzed if y not in completed_years]
-
-                    runs.append({
-                        'run_id': row['run_id'],
-                        'ticker': row['ticker'],
-                        'company_name': row['company_name'],
-                        'analysis_type': row['analysis_type'],
-                        'filing_type': row['filing_type'],
-                        'years_analyzed': years_analyzed,
-                        'completed_years': completed_years,
-                        'remaining_years': remaining_years,
-                        'started_at': row['started_at'],
-                        'last_activity_at': row['last_activity_at'],
-                        'progress_message': row['progress_message'],
-                        'progress_percent': row['progress_percent'] or 0,
-                        'current_step': row['current_step'],
-                        'total_steps': row['total_steps'] or 0,
-                    })
-
-                return runs
+            rows = self._execute_with_retry(query, (stale_minutes,), fetch_all=True)
+
+            runs = []
+            for row in rows:
+                years_analyzed = json.loads(row['years_analyzed']) if row['years_analyzed'] else []
+                completed_years = json.loads(row['completed_years']) if row['completed_years'] else []
+                remaining_years = [y for y in years_analyzed if y not in completed_years]
+
+                runs.append({
+                    'run_id': row['run_id'],
+                    'ticker': row['ticker'],
+                    'company_name': row['company_name'],
+                    'analysis_type': row['analysis_type'],
+                    'filing_type': row['filing_type'],
+                    'years_analyzed': years_analyzed,
+                    'completed_years': completed_years,
+                    'remaining_years': remaining_years,
+                    'started_at': row['started_at'],
+                    'last_activity_at': row['last_activity_at'],
+                    'progress_message': row['progress_message'],
+                    'progress_percent': row['progress_percent'] or 0,
+                    'current_step': row['current_step'],
+                    'total_steps': row['total_steps'] or 0,
+                })
+
+            return runs
 
         except Exception as e:
             logger.warning(f"Error getting interrupted runs: {e}")
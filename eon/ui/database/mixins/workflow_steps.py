@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Workflow step checkpoint database operations mixin.
+
+Multi-call custom workflows (see eon.analysis.workflow_graph) persist each
+sub-call's validated output in workflow_step_outputs as it completes, so a
+retried company-year only reruns the sub-calls that are missing. A
+checkpoint is a workflow_runs row keyed by workflow, filing and model;
+its workflow_runs.workflow_id points at a workflows row named after the
+custom workflow.
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class WorkflowStepsMixin:
+    """Mixin for workflow step checkpoint operations."""
+
+    def start_workflow_checkpoint(
+        self,
+        checkpoint_id: str,
+        workflow_name: str,
+        step_names: List[str]
+    ) -> None:
+        """
+        Create (or reopen) the checkpoint for one workflow run over one filing.
+
+        Args:
+            checkpoint_id: Stable ID for (workflow, ticker, year, filing, model)
+            workflow_name: Custom workflow ID
+            step_names: Names of the workflow's steps
+        """
+        now = datetime.utcnow().isoformat()
+        self._execute_with_retry(
+            """
+            INSERT OR IGNORE INTO workflows (name, description, workflow_json)
+            VALUES (?, ?, ?)
+            """,
+            (workflow_name, "Custom workflow step graph", json.dumps({"steps": step_names}))
+        )
+        self._execute_with_retry(
+            """
+            INSERT INTO workflow_runs (id, workflow_id, status, total_steps, started_at)
+            SELECT ?, id, 'running', ?, ? FROM workflows WHERE name = ?
+            ON CONFLICT(id) DO UPDATE SET
+                status = 'running',
+                total_steps = excluded.total_steps,
+                completed_at = NULL
+            """,
+            (checkpoint_id, len(step_names), now, workflow_name)
+        )
+
+    def save_workflow_step_output(self, checkpoint_id: str, step_id: str, output_json: str) -> None:
+        """
+        Persist a completed step's output.
+
+        Args:
+            checkpoint_id: Checkpoint ID
+            step_id: Step name
+            output_json: Validated step output, serialized
+        """
+        self._execute_with_retry(
+            """
+            INSERT OR REPLACE INTO workflow_step_outputs
+            (workflow_run_id, step_id, output_json, created_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (checkpoint_id, step_id, output_json, datetime.utcnow().isoformat())
+        )
+        self._execute_with_retry(
+            """
+            UPDATE workflow_runs
+            SET current_step_index = (
+                    SELECT COUNT(*) FROM workflow_step_outputs WHERE workflow_run_id = ?
+                ),
+                last_successful_step = ?
+            WHERE id = ?
+            """,
+            (checkpoint_id, step_id, checkpoint_id)
+        )
+
+    def get_workflow_step_outputs(self, checkpoint_id: str) -> Dict[str, str]:
+        """
+        Get the outputs saved for a checkpoint.
+
+        Args:
+            checkpoint_id: Checkpoint ID
+
+        Returns:
+            Dict mapping step name to serialized output
+        """
+        rows = self._execute_with_retry(
+            "SELECT step_id, output_json FROM workflow_step_outputs WHERE workflow_run_id = ?",
+            (checkpoint_id,),
+            fetch_all=True
+        )
+        return {row['step_id']: row['output_json'] for row in rows}
+
+    def log_workflow_step(self, checkpoint_id: str, step_id: str, log_level: str, message: str) -> None:
+        """
+        Record a step event (INFO, WARNING, ERROR).
+
+        Args:
+            checkpoint_id: Checkpoint ID
+            step_id: Step name
+            log_level: INFO, WARNING or ERROR
+            message: Log message
+        """
+        self._execute_with_retry(
+            """
+            INSERT INTO workflow_step_logs (workflow_run_id, step_id, log_level, message, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (checkpoint_id, step_id, log_level, message, datetime.utcnow().isoformat())
+        )
+
+    def finish_workflow_checkpoint(
+        self,
+        checkpoint_id: str,
+        status: str,
+        errors: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Mark a checkpoint completed or failed.
+
+        Args:
+            checkpoint_id: Checkpoint ID
+            status: 'completed' or 'failed'
+            errors: Step name -> error for the steps that failed
+        """
+        self._execute_with_retry(
+            """
+            UPDATE workflow_runs
+            SET status = ?, completed_at = ?, errors_json = ?
+            WHERE id = ?
+            """,
+            (
+                status,
+                datetime.utcnow().isoformat(),
+                json.dumps(errors) if errors else None,
+                checkpoint_id
+            )
+        )
@@ -11,16 +11,31 @@ Improvements for batch processing reliability:
 - SQLITE_BUSY specific handling
 - Database backup support
 - Context manager support for proper cleanup
+
+Connections:
+    Each thread keeps one long-lived connection (opened on first use, with
+    the WAL/busy_timeout pragmas applied once), so a 25-thread batch doesn't
+    pay connect + pragma overhead on every progress update and heartbeat,
+    and sqlite3's per-connection statement cache actually gets reused.
+    Connections run in autocommit mode; use transaction() when several
+    statements must commit together:
+
+        with db.transaction() as conn:
+            conn.execute("UPDATE batch_items SET ...")
+            conn.execute("UPDATE batch_jobs SET ...")
 """
 
+import os
 import sqlite3
 import logging
 import random
 import shutil
+import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, Optional, Tuple
 
 import pandas as pd
 
@@ -35,7 +50,9 @@ from .mixins import (
     APIUsageMixin,
     CIKCacheMixin,
     SynthesisMixin,
+    WorkflowStepsMixin,
 )
+from .schema import ensure_schema
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +68,7 @@ class DatabaseRepository(
     APIUsageMixin,
     CIKCacheMixin,
     SynthesisMixin,
+    WorkflowStepsMixin,
 ):
     """
     Data access layer for Streamlit UI.
@@ -67,8 +85,14 @@ class DatabaseRepository(
     - APIUsageMixin: API usage tracking
     - CIKCacheMixin: CIK to company mapping cache
     - SynthesisMixin: Synthesis job checkpointing
+    - WorkflowStepsMixin: Workflow sub-call checkpointing
     """
 
+    # Seconds to wait for another connection's write lock
+    BUSY_TIMEOUT = 30.0
+    # Prepared statements kept per connection (sqlite3 defaults to 128)
+    STATEMENT_CACHE_SIZE = 256
+
     def __init__(self, db_path: str = "data/eon.db"):
         """
         Initialize database repository.
@@ -78,6 +102,11 @@ class DatabaseRepository(
         """
         self.db_path = db_path
         self._closed = False
+        self._local = threading.local()
+        # Every open connection by owning thread, so close() and dead threads' cleanup can reach them
+        self._connections: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        self._connections_lock = threading.Lock()
+        self._pid = os.getpid()
         self._init_database()
 
     def __enter__(self):
@@ -98,6 +127,16 @@ class DatabaseRepository(
         """
         if not self._closed:
             self._closed = True
+            with self._connections_lock:
+                connections = list(self._connections.values())
+                self._connections.clear()
+            for _, conn in connections:
+                try:
+                    conn.close()
+                except sqlite3.Error as e:
+                    logger.warning(f"Error closing connection: {e}")
+            self._local = threading.local()
+
             # Perform a final WAL checkpoint to ensure all data is written
             try:
                 with sqlite3.connect(self.db_path, timeout=10.0) as conn:
@@ -106,27 +145,74 @@ class DatabaseRepository(
                 logger.warning(f"Error during repository close: {e}")
 
     def _init_database(self):
-        """Initialize database schema from migration scripts."""
-        # Ensure data directory exists
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        """Apply any migrations this database hasn't recorded yet (once per process)."""
+        ensure_schema(self.db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use."""
+        if os.getpid() != self._pid:
+            # Forked child - the parent's connections must not be used here
+            self._pid = os.getpid()
+            self._local = threading.local()
+            with self._connections_lock:
+                self._connections = {}
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+
+        # Autocommit mode: each statement commits on its own unless inside transaction()
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.BUSY_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.BUSY_TIMEOUT * 1000)}")
+        self._local.conn = conn
+
+        thread = threading.current_thread()
+        with self._connections_lock:
+            # Close connections of threads that have exited (pipeline workers come and go)
+            for ident, (owner, old_conn) in list(self._connections.items()):
+                if not owner.is_alive():
+                    old_conn.close()
+                    del self._connections[ident]
+            self._connections[thread.ident] = (thread, conn)
+        self._closed = False
+        return conn
 
-        migrations_dir = Path(__file__).parent / "migrations"
+    @contextmanager
+    def transaction(self, immediate: bool = True) -> Iterator[sqlite3.Connection]:
+        """
+        Run several statements atomically on the calling thread's connection.
 
-        with sqlite3.connect(self.db_path) as conn:
-            # Enable WAL mode for better concurrency
-            conn.execute("PRAGMA journal_mode=WAL")
+        Commits when the block exits normally and rolls back if it raises.
+        Nested scopes join the outermost one. _execute_with_retry() calls
+        made inside the block take part in the transaction.
 
-            # Apply migrations in order
-            migration_files = sorted(migrations_dir.glob("v*.sql"))
-            for migration_file in migration_files:
-                try:
-                    with open(migration_file, 'r') as f:
-                        conn.executescript(f.read())
-                except sqlite3.OperationalError as e:
-                    # Ignore "duplicate column" errors (migration already applied)
-                    if "duplicate column" not in str(e).lower():
-                        raise
-            conn.commit()
+        Args:
+            immediate: Take the write lock up front (BEGIN IMMEDIATE), so a
+                read-then-write sequence can't be interleaved by another writer
+
+        Yields:
+            The connection; rows come back as sqlite3.Row
+        """
+        conn = self._connect()
+        if conn.in_transaction:
+            yield conn
+            return
+
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
 
     def _execute_with_retry(
         self,
@@ -160,34 +246,33 @@ class DatabaseRepository(
         last_error = None
 
         for attempt in range(max_retries):
+            conn = self._connect()
             try:
-                with sqlite3.connect(self.db_path, timeout=30.0) as conn:
-                    # Enable WAL mode for better concurrency
-                    conn.execute("PRAGMA journal_mode=WAL")
-                    # Busy timeout in milliseconds (30 seconds)
-                    conn.execute("PRAGMA busy_timeout=30000")
-                    conn.row_factory = sqlite3.Row
-                    cursor = conn.cursor()
-                    cursor.execute(query, params)
-                    conn.commit()
-
-                    # Fetch data while connection is still open
+                cursor = conn.execute(query, params)
+                try:
                     if fetch_one:
                         row = cursor.fetchone()
                         return dict(row) if row else None
                     elif fetch_all:
                         rows = cursor.fetchall()
                         return [dict(row) for row in rows]
-                    else:
-                        # For INSERT/UPDATE/DELETE, return useful metadata
-                        return cursor.lastrowid if cursor.lastrowid else cursor.rowcount
+                    # For INSERT/UPDATE/DELETE, return useful metadata. On a
+                    # reused connection lastrowid is the last insert of *any*
+                    # statement, so only trust it for inserts that wrote a row.
+                    if cursor.rowcount > 0 and query.split(None, 1)[0].upper() in ("INSERT", "REPLACE"):
+                        return cursor.lastrowid
+                    return cursor.rowcount
+                finally:
+                    # Finish the statement so it doesn't pin a read snapshot
+                    cursor.close()
 
             except sqlite3.OperationalError as e:
                 last_error = e
                 error_str = str(e).lower()
 
-                # Check for retryable errors (locked, busy)
-                is_retryable = any(keyword in error_str for keyword in [
+                # Check for retryable errors (locked, busy); never retry a
+                # single statement of a caller's transaction
+                is_retryable = not conn.in_transaction and any(keyword in error_str for keyword in [
                     "locked", "busy", "database is locked", "database is busy"
                 ])
 
@@ -383,13 +468,15 @@ class DatabaseRepository(
 
         for attempt in range(max_retries):
             try:
-                with sqlite3.connect(self.db_path, timeout=30.0) as conn:
-                    conn.execute("PRAGMA journal_mode=WAL")
-                    conn.execute("PRAGMA busy_timeout=30000")
+                conn = self._connect()
+                conn.row_factory = None  # pandas expects plain tuples
+                try:
                     if params:
                         return pd.read_sql(query, conn, params=params)
                     else:
                         return pd.read_sql(query, conn)
+                finally:
+                    conn.row_factory = sqlite3.Row
 
             except sqlite3.OperationalError as e:
                 last_error = e
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Versioned schema migrations for the EON database.
+
+Each migrations/vNNN_*.sql file is applied once and recorded in the
+schema_version table, so opening a repository no longer re-runs every
+script. A migration and its version row commit in one BEGIN IMMEDIATE
+transaction: processes starting together (CLI workers, Streamlit pages)
+serialize on SQLite's write lock, and whichever comes second finds the
+version already recorded and skips it.
+
+SQLite has no ADD COLUMN IF NOT EXISTS, so an ALTER TABLE ... ADD COLUMN
+that fails with "duplicate column" counts as applied (v013 re-adds a
+column v007 already creates). This is checked per statement, so the rest
+of the script still runs - the old executescript loop stopped at the
+first duplicate. Databases created before schema_version existed have no
+recorded versions; their first run applies every script once more under
+that rule and records them, after which only new files are applied.
+
+Usage:
+    ensure_schema("data/eon.db")  # Cheap after the first call per process
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+_MIGRATION_FILE = re.compile(r"^v(\d+)_.*\.sql$")
+_ADD_COLUMN = re.compile(r"\bALTER\s+TABLE\b.*\bADD\s+(COLUMN\s+)?", re.IGNORECASE | re.DOTALL)
+
+# Databases already migrated by this process, by absolute path
+_ready_paths: Set[str] = set()
+_ready_lock = threading.Lock()
+
+
+def ensure_schema(db_path: str) -> None:
+    """
+    Bring a database up to date, once per process.
+
+    Later calls for the same path return without touching the database.
+
+    Args:
+        db_path: Path to the SQLite database file (created if missing)
+    """
+    key = os.path.abspath(db_path)
+    if key in _ready_paths:
+        return
+    with _ready_lock:
+        if key in _ready_paths:
+            return
+        apply_migrations(db_path)
+        _ready_paths.add(key)
+
+
+def list_migrations(migrations_dir: Path = MIGRATIONS_DIR) -> List[Tuple[int, Path]]:
+    """
+    Find migration scripts in version order.
+
+    Args:
+        migrations_dir: Directory holding vNNN_*.sql files
+
+    Returns:
+        (version, path) pairs sorted by version
+
+    Raises:
+        ValueError: If two files share a version number
+    """
+    migrations = {}
+    for path in migrations_dir.glob("v*.sql"):
+        match = _MIGRATION_FILE.match(path.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: {migrations[version].name}, {path.name}")
+        migrations[version] = path
+    return sorted(migrations.items())
+
+
+def split_statements(script: str) -> List[str]:
+    """
+    Split a SQL script into single statements.
+
+    Uses sqlite3.complete_statement, so semicolons inside strings,
+    comments and CREATE TRIGGER bodies don't end a statement.
+
+    Args:
+        script: Contents of a migration file
+
+    Returns:
+        Statements, each ending with its semicolon
+    """
+    statements = []
+    start = 0
+    for index, char in enumerate(script):
+        if char == ";" and sqlite3.complete_statement(script[start:index + 1]):
+            statements.append(script[start:index + 1].strip())
+            start = index + 1
+
+    # A final statement without a semicolon; comment-only leftovers stay incomplete
+    remainder = script[start:].strip()
+    if remainder and sqlite3.complete_statement(remainder + ";"):
+        statements.append(remainder)
+    return statements
+
+
+def get_schema_version(db_path: str) -> int:
+    """
+    Get the highest applied migration version.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        Version number, or 0 if no migration has been recorded
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0  # No schema_version table yet
+    finally:
+        conn.close()
+    return row[0] or 0
+
+
+def apply_migrations(db_path: str, migrations_dir: Path = MIGRATIONS_DIR) -> List[int]:
+    """
+    Apply every migration not yet recorded in schema_version.
+
+    Args:
+        db_path: Path to the SQLite database file (created if missing)
+        migrations_dir: Directory holding vNNN_*.sql files
+
+    Returns:
+        Versions applied by this call (empty if already up to date)
+
+    Raises:
+        sqlite3.Error: If a migration fails; it is rolled back and the
+            ones before it stay applied
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    migrations = list_migrations(migrations_dir)
+
+    conn = sqlite3.connect(db_path, timeout=30.0, isolation_level=None)
+    try:
+        # Outside any transaction: journal_mode can't change inside one
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        applied = _applied_versions(conn)
+        if all(version in applied for version, _ in migrations):
+            return []
+
+        newly_applied = []
+        for version, path in migrations:
+            if version in applied:
+                continue
+            if _apply_migration(conn, version, path):
+                newly_applied.append(version)
+                logger.info(f"Applied migration {path.name}")
+        return newly_applied
+    finally:
+        conn.close()
+
+
+def _applied_versions(conn: sqlite3.Connection) -> Set[int]:
+    return {row[0] for row in conn.execute("SELECT version FROM schema_version")}
+
+
+def _apply_migration(conn: sqlite3.Connection, version: int, path: Path) -> bool:
+    """
+    Apply one migration and record it, unless another process got there first.
+
+    Args:
+        conn: Autocommit connection
+        version: Migration version number
+        path: Migration script
+
+    Returns:
+        True if applied here, False if it was already recorded
+    """
+    statements = split_statements(path.read_text())
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-check under the write lock
+        if conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,)).fetchone():
+            conn.execute("ROLLBACK")
+            return False
+
+        for statement in statements:
+            try:
+                conn.execute(statement)
+            except sqlite3.OperationalError as e:
+                if not ("duplicate column" in str(e).lower() and _ADD_COLUMN.search(statement)):
+                    raise
+                logger.debug(f"{path.name}: column already exists ({e})")
+
+        conn.execute(
+            "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+            (version, path.name)
+        )
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    return True
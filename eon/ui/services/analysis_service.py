@@ -9,9 +9,13 @@ and progress tracking.
 """
 
 import uuid
+import queue
+import asyncio
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Union, Callable, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, Awaitable, Union, Callable, TYPE_CHECKING
 from datetime import datetime
 
 from eon.core import (
@@ -21,12 +25,18 @@ from eon.core import (
     IKeyManager, IRateLimiter, IDownloader, IExtractor,
     is_annual_filing, is_quarterly_filing,
 )
+from eon.core.exceptions import KeyQuotaExhaustedError
 from eon.ai import APIKeyManager, RateLimiter
-from eon.data.sources.sec import SECDownloader, SECConverter, PDFExtractor
+from eon.data.sources.sec import (
+    SECDownloader, SECConverter, HTMLExtractor, CachingExtractor,
+    compute_file_hash, get_text_cache, get_ticker_index,
+)
 from eon.analysis.fundamental import FundamentalAnalyzer
 from eon.analysis.fundamental.success_factors import ExcellentCompanyAnalyzer, ObjectiveCompanyAnalyzer
 from eon.analysis.perspectives import PerspectiveAnalyzer
 from eon.analysis.comparative.contrarian_scanner import ContrarianScanner
+from eon.analysis.workflow_graph import StepCheckpoint
+from eon.analysis.async_engine import AsyncAnalysisEngine, JobOutcome
 from eon.ui.database import DatabaseRepository
 from eon.ui.services.cancellation import (
     get_cancellation_registry,
@@ -38,6 +48,23 @@ if TYPE_CHECKING:
     from eon.core import IConfig
 
 
+@dataclass
+class PreparedRun:
+    """
+    A run whose filings are downloaded and converted, ready for the LLM stage.
+
+    Produced by AnalysisService.prepare_run() and consumed by execute_run().
+    completed is True when every year was already done (per-year resume).
+    """
+    run_id: str
+    ticker: str
+    analysis_type: str
+    filing_type: str
+    custom_prompt: Optional[str] = None
+    pdf_paths: Dict[Union[int, str], Path] = field(default_factory=dict)
+    completed: bool = False
+
+
 class AnalysisService:
     """
     Service layer that wraps EON analyzers for UI consumption.
@@ -70,7 +97,10 @@ class AnalysisService:
             key_manager: API key manager (defaults to APIKeyManager)
             rate_limiter: Rate limiter (defaults to RateLimiter)
             downloader: SEC downloader (defaults to SECDownloader)
-            extractor: PDF extractor (defaults to PDFExtractor)
+            extractor: Filing text extractor (defaults to HTMLExtractor, which
+                also reads filings cached as PDFs). Unless caching is disabled
+                it is wrapped in a CachingExtractor so each filing is only
+                parsed once across runs and analysis types.
         """
         self.db = db
         self.config = config or get_config()
@@ -83,7 +113,14 @@ class AnalysisService:
         self.downloader = downloader or SECDownloader()
         # Note: converter is NOT shared - each thread needs its own browser instance
         # to avoid PDF mixing when running parallel analyses
-        self.extractor = extractor or PDFExtractor()
+        extractor = extractor or HTMLExtractor()
+        if self.config.enable_caching and not isinstance(extractor, CachingExtractor):
+            extractor = CachingExtractor(extractor, cache=get_text_cache(), db=self.db)
+        self.extractor = extractor
+
+        # Persist the shared ticker -> CIK index next to the CIK cache so
+        # other processes reuse it instead of re-downloading it from SEC
+        get_ticker_index(db=self.db)
 
         self.logger.info("AnalysisService initialized")
 
@@ -112,6 +149,10 @@ class AnalysisService:
         4. Stores results in database
         5. Updates status
 
+        Steps 1-2 are prepare_run() and steps 3-5 execute_run(); the batch
+        queue calls them separately so filings are fetched and converted in
+        pipeline stages that hold no API key.
+
         Args:
             ticker: Company ticker symbol or CIK (based on input_mode)
             analysis_type: Type of analysis (fundamental, excellent, buffett, etc.)
@@ -135,6 +176,64 @@ class AnalysisService:
             ValueError: If invalid parameters
             Exception: If analysis fails
         """
+        prepared = self.prepare_run(
+            ticker=ticker,
+            analysis_type=analysis_type,
+            filing_type=filing_type,
+            years=years,
+            num_years=num_years,
+            custom_prompt=custom_prompt,
+            company_name=company_name,
+            input_mode=input_mode,
+            cik=cik,
+            skip_years=skip_years
+        )
+        return self.execute_run(
+            prepared, api_key=api_key, year_progress_callback=year_progress_callback
+        )
+
+    def prepare_run(
+        self,
+        ticker: str,
+        analysis_type: str,
+        filing_type: str = "10-K",
+        years: Optional[List[int]] = None,
+        num_years: Optional[int] = None,
+        custom_prompt: Optional[str] = None,
+        company_name: Optional[str] = None,
+        input_mode: str = 'ticker',
+        cik: Optional[str] = None,
+        skip_years: Optional[List[str]] = None,
+        extract_text: bool = False
+    ) -> PreparedRun:
+        """
+        Create the run record and get its filings ready for analysis.
+
+        Downloads (or reuses cached) filings and converts them. Needs no
+        API key. If every year was already completed (skip_years), the run
+        is marked completed and the returned PreparedRun has no filings.
+
+        Args:
+            ticker: Company ticker symbol or CIK (based on input_mode)
+            analysis_type: Type of analysis (fundamental, excellent, buffett, etc.)
+            filing_type: Filing type (10-K, 10-Q, 8-K)
+            years: Specific years to analyze
+            num_years: Number of recent years (alternative to years)
+            custom_prompt: Optional custom prompt template
+            company_name: Optional company name
+            input_mode: 'ticker' or 'cik' - determines how ticker param is interpreted
+            cik: Explicit CIK value (if known from ticker lookup)
+            skip_years: Optional list of fiscal year strings already completed
+            extract_text: Also extract each filing's text into the text cache,
+                so the analysis stage doesn't parse filings while holding a key
+
+        Returns:
+            PreparedRun to pass to execute_run()
+
+        Raises:
+            ValueError: If no filings could be found
+            Exception: If download or conversion fails (the run is marked failed)
+        """
         run_id = str(uuid.uuid4())
 
         # Handle CIK mode - resolve company info if needed
@@ -185,9 +284,6 @@ class AnalysisService:
             current_year = datetime.now().year
             years = [current_year - 1]
 
-        # Store original requested count for flexible matching
-        requested_num_years = num_years
-
         self.logger.info(
             f"Starting {analysis_type} analysis for {display_identifier} "
             f"({filing_type}, years: {years}, mode: {input_mode})"
@@ -212,11 +308,19 @@ class AnalysisService:
             input_mode=input_mode
         )
 
-        # Create cancellation token for this run
+        # Create cancellation token for this run (execute_run picks it up)
         registry = get_cancellation_registry()
         token = registry.create_token(run_id)
         token.set_thread(threading.current_thread())
 
+        prepared = PreparedRun(
+            run_id=run_id,
+            ticker=ticker,
+            analysis_type=analysis_type,
+            filing_type=filing_type,
+            custom_prompt=custom_prompt,
+        )
+        ready = False
         try:
             self.db.update_run_status(run_id, 'running')
 
@@ -262,7 +366,69 @@ class AnalysisService:
                 if not pdf_paths:
                     self.logger.info(f"All years already completed for {ticker}, nothing to do")
                     self.db.update_run_status(run_id, 'completed')
-                    return run_id
+                    prepared.completed = True
+                    return prepared
+
+            if extract_text and isinstance(self.extractor, CachingExtractor):
+                self.db.update_run_progress(
+                    run_id,
+                    progress_message=f"Extracting text from {len(pdf_paths)} {filing_type} filings...",
+                    progress_percent=40
+                )
+                for pdf_path in pdf_paths.values():
+                    token.raise_if_cancelled()
+                    self.extractor.extract_text(pdf_path)
+
+            prepared.pdf_paths = pdf_paths
+            ready = True
+            return prepared
+
+        except Exception as e:
+            self._record_run_failure(run_id, e)
+            raise
+
+        finally:
+            # A prepared run keeps its token until execute_run() finishes
+            if not ready:
+                registry.cleanup_token(run_id)
+
+    def execute_run(
+        self,
+        prepared: PreparedRun,
+        api_key: Optional[str] = None,
+        year_progress_callback: Optional[Callable[[int, int, int], None]] = None
+    ) -> str:
+        """
+        Run the analyzers over a prepared run's filings and store the results.
+
+        Args:
+            prepared: Result of prepare_run()
+            api_key: Optional pre-reserved API key (for batch processing Fix #1)
+            year_progress_callback: Optional callback(current_year, completed_count, total_count)
+                                   called after each year is processed
+
+        Returns:
+            The run_id
+
+        Raises:
+            Exception: If analysis fails (the run is marked failed or cancelled)
+        """
+        run_id = prepared.run_id
+        if prepared.completed:
+            return run_id
+
+        ticker = prepared.ticker
+        analysis_type = prepared.analysis_type
+        filing_type = prepared.filing_type
+        custom_prompt = prepared.custom_prompt
+        pdf_paths = prepared.pdf_paths
+
+        registry = get_cancellation_registry()
+        token = registry.get_token(run_id) or registry.create_token(run_id)
+        token.set_thread(threading.current_thread())
+
+        try:
+            token.raise_if_cancelled()
 
             self.db.update_run_progress(
                 run_id,
@@ -329,70 +495,52 @@ class AnalysisService:
             self.db.update_run_status(run_id, 'completed')
             self.logger.info(f"Analysis completed successfully: {run_id}")
 
-        except DownloadError as e:
-            error_msg = f"Download failed: {str(e)}"
-            self.logger.error(error_msg)
-            self.db.update_run_status(run_id, 'failed', error_msg)
+        except Exception as e:
+            self._record_run_failure(run_id, e)
             raise
 
-        except ConversionError as e:
-            error_msg = f"PDF conversion failed: {str(e)}"
-            self.logger.error(error_msg)
-            self.db.update_run_status(run_id, 'failed', error_msg)
-            raise
+        finally:
+            # Always cleanup cancellation token
+            registry.cleanup_token(run_id)
 
-        except ExtractionError as e:
-            error_msg = f"Text extraction failed: {str(e)}"
-            self.logger.error(error_msg)
-            self.db.update_run_status(run_id, 'failed', error_msg)
-            raise
+        return run_id
 
-        except AIProviderError as e:
-            error_msg = str(e)
-            self.logger.error("AI analysis failed", exc_info=True)
-            self.db.update_run_status(run_id, 'failed', error_msg)
-            raise
+    def _record_run_failure(self, run_id: str, error: Exception) -> None:
+        """Log a failed or cancelled run and record its status."""
+        if isinstance(error, AnalysisCancelledException):
+            self.logger.info(f"Analysis {run_id} cancelled by user")
+            self.db.update_run_status(run_id, 'cancelled', 'Cancelled by user')
+            return
 
-        except AnalysisError as e:
-            error_msg = str(e)
+        if isinstance(error, DownloadError):
+            error_msg = f"Download failed: {str(error)}"
+            self.logger.error(error_msg)
+        elif isinstance(error, ConversionError):
+            error_msg = f"PDF conversion failed: {str(error)}"
+            self.logger.error(error_msg)
+        elif isinstance(error, ExtractionError):
+            error_msg = f"Text extraction failed: {str(error)}"
+            self.logger.error(error_msg)
+        elif isinstance(error, AIProviderError):
+            error_msg = str(error)
+            self.logger.error("AI analysis failed", exc_info=True)
+        elif isinstance(error, AnalysisError):
+            error_msg = str(error)
             self.logger.error("Analysis failed", exc_info=True)
-            self.db.update_run_status(run_id, 'failed', error_msg)
-            raise
-
-        except RateLimitError as e:
-            error_msg = f"Rate limit exceeded: {str(e)}"
+        elif isinstance(error, RateLimitError):
+            error_msg = f"Rate limit exceeded: {str(error)}"
             self.logger.error(error_msg)
-            self.db.update_run_status(run_id, 'failed', error_msg)
-            raise
-
-        except ValidationError as e:
-            error_msg = f"Validation error: {str(e)}"
+        elif isinstance(error, ValidationError):
+            error_msg = f"Validation error: {str(error)}"
             self.logger.error(error_msg)
-            self.db.update_run_status(run_id, 'failed', error_msg)
-            raise
-
-        except ValueError as e:
-            error_msg = f"Invalid configuration: {str(e)}"
+        elif isinstance(error, ValueError):
+            error_msg = f"Invalid configuration: {str(error)}"
             self.logger.error(error_msg)
-            self.db.update_run_status(run_id, 'failed', error_msg)
-            raise
-
-        except AnalysisCancelledException:
-            self.logger.info(f"Analysis {run_id} cancelled by user")
-            self.db.update_run_status(run_id, 'cancelled', 'Cancelled by user')
-            raise
-
-        except Exception as e:
-            error_msg = f"Unexpected error: {str(e)}"
+        else:
+            error_msg = f"Unexpected error: {str(error)}"
             self.logger.error(error_msg, exc_info=True)
-            self.db.update_run_status(run_id, 'failed', error_msg)
-            raise
-
-        finally:
-            # Always cleanup cancellation token
-            registry.cleanup_token(run_id)
 
-        return run_id
+        self.db.update_run_status(run_id, 'failed', error_msg)
 
     def _get_or_download_filings(
         self,
@@ -509,25 +657,17 @@ class AnalysisService:
 
             self.db.update_run_progress(
                 run_id,
-                progress_message=f"Converting HTML filings to PDF...",
+                progress_message=f"Converting {filing_type} filings to {self._conversion_label()}...",
                 progress_percent=30
             )
 
-            # Convert to PDF - pass filing_metadata for unique filename generation
-            # Use identifier (CIK or ticker) for the PDF directory
-            pdf_dir_name = identifier.upper() if input_mode == 'ticker' else f"CIK_{identifier}"
-            ticker_pdf_path = self.config.get_data_path("pdfs") / pdf_dir_name
-            with SECConverter() as converter:
-                pdf_files = converter.convert(
-                    ticker=identifier,
-                    input_path=filing_dir,
-                    output_path=ticker_pdf_path,
-                    filing_type=filing_type,
-                    filing_metadata=filing_metadata
-                )
+            # Convert - pass filing_metadata for unique filename generation
+            pdf_files = self._convert_filings(
+                identifier, filing_dir, filing_type, filing_metadata, input_mode
+            )
 
             if not pdf_files:
-                self.logger.warning(f"No PDFs generated for {identifier}")
+                self.logger.warning(f"No filings converted for {identifier}")
                 return pdf_paths
 
             # Build mapping from filing_date -> fiscal_year using SEC metadata
@@ -572,7 +712,7 @@ class AnalysisService:
             for year in years_to_download:
                 if year in available_pdfs:
                     pdf_info = available_pdfs[year]
-                    pdf_path = pdf_info['pdf_path']
+                    pdf_path = pdf_info['file_path']
                     filing_date = pdf_info.get('filing_date')
                     fiscal_year = pdf_info.get('fiscal_year', year)
                     pdf_paths[year] = Path(pdf_path)
@@ -580,6 +720,7 @@ class AnalysisService:
                     # Cache using fiscal_year (not filing year from accession)
                     self.db.cache_file(
                         identifier, fiscal_year, filing_type, str(pdf_path),
+                        file_hash=compute_file_hash(pdf_path),
                         filing_date=filing_date
                     )
                     self.logger.info(f"Matched and cached {identifier} FY{fiscal_year} (filed {filing_date}): {pdf_path}")
@@ -600,7 +741,7 @@ class AnalysisService:
                         break
                     if avail_year not in already_used:
                         pdf_info = available_pdfs[avail_year]
-                        pdf_path = pdf_info['pdf_path']
+                        pdf_path = pdf_info['file_path']
                         filing_date = pdf_info.get('filing_date')
                         fiscal_year = pdf_info.get('fiscal_year', avail_year)
                         pdf_paths[avail_year] = Path(pdf_path)
@@ -608,6 +749,7 @@ class AnalysisService:
                         # Cache using fiscal_year
                         self.db.cache_file(
                             identifier, fiscal_year, filing_type, str(pdf_path),
+                            file_hash=compute_file_hash(pdf_path),
                             filing_date=filing_date
                         )
                         self.logger.info(
@@ -621,6 +763,54 @@ class AnalysisService:
 
         return pdf_paths
 
+    def _conversion_label(self) -> str:
+        """Human-readable target of filing conversion for progress messages."""
+        return "text" if self.config.filing_text_source == 'html' else "PDF"
+
+    def _convert_filings(
+        self,
+        identifier: str,
+        filing_dir: Path,
+        filing_type: str,
+        filing_metadata: Optional[List[Dict]],
+        input_mode: str = 'ticker'
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert downloaded filings into documents the extractor can read.
+
+        With filing_text_source='html' (default) filings are extracted to
+        text without starting a browser; a PDF copy is only rendered if
+        keep_pdf_artifacts is set. With 'pdf' the legacy Chrome path is used.
+
+        Args:
+            identifier: Ticker or zero-padded CIK
+            filing_dir: Directory with downloaded accession folders
+            filing_type: Filing type (10-K, 8-K, etc.)
+            filing_metadata: Filing metadata from SEC (for filing dates)
+            input_mode: 'ticker' or 'cik' - determines output directory name
+
+        Returns:
+            Converter result dicts ('file_path', 'year', 'filing_date', ...)
+        """
+        dir_name = identifier.upper() if input_mode == 'ticker' else f"CIK_{identifier}"
+
+        if self.config.filing_text_source == 'html':
+            output_formats = ("text", "pdf") if self.config.keep_pdf_artifacts else ("text",)
+            output_path = self.config.get_data_path("filings") / dir_name
+        else:
+            output_formats = ("pdf",)
+            output_path = self.config.get_data_path("pdfs") / dir_name
+
+        with SECConverter() as converter:
+            return converter.convert(
+                ticker=identifier,
+                input_path=filing_dir,
+                output_path=output_path,
+                filing_type=filing_type,
+                filing_metadata=filing_metadata,
+                output_formats=output_formats
+            )
+
     def _get_event_filings(
         self,
         ticker: str,
@@ -714,23 +904,16 @@ class AnalysisService:
 
             self.db.update_run_progress(
                 run_id,
-                progress_message=f"Converting {filing_type} filings to PDF...",
+                progress_message=f"Converting {filing_type} filings to {self._conversion_label()}...",
                 progress_percent=30
             )
 
-            pdf_dir_name = identifier.upper() if input_mode == 'ticker' else f"CIK_{identifier}"
-            ticker_pdf_path = self.config.get_data_path("pdfs") / pdf_dir_name
-            with SECConverter() as converter:
-                pdf_files = converter.convert(
-                    ticker=identifier,
-                    input_path=filing_dir,
-                    output_path=ticker_pdf_path,
-                    filing_type=filing_type,
-                    filing_metadata=filing_metadata
-                )
+            pdf_files = self._convert_filings(
+                identifier, filing_dir, filing_type, filing_metadata, input_mode
+            )
 
             if not pdf_files:
-                self.logger.warning(f"No PDFs generated for {identifier}")
+                self.logger.warning(f"No filings converted for {identifier}")
                 return pdf_paths
 
             # For event filings, use filing_date as key (or index if no date)
@@ -746,7 +929,7 @@ class AnalysisService:
                 if len(pdf_paths) >= count:
                     break
 
-                pdf_path = pdf_info['pdf_path']
+                pdf_path = pdf_info['file_path']
                 filing_date = pdf_info.get('filing_date')
                 actual_year = pdf_info.get('year')
 
@@ -761,6 +944,7 @@ class AnalysisService:
                     # Cache with filing_date
                     self.db.cache_file(
                         identifier, actual_year or 0, filing_type, str(pdf_path),
+                        file_hash=compute_file_hash(pdf_path),
                         filing_date=filing_date
                     )
                     self.logger.info(f"[CACHE STORED] {filing_type} filed {filing_date} for {identifier}")
@@ -804,59 +988,31 @@ class AnalysisService:
             self.logger.warning(f"No PDF files provided for fundamental analysis of {ticker}")
             return {}
 
-        # Get cancellation token for this run
-        token = get_cancellation_registry().get_token(run_id)
-
-        # Create analyzer - if api_key is provided, it's from batch queue Fix #1
-        # The analyzer will use the api_key_manager internally
-        analyzer = FundamentalAnalyzer(
-            api_key_manager=self.api_key_manager,
-            rate_limiter=self.rate_limiter,
-            api_key=api_key  # Pass pre-reserved key if available
-        )
-
-        results = {}
-        total_years = len(pdf_paths)
-        for idx, (year, pdf_path) in enumerate(pdf_paths.items(), 1):
-            # Check for cancellation before processing each year
-            if token:
-                token.raise_if_cancelled()
-
-            self.logger.info(f"Analyzing {ticker} {year} (Fundamental)")
-
-            # Update progress for this specific year
-            progress_pct = 50 + int((idx / total_years) * 40)  # 50-90% range
-            self.db.update_run_progress(
-                run_id,
-                progress_message=f"Analyzing {ticker} {year} (Fundamental)",
-                progress_percent=progress_pct,
-                current_step=f"Year {year}",
-                total_steps=total_years
-            )
-
-            result = analyzer.analyze_filing(
+        # One analyzer per key: a pre-reserved key comes from batch queue Fix #1;
+        # with no key the analyzer reserves one per call from api_key_manager
+        analyzers: Dict[Optional[str], FundamentalAnalyzer] = {}
+
+        def analyze_year(year, pdf_path, year_key):
+            if year_key not in analyzers:
+                analyzers[year_key] = FundamentalAnalyzer(
+                    api_key_manager=self.api_key_manager,
+                    rate_limiter=self.rate_limiter,
+                    api_key=year_key,
+                    extractor=self.extractor
+                )
+            return analyzers[year_key].analyze_filing(
                 pdf_path=pdf_path,
                 ticker=ticker,
                 year=year,
                 custom_prompt=custom_prompt
             )
-            if result:
-                results[year] = result
-                # Incremental save: persist each year's result immediately
-                self.db.store_result(
-                    run_id=run_id, ticker=ticker, fiscal_year=year,
-                    filing_type=filing_type, result_type=type(result).__name__,
-                    result_data=result.model_dump()
-                )
 
-            # Call progress callback after each year
-            if year_progress_callback:
-                try:
-                    year_progress_callback(year, idx, total_years)
-                except Exception as e:
-                    self.logger.warning(f"Year progress callback error: {e}")
-
-        return results
+        return self._run_years(
+            ticker, pdf_paths, run_id, "Fundamental", analyze_year,
+            api_key=api_key,
+            year_progress_callback=year_progress_callback,
+            filing_type=filing_type
+        )
 
     def _run_excellent_analysis(
         self,
@@ -876,7 +1032,8 @@ class AnalysisService:
         fundamental_analyzer = FundamentalAnalyzer(
             api_key_manager=self.api_key_manager,
             rate_limiter=self.rate_limiter,
-            api_key=api_key
+            api_key=api_key,
+            extractor=self.extractor
         )
 
         fundamental_analyses = {}
@@ -952,7 +1109,8 @@ class AnalysisService:
         fundamental_analyzer = FundamentalAnalyzer(
             api_key_manager=self.api_key_manager,
             rate_limiter=self.rate_limiter,
-            api_key=api_key
+            api_key=api_key,
+            extractor=self.extractor
         )
 
         fundamental_analyses = {}
@@ -1050,66 +1208,53 @@ class AnalysisService:
             self.logger.warning(f"No PDF files provided for {display_name} analysis of {ticker}")
             return {}
 
-        # Get cancellation token
-        token = get_cancellation_registry().get_token(run_id)
-
-        analyzer = PerspectiveAnalyzer(
-            api_key_manager=self.api_key_manager,
-            rate_limiter=self.rate_limiter,
-            api_key=api_key
-        )
-
         # Map perspective to analyzer method
-        analyze_methods = {
-            'buffett': analyzer.analyze_buffett,
-            'taleb': analyzer.analyze_taleb,
-            'contrarian': analyzer.analyze_contrarian,
-            'multi': analyzer.analyze_multi_perspective,
+        method_names = {
+            'buffett': 'analyze_buffett',
+            'taleb': 'analyze_taleb',
+            'contrarian': 'analyze_contrarian',
+            'multi': 'analyze_multi_perspective',
         }
-        analyze_method = analyze_methods.get(perspective)
-        if not analyze_method:
+        method_name = method_names.get(perspective)
+        if not method_name:
             raise ValueError(f"Unknown perspective: {perspective}")
 
-        results = {}
-        total_years = len(pdf_paths)
-        for idx, (year, pdf_path) in enumerate(pdf_paths.items(), 1):
-            # Check for cancellation
-            if token:
-                token.raise_if_cancelled()
-
-            self.logger.info(f"Analyzing {ticker} {year} ({display_name})")
+        # One analyzer per key (see _run_fundamental_analysis)
+        analyzers: Dict[Optional[str], PerspectiveAnalyzer] = {}
 
-            progress_pct = 50 + int((idx / total_years) * 40)
-            self.db.update_run_progress(
-                run_id,
-                progress_message=f"Analyzing {ticker} {year} ({display_name})",
-                progress_percent=progress_pct,
-                current_step=f"Year {year}",
-                total_steps=total_years
-            )
+        def analyzer_for(year_key):
+            if year_key not in analyzers:
+                analyzers[year_key] = PerspectiveAnalyzer(
+                    api_key_manager=self.api_key_manager,
+                    rate_limiter=self.rate_limiter,
+                    api_key=year_key,
+                    extractor=self.extractor
+                )
+            return analyzers[year_key]
 
-            result = analyze_method(
+        def analyze_year(year, pdf_path, year_key):
+            analyze_method = getattr(analyzer_for(year_key), method_name)
+            return analyze_method(
                 pdf_path=pdf_path,
                 ticker=ticker,
                 year=year
             )
-            if result:
-                results[year] = result
-                # Incremental save: persist each year's result immediately
-                self.db.store_result(
-                    run_id=run_id, ticker=ticker, fiscal_year=year,
-                    filing_type=filing_type, result_type=type(result).__name__,
-                    result_data=result.model_dump()
-                )
 
-            # Call progress callback after each year
-            if year_progress_callback:
-                try:
-                    year_progress_callback(year, idx, total_years)
-                except Exception as e:
-                    self.logger.warning(f"Year progress callback error: {e}")
+        async def analyze_year_async(year, pdf_path, provider):
+            return await analyzer_for(provider.api_key).analyze_async(
+                pdf_path=pdf_path,
+                ticker=ticker,
+                year=year,
+                perspective=perspective
+            )
 
-        return results
+        return self._run_years(
+            ticker, pdf_paths, run_id, display_name, analyze_year,
+            api_key=api_key,
+            year_progress_callback=year_progress_callback,
+            filing_type=filing_type,
+            analyze_year_async=analyze_year_async
+        )
 
     def _run_buffett_analysis(
         self,
@@ -1172,7 +1317,8 @@ class AnalysisService:
         fundamental_analyzer = FundamentalAnalyzer(
             api_key_manager=self.api_key_manager,
             rate_limiter=self.rate_limiter,
-            api_key=api_key
+            api_key=api_key,
+            extractor=self.extractor
         )
 
         fundamental_analyses = {}
@@ -1263,6 +1409,284 @@ class AnalysisService:
 
         return {}
 
+    def _run_years(
+        self,
+        ticker: str,
+        pdf_paths: Dict[int, Path],
+        run_id: str,
+        label: str,
+        analyze_year: Callable[[int, Path, Optional[str]], Any],
+        api_key: Optional[str] = None,
+        year_progress_callback: Optional[Callable[[int, int, int], None]] = None,
+        filing_type: Optional[str] = None,
+        on_error: Optional[Callable[[int, Exception], None]] = None,
+        analyze_year_async: Optional[Callable[[int, Path, Any], Awaitable[Any]]] = None,
+    ) -> Dict[int, Any]:
+        """
+        Run one analysis per fiscal year, serially or fanned out across keys.
+
+        With ``config.year_concurrency`` at 1 (the default) the years run one
+        after another on ``api_key``, exactly as before. Above 1, up to that
+        many years run at once, each on its own key: ``api_key`` (if the batch
+        pre-reserved one) plus extra keys reserved without waiting. If no key
+        is free, the years run with no key and the analyzers reserve their own.
+
+        Analyses that provide ``analyze_year_async`` fan out on an
+        AsyncAnalysisEngine instead: one event loop on this thread whose
+        years share the same reserved keys, each year taking whichever has
+        free quota soonest, rather than one thread per key. The extra keys
+        are released when the years finish.
+
+        Whatever the mode, results are stored and ``year_progress_callback``
+        is called from this thread, one year at a time, with a completed
+        count that rises 1..total. Cancellation is checked before each year
+        starts and while waiting on running years.
+
+        Args:
+            ticker: Company ticker (for progress messages)
+            pdf_paths: Dict mapping year to filing path
+            run_id: Run ID for progress, storage and cancellation
+            label: Analysis name shown in progress messages
+            analyze_year: Callable ``(year, pdf_path, api_key) -> result``
+            api_key: Pre-reserved API key from the batch queue
+            year_progress_callback: Optional ``(year, completed, total)`` callback
+            filing_type: Filing type for incremental saves; None skips them
+            on_error: Called with ``(year, exception)`` when a year fails. Without
+                it the first failure cancels the remaining years and is raised.
+            analyze_year_async: Optional coroutine function
+                ``(year, pdf_path, provider) -> result`` used for the fan-out
+
+        Returns:
+            Dict mapping year to result for the years that produced one
+
+        Raises:
+            AnalysisCancelledException: If the run is cancelled
+        """
+        token = get_cancellation_registry().get_token(run_id)
+        results: Dict[int, Any] = {}
+        total_years = len(pdf_paths)
+        completed = 0
+        # Raised even with on_error: out of quota is the batch queue's to
+        # handle (wait for reset), not a bad year
+        stop = (AnalysisCancelledException, KeyQuotaExhaustedError)
+
+        def start_year(idx: int, year: int) -> None:
+            if token:
+                token.raise_if_cancelled()
+
+            self.logger.info(f"Analyzing {ticker} {year} ({label})")
+
+            progress_pct = 50 + int((idx / total_years) * 40)  # 50-90% range
+            self.db.update_run_progress(
+                run_id,
+                progress_message=f"Analyzing {ticker} {year} ({label})",
+                progress_percent=progress_pct,
+                current_step=f"Year {year}",
+                total_steps=total_years
+            )
+
+        def finish_year(year: int, result: Any) -> None:
+            nonlocal completed
+            completed += 1
+            if result:
+                results[year] = result
+                if filing_type is not None:
+                    # Incremental save: persist each year's result immediately
+                    self.db.store_result(
+                        run_id=run_id, ticker=ticker, fiscal_year=year,
+                        filing_type=filing_type, result_type=type(result).__name__,
+                        result_data=result.model_dump()
+                    )
+
+            if year_progress_callback:
+                try:
+                    year_progress_callback(year, completed, total_years)
+                except Exception as e:
+                    self.logger.warning(f"Year progress callback error: {e}")
+
+        concurrency = min(self.config.year_concurrency, total_years)
+        if concurrency <= 1:
+            for idx, (year, pdf_path) in enumerate(pdf_paths.items(), 1):
+                start_year(idx, year)
+                try:
+                    result = analyze_year(year, pdf_path, api_key)
+                except stop:
+                    raise
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    on_error(year, e)
+                    completed += 1
+                    continue
+                finish_year(year, result)
+            return results
+
+        # Keys for the fan-out: the batch's key plus whatever is free right now.
+        # Waiting here would starve other companies in the batch of keys.
+        keys: List[Optional[str]] = [api_key] if api_key else []
+        extra_keys: List[str] = []
+        while len(keys) < concurrency:
+            extra = self.api_key_manager.reserve_key(wait_timeout=0)
+            if not extra:
+                break
+            extra_keys.append(extra)
+            keys.append(extra)
+
+        if analyze_year_async is not None:
+            years = list(pdf_paths.items())
+
+            def job(idx: int, year: int, pdf_path: Path):
+                async def run(provider):
+                    # Progress is a SQLite write - keep it off the event loop
+                    await asyncio.to_thread(start_year, idx, year)
+                    return await analyze_year_async(year, pdf_path, provider)
+                return run
+
+            def on_outcome(outcome: JobOutcome) -> None:
+                nonlocal completed
+                if token:
+                    token.raise_if_cancelled()
+                if outcome.success:
+                    finish_year(outcome.key, outcome.result)
+                    return
+                if isinstance(outcome.error, stop) or on_error is None:
+                    raise outcome.error
+                on_error(outcome.key, outcome.error)
+                completed += 1
+
+            engine = AsyncAnalysisEngine(
+                self.api_key_manager,
+                self.rate_limiter,
+                model=self.config.default_model,
+                thinking_budget=self.config.thinking_budget,
+                max_in_flight=concurrency,
+                api_keys=keys,
+            )
+            self.logger.info(
+                f"Analyzing {total_years} years of {ticker} on one event loop "
+                f"({concurrency} in flight, {len(keys) or 'any'} key(s))"
+            )
+            try:
+                engine.run(
+                    ((year, job(idx, year, pdf_path)) for idx, (year, pdf_path) in enumerate(years, 1)),
+                    on_outcome=on_outcome,
+                )
+            finally:
+                for key in extra_keys:
+                    self.api_key_manager.release_key(key)
+            return results
+
+        if not keys:
+            keys = [None] * concurrency
+
+        free_keys: "queue.Queue[Optional[str]]" = queue.Queue()
+        for key in keys:
+            free_keys.put(key)
+
+        def run_year(idx: int, year: int, pdf_path: Path) -> Any:
+            year_key = free_keys.get()
+            try:
+                start_year(idx, year)
+                return analyze_year(year, pdf_path, year_key)
+            finally:
+                free_keys.put(year_key)
+
+        self.logger.info(
+            f"Analyzing {total_years} years of {ticker} with {len(keys)} "
+            f"concurrent worker(s)"
+        )
+        try:
+            with ThreadPoolExecutor(
+                max_workers=len(keys), thread_name_prefix=f"years-{ticker}"
+            ) as executor:
+                futures = {
+                    executor.submit(run_year, idx, year, pdf_path): year
+                    for idx, (year, pdf_path) in enumerate(pdf_paths.items(), 1)
+                }
+                pending = set(futures)
+                try:
+                    while pending:
+                        done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                        if token:
+                            token.raise_if_cancelled()
+                        for future in done:
+                            year = futures[future]
+                            try:
+                                result = future.result()
+                            except stop:
+                                raise
+                            except Exception as e:
+                                if on_error is None:
+                                    raise
+                                on_error(year, e)
+                                completed += 1
+                                continue
+                            finish_year(year, result)
+                except BaseException:
+                    # Drop years that have not started; running ones finish
+                    # (and their keys come back) before the executor exits.
+                    for future in pending:
+                        future.cancel()
+                    raise
+        finally:
+            for key in extra_keys:
+                self.api_key_manager.release_key(key)
+
+        return results
+
+    def _analyze_with_workflow(
+        self,
+        workflow,
+        workflow_id: str,
+        ticker: str,
+        year: int,
+        text: str,
+        provider
+    ):
+        """
+        Call workflow.analyze(), checkpointing its sub-calls when it supports it.
+
+        Step outputs are saved in workflow_step_outputs under an ID built
+        from the workflow, filing and model, so when the batch queue retries
+        a failed year only the sub-calls that did not complete run again.
+
+        Args:
+            workflow: CustomWorkflow instance
+            workflow_id: Custom workflow ID
+            ticker: Company ticker
+            year: Fiscal year
+            text: Extracted filing text
+            provider: Provider for the workflow's calls
+
+        Returns:
+            The workflow's schema instance
+        """
+        checkpoint = self._workflow_checkpoint(workflow, workflow_id, ticker, year, text, provider)
+        if checkpoint is None:
+            return workflow.analyze(ticker=ticker, year=year, text=text, provider=provider)
+
+        return workflow.analyze(
+            ticker=ticker, year=year, text=text, provider=provider, checkpoint=checkpoint
+        )
+
+    def _workflow_checkpoint(
+        self,
+        workflow,
+        workflow_id: str,
+        ticker: str,
+        year: int,
+        text: str,
+        provider
+    ) -> Optional[StepCheckpoint]:
+        """Step checkpoint for one workflow filing, or None if the workflow can't use one."""
+        if not workflow.accepts_checkpoint():
+            return None
+        return StepCheckpoint(
+            self.db,
+            StepCheckpoint.make_id(workflow_id, ticker, year, provider.model, text),
+            workflow_id,
+        )
+
     def _run_custom_workflow(
         self,
         ticker: str,
@@ -1305,82 +1729,73 @@ class AnalysisService:
         self.logger.info(f"Running custom workflow '{workflow.name}' for {ticker}")
 
         # Import AI provider
-        from eon.ai.providers.gemini import GeminiProvider
+        from eon.ai.providers import get_gemini_provider
 
-        results = {}
         year_errors: Dict[int, str] = {}  # Track per-year failures so we can raise if ALL fail
         total_years = len(pdf_paths)
 
-        for idx, (year, pdf_path) in enumerate(pdf_paths.items(), 1):
-            self.logger.info(f"Analyzing {ticker} {year} ({workflow.name})")
+        def analyze_year(year, pdf_path, year_key):
+            # Extract text from PDF
+            text = self.extractor.extract_text(pdf_path)
 
-            progress_pct = 50 + int((idx / total_years) * 40)
-            self.db.update_run_progress(
-                run_id,
-                progress_message=f"Analyzing {ticker} {year} ({workflow.name})",
-                progress_percent=progress_pct,
-                current_step=f"Year {year}",
-                total_steps=total_years
-            )
+            # Use the key handed in (batch or year fan-out), otherwise reserve per year
+            key_was_pre_reserved = bool(year_key)
+            if not year_key:
+                year_key = self.api_key_manager.reserve_key()
 
-            try:
-                # Extract text from PDF
-                text = self.extractor.extract_text(pdf_path)
+            if not year_key:
+                self.logger.error("No API keys available for custom workflow")
+                raise AnalysisError("No API keys available")
 
-                # Use pre-reserved key if available (batch), otherwise reserve per year
-                if api_key:
-                    year_key = api_key
-                    key_was_pre_reserved = True
-                else:
-                    year_key = self.api_key_manager.reserve_key()
-                    key_was_pre_reserved = False
-
-                if not year_key:
-                    self.logger.error("No API keys available for custom workflow")
-                    year_errors[year] = "No API keys available"
-                    continue
-
-                try:
-                    provider = GeminiProvider(
-                        api_key=year_key,
-                        model=self.config.default_model,
-                        thinking_budget=self.config.thinking_budget,
-                        rate_limiter=self.rate_limiter
-                    )
+            try:
+                provider = get_gemini_provider(
+                    api_key=year_key,
+                    model=self.config.default_model,
+                    thinking_budget=self.config.thinking_budget,
+                    rate_limiter=self.rate_limiter
+                )
 
-                    # Delegate to the workflow's analyze() hook. Default
-                    # implementation is a single Gemini call (legacy
-                    # behavior). Workflows that need multi-call
-                    # orchestration override this method.
-                    result = workflow.analyze(
-                        ticker=ticker,
-                        year=year,
-                        text=text,
-                        provider=provider,
-                    )
+                # Delegate to the workflow's analyze() hook. Default
+                # implementation is a single Gemini call (legacy
+                # behavior). Workflows that need multi-call
+                # orchestration declare a step graph or override it.
+                result = self._analyze_with_workflow(
+                    workflow, workflow_id, ticker, year, text, provider
+                )
 
-                    if result:
-                        results[year] = result
-                        self.logger.info(f"Completed {workflow.name} analysis for {ticker} {year}")
-                    else:
-                        year_errors[year] = f"{workflow.name}.analyze() returned no result"
+                if result:
+                    self.logger.info(f"Completed {workflow.name} analysis for {ticker} {year}")
+                else:
+                    year_errors[year] = f"{workflow.name}.analyze() returned no result"
+                return result
 
-                finally:
-                    # Only release if we reserved it (not if pre-reserved by batch)
-                    if not key_was_pre_reserved:
-                        self.api_key_manager.release_key(year_key)
+            finally:
+                # Only release if we reserved it (not if handed in)
+                if not key_was_pre_reserved:
+                    self.api_key_manager.release_key(year_key)
 
-            except Exception as e:
-                self.logger.error(f"Failed to analyze {ticker} {year} with {workflow.name}: {e}")
-                year_errors[year] = str(e)
-                continue
+        async def analyze_year_async(year, pdf_path, provider):
+            text = await asyncio.to_thread(self.extractor.extract_text, pdf_path)
+            checkpoint = self._workflow_checkpoint(workflow, workflow_id, ticker, year, text, provider)
+            result = await workflow.analyze_async(ticker, year, text, provider, checkpoint=checkpoint)
 
-            # Call progress callback after each year
-            if year_progress_callback:
-                try:
-                    year_progress_callback(year, idx, total_years)
-                except Exception as e:
-                    self.logger.warning(f"Year progress callback error: {e}")
+            if result:
+                self.logger.info(f"Completed {workflow.name} analysis for {ticker} {year}")
+            else:
+                year_errors[year] = f"{workflow.name}.analyze() returned no result"
+            return result
+
+        def record_error(year, error):
+            self.logger.error(f"Failed to analyze {ticker} {year} with {workflow.name}: {error}")
+            year_errors[year] = str(error)
+
+        results = self._run_years(
+            ticker, pdf_paths, run_id, workflow.name, analyze_year,
+            api_key=api_key,
+            year_progress_callback=year_progress_callback,
+            on_error=record_error,
+            analyze_year_async=analyze_year_async
+        )
 
         # If every year failed, raise so the run is marked 'failed' rather than
         # ghost-completed (empty results dict + run.status='completed'). The
@@ -1663,7 +2078,8 @@ class AnalysisService:
 
         analyzer = FundamentalAnalyzer(
             api_key_manager=self.api_key_manager,
-            rate_limiter=self.rate_limiter
+            rate_limiter=self.rate_limiter,
+            extractor=self.extractor
         )
 
         results = {}
@@ -1725,7 +2141,7 @@ class AnalysisService:
 
         self.logger.info(f"Running custom workflow '{workflow.name}' for {ticker}")
 
-        from eon.ai.providers.gemini import GeminiProvider
+        from eon.ai.providers import get_gemini_provider
 
         results = {}
         total_years = len(pdf_paths)
@@ -1759,7 +2175,7 @@ class AnalysisService:
                     continue
 
                 try:
-                    provider = GeminiProvider(
+                    provider = get_gemini_provider(
                         api_key=year_key,
                         model=self.config.default_model,
                         thinking_budget=self.config.thinking_budget,
@@ -1769,12 +2185,9 @@ class AnalysisService:
                     # Delegate to the workflow's analyze() hook. Default
                     # implementation is a single Gemini call (legacy
                     # behavior). Workflows that need multi-call
-                    # orchestration override this method.
-                    result = workflow.analyze(
-                        ticker=ticker,
-                        year=year,
-                        text=text,
-                        provider=provider,
+                    # orchestration declare a step graph or override it.
+                    result = self._analyze_with_workflow(
+                        workflow, workflow_id, ticker, year, text, provider
                     )
 
                     if result:
@@ -1811,7 +2224,7 @@ class AnalysisService:
         Returns:
             New run_id of the synthesis analysis, or None if failed
         """
-        from eon.ai.providers.gemini import GeminiProvider
+        from eon.ai.providers import get_gemini_provider
         import json as json_module
 
         # Get original run details
@@ -1913,7 +2326,7 @@ Be comprehensive but focus on actionable insights from the longitudinal perspect
                 raise Exception("No API keys available for synthesis")
 
             try:
-                provider = GeminiProvider(
+                provider = get_gemini_provider(
                     api_key=api_key,
                     model=self.config.default_model,
                     thinking_budget=self.config.thinking_budget,
@@ -2014,5 +2427,5 @@ def create_analysis_service(
         key_manager=APIKeyManager(config.google_api_keys),
         rate_limiter=RateLimiter(),
         downloader=SECDownloader(),
-        extractor=PDFExtractor(),
+        extractor=HTMLExtractor(),
     )
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Staged producer/consumer pipeline for batch processing.
+
+A batch item used to run download -> HTML-to-PDF -> text extraction ->
+every LLM year in one worker thread that held a pre-reserved API key, so
+keys sat idle through SEC I/O and Chrome conversion. The pipeline splits
+that work into stages joined by bounded queues, each stage with its own
+worker count: I/O stages can run wide without holding keys, and the LLM
+stage only ever waits on the API.
+
+Each stage handler takes a payload and returns the payload for the next
+stage, or None when the item is finished. Bounded queues give
+backpressure: a slow LLM stage stops the fetch stage from downloading
+more than a few companies ahead.
+
+Usage:
+    pipeline = StagedPipeline(
+        [
+            Stage("fetch", download, workers=4, queue_size=5),
+            Stage("llm", analyze, workers=25, queue_size=25),
+        ],
+        on_error=lambda stage, payload, error: log(stage, error),
+    )
+    pipeline.start()
+    for item in items:
+        pipeline.submit(item)
+    pipeline.close()
+    pipeline.join()
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from eon.core import get_logger
+
+
+# Marks the end of a stage's input; one per worker of the receiving stage
+_CLOSE = object()
+
+
+@dataclass
+class Stage:
+    """One step of a StagedPipeline."""
+    name: str
+    handler: Callable[[Any], Optional[Any]]
+    workers: int = 1
+    queue_size: int = 1  # Capacity of this stage's input queue
+
+
+class StagedPipeline:
+    """
+    Runs payloads through a chain of stages on dedicated worker threads.
+
+    Every submitted payload ends in exactly one of: a handler returning
+    None (finished), on_error (a handler raised), or on_discard (the
+    pipeline was stopped before the payload reached the end).
+
+    Thread-safe: submit()/stop()/stats() may be called from any thread.
+
+    Example:
+        pipeline = StagedPipeline([Stage("double", lambda x: x * 2), Stage("store", store)])
+        pipeline.start()
+        pipeline.submit(21)
+        pipeline.close()
+        pipeline.join()
+    """
+
+    POLL_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        on_error: Optional[Callable[[str, Any, Exception], None]] = None,
+        on_discard: Optional[Callable[[str, Any], None]] = None,
+        name: str = "pipeline"
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in processing order
+            on_error: Called with (stage name, payload, exception) when a handler raises
+            on_discard: Called with (stage name, payload) for payloads dropped by stop()
+            name: Prefix for worker thread names
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+
+        self.stages = stages
+        self.on_error = on_error
+        self.on_discard = on_discard
+        self.name = name
+
+        self._queues = [queue.Queue(maxsize=max(1, s.queue_size)) for s in stages]
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._closed = False
+        self._alive = [max(1, s.workers) for s in stages]
+        self._busy = [0] * len(stages)
+        self._done = [0] * len(stages)
+        self._failed = [0] * len(stages)
+
+        self.logger = get_logger(f"{__name__}.StagedPipeline")
+
+    def start(self) -> None:
+        """Start every stage's worker threads."""
+        if self._threads:
+            raise RuntimeError("Pipeline is already running")
+
+        for index, stage in enumerate(self.stages):
+            for worker in range(max(1, stage.workers)):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index,),
+                    name=f"{self.name}-{stage.name}-{worker}",
+                    daemon=True
+                )
+                self._threads.append(thread)
+                thread.start()
+
+    def submit(self, payload: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Add a payload to the first stage, waiting while its queue is full.
+
+        Args:
+            payload: Input for the first stage's handler
+            timeout: Maximum seconds to wait for room (None = no limit)
+
+        Returns:
+            True if queued, False if the pipeline was stopped or the wait timed out
+        """
+        if self._stopped.is_set():
+            return False
+        if self._closed:
+            raise RuntimeError("Pipeline is closed")
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        return self._put(0, payload, deadline)
+
+    def close(self) -> None:
+        """Signal that no more payloads will be submitted; stages drain and exit."""
+        if self._closed:
+            return
+        self._closed = True
+        self._close_stage(0)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for every worker to exit (call close() or stop() first).
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if all workers exited
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in self._threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+            if thread.is_alive():
+                return False
+        if self._stopped.is_set():
+            # Payloads that raced stop() into a queue after its workers left
+            for index, inbox in enumerate(self._queues):
+                while True:
+                    try:
+                        payload = inbox.get_nowait()
+                    except queue.Empty:
+                        break
+                    if payload is not _CLOSE:
+                        self._discard(index, payload)
+        return True
+
+    def stop(self) -> None:
+        """
+        Stop accepting work and discard queued payloads.
+
+        Handlers already running finish; their results are discarded
+        instead of moving on. Safe to call from inside a handler.
+        """
+        self._closed = True
+        self._stopped.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-stage counters.
+
+        Returns:
+            Stage name -> queued, busy, done (handler returned) and failed counts
+        """
+        with self._lock:
+            return {
+                stage.name: {
+                    'queued': self._queues[i].qsize(),
+                    'busy': self._busy[i],
+                    'done': self._done[i],
+                    'failed': self._failed[i],
+                }
+                for i, stage in enumerate(self.stages)
+            }
+
+    def _put(self, index: int, payload: Any, deadline: Optional[float] = None) -> bool:
+        """Queue a payload for a stage, giving up if the pipeline is stopped."""
+        target = self._queues[index]
+        while not self._stopped.is_set():
+            wait = self.POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return False
+            try:
+                target.put(payload, timeout=wait)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _close_stage(self, index: int) -> None:
+        """Send one close marker per worker of a stage."""
+        for _ in range(max(1, self.stages[index].workers)):
+            if not self._put(index, _CLOSE):
+                return  # Stopped - the workers exit on their own
+
+    def _discard(self, index: int, payload: Any) -> None:
+        if self.on_discard is None:
+            return
+        try:
+            self.on_discard(self.stages[index].name, payload)
+        except Exception as e:
+            self.logger.error(f"Discard handler failed in stage {self.stages[index].name}: {e}")
+
+    def _worker(self, index: int) -> None:
+        stage = self.stages[index]
+        inbox = self._queues[index]
+        is_last = index == len(self.stages) - 1
+
+        while True:
+            try:
+                payload = inbox.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                if self._stopped.is_set():
+                    break
+                continue
+            if payload is _CLOSE:
+                break
+            if self._stopped.is_set():
+                self._discard(index, payload)
+                continue
+
+            with self._lock:
+                self._busy[index] += 1
+            try:
+                result = stage.handler(payload)
+            except Exception as e:
+                with self._lock:
+                    self._busy[index] -= 1
+                    self._failed[index] += 1
+                if self.on_error is None:
+                    self.logger.error(f"Stage {stage.name} failed: {e}", exc_info=True)
+                    continue
+                try:
+                    self.on_error(stage.name, payload, e)
+                except Exception as handler_error:
+                    self.logger.error(f"Error handler failed in stage {stage.name}: {handler_error}")
+                continue
+
+            with self._lock:
+                self._busy[index] -= 1
+                self._done[index] += 1
+            if result is None or is_last:
+                continue
+            if not self._put(index + 1, result):
+                self._discard(index, result)
+
+        # The last worker out closes the next stage
+        with self._lock:
+            self._alive[index] -= 1
+            last_out = self._alive[index] == 0
+        if last_out and not is_last:
+            self._close_stage(index + 1)
@@ -5,6 +5,7 @@ Batch queue system for large-scale multi-day analysis.
 
 Handles:
 - Distributing work across API keys
+- Staged fetch -> extract -> llm -> persist pipeline (keys held only by llm)
 - Waiting for midnight PST rate limit reset
 - Persistent progress tracking that survives crashes
 - Auto-resume after rate limit reset
@@ -15,7 +16,7 @@ import json
 import threading
 import time
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED, Future
+import socket
 from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -27,8 +28,11 @@ from eon.core import DiskMonitor, ProcessMonitor, cleanup_orphaned_chrome
 from eon.core.notifications import NotificationService
 from eon.ai import APIKeyManager, RateLimiter
 from eon.ai.api_config import get_sec_limits
+from eon.data.sources.sec import SECDownloader, get_browser_pool
+from eon.data.sources.sec.prefetch import filings_to_request
 from eon.ui.database import DatabaseRepository
-from eon.ui.services.cancellation import AnalysisCancelledException
+from eon.ui.services.batch_pipeline import Stage, StagedPipeline
+from eon.ui.services.cancellation import AnalysisCancelledException, get_cancellation_registry
 from eon.core.exceptions import KeyQuotaExhaustedError, ContextLengthExceededError
 
 
@@ -47,6 +51,17 @@ class BatchJobConfig:
     enable_synthesis: bool = False  # If True, create synthesis analysis after all tickers complete
 
 
+@dataclass
+class _BatchWork:
+    """One claimed batch item moving through the processing pipeline."""
+    item: Dict
+    batch_id: str
+    batch_config: Dict
+    heartbeat_stop: Optional[threading.Event] = None
+    prepared: Any = None  # PreparedRun, set by the extract stage
+    run_id: Optional[str] = None  # Set once the llm stage has finished
+
+
 class BatchQueueService:
     """
     Manages large batch analysis jobs that span multiple days.
@@ -62,6 +77,14 @@ class BatchQueueService:
     and will be created with sensible defaults if not provided.
     """
 
+    # Seconds an llm stage worker waits for a key before re-checking for stop/exhaustion
+    PIPELINE_KEY_WAIT = 30
+
+    # Worker processes heartbeat their batch_workers row this often; one that
+    # misses WORKER_STALE_SECONDS is dead and its leased items are reclaimed
+    WORKER_HEARTBEAT_SECONDS = 15
+    WORKER_STALE_SECONDS = 60
+
     def __init__(
         self,
         db: DatabaseRepository,
@@ -86,12 +109,21 @@ class BatchQueueService:
         self.api_key_manager = key_manager or APIKeyManager(self.config.google_api_keys)
         self.rate_limiter = rate_limiter or RateLimiter()
 
-        # SEC rate limiting configuration for staggered worker starts
+        # Companies downloaded ahead of the LLM stage
         sec_limits = get_sec_limits()
-        self._worker_stagger_delay = sec_limits.WORKER_STAGGER_DELAY
+        self._prefetch_lookahead = sec_limits.PREFETCH_LOOKAHEAD
+        self._pipeline: Optional[StagedPipeline] = None
+        self._thread_state = threading.local()
         self.worker_id = str(uuid.uuid4())
         self._lease_minutes = int(os.getenv("EON_BATCH_ITEM_LEASE_MINUTES", "180"))
 
+        # Registration in batch_workers (see start_worker)
+        self._shard_index = 0
+        self._shard_count = 1
+        self._worker_batch_id: Optional[str] = None
+        self._worker_heartbeat_stop: Optional[threading.Event] = None
+        self._owns_queue_state = True  # False for `eon batch worker` processes
+
         # Worker thread control
         self._worker_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
@@ -116,7 +148,9 @@ class BatchQueueService:
         self.logger.info(
             "BatchQueueService initialized "
             f"(worker_id={self.worker_id}, lease_minutes={self._lease_minutes}, "
-            f"worker_stagger_delay={self._worker_stagger_delay}s)"
+            f"prefetch_lookahead={self._prefetch_lookahead}, "
+            f"fetch_workers={self.config.batch_fetch_workers}, "
+            f"extract_workers={self.config.batch_extract_workers})"
         )
 
     def _cleanup_stale_worker(self):
@@ -128,7 +162,7 @@ class BatchQueueService:
         """
         try:
             query = """
-                SELECT worker_pid, current_batch_id
+                SELECT worker_pid, worker_id, current_batch_id
                 FROM queue_state
                 WHERE id = 1 AND is_running = 1
             """
@@ -136,6 +170,7 @@ class BatchQueueService:
 
             if row and row['worker_pid']:
                 old_pid = row['worker_pid']
+                old_worker_id = row['worker_id']
                 batch_id = row['current_batch_id']
 
                 if not self._is_process_alive(old_pid):
@@ -146,7 +181,12 @@ class BatchQueueService:
                     # Clear queue state
                     self._cleanup_worker(batch_id)
 
-                    # Reset any 'running' items back to 'pending' for the stale batch
+                    if old_worker_id:
+                        query = "UPDATE batch_workers SET status = 'stopped' WHERE worker_id = ?"
+                        self.db._execute_with_retry(query, (old_worker_id,))
+
+                    # Reset the crashed worker's 'running' items back to 'pending';
+                    # items leased by `eon batch worker` processes are left to them
                     if batch_id:
                         query = """
                             UPDATE batch_items
@@ -155,17 +195,19 @@ class BatchQueueService:
                                 lease_expires_at = NULL,
                                 last_heartbeat_at = NULL
                             WHERE batch_id = ? AND status = 'running'
+                            AND (lease_owner IS NULL OR lease_owner = ?)
                         """
-                        self.db._execute_with_retry(query, (batch_id,))
+                        self.db._execute_with_retry(query, (batch_id, old_worker_id))
                         self.logger.info(f"Reset running items to pending for batch {batch_id}")
 
-                        # Mark batch as stopped if it was running
-                        query = """
-                            UPDATE batch_jobs
-                            SET status = 'stopped', error_message = 'Worker process crashed - restart to continue'
-                            WHERE batch_id = ? AND status IN ('running', 'waiting_reset')
-                        """
-                        self.db._execute_with_retry(query, (batch_id,))
+                        # Mark batch as stopped if it was running and nobody else is on it
+                        if not self.get_batch_workers(batch_id):
+                            query = """
+                                UPDATE batch_jobs
+                                SET status = 'stopped', error_message = 'Worker process crashed - restart to continue'
+                                WHERE batch_id = ? AND status IN ('running', 'waiting_reset')
+                            """
+                            self.db._execute_with_retry(query, (batch_id,))
         except Exception as e:
             self.logger.error(f"Error during stale worker cleanup: {e}")
 
@@ -252,59 +294,26 @@ class BatchQueueService:
         if (self._process_monitor.should_cleanup_chrome(memory_threshold_pct=80.0)
                 or self._companies_since_chrome_cleanup >= self._chrome_cleanup_interval):
             self._companies_since_chrome_cleanup = 0
-            cleaned = cleanup_orphaned_chrome(max_age_minutes=30)
+            # Pipeline threads may have browsers checked out mid-conversion:
+            # quit only idle pooled browsers and keep every pooled one out of the sweep
+            browser_pool = get_browser_pool()
+            browser_pool.recycle_idle()
+            cleaned = cleanup_orphaned_chrome(
+                max_age_minutes=30, exclude_pids=browser_pool.get_browser_pids()
+            )
             if cleaned > 0:
                 self.logger.info(f"Chrome cleanup: removed {cleaned} processes")
 
         return True
 
-    def _claim_item(self, item_id: int) -> bool:
-        """
-        Atomically claim an item for processing.
-
-        Uses optimistic locking to ensure only one worker claims each item.
-        Returns True if successfully claimed, False if already claimed.
-
-        Args:
-            item_id: Batch item ID to claim
-
-        Returns:
-            True if successfully claimed, False if already claimed by another worker
-        """
-        import sqlite3
-
-        try:
-            with sqlite3.connect(self.db.db_path, timeout=30.0) as conn:
-                conn.execute("PRAGMA journal_mode=WAL")
-                cursor = conn.cursor()
-
-                now = datetime.utcnow().isoformat()
-
-                # Try to claim the item only if it's still pending
-                cursor.execute("""
-                    UPDATE batch_items
-                    SET status = 'running',
-                        started_at = ?,
-                        lease_owner = ?,
-                        lease_expires_at = ?,
-                        last_heartbeat_at = ?
-                    WHERE id = ? AND status = 'pending'
-                """, (now, self.worker_id, self._lease_expires_at(), now, item_id))
-
-                conn.commit()
-
-                # Check if we successfully claimed it
-                return cursor.rowcount == 1
-
-        except sqlite3.Error as e:
-            self.logger.error(f"Database error in _claim_item: {e}")
-            return False
-
-    def _reset_item_to_pending(self, item_id: int):
+    def _reset_item_to_pending(self, item_id: int) -> bool:
         """
         Reset a batch item back to pending status.
 
         Used when an item couldn't be processed (e.g., no API key available).
+
+        Returns:
+            False if this worker no longer holds the item's lease
         """
         query = """
             UPDATE batch_items
@@ -313,23 +322,54 @@ class BatchQueueService:
                 lease_owner = NULL,
                 lease_expires_at = NULL,
                 last_heartbeat_at = NULL
-            WHERE id = ?
+            WHERE id = ? AND lease_owner = ?
+        """
+        return self._check_lease(self.db._execute_with_retry(query, (item_id, self.worker_id)), item_id)
+
+    def _check_lease(self, rowcount: int, item_id: int) -> bool:
         """
-        self.db._execute_with_retry(query, (item_id,))
+        Check that an item write guarded by lease_owner hit its row.
+
+        A worker whose lease expired (e.g. it stalled past lease_minutes)
+        may find the item reclaimed by another worker; its writes then
+        match nothing and must not be treated as applied.
+
+        Args:
+            rowcount: Rows updated by the guarded write
+            item_id: Batch item ID
+
+        Returns:
+            True if this worker still holds the lease
+        """
+        if rowcount:
+            return True
+        self.logger.warning(
+            f"Lease on batch item {item_id} is no longer held by worker "
+            f"{self.worker_id[:8]}; dropping this worker's update"
+        )
+        return False
 
     def _lease_expires_at(self) -> str:
         """Calculate lease expiration time for a batch item."""
         return (datetime.utcnow() + timedelta(minutes=self._lease_minutes)).isoformat()
 
-    def _refresh_item_lease(self, item_id: int):
-        """Refresh lease and heartbeat for an in-progress batch item."""
+    def _refresh_item_lease(self, item_id: int) -> bool:
+        """
+        Refresh lease and heartbeat for an in-progress batch item.
+
+        Returns:
+            False if this worker no longer holds the item's lease
+        """
         now = datetime.utcnow().isoformat()
         query = """
             UPDATE batch_items
             SET last_heartbeat_at = ?, lease_expires_at = ?
-            WHERE id = ?
+            WHERE id = ? AND lease_owner = ?
         """
-        self.db._execute_with_retry(query, (now, self._lease_expires_at(), item_id))
+        rowcount = self.db._execute_with_retry(
+            query, (now, self._lease_expires_at(), item_id, self.worker_id)
+        )
+        return self._check_lease(rowcount, item_id)
 
     def _update_item_year_progress(self, item_id: int, current_year: Optional[str] = None, completed_count: Optional[int] = None, total_count: Optional[int] = None):
         """
@@ -362,9 +402,9 @@ class BatchQueueService:
         if not updates:
             return
 
-        params.append(item_id)
-        query = f"UPDATE batch_items SET {', '.join(updates)} WHERE id = ?"
-        self.db._execute_with_retry(query, tuple(params))
+        params.extend([item_id, self.worker_id])
+        query = f"UPDATE batch_items SET {', '.join(updates)} WHERE id = ? AND lease_owner = ?"
+        self._check_lease(self.db._execute_with_retry(query, tuple(params)), item_id)
 
     def _finalize_item_year_progress(self, item_id: int, run_id: str):
         """
@@ -391,13 +431,16 @@ class BatchQueueService:
             SET completed_years = ?,
                 completed_years_list = ?,
                 current_year = NULL
-            WHERE id = ?
+            WHERE id = ? AND lease_owner = ?
         """
-        self.db._execute_with_retry(query, (
+        rowcount = self.db._execute_with_retry(query, (
             completed_count,
             json.dumps(completed_years_list),
-            item_id
+            item_id,
+            self.worker_id
         ))
+        if not self._check_lease(rowcount, item_id):
+            return
 
         self.logger.debug(f"Item {item_id} finalized with {completed_count} years: {completed_years_list}")
 
@@ -430,7 +473,8 @@ class BatchQueueService:
 
         def _heartbeat_loop():
             while not stop_event.wait(interval_seconds):
-                self._refresh_item_lease(item_id)
+                if not self._refresh_item_lease(item_id):
+                    break  # Another worker owns the item now
 
         thread = threading.Thread(
             target=_heartbeat_loop,
@@ -540,7 +584,8 @@ class BatchQueueService:
             self.logger.info(preflight_msg)
 
         # Reset any items stuck in 'running' status back to 'pending'
-        # This handles the case where a previous run crashed mid-process
+        # This handles the case where a previous run crashed mid-process.
+        # Items held by live `eon batch worker` processes are still in progress.
         reset_query = """
             UPDATE batch_items
             SET status = 'pending',
@@ -549,8 +594,12 @@ class BatchQueueService:
                 lease_expires_at = NULL,
                 last_heartbeat_at = NULL
             WHERE batch_id = ? AND status = 'running'
+            AND (lease_owner IS NULL OR lease_owner NOT IN (
+                SELECT worker_id FROM batch_workers
+                WHERE status = 'running' AND last_heartbeat_at >= ?
+            ))
         """
-        result = self.db._execute_with_retry(reset_query, (batch_id,))
+        result = self.db._execute_with_retry(reset_query, (batch_id, self._worker_stale_cutoff()))
         if result and result > 0:
             self.logger.info(f"Reset {result} stale 'running' items to 'pending' for batch {batch_id}")
 
@@ -576,6 +625,7 @@ class BatchQueueService:
         self.db._execute_with_retry(query, (batch_id, os.getpid(), self.worker_id, now))
 
         # Start worker thread
+        self._owns_queue_state = True
         self._stop_event.clear()
         self._pause_event.clear()
         self._worker_thread = threading.Thread(
@@ -589,32 +639,307 @@ class BatchQueueService:
         self.logger.info(f"Started batch job {batch_id}")
         return True
 
+    # ------------------------------------------------------------------
+    # Worker processes (`eon batch worker`)
+    # ------------------------------------------------------------------
+
+    def start_worker(self, batch_id: str, shard_count: int = 1, shard_index: Optional[int] = None) -> bool:
+        """
+        Join a batch as one of several worker processes.
+
+        Unlike start_batch_job(), items other processes are working on are
+        left alone: every worker claims pending items with the same atomic
+        lease, and items held by a worker whose heartbeat stops are
+        reclaimed by the others. With shard_count > 1 each worker takes a
+        shard (the lowest free one unless shard_index is given) and only
+        uses every shard_count-th API key, so processes don't compete for
+        the same keys.
+
+        Args:
+            batch_id: The batch to work on
+            shard_count: Number of worker processes sharing the API keys
+            shard_index: Shard to take (0-based), or None for the lowest free one
+
+        Returns:
+            True if the worker started, False if already running or nothing to do
+
+        Raises:
+            ValueError: If the batch doesn't exist, there are more shards than
+                API keys, or the requested shard is taken
+        """
+        if self._worker_thread and self._worker_thread.is_alive():
+            self.logger.warning("Worker thread already running")
+            return False
+
+        batch = self.get_batch_status(batch_id)
+        if not batch:
+            raise ValueError(f"Batch {batch_id} not found")
+        if batch['status'] == 'completed':
+            self.logger.info(f"Batch {batch_id} is already completed")
+            return False
+
+        all_keys = list(self.api_key_manager.api_keys)
+        if shard_count < 1 or shard_count > len(all_keys):
+            raise ValueError(
+                f"Cannot split {len(all_keys)} API keys across {shard_count} workers"
+            )
+
+        preflight_ok, preflight_msg = self._preflight_check(batch['total_tickers'], batch['num_years'])
+        if not preflight_ok:
+            self.logger.error(preflight_msg)
+            return False
+
+        shard = self._register_worker(batch_id, shard_count, shard_index)
+        if shard_count > 1:
+            self.api_key_manager = APIKeyManager(
+                all_keys[shard::shard_count], tracker=self.api_key_manager.tracker
+            )
+        self.logger.info(
+            f"Worker {self.worker_id} joined batch {batch_id} "
+            f"(shard {shard + 1}/{shard_count}, {len(self.api_key_manager.api_keys)} keys)"
+        )
+
+        query = """
+            UPDATE batch_jobs
+            SET status = 'running', started_at = COALESCE(started_at, ?), last_activity_at = ?
+            WHERE batch_id = ?
+        """
+        now = datetime.utcnow().isoformat()
+        self.db._execute_with_retry(query, (now, now, batch_id))
+
+        self._owns_queue_state = False
+        self._stop_event.clear()
+        self._pause_event.clear()
+        self._worker_thread = threading.Thread(
+            target=self._batch_worker,
+            args=(batch_id,),
+            daemon=True,
+            name=f"BatchWorker-{batch_id[:8]}-{shard}"
+        )
+        self._worker_thread.start()
+        return True
+
+    def stop_worker(self):
+        """
+        Stop this worker process only.
+
+        Other workers keep going; the batch is marked stopped once the last
+        one leaves. Use stop_batch() to stop every worker.
+        """
+        batch_id = self._worker_batch_id
+        self._stop_event.set()
+        if self._worker_thread:
+            self._worker_thread.join(timeout=10)
+        self._deregister_worker()
+        if batch_id and not self.get_batch_workers(batch_id):
+            batch = self.get_batch_status(batch_id)
+            if batch and batch['status'] in ('running', 'paused', 'waiting_reset'):
+                self._mark_batch_stopped(batch_id, "Stopped by user")
+        self.logger.info(f"Stopped worker {self.worker_id}")
+
+    def is_worker_alive(self) -> bool:
+        """True while this service's worker thread is running."""
+        return self._worker_thread is not None and self._worker_thread.is_alive()
+
+    def get_batch_workers(self, batch_id: str, include_stopped: bool = False) -> List[Dict]:
+        """
+        Get the worker processes registered on a batch.
+
+        Args:
+            batch_id: Batch to query
+            include_stopped: Also return stopped and dead workers
+
+        Returns:
+            Worker dicts (pid, hostname, shard, heartbeat, item counts,
+            active_items, alive), by shard
+        """
+        cutoff = self._worker_stale_cutoff()
+        query = """
+            SELECT w.worker_id, w.pid, w.hostname, w.shard_index, w.shard_count, w.num_keys,
+                   w.status, w.started_at, w.last_heartbeat_at, w.items_completed, w.items_failed,
+                   (SELECT COUNT(*) FROM batch_items i
+                    WHERE i.lease_owner = w.worker_id AND i.status = 'running') AS active_items
+            FROM batch_workers w
+            WHERE w.batch_id = ?
+        """
+        params: tuple = (batch_id,)
+        if not include_stopped:
+            query += " AND w.status = 'running' AND w.last_heartbeat_at >= ?"
+            params = (batch_id, cutoff)
+        query += " ORDER BY w.shard_index, w.started_at"
+
+        rows = self.db._execute_with_retry(query, params, fetch_all=True)
+        workers = []
+        for row in rows or []:
+            worker = dict(row)
+            worker['alive'] = (
+                row['status'] == 'running'
+                and row['last_heartbeat_at'] is not None
+                and row['last_heartbeat_at'] >= cutoff
+            )
+            workers.append(worker)
+        return workers
+
+    def _worker_stale_cutoff(self) -> str:
+        """Heartbeats older than this belong to dead workers."""
+        return (datetime.utcnow() - timedelta(seconds=self.WORKER_STALE_SECONDS)).isoformat()
+
+    def _register_worker(self, batch_id: str, shard_count: int = 1, shard_index: Optional[int] = None) -> int:
+        """
+        Add this worker to batch_workers and start its heartbeat.
+
+        Shards are handed out inside one IMMEDIATE transaction, so two
+        processes starting together can't take the same one.
+
+        Returns:
+            The shard index taken
+
+        Raises:
+            ValueError: If the requested shard is taken or all shards are
+        """
+        now = datetime.utcnow().isoformat()
+        with self.db.transaction() as conn:
+            shard = shard_index or 0
+            if shard_count > 1:
+                cursor = conn.execute("""
+                    SELECT shard_index FROM batch_workers
+                    WHERE batch_id = ? AND shard_count = ? AND worker_id != ?
+                    AND status = 'running' AND last_heartbeat_at >= ?
+                """, (batch_id, shard_count, self.worker_id, self._worker_stale_cutoff()))
+                taken = {row[0] for row in cursor.fetchall()}
+                if shard_index is None:
+                    free = [i for i in range(shard_count) if i not in taken]
+                    if not free:
+                        raise ValueError(f"All {shard_count} worker shards of batch {batch_id} are taken")
+                    shard = free[0]
+                elif not 0 <= shard_index < shard_count or shard_index in taken:
+                    raise ValueError(f"Shard {shard_index} of batch {batch_id} is not available")
+
+            num_keys = len(self.api_key_manager.api_keys[shard::shard_count])
+            conn.execute("""
+                INSERT OR REPLACE INTO batch_workers
+                (worker_id, batch_id, pid, hostname, shard_index, shard_count, num_keys,
+                 status, started_at, last_heartbeat_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 'running', ?, ?)
+            """, (self.worker_id, batch_id, os.getpid(), socket.gethostname(),
+                  shard, shard_count, num_keys, now, now))
+
+        self._shard_index = shard
+        self._shard_count = shard_count
+        self._worker_batch_id = batch_id
+        self._worker_heartbeat_stop = self._start_worker_heartbeat(batch_id)
+        return shard
+
+    def _start_worker_heartbeat(self, batch_id: str) -> threading.Event:
+        """
+        Heartbeat this worker's row and follow the batch status.
+
+        Pausing or stopping a batch from the UI or another process only
+        changes batch_jobs.status; workers pick it up here.
+        """
+        stop_event = threading.Event()
+
+        def _heartbeat_loop():
+            while not stop_event.wait(self.WORKER_HEARTBEAT_SECONDS):
+                try:
+                    query = "UPDATE batch_workers SET last_heartbeat_at = ? WHERE worker_id = ?"
+                    self.db._execute_with_retry(query, (datetime.utcnow().isoformat(), self.worker_id))
+
+                    row = self.db._execute_with_retry(
+                        "SELECT status FROM batch_jobs WHERE batch_id = ?", (batch_id,), fetch_one=True
+                    )
+                    status = row['status'] if row else None
+                    if status is None or status in ('stopped', 'failed', 'completed'):
+                        self._stop_event.set()
+                    elif status == 'paused':
+                        self._pause_event.set()
+                    elif status in ('running', 'waiting_reset'):
+                        self._pause_event.clear()
+                except Exception as e:
+                    self.logger.warning(f"Worker heartbeat failed: {e}")
+
+        thread = threading.Thread(
+            target=_heartbeat_loop,
+            name=f"BatchWorkerHeartbeat-{self.worker_id[:8]}",
+            daemon=True
+        )
+        thread.start()
+        return stop_event
+
+    def _deregister_worker(self):
+        """Stop the heartbeat and mark this worker's row stopped."""
+        if self._worker_heartbeat_stop is None:
+            return
+        self._worker_heartbeat_stop.set()
+        self._worker_heartbeat_stop = None
+        query = """
+            UPDATE batch_workers SET status = 'stopped', last_heartbeat_at = ?
+            WHERE worker_id = ?
+        """
+        self.db._execute_with_retry(query, (datetime.utcnow().isoformat(), self.worker_id))
+
+    def _count_worker_item(self, column: str):
+        """Bump one of this worker's items_completed / items_failed counters."""
+        query = f"UPDATE batch_workers SET {column} = {column} + 1 WHERE worker_id = ?"
+        self.db._execute_with_retry(query, (self.worker_id,))
+
+    def _recover_stale_leases(self, conn, batch_id: str, now: str) -> int:
+        """
+        Return items whose lease expired or whose worker died to pending.
+
+        Runs inside the caller's transaction on conn. Only workers registered in
+        batch_workers can be found dead early; anything else waits for
+        its lease to expire.
+
+        Returns:
+            Number of items recovered
+        """
+        cursor = conn.execute("""
+            UPDATE batch_items
+            SET status = 'pending',
+                started_at = NULL,
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                last_heartbeat_at = NULL
+            WHERE batch_id = ?
+            AND status = 'running'
+            AND (
+                (lease_expires_at IS NOT NULL AND lease_expires_at < ?)
+                OR lease_owner IN (
+                    SELECT worker_id FROM batch_workers
+                    WHERE batch_id = ? AND worker_id != ?
+                    AND (status != 'running' OR last_heartbeat_at < ?)
+                )
+            )
+        """, (batch_id, now, batch_id, self.worker_id, self._worker_stale_cutoff()))
+        if cursor.rowcount > 0:
+            self.logger.info(f"Recovered {cursor.rowcount} items from expired leases or dead workers")
+        return cursor.rowcount
+
     def _batch_worker(self, batch_id: str):
         """
-        Main worker loop for processing batch items IN PARALLEL with continuous replenishment.
+        Main worker loop: feeds pending items through the staged pipeline.
 
-        Uses a thread pool to process multiple items concurrently. When any worker
-        finishes, immediately starts a new one for the next pending item. This
-        ensures maximum parallelism - never waiting for all workers to finish
-        before starting new ones.
+        Each item moves fetch -> extract -> llm -> persist (see
+        _run_pipeline). Only the llm stage holds an API key, so downloads
+        and HTML-to-PDF conversion for upcoming companies overlap with
+        analysis and keys are only reserved for Gemini calls.
 
-        Example with 29 companies and 5 workers:
-        - Workers 1-5 start on companies 1-5
-        - Worker 3 finishes first -> immediately starts on company 6
-        - Worker 1 finishes -> immediately starts on company 7
-        - Continue until all 29 companies are processed
+        Example with 29 companies and 5 LLM workers:
+        - Fetch workers download companies 1-9 while extract workers convert 1-2
+        - LLM workers pick up companies as soon as they are converted
+        - An LLM worker that finishes takes the next converted company at once
 
         Handles:
-        - Continuous worker replenishment (no batch waiting)
-        - Pre-reserving API keys before thread spawn
-        - Staggered worker starts for SEC rate limiting
+        - Per-stage worker counts and bounded queues between stages
         - Sleeping until midnight when all keys exhausted
         - Graceful stop/pause
+        - Other worker processes on the same batch (see start_worker)
         """
-        # Import here to avoid circular imports
-        from eon.ui.services.analysis_service import AnalysisService
-
         try:
+            if self._worker_heartbeat_stop is None:
+                self._register_worker(batch_id)
+
             while not self._stop_event.is_set():
                 # Check for pause
                 if self._pause_event.is_set():
@@ -622,14 +947,14 @@ class BatchQueueService:
                     time.sleep(5)
                     continue
 
-                # Get available keys count for thread pool sizing
+                # Get available keys count for LLM stage sizing
                 available_keys = self.api_key_manager.get_available_keys()
                 if not available_keys:
                     # All keys exhausted - wait for midnight reset
                     self._wait_for_reset(batch_id)
                     continue
 
-                # Determine max parallel workers
+                # Determine max parallel LLM workers
                 sec_limits = get_sec_limits()
                 max_workers_config = sec_limits.MAX_PARALLEL_WORKERS
                 if max_workers_config > 0:
@@ -638,161 +963,27 @@ class BatchQueueService:
                 else:
                     max_parallel = len(available_keys)  # 0 = unlimited
 
-                # Get ALL pending items for this batch (for continuous replenishment)
-                # We fetch more than max_parallel to have items ready when workers finish
-                all_pending = self._get_all_pending_items(batch_id)
+                # Claim the first few items; the pipeline claims more as it goes
+                claimed = self._get_pending_items(batch_id, limit=self.config.batch_claim_size)
 
-                if not all_pending:
+                if not claimed:
+                    if self._count_running_items(batch_id):
+                        # Other workers are finishing the last items; if one
+                        # dies its items come back as pending here
+                        self._stop_event.wait(self.WORKER_HEARTBEAT_SECONDS)
+                        continue
                     # No more items - batch complete
                     self._complete_batch(batch_id)
                     break
 
-                self.logger.info(
-                    f"Starting continuous processing: {len(all_pending)} items pending, "
-                    f"max {max_parallel} parallel workers"
-                )
-
-                # Track which keys have been released by workers
-                released_keys = set()
-                released_keys_lock = threading.Lock()
-
-                def mark_key_released(key: str):
-                    with released_keys_lock:
-                        released_keys.add(key)
+                self.logger.info(f"Starting pipeline: {max_parallel} LLM workers")
 
-                # Use a deque as a work queue for continuous replenishment
-                work_queue = deque(all_pending)
-                active_futures: Dict[Future, tuple] = {}
-                worker_index_counter = [0]  # Mutable container for closure
-
-                try:
-                    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
-                        # Helper function to submit a new item
-                        def submit_next_item() -> bool:
-                            """Submit the next item from the queue. Returns True if submitted."""
-                            if not work_queue or self._stop_event.is_set():
-                                return False
-
-                            # Try to reserve a key
-                            key = self.api_key_manager.reserve_key(wait_timeout=0)
-                            if key is None:
-                                return False  # No keys available
-
-                            item = work_queue.popleft()
-                            worker_idx = worker_index_counter[0]
-                            worker_index_counter[0] += 1
-
-                            # Calculate stagger delay only for initial workers
-                            # After the initial batch, new workers start without stagger
-                            stagger_delay = 0
-                            if worker_idx < max_parallel:
-                                stagger_delay = worker_idx * self._worker_stagger_delay
-
-                            future = executor.submit(
-                                self._process_item_with_staggered_start,
-                                item,
-                                batch_id,
-                                key,
-                                mark_key_released,
-                                stagger_delay,
-                                worker_idx
-                            )
-                            active_futures[future] = (item, key)
-                            return True
-
-                        # Submit initial batch of workers up to max_parallel
-                        initial_submitted = 0
-                        while initial_submitted < max_parallel and work_queue:
-                            if submit_next_item():
-                                initial_submitted += 1
-                            else:
-                                break  # No more keys available
-
-                        if not active_futures:
-                            # Couldn't submit any workers - keys exhausted
-                            self.logger.info("No API keys available for initial workers")
-                            self._wait_for_reset(batch_id)
-                            continue
-
-                        self.logger.info(
-                            f"Started {len(active_futures)} initial workers, "
-                            f"{len(work_queue)} items remaining in queue"
-                        )
-
-                        # Continuous replenishment loop
-                        while active_futures and not self._stop_event.is_set():
-                            # Wait for ANY worker to complete (not all)
-                            done, _ = wait(active_futures.keys(), timeout=1.0, return_when=FIRST_COMPLETED)
-
-                            if not done:
-                                # Timeout - no workers completed yet, check stop event and continue
-                                continue
-
-                            # Process completed workers
-                            for future in done:
-                                item, api_key = active_futures.pop(future)
-
-                                try:
-                                    future.result()  # Raises if the thread raised
-                                    self._update_batch_progress(batch_id)
-                                    self.logger.debug(
-                                        f"Worker completed {item['ticker']}, "
-                                        f"{len(active_futures)} active, {len(work_queue)} queued"
-                                    )
-
-                                except AnalysisCancelledException:
-                                    self.logger.info(f"Batch job {batch_id} cancelled")
-                                    self._mark_batch_stopped(batch_id, "Cancelled by user")
-                                    executor.shutdown(wait=False, cancel_futures=True)
-                                    return
-
-                                except KeyQuotaExhaustedError as e:
-                                    self.logger.warning(
-                                        f"Quota exhausted for {item['ticker']}, "
-                                        "resetting to pending (no retry increment)"
-                                    )
-                                    self._reset_item_to_pending_no_retry_increment(item['id'])
-                                    self._update_batch_progress(batch_id)
-
-                                except ContextLengthExceededError as e:
-                                    self.logger.warning(
-                                        f"Context length exceeded for {item['ticker']}, "
-                                        f"marking as skipped: {e}"
-                                    )
-                                    self._mark_item_skipped(item['id'], str(e))
-                                    self._update_batch_progress(batch_id)
-
-                                except Exception as e:
-                                    self._handle_item_error(item, str(e), batch_id)
-                                    self._update_batch_progress(batch_id)
-
-                                # CONTINUOUS REPLENISHMENT: Immediately start next item
-                                if work_queue and not self._stop_event.is_set():
-                                    if submit_next_item():
-                                        self.logger.debug(
-                                            f"Replenished worker, now {len(active_futures)} active, "
-                                            f"{len(work_queue)} queued"
-                                        )
-
-                        # Handle stop event
-                        if self._stop_event.is_set() and active_futures:
-                            self.logger.info("Stop event received, cancelling remaining workers")
-                            executor.shutdown(wait=False, cancel_futures=True)
-                            # Reset uncompleted items back to pending
-                            for future, (item, key) in active_futures.items():
-                                self._reset_item_to_pending(item['id'])
-
-                finally:
-                    # Release any keys that weren't released by workers
-                    with released_keys_lock:
-                        for future, (item, key) in active_futures.items():
-                            if key not in released_keys:
-                                self.api_key_manager.release_key(key)
-                                self.logger.debug("Released unreleased key in finally block")
+                if not self._run_pipeline(batch_id, claimed, max_parallel):
+                    return  # Cancelled by user
 
                 # Check if all API keys were exhausted
                 available_keys = self.api_key_manager.get_available_keys()
-                if not available_keys and work_queue:
+                if not available_keys and not self._stop_event.is_set():
                     self.logger.info(
                         "All API keys exhausted during processing - "
                         "waiting for midnight PST reset"
@@ -807,7 +998,360 @@ class BatchQueueService:
             self.logger.error(f"Batch worker error: {e}", exc_info=True)
             self._mark_batch_failed(batch_id, str(e))
         finally:
-            self._cleanup_worker(batch_id)
+            self._deregister_worker()
+            if self._owns_queue_state:
+                self._cleanup_worker(batch_id)
+
+    def _count_running_items(self, batch_id: str) -> int:
+        """Count items of a batch currently leased by any worker."""
+        query = "SELECT COUNT(*) AS n FROM batch_items WHERE batch_id = ? AND status = 'running'"
+        row = self.db._execute_with_retry(query, (batch_id,), fetch_one=True)
+        return row['n'] if row else 0
+
+    def _run_pipeline(self, batch_id: str, items: List[Dict], llm_workers: int) -> bool:
+        """
+        Process items through the fetch -> extract -> llm -> persist stages.
+
+        Queues between I/O stages hold EON_SEC_PREFETCH_LOOKAHEAD items, so
+        at most a few companies are downloaded ahead of the LLM stage. The
+        llm and persist queues hold one item per LLM worker, keeping every
+        key busy without converting far ahead.
+
+        Items are fed from a local buffer of claimed items, refilled with
+        EON_BATCH_CLAIM_SIZE more whenever it runs dry, until the batch
+        has nothing left to claim. Buffered items that never enter the
+        pipeline are released when it stops.
+
+        Args:
+            batch_id: Batch being processed
+            items: Items already claimed by this worker, in processing order
+            llm_workers: LLM stage threads (one API key each)
+
+        Returns:
+            False if the batch was cancelled, True otherwise
+        """
+        batch_config = self._get_batch_config(batch_id)
+        lookahead = max(1, self._prefetch_lookahead)
+        downloader = SECDownloader() if self._prefetch_lookahead > 0 else None
+        cancelled = threading.Event()
+
+        pipeline = StagedPipeline(
+            [
+                Stage(
+                    "fetch", lambda work: self._fetch_stage(work, downloader),
+                    workers=self.config.batch_fetch_workers, queue_size=lookahead
+                ),
+                Stage(
+                    "extract", self._extract_stage,
+                    workers=self.config.batch_extract_workers, queue_size=lookahead
+                ),
+                Stage("llm", self._llm_stage, workers=llm_workers, queue_size=llm_workers),
+                # Single writer for completion updates
+                Stage("persist", self._persist_stage, workers=1, queue_size=llm_workers),
+            ],
+            on_error=lambda stage, work, error: self._on_stage_error(stage, work, error, cancelled),
+            on_discard=self._discard_work,
+            name=f"Batch-{batch_id[:8]}"
+        )
+        self._pipeline = pipeline
+        pipeline.start()
+
+        buffer = deque(items)
+        try:
+            while True:
+                while self._pause_event.is_set() and not self._stop_event.is_set():
+                    time.sleep(1)
+                if self._stop_event.is_set() or pipeline.stopped:
+                    break
+                if not buffer:
+                    buffer.extend(self._get_pending_items(batch_id, limit=self.config.batch_claim_size))
+                    if not buffer:
+                        break
+                work = _BatchWork(item=buffer[0], batch_id=batch_id, batch_config=batch_config)
+                # Waits while the fetch stage is backed up
+                submitted = pipeline.submit(work, timeout=1.0)
+                while not submitted and not (self._stop_event.is_set() or pipeline.stopped):
+                    submitted = pipeline.submit(work, timeout=1.0)
+                if not submitted:
+                    break
+                buffer.popleft()
+        finally:
+            self._release_claimed_items([item['id'] for item in buffer])
+            if self._stop_event.is_set():
+                pipeline.stop()
+            pipeline.close()
+            while not pipeline.join(timeout=1.0):
+                if self._stop_event.is_set() and not pipeline.stopped:
+                    self.logger.info("Stop event received, returning queued items to pending")
+                    pipeline.stop()
+            self._pipeline = None
+
+        self.logger.info(f"Pipeline finished: {pipeline.stats()}")
+
+        if cancelled.is_set():
+            self.logger.info(f"Batch job {batch_id} cancelled")
+            self._mark_batch_stopped(batch_id, "Cancelled by user")
+            return False
+        return True
+
+    def _pipeline_stopping(self) -> bool:
+        """True when the batch or the running pipeline is being stopped."""
+        pipeline = self._pipeline
+        return self._stop_event.is_set() or (pipeline is not None and pipeline.stopped)
+
+    def _analysis_service(self):
+        """Get the calling pipeline thread's AnalysisService (one per thread)."""
+        service = getattr(self._thread_state, 'analysis_service', None)
+        if service is None:
+            # Import here to avoid circular imports
+            from eon.ui.services.analysis_service import AnalysisService
+            service = AnalysisService(self.db, key_manager=self.api_key_manager)
+            self._thread_state.analysis_service = service
+        return service
+
+    def _fetch_stage(self, work: '_BatchWork', downloader: Optional[SECDownloader]) -> '_BatchWork':
+        """
+        Start a claimed item's lease heartbeat and download its filings (holds no API key).
+
+        Args:
+            work: Claimed item entering the pipeline
+            downloader: Shared SEC downloader, or None when prefetch is disabled
+
+        Returns:
+            The work item
+        """
+        item = work.item
+        self._refresh_item_lease(item['id'])
+        work.heartbeat_stop = self._start_lease_heartbeat(item['id'])
+
+        # Update batch last activity
+        query = """
+            UPDATE batch_jobs SET last_activity_at = ? WHERE batch_id = ?
+        """
+        self.db._execute_with_retry(query, (datetime.utcnow().isoformat(), work.batch_id))
+
+        if downloader is not None:
+            filing_type = work.batch_config['filing_type']
+            try:
+                # Same documents AnalysisService asks for, so it finds them on disk
+                downloader.download_with_metadata(
+                    item['ticker'],
+                    filings_to_request(filing_type, work.batch_config['num_years']),
+                    filing_type
+                )
+            except Exception as e:
+                # Prefetch is an optimization; the extract stage downloads on its own
+                self.logger.warning(f"Prefetch failed for {item['ticker']}: {e}")
+
+        return work
+
+    def _extract_stage(self, work: '_BatchWork') -> '_BatchWork':
+        """
+        Convert filings and extract their text (holds no API key).
+
+        Creates the analysis run via AnalysisService.prepare_run(), skipping
+        years completed by an earlier attempt (per-year resume).
+        """
+        item = work.item
+        completed_years_list = self._get_item_completed_years(item['id'])
+
+        work.prepared = self._analysis_service().prepare_run(
+            ticker=item['ticker'],
+            analysis_type=work.batch_config['analysis_type'],
+            filing_type=work.batch_config['filing_type'],
+            num_years=work.batch_config['num_years'],
+            company_name=item.get('company_name'),
+            custom_prompt=work.batch_config.get('custom_prompt'),
+            skip_years=completed_years_list if completed_years_list else None,
+            extract_text=True
+        )
+        return work
+
+    def _llm_stage(self, work: '_BatchWork') -> Optional['_BatchWork']:
+        """
+        Analyze a prepared item on a freshly reserved API key.
+
+        The only stage that holds a key; it is released as soon as the
+        analysis finishes.
+
+        Raises:
+            KeyQuotaExhaustedError: If every key is exhausted for the day
+        """
+        item_id = work.item['id']
+        prepared = work.prepared
+
+        if not prepared.completed:
+            try:
+                api_key = self._reserve_pipeline_key()
+            except KeyQuotaExhaustedError:
+                self._abandon_prepared_run(prepared, "API quota exhausted before analysis")
+                raise
+            if api_key is None:
+                # Stopping - hand the item back instead of analyzing it
+                self._discard_work("llm", work)
+                return None
+
+            def year_progress_callback(current_year: int, completed_count: int, total_count: int):
+                """Update batch_items with year progress."""
+                self._update_item_year_progress(
+                    item_id,
+                    current_year=str(current_year),
+                    completed_count=completed_count,
+                    total_count=total_count
+                )
+
+            try:
+                self.logger.info(f"[Pipeline] Analyzing {work.item['ticker']}")
+                self._analysis_service().execute_run(
+                    prepared, api_key=api_key, year_progress_callback=year_progress_callback
+                )
+            finally:
+                self.api_key_manager.release_key(api_key)
+
+        work.run_id = prepared.run_id
+        return work
+
+    def _reserve_pipeline_key(self) -> Optional[str]:
+        """
+        Reserve an API key for the llm stage, waiting while all are in use.
+
+        Returns:
+            Reserved key, or None if the pipeline is stopping
+
+        Raises:
+            KeyQuotaExhaustedError: If every key is exhausted for the day
+        """
+        while not self._pipeline_stopping():
+            key = self.api_key_manager.reserve_key(wait_timeout=self.PIPELINE_KEY_WAIT)
+            if key is not None:
+                return key
+            if not self.api_key_manager.get_available_keys():
+                raise KeyQuotaExhaustedError("All API keys have exhausted their daily quota")
+        return None
+
+    def _persist_stage(self, work: '_BatchWork') -> None:
+        """Mark an analyzed item completed and update batch progress."""
+        item_id = work.item['id']
+
+        with self.db.transaction():
+            # Finalize year progress tracking (before completing clears the lease)
+            self._finalize_item_year_progress(item_id, work.run_id)
+
+            # Mark as completed - only if the lease is still ours, otherwise
+            # another worker has reclaimed the item and its run wins
+            owned = self._mark_item_completed(item_id, work.run_id)
+            if owned:
+                self._count_worker_item('items_completed')
+        self._end_work(work)
+
+        if not owned:
+            self.logger.warning(
+                f"[Pipeline] Dropped result for {work.item['ticker']} (run_id: {work.run_id}): "
+                "lease was lost to another worker"
+            )
+            return None
+
+        self.logger.info(f"[Pipeline] Completed {work.item['ticker']} (run_id: {work.run_id})")
+        self._update_batch_progress(work.batch_id)
+        return None
+
+    def _mark_item_completed(self, item_id: int, run_id: str) -> bool:
+        """
+        Mark a leased item completed and release its lease.
+
+        Args:
+            item_id: Batch item ID
+            run_id: Analysis run ID
+
+        Returns:
+            False if this worker no longer holds the lease (nothing written)
+        """
+        query = """
+            UPDATE batch_items
+            SET status = 'completed',
+                run_id = ?,
+                completed_at = ?,
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                last_heartbeat_at = NULL
+            WHERE id = ? AND lease_owner = ?
+        """
+        rowcount = self.db._execute_with_retry(
+            query, (run_id, datetime.utcnow().isoformat(), item_id, self.worker_id)
+        )
+        return self._check_lease(rowcount, item_id)
+
+    def _on_stage_error(self, stage: str, work: '_BatchWork', error: Exception, cancelled: threading.Event):
+        """
+        Record a failed item (StagedPipeline on_error callback).
+
+        Args:
+            stage: Stage whose handler raised
+            work: The item
+            error: The exception
+            cancelled: Set when the user cancelled the batch
+        """
+        item = work.item
+        try:
+            if isinstance(error, AnalysisCancelledException):
+                cancelled.set()
+                self._reset_item_to_pending(item['id'])
+                if self._pipeline is not None:
+                    self._pipeline.stop()
+                return
+
+            if isinstance(error, KeyQuotaExhaustedError):
+                self.logger.warning(
+                    f"Quota exhausted for {item['ticker']}, "
+                    "resetting to pending (no retry increment)"
+                )
+                self._reset_item_to_pending_no_retry_increment(item['id'])
+                if not self.api_key_manager.get_available_keys() and self._pipeline is not None:
+                    # Nothing can be analyzed until the reset; queued items go back to pending
+                    self._pipeline.stop()
+
+            elif isinstance(error, ContextLengthExceededError):
+                self.logger.warning(
+                    f"Context length exceeded for {item['ticker']}, "
+                    f"marking as skipped: {error}"
+                )
+                self._mark_item_skipped(item['id'], str(error))
+
+            else:
+                self.logger.error(f"[Pipeline] {stage} stage failed for {item['ticker']}: {error}")
+                self._handle_item_error(item, str(error), work.batch_id)
+
+            self._update_batch_progress(work.batch_id)
+        finally:
+            self._end_work(work)
+
+    def _discard_work(self, stage: str, work: '_BatchWork'):
+        """
+        Return an item dropped by a stopping pipeline to pending.
+
+        An item whose analysis already finished is recorded as completed
+        instead, so its results aren't redone.
+        """
+        if work.run_id is not None:
+            self._persist_stage(work)
+            return
+
+        if work.prepared is not None:
+            self._abandon_prepared_run(work.prepared, "Batch stopped before analysis")
+        self._reset_item_to_pending(work.item['id'])
+        self._end_work(work)
+
+    def _abandon_prepared_run(self, prepared, reason: str):
+        """Close a run that prepare_run() left open for execute_run()."""
+        if prepared.completed:
+            return
+        self.db.update_run_status(prepared.run_id, 'cancelled', reason)
+        get_cancellation_registry().cleanup_token(prepared.run_id)
+
+    def _end_work(self, work: '_BatchWork'):
+        """Stop an item's lease heartbeat."""
+        if work.heartbeat_stop is not None:
+            work.heartbeat_stop.set()
 
     def _get_next_pending_item(self, batch_id: str) -> Optional[Dict]:
         """Get next pending item from batch (highest priority first)."""
@@ -829,169 +1373,82 @@ class BatchQueueService:
             }
         return None
 
-    def _get_all_pending_items(self, batch_id: str) -> List[Dict]:
-        """
-        Get ALL pending items from a batch for continuous processing.
-
-        Unlike _get_pending_items which claims items with a lease, this method
-        just returns all pending items without modifying their status. The items
-        will be claimed one-by-one as workers become available.
-
-        This is used for continuous replenishment where we need the full queue
-        upfront but don't want to claim all items at once.
-
-        Args:
-            batch_id: Batch to get items from
-
-        Returns:
-            List of item dictionaries (id, ticker, company_name, attempts)
-        """
-        import sqlite3
-
-        try:
-            with sqlite3.connect(self.db.db_path, timeout=30.0) as conn:
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                # Reset lease-expired running items back to pending first
-                now = datetime.utcnow().isoformat()
-                cursor.execute("""
-                    UPDATE batch_items
-                    SET status = 'pending',
-                        started_at = NULL,
-                        lease_owner = NULL,
-                        lease_expires_at = NULL,
-                        last_heartbeat_at = NULL
-                    WHERE batch_id = ?
-                    AND status = 'running'
-                    AND lease_expires_at IS NOT NULL
-                    AND lease_expires_at < ?
-                """, (batch_id, now))
-
-                # Get all pending items (highest priority first)
-                cursor.execute("""
-                    SELECT id, ticker, company_name, attempts
-                    FROM batch_items
-                    WHERE batch_id = ? AND status = 'pending'
-                    ORDER BY priority DESC, id
-                """, (batch_id,))
-                rows = cursor.fetchall()
-
-                conn.commit()
-
-                return [
-                    {
-                        'id': row['id'],
-                        'ticker': row['ticker'],
-                        'company_name': row['company_name'],
-                        'attempts': row['attempts']
-                    }
-                    for row in rows
-                ]
-
-        except sqlite3.Error as e:
-            self.logger.error(f"Database error in _get_all_pending_items: {e}")
-            return []
-
     def _get_pending_items(self, batch_id: str, limit: int = 10) -> List[Dict]:
         """
-        Get multiple pending items from batch for parallel processing.
+        Claim the next pending items of a batch, highest priority first.
 
-        Fix #6: Uses a single atomic transaction for both SELECT and UPDATE
-        to prevent race conditions and improve performance.
+        One UPDATE ... RETURNING claims up to `limit` items, picked from
+        the (batch_id, status, priority, id) index, so a claim touches
+        O(limit) rows however many are still pending. Each claimed item
+        gets this worker's lease.
 
         Fix #3: Does NOT increment attempts here - that happens on error
         to ensure max_retries means "number of retries after initial attempt".
 
         Args:
             batch_id: Batch to get items from
-            limit: Maximum number of items to return
+            limit: Maximum number of items to claim
 
         Returns:
-            List of item dictionaries
+            Claimed item dictionaries (id, ticker, company_name, attempts), in claim order
         """
         import sqlite3
 
-        # Fix #6 & #8: Use single atomic transaction for better concurrency
         try:
-            with sqlite3.connect(self.db.db_path, timeout=30.0) as conn:
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                # Start immediate transaction to lock for write
-                cursor.execute("BEGIN IMMEDIATE")
-
-                # Reset lease-expired running items back to pending
+            # Immediate transaction: takes the write lock before recovering and claiming
+            with self.db.transaction() as conn:
+                # Reset lease-expired and dead workers' items back to pending
                 now = datetime.utcnow().isoformat()
-                cursor.execute("""
-                    UPDATE batch_items
-                    SET status = 'pending',
-                        started_at = NULL,
-                        lease_owner = NULL,
-                        lease_expires_at = NULL,
-                        last_heartbeat_at = NULL
-                    WHERE batch_id = ?
-                    AND status = 'running'
-                    AND lease_expires_at IS NOT NULL
-                    AND lease_expires_at < ?
-                """, (batch_id, now))
-
-                # SELECT pending items
-                cursor.execute("""
-                    SELECT id, ticker, company_name, attempts
-                    FROM batch_items
-                    WHERE batch_id = ? AND status = 'pending'
-                    ORDER BY id
-                    LIMIT ?
-                """, (batch_id, limit))
-                rows = cursor.fetchall()
-
-                if not rows:
-                    conn.commit()
-                    return []
-
-                items = []
-                item_ids = []
-
-                for row in rows:
-                    items.append({
-                        'id': row['id'],
-                        'ticker': row['ticker'],
-                        'company_name': row['company_name'],
-                        'attempts': row['attempts']
-                    })
-                    item_ids.append(row['id'])
+                self._recover_stale_leases(conn, batch_id, now)
 
-                # Fix #6: Single batched UPDATE for all items
-                # Fix #3: Don't increment attempts here - do it on error
-                placeholders = ','.join('?' * len(item_ids))
-                cursor.execute(f"""
+                rows = conn.execute("""
                     UPDATE batch_items
                     SET status = 'running',
                         started_at = ?,
                         lease_owner = ?,
                         lease_expires_at = ?,
                         last_heartbeat_at = ?
-                    WHERE id IN ({placeholders})
-                    AND status = 'pending'
-                """, [now, self.worker_id, self._lease_expires_at(), now] + item_ids)
-
-                # Verify we updated the expected number of rows
-                if cursor.rowcount != len(item_ids):
-                    self.logger.warning(
-                        f"Expected to update {len(item_ids)} items but updated {cursor.rowcount}. "
-                        "Some items may have been grabbed by another worker."
+                    WHERE id IN (
+                        SELECT id FROM batch_items
+                        WHERE batch_id = ? AND status = 'pending'
+                        ORDER BY priority DESC, id
+                        LIMIT ?
                     )
+                    RETURNING id, ticker, company_name, attempts, priority
+                """, (now, self.worker_id, self._lease_expires_at(), now, batch_id, limit)).fetchall()
 
-                conn.commit()
-                return items
+            # RETURNING order is unspecified
+            rows.sort(key=lambda row: (-row['priority'], row['id']))
+            return [
+                {
+                    'id': row['id'],
+                    'ticker': row['ticker'],
+                    'company_name': row['company_name'],
+                    'attempts': row['attempts']
+                }
+                for row in rows
+            ]
 
         except sqlite3.Error as e:
             self.logger.error(f"Database error in _get_pending_items: {e}")
             return []
 
+    def _release_claimed_items(self, item_ids: List[int]):
+        """Return claimed items that never entered the pipeline to pending."""
+        if not item_ids:
+            return
+        placeholders = ','.join('?' * len(item_ids))
+        query = f"""
+            UPDATE batch_items
+            SET status = 'pending',
+                started_at = NULL,
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                last_heartbeat_at = NULL
+            WHERE id IN ({placeholders}) AND status = 'running' AND lease_owner = ?
+        """
+        self.db._execute_with_retry(query, tuple(item_ids) + (self.worker_id,))
+
     def _process_item_parallel(self, item: Dict, batch_id: str):
         """
         Process a single batch item in a parallel worker thread.
@@ -1054,19 +1511,8 @@ class BatchQueueService:
             self._finalize_item_year_progress(item_id, run_id)
 
             # Mark as completed
-            query = """
-                UPDATE batch_items
-                SET status = 'completed',
-                    run_id = ?,
-                    completed_at = ?,
-                    lease_owner = NULL,
-                    lease_expires_at = NULL,
-                    last_heartbeat_at = NULL
-                WHERE id = ?
-            """
-            self.db._execute_with_retry(query, (run_id, datetime.utcnow().isoformat(), item_id))
-
-            self.logger.info(f"[Parallel] Completed batch item: {ticker} (run_id: {run_id})")
+            if self._mark_item_completed(item_id, run_id):
+                self.logger.info(f"[Parallel] Completed batch item: {ticker} (run_id: {run_id})")
 
         except Exception as e:
             self.logger.error(f"[Parallel] Failed batch item {ticker}: {e}")
@@ -1074,203 +1520,6 @@ class BatchQueueService:
         finally:
             heartbeat_stop.set()
 
-    def _process_item_with_key(
-        self,
-        item: Dict,
-        batch_id: str,
-        api_key: str,
-        release_callback
-    ):
-        """
-        Process a batch item with a pre-reserved API key (Fix #1).
-
-        This method is called by the batch worker with an already-reserved API key,
-        preventing the race condition where threads compete for keys.
-
-        Args:
-            item: Item dictionary with id, ticker, company_name, attempts
-            batch_id: Parent batch ID
-            api_key: Pre-reserved API key to use for this analysis
-            release_callback: Callback function to mark key as released
-        """
-        # Import here to avoid circular imports
-        from eon.ui.services.analysis_service import AnalysisService
-
-        item_id = item['id']
-        ticker = item['ticker']
-
-        heartbeat_stop: Optional[threading.Event] = None
-        try:
-            # Create thread-local analysis service
-            analysis_service = AnalysisService(self.db)
-
-            self.logger.info(f"[Parallel] Processing {ticker} with pre-reserved API key")
-
-            self._refresh_item_lease(item_id)
-            heartbeat_stop = self._start_lease_heartbeat(item_id)
-
-            # Update batch last activity
-            query = """
-                UPDATE batch_jobs SET last_activity_at = ? WHERE batch_id = ?
-            """
-            self.db._execute_with_retry(query, (datetime.utcnow().isoformat(), batch_id))
-
-            # Get batch config
-            batch_config = self._get_batch_config(batch_id)
-
-            # Load previously completed years for per-year resume
-            completed_years_list = self._get_item_completed_years(item_id)
-
-            # Create year progress callback for real-time tracking
-            def year_progress_callback(current_year: int, completed_count: int, total_count: int):
-                """Update batch_items with year progress."""
-                self._update_item_year_progress(
-                    item_id,
-                    current_year=str(current_year),
-                    completed_count=completed_count,
-                    total_count=total_count
-                )
-
-            # Run analysis with the pre-reserved key
-            # skip_years enables per-year resume: already-completed years are not re-processed
-            run_id = analysis_service.run_analysis(
-                ticker=ticker,
-                analysis_type=batch_config['analysis_type'],
-                filing_type=batch_config['filing_type'],
-                num_years=batch_config['num_years'],
-                company_name=item.get('company_name'),
-                custom_prompt=batch_config.get('custom_prompt'),
-                api_key=api_key,  # Pass pre-reserved key
-                year_progress_callback=year_progress_callback,
-                skip_years=completed_years_list if completed_years_list else None
-            )
-
-            # Finalize year progress tracking
-            self._finalize_item_year_progress(item_id, run_id)
-
-            # Mark as completed
-            query = """
-                UPDATE batch_items
-                SET status = 'completed',
-                    run_id = ?,
-                    completed_at = ?,
-                    lease_owner = NULL,
-                    lease_expires_at = NULL,
-                    last_heartbeat_at = NULL
-                WHERE id = ?
-            """
-            self.db._execute_with_retry(query, (run_id, datetime.utcnow().isoformat(), item_id))
-
-            self.logger.info(f"[Parallel] Completed {ticker} (run_id: {run_id})")
-
-        except Exception as e:
-            self.logger.error(f"[Parallel] Failed {ticker}: {e}")
-            raise  # Let the caller handle error tracking
-
-        finally:
-            if heartbeat_stop:
-                heartbeat_stop.set()
-            # Always release the key and notify
-            self.api_key_manager.release_key(api_key)
-            release_callback(api_key)
-
-    def _process_item_with_staggered_start(
-        self,
-        item: Dict,
-        batch_id: str,
-        api_key: str,
-        release_callback,
-        stagger_delay: float,
-        worker_idx: int = 0
-    ):
-        """
-        Process a batch item with staggered start for SEC rate limiting.
-
-        This wrapper adds a delay before starting the actual processing to prevent
-        all workers from hitting the SEC EDGAR API simultaneously (thundering herd).
-
-        IMPORTANT: To avoid holding API keys during the stagger wait (which would
-        exhaust all keys immediately), workers with stagger_delay > 0 will:
-        1. Release their pre-reserved key immediately
-        2. Wait for the stagger delay
-        3. Re-acquire a key after the delay
-        4. Then proceed with processing
-
-        With 25 workers and a 30-second stagger:
-        - Worker 0: starts immediately (keeps pre-reserved key)
-        - Worker 1: releases key, waits 30s, re-acquires key, starts
-        - Worker 2: releases key, waits 60s, re-acquires key, starts
-        - ...
-        - Worker 24: releases key, waits 720s, re-acquires key, starts
-
-        Args:
-            item: Item dictionary with id, ticker, company_name, attempts
-            batch_id: Parent batch ID
-            api_key: Pre-reserved API key to use for this analysis
-            release_callback: Callback function to mark key as released
-            stagger_delay: Seconds to wait before starting (based on worker index)
-            worker_idx: Worker index for logging
-        """
-        # First, claim the item by marking it as running
-        # This prevents other workers from picking it up
-        if not self._claim_item(item['id']):
-            self.logger.warning(
-                f"Worker {worker_idx} for {item['ticker']}: "
-                "item already claimed by another worker, skipping"
-            )
-            # Release the key since we won't use it
-            self.api_key_manager.release_key(api_key)
-            release_callback(api_key)
-            return
-
-        if stagger_delay > 0:
-            # Release the pre-reserved key during the wait so other workers can use it
-            self.logger.info(
-                f"Worker {worker_idx} for {item['ticker']}: releasing key, "
-                f"waiting {stagger_delay}s (staggered start)"
-            )
-            self.api_key_manager.release_key(api_key)
-            release_callback(api_key)
-
-            # Sleep in chunks to allow stop event to interrupt
-            remaining = stagger_delay
-            chunk_size = 5.0  # Check stop event every 5 seconds
-            while remaining > 0 and not self._stop_event.is_set():
-                sleep_time = min(chunk_size, remaining)
-                time.sleep(sleep_time)
-                remaining -= sleep_time
-
-            if self._stop_event.is_set():
-                self.logger.info(f"Stop event received during stagger wait for {item['ticker']}")
-                # Reset item to pending since we didn't process it
-                self._reset_item_to_pending(item['id'])
-                return
-
-            # Re-acquire a key after the stagger delay
-            self.logger.info(f"Worker {worker_idx} for {item['ticker']}: stagger complete, acquiring key")
-            new_api_key = self.api_key_manager.reserve_key()
-
-            if new_api_key is None:
-                self.logger.warning(
-                    f"Worker {worker_idx} for {item['ticker']}: no key available after stagger, "
-                    "resetting to pending"
-                )
-                self._reset_item_to_pending(item['id'])
-                return
-
-            # Use a no-op callback since we're managing the key ourselves
-            def noop_callback(key: str):
-                pass
-
-            self._refresh_item_lease(item['id'])
-
-            # Process with the newly acquired key
-            return self._process_item_with_key(item, batch_id, new_api_key, noop_callback)
-        else:
-            # Worker 0: start immediately with pre-reserved key
-            self._refresh_item_lease(item['id'])
-            return self._process_item_with_key(item, batch_id, api_key, release_callback)
-
     def _process_item(self, item: Dict, service, batch_id: str):
         """Process a single batch item."""
         item_id = item['id']
@@ -1332,19 +1581,8 @@ class BatchQueueService:
             self._finalize_item_year_progress(item_id, run_id)
 
             # Mark as completed
-            query = """
-                UPDATE batch_items
-                SET status = 'completed',
-                    run_id = ?,
-                    completed_at = ?,
-                    lease_owner = NULL,
-                    lease_expires_at = NULL,
-                    last_heartbeat_at = NULL
-                WHERE id = ?
-            """
-            self.db._execute_with_retry(query, (run_id, datetime.utcnow().isoformat(), item_id))
-
-            self.logger.info(f"Completed batch item: {ticker} (run_id: {run_id})")
+            if self._mark_item_completed(item_id, run_id):
+                self.logger.info(f"Completed batch item: {ticker} (run_id: {run_id})")
 
         except Exception as e:
             raise  # Let caller handle
@@ -1744,9 +1982,16 @@ class BatchQueueService:
                 last_activity_at IS NULL
                 OR (julianday('now') - julianday(last_activity_at)) * 24 * 60 > ?
             )
+            AND NOT EXISTS (
+                SELECT 1 FROM batch_workers w
+                WHERE w.batch_id = batch_jobs.batch_id
+                AND w.status = 'running' AND w.last_heartbeat_at >= ?
+            )
             ORDER BY created_at DESC
         """
-        rows = self.db._execute_with_retry(query, (stale_minutes,), fetch_all=True)
+        rows = self.db._execute_with_retry(
+            query, (stale_minutes, self._worker_stale_cutoff()), fetch_all=True
+        )
 
         batches = []
         for row in rows:
@@ -1785,6 +2030,9 @@ class BatchQueueService:
         """
         self.db._execute_with_retry(reset_query, (batch_id,))
 
+        query = "UPDATE batch_workers SET status = 'stopped' WHERE batch_id = ? AND status = 'running'"
+        self.db._execute_with_retry(query, (batch_id,))
+
         # Update batch status
         query = """
             UPDATE batch_jobs
@@ -1794,18 +2042,26 @@ class BatchQueueService:
         self.db._execute_with_retry(query, (now, batch_id))
 
     def get_queue_state(self) -> Dict:
-        """Get current queue state."""
+        """
+        Get current queue state.
+
+        is_running is also True while any `eon batch worker` process is
+        alive; active_workers counts them across all batches.
+        """
         query = """
             SELECT is_running, current_batch_id, next_run_at, daily_requests_made,
-                   last_reset_date, worker_pid, worker_id, updated_at
+                   last_reset_date, worker_pid, worker_id, updated_at,
+                   (SELECT COUNT(*) FROM batch_workers
+                    WHERE status = 'running' AND last_heartbeat_at >= ?) AS active_workers
             FROM queue_state
             WHERE id = 1
         """
-        row = self.db._execute_with_retry(query, fetch_one=True)
+        row = self.db._execute_with_retry(query, (self._worker_stale_cutoff(),), fetch_one=True)
 
         if row:
             return {
-                'is_running': bool(row['is_running']),
+                'is_running': bool(row['is_running']) or row['active_workers'] > 0,
+                'active_workers': row['active_workers'],
                 'current_batch_id': row['current_batch_id'],
                 'next_run_at': row['next_run_at'],
                 'daily_requests_made': row['daily_requests_made'],
@@ -1814,7 +2070,7 @@ class BatchQueueService:
                 'worker_id': row['worker_id'],
                 'updated_at': row['updated_at']
             }
-        return {'is_running': False}
+        return {'is_running': False, 'active_workers': 0}
 
     def delete_batch(self, batch_id: str) -> bool:
         """Delete a batch job and its items."""
@@ -1826,6 +2082,9 @@ class BatchQueueService:
         query = "DELETE FROM batch_items WHERE batch_id = ?"
         self.db._execute_with_retry(query, (batch_id,))
 
+        query = "DELETE FROM batch_workers WHERE batch_id = ?"
+        self.db._execute_with_retry(query, (batch_id,))
+
         query = "DELETE FROM batch_jobs WHERE batch_id = ?"
         self.db._execute_with_retry(query, (batch_id,))
 
@@ -1939,13 +2198,15 @@ class BatchQueueService:
 
     def _complete_batch(self, batch_id: str):
         """Mark batch as complete and send notification."""
+        # Several workers can finish at once; only the first one notifies
         query = """
             UPDATE batch_jobs
             SET status = 'completed', completed_at = ?, last_activity_at = ?
-            WHERE batch_id = ?
+            WHERE batch_id = ? AND status != 'completed'
         """
         now = datetime.utcnow().isoformat()
-        self.db._execute_with_retry(query, (now, now, batch_id))
+        if not self.db._execute_with_retry(query, (now, now, batch_id)):
+            return
         self.logger.info(f"Batch {batch_id} completed")
 
         # Send notification
@@ -2006,53 +2267,59 @@ class BatchQueueService:
         item_id = item['id']
         max_retries = self._get_batch_config(batch_id).get('max_retries', 2)
 
-        # Fix #3: Increment attempts on ERROR, not when starting
-        query = """
-            UPDATE batch_items
-            SET attempts = attempts + 1
-            WHERE id = ?
-        """
-        self.db._execute_with_retry(query, (item_id,))
-
-        # Get updated attempts count
-        query = "SELECT attempts FROM batch_items WHERE id = ?"
-        row = self.db._execute_with_retry(query, (item_id,), fetch_one=True)
-        current_attempts = row['attempts'] if row else 1
-
-        # Fix #3: Use > instead of >= so max_retries retries are allowed
-        if current_attempts > max_retries:
-            # Mark as failed - we've exhausted all retries
-            # Truncate error to prevent database bloat
-            truncated_error = self._truncate_error(error)
-            query = """
-                UPDATE batch_items
-                SET status = 'failed',
-                    error_message = ?,
-                    lease_owner = NULL,
-                    lease_expires_at = NULL,
-                    last_heartbeat_at = NULL
-                WHERE id = ?
-            """
-            self.db._execute_with_retry(query, (truncated_error, item_id))
-            self.logger.warning(
-                f"Item {item['ticker']} failed after {current_attempts} attempts "
-                f"(max_retries={max_retries}): {error}"
-            )
-        else:
-            # Reset to pending for retry
+        # One transaction: the attempts read below must see this increment, not another worker's
+        with self.db.transaction():
+            # Fix #3: Increment attempts on ERROR, not when starting
             query = """
                 UPDATE batch_items
-                SET status = 'pending',
-                    lease_owner = NULL,
-                    lease_expires_at = NULL,
-                    last_heartbeat_at = NULL
-                WHERE id = ?
+                SET attempts = attempts + 1
+                WHERE id = ? AND lease_owner = ?
             """
-            self.db._execute_with_retry(query, (item_id,))
-            self.logger.info(
-                f"Item {item['ticker']} will be retried "
-                f"(attempt {current_attempts}/{max_retries + 1})"
-            )
+            rowcount = self.db._execute_with_retry(query, (item_id, self.worker_id))
+            if not self._check_lease(rowcount, item_id):
+                # Another worker reclaimed the item; its attempt is the one that counts
+                return
+
+            # Get updated attempts count
+            query = "SELECT attempts FROM batch_items WHERE id = ?"
+            row = self.db._execute_with_retry(query, (item_id,), fetch_one=True)
+            current_attempts = row['attempts'] if row else 1
+
+            # Fix #3: Use > instead of >= so max_retries retries are allowed
+            if current_attempts > max_retries:
+                # Mark as failed - we've exhausted all retries
+                # Truncate error to prevent database bloat
+                truncated_error = self._truncate_error(error)
+                query = """
+                    UPDATE batch_items
+                    SET status = 'failed',
+                        error_message = ?,
+                        lease_owner = NULL,
+                        lease_expires_at = NULL,
+                        last_heartbeat_at = NULL
+                    WHERE id = ? AND lease_owner = ?
+                """
+                self.db._execute_with_retry(query, (truncated_error, item_id, self.worker_id))
+                self._count_worker_item('items_failed')
+                self.logger.warning(
+                    f"Item {item['ticker']} failed after {current_attempts} attempts "
+                    f"(max_retries={max_retries}): {error}"
+                )
+            else:
+                # Reset to pending for retry
+                query = """
+                    UPDATE batch_items
+                    SET status = 'pending',
+                        lease_owner = NULL,
+                        lease_expires_at = NULL,
+                        last_heartbeat_at = NULL
+                    WHERE id = ? AND lease_owner = ?
+                """
+                self.db._execute_with_retry(query, (item_id, self.worker_id))
+                self.logger.info(
+                    f"Item {item['ticker']} will be retried "
+                    f"(attempt {current_attempts}/{max_retries + 1})"
+                )
 
     def _reset_item_to_pending_no_retry_increment(self, item_id: int):
         """
@@ -2067,9 +2334,9 @@ class BatchQueueService:
                 lease_owner = NULL,
                 lease_expires_at = NULL,
                 last_heartbeat_at = NULL
-            WHERE id = ?
+            WHERE id = ? AND lease_owner = ?
         """
-        self.db._execute_with_retry(query, (item_id,))
+        self._check_lease(self.db._execute_with_retry(query, (item_id, self.worker_id)), item_id)
 
     def _mark_item_skipped(self, item_id: int, reason: str):
         """
@@ -2092,17 +2359,18 @@ class BatchQueueService:
                 lease_owner = NULL,
                 lease_expires_at = NULL,
                 last_heartbeat_at = NULL
-            WHERE id = ?
+            WHERE id = ? AND lease_owner = ?
         """
-        self.db._execute_with_retry(query, (now, reason[:500], item_id))
-        self.logger.info(f"Marked item {item_id} as skipped: {reason[:100]}...")
+        rowcount = self.db._execute_with_retry(query, (now, reason[:500], item_id, self.worker_id))
+        if self._check_lease(rowcount, item_id):
+            self.logger.info(f"Marked item {item_id} as skipped: {reason[:100]}...")
 
     def _perform_daily_maintenance(self):
         """
         Perform maintenance tasks during daily reset wait.
 
         This is called at the start of the reset wait period to:
-        - Clean up orphaned Chrome processes
+        - Close idle pooled browsers and clean up orphaned Chrome processes
         - Perform SQLite maintenance (WAL checkpoint, ANALYZE)
         - Create database backup
         - Clean up old API usage records
@@ -2113,9 +2381,13 @@ class BatchQueueService:
         """
         self.logger.info("Performing daily maintenance during reset wait...")
 
-        # 1. Clean up Chrome processes using new monitoring module
+        # 1. Close idle pooled browsers, then clean up orphaned Chrome processes
         try:
-            cleaned = cleanup_orphaned_chrome(max_age_minutes=30)
+            browser_pool = get_browser_pool()
+            browser_pool.recycle_idle()
+            cleaned = cleanup_orphaned_chrome(
+                max_age_minutes=30, exclude_pids=browser_pool.get_browser_pids()
+            )
             if cleaned > 0:
                 self.logger.info(f"Cleaned up {cleaned} orphaned Chrome processes")
         except Exception as e:
@@ -2231,7 +2503,7 @@ class BatchQueueService:
         Returns:
             run_id of the synthesis analysis, or None if failed
         """
-        from eon.ai.providers.gemini import GeminiProvider
+        from eon.ai.providers import get_gemini_provider
 
         # Get batch info
         batch = self.get_batch_status(batch_id)
@@ -2333,7 +2605,7 @@ Be concise but comprehensive. Focus on actionable insights.
                 raise Exception("No API keys available for synthesis")
 
             try:
-                provider = GeminiProvider(
+                provider = get_gemini_provider(
                     api_key=api_key,
                     model=self.config.default_model,
                     thinking_budget=self.config.thinking_budget,
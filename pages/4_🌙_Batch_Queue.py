@@ -20,6 +20,7 @@ from datetime import datetime
 from eon.ui.database import DatabaseRepository
 from eon.ui.services.batch_queue import BatchQueueService, BatchJobConfig
 from eon.ui.theme import apply_theme
+from eon.core.formatting import format_duration
 from eon.ui.skin import topbar, components as C
 from eon.core.analysis_types import (
     get_analysis_type,
@@ -91,12 +92,16 @@ if interrupted_batches:
 # Queue status overview
 queue_state = queue.get_queue_state()
 
-col1, col2, col3 = st.columns(3)
+col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     status_text = "Running" if queue_state.get('is_running') else "Idle"
     st.metric("Queue Status", status_text)
 
+with col4:
+    # Live processes across all batches, including `eon batch worker`s
+    st.metric("Worker Processes", queue_state.get('active_workers', 0))
+
 with col2:
     if queue_state.get('next_run_at'):
         try:
@@ -353,6 +358,27 @@ else:
                             hide_index=True,
                         )
 
+                worker_processes = queue.get_batch_workers(batch['batch_id'])
+                if len(worker_processes) > 1:
+                    st.markdown(f"**Worker Processes ({len(worker_processes)}):**")
+                    st.dataframe(
+                        pd.DataFrame([
+                            {
+                                'Shard': f"{w['shard_index'] + 1}/{w['shard_count']}",
+                                'PID': w['pid'],
+                                'Host': w.get('hostname') or '',
+                                'Keys': w['num_keys'],
+                                'Active': w['active_items'],
+                                'Done': w['items_completed'],
+                                'Failed': w['items_failed'],
+                                'Heartbeat': format_duration(start=w['last_heartbeat_at']) + " ago",
+                            }
+                            for w in worker_processes
+                        ]),
+                        width="stretch",
+                        hide_index=True,
+                    )
+
             # Status-specific info
             if batch['status'] == 'waiting_reset':
                 st.info("Waiting for midnight PST rate limit reset...")
@@ -244,6 +244,62 @@ def thread_error_collector():
     return ErrorCollector()
 
 
+# =============================================================================
+# LLM Response Cache Isolation
+# =============================================================================
+
+@pytest.fixture(autouse=True)
+def isolated_response_cache(tmp_path_factory, monkeypatch):
+    """Give each test an empty LLM response cache so answers never leak between tests."""
+    from eon.ai import response_cache
+
+    cache = response_cache.ResponseCache(tmp_path_factory.mktemp("llm_responses"))
+    monkeypatch.setattr(response_cache, '_global_cache', cache)
+    yield cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_section_cache(monkeypatch):
+    """Keep parsed filing section offsets in memory so tests don't write to ./cache."""
+    from eon.data.sources.sec import sections
+
+    cache = sections.SectionCache()
+    monkeypatch.setattr(sections, '_global_cache', cache)
+    yield cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_usage_data(tmp_path_factory, monkeypatch):
+    """Keep usage.db, key lock files and token calibration out of ./data/api_usage."""
+    import dataclasses
+    import eon.core.config as core_config
+    from eon.ai import api_config, key_scheduler, request_queue, token_estimator, usage_tracker
+
+    data_dir = tmp_path_factory.mktemp("data")
+    usage_dir = data_dir / "api_usage"
+    usage_dir.mkdir()
+
+    limits = dataclasses.replace(api_config.get_api_limits(), USAGE_DATA_DIR=str(usage_dir))
+    monkeypatch.setattr(api_config, '_api_limits_instance', limits)
+    # Default APIUsageTracker() resolves its directory from config.data_dir
+    monkeypatch.setenv('EON_DATA_DIR', str(data_dir))
+    monkeypatch.setattr(core_config, '_config_instance', None)
+    # Singletons built by an earlier test would still hold the old paths
+    monkeypatch.setattr(key_scheduler, '_global_scheduler', None)
+    monkeypatch.setattr(request_queue, '_global_queue', None)
+    monkeypatch.setattr(token_estimator, '_global_estimator', None)
+    monkeypatch.setattr(usage_tracker, '_tracker_instance', None)
+    yield usage_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_ticker_index(monkeypatch):
+    """Give each test a fresh global ticker index so it never persists into a shared database."""
+    from eon.data.sources.sec import ticker_index
+
+    monkeypatch.setattr(ticker_index, '_global_index', None)
+
+
 # =============================================================================
 # Pytest Markers
 # =============================================================================
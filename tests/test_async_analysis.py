@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the asyncio Gemini provider and async analysis engine.
+
+Covers:
+- AsyncGeminiProvider awaiting the aio client through the request queue
+- The shared retry policy on the async path
+- Async quota waits in KeyScheduler
+- CustomWorkflow.analyze_async and AsyncAnalysisEngine driving many jobs
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from custom_workflows.base import CustomWorkflow
+from eon.ai.providers import LocalProvider
+from eon.analysis.async_engine import AsyncAnalysisEngine
+
+
+class Answer(BaseModel):
+    answer: str
+
+
+class EchoWorkflow(CustomWorkflow):
+    name = "Echo"
+
+    @property
+    def prompt_template(self):
+        return "Analyze {ticker} for {year}."
+
+    @property
+    def schema(self):
+        return Answer
+
+
+def gemini_response(text='{"answer": "ok"}', prompt_tokens=100):
+    response = MagicMock(text=text)
+    response.usage_metadata.prompt_token_count = prompt_tokens
+    response.usage_metadata.cached_content_token_count = None
+    response.usage_metadata.candidates_token_count = 5
+    response.usage_metadata.total_token_count = prompt_tokens + 5
+    return response
+
+
+class TestAsyncGeminiProvider:
+    """Tests for AsyncGeminiProvider."""
+
+    @pytest.fixture
+    def provider(self, temp_usage_dir):
+        from eon.ai.providers.gemini_async import AsyncGeminiProvider
+        from eon.ai.request_queue import GeminiRequestQueue
+        from eon.ai.token_estimator import TokenEstimator
+
+        queue = GeminiRequestQueue(lock_dir=temp_usage_dir, requests_per_minute=600, tokens_per_minute=10**6)
+        estimator = TokenEstimator(state_file=temp_usage_dir / "token_calibration.json")
+
+        with patch('eon.ai.providers.gemini.genai.Client'), \
+             patch('eon.ai.providers.gemini_async.get_gemini_request_queue', return_value=queue), \
+             patch('eon.ai.providers.gemini.get_token_estimator', return_value=estimator):
+            provider = AsyncGeminiProvider(api_key="test_key", model="gemini-2.5-flash")
+            provider.client.aio.models.generate_content = AsyncMock(return_value=gemini_response())
+            provider.queue = queue
+            yield provider
+
+    @pytest.mark.unit
+    def test_generate_async_uses_aio_client(self, provider):
+        result = asyncio.run(provider.generate_async("question", schema=Answer))
+
+        assert result == Answer(answer="ok")
+        provider.client.aio.models.generate_content.assert_awaited_once()
+        provider.client.models.generate_content.assert_not_called()
+        assert provider.queue.get_stats()["total_requests"] == 1
+        assert provider.get_token_usage()["prompt_tokens"] == 100
+
+    @pytest.mark.unit
+    def test_many_requests_share_one_loop(self, provider):
+        async def run_all():
+            return await asyncio.gather(*(
+                provider.generate_with_retry_async(f"q{i}", schema=Answer) for i in range(50)
+            ))
+
+        assert len(asyncio.run(run_all())) == 50
+        assert provider.client.aio.models.generate_content.await_count == 50
+
+    @pytest.mark.unit
+    def test_rate_limit_retry_waits_without_blocking(self, provider):
+        provider.client.aio.models.generate_content.side_effect = [
+            Exception("429 RESOURCE_EXHAUSTED {'retryDelay': '5s'}"),
+            gemini_response(),
+        ]
+        # The 429 also rests the key in the scheduler; let it through
+        provider.queue.scheduler.acquire_async = AsyncMock(return_value=True)
+
+        with patch('eon.ai.providers.gemini_async.asyncio.sleep', new=AsyncMock()) as sleep:
+            result = asyncio.run(provider.generate_with_retry_async("q", schema=Answer, buffer_seconds=20))
+
+        assert result.answer == "ok"
+        sleep.assert_awaited_once_with(25)
+
+
+class TestAsyncKeyScheduler:
+    """Tests for KeyScheduler.acquire_async()."""
+
+    @pytest.mark.unit
+    def test_times_out_when_key_has_no_tokens(self, temp_usage_dir):
+        from eon.ai.key_scheduler import KeyScheduler
+
+        scheduler = KeyScheduler(lock_dir=temp_usage_dir, requests_per_minute=60, tokens_per_minute=1000)
+
+        async def take_twice():
+            first = await scheduler.acquire_async("key_a", tokens=800)
+            second = await scheduler.acquire_async("key_a", tokens=800, timeout=0.2)
+            return first, second
+
+        assert asyncio.run(take_twice()) == (True, False)
+
+    @pytest.mark.unit
+    def test_bucket_locks_are_taken_off_the_event_loop(self, temp_usage_dir):
+        import threading
+        from eon.ai.key_scheduler import KeyScheduler
+
+        scheduler = KeyScheduler(lock_dir=temp_usage_dir, requests_per_minute=60, tokens_per_minute=1000)
+        update = scheduler._update
+        locked_on = []
+        scheduler._update = lambda *args, **kwargs: locked_on.append(threading.get_ident()) or update(*args, **kwargs)
+
+        async def take():
+            return threading.get_ident(), await scheduler.acquire_async("key_a", tokens=10)
+
+        loop_thread, taken = asyncio.run(take())
+
+        assert taken
+        assert locked_on and loop_thread not in locked_on
+
+
+class TestAsyncAnalysis:
+    """Tests for CustomWorkflow.analyze_async and AsyncAnalysisEngine."""
+
+    @pytest.mark.unit
+    def test_workflow_analyze_async_with_any_provider(self):
+        provider = LocalProvider(lambda prompt, schema, context: {"answer": prompt[:19]})
+
+        result = asyncio.run(EchoWorkflow().analyze_async("AAPL", 2024, "filing text", provider))
+
+        assert result == Answer(answer="Analyze AAPL for 20")
+
+    @pytest.mark.unit
+    def test_engine_runs_workflow_over_many_filings(self):
+        key_manager = MagicMock()
+        key_manager.pick_key.return_value = "key_a"
+
+        def responder(prompt, schema, context):
+            if "BAD" in prompt:
+                raise ValueError("model refused")
+            return {"answer": prompt.split()[1]}
+
+        engine = AsyncAnalysisEngine(
+            key_manager,
+            max_in_flight=10,
+            provider_factory=lambda api_key: LocalProvider(responder, api_key=api_key),
+        )
+        filings = {(ticker, 2024): "text" for ticker in ["AAPL", "MSFT", "BAD"]}
+
+        outcomes = engine.analyze_workflow(EchoWorkflow(), filings)
+
+        assert outcomes[("AAPL", 2024)].result == Answer(answer="AAPL")
+        assert outcomes[("MSFT", 2024)].success
+        assert not outcomes[("BAD", 2024)].success
+        assert "model refused" in str(outcomes[("BAD", 2024)].error)
+
+    @pytest.mark.unit
+    def test_engine_picks_keys_off_the_event_loop(self):
+        import threading
+
+        loop_thread = threading.get_ident()
+        picked_on = []
+        key_manager = MagicMock()
+        key_manager.pick_key.side_effect = lambda: picked_on.append(threading.get_ident()) or "key_a"
+        engine = AsyncAnalysisEngine(key_manager, provider_factory=lambda api_key: LocalProvider(api_key=api_key))
+
+        engine.run([("job", lambda provider: provider.generate_with_retry_async("q"))])
+
+        assert picked_on and loop_thread not in picked_on
+
+    @pytest.mark.unit
+    def test_engine_restricts_picks_to_given_keys(self):
+        key_manager = MagicMock()
+        key_manager.pick_key.return_value = "key_b"
+        used = []
+        engine = AsyncAnalysisEngine(
+            key_manager,
+            api_keys=["key_b", "key_c"],
+            provider_factory=lambda api_key: used.append(api_key) or LocalProvider(api_key=api_key),
+        )
+
+        engine.run([("job", lambda provider: provider.generate_with_retry_async("q"))])
+
+        key_manager.pick_key.assert_called_once_with(keys=["key_b", "key_c"])
+        assert used == ["key_b"]
+
+    @pytest.mark.unit
+    def test_raising_on_outcome_cancels_remaining_jobs(self):
+        key_manager = MagicMock()
+        key_manager.pick_key.return_value = "key_a"
+        engine = AsyncAnalysisEngine(key_manager, provider_factory=lambda api_key: LocalProvider(api_key=api_key))
+        finished = []
+
+        async def slow(provider):
+            await asyncio.sleep(5)
+            finished.append("slow")
+
+        async def fast(provider):
+            return "done"
+
+        def stop(outcome):
+            raise RuntimeError(f"stop after {outcome.key}")
+
+        with pytest.raises(RuntimeError, match="stop after fast"):
+            engine.run([("slow", slow), ("fast", fast)], on_outcome=stop)
+        assert finished == []
+
+    @pytest.mark.unit
+    def test_engine_reports_exhausted_keys(self):
+        key_manager = MagicMock()
+        key_manager.pick_key.return_value = None
+        engine = AsyncAnalysisEngine(key_manager, provider_factory=lambda api_key: LocalProvider(api_key=api_key))
+
+        outcomes = engine.run([("job", lambda provider: provider.generate_with_retry_async("q"))])
+
+        assert "exhausted" in str(outcomes["job"].error)
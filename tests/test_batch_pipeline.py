@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the staged batch processing pipeline.
+
+Covers:
+- StagedPipeline: stage ordering, backpressure, error routing, stop/discard
+- BatchQueueService stages: keys reserved only by the llm stage,
+  quota exhaustion returning items to pending
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from eon.ui.services.batch_pipeline import Stage, StagedPipeline
+
+
+def _run(pipeline, payloads):
+    pipeline.start()
+    for payload in payloads:
+        assert pipeline.submit(payload, timeout=5)
+    pipeline.close()
+    assert pipeline.join(timeout=5)
+
+
+class TestStagedPipeline:
+    """Tests for StagedPipeline."""
+
+    @pytest.mark.unit
+    def test_payloads_pass_through_every_stage(self):
+        results = []
+        lock = threading.Lock()
+
+        def store(value):
+            with lock:
+                results.append(value)
+
+        pipeline = StagedPipeline([
+            Stage("double", lambda x: x * 2, workers=3, queue_size=2),
+            Stage("label", lambda x: f"v{x}", workers=2),
+            Stage("store", store),
+        ])
+        _run(pipeline, range(10))
+
+        assert sorted(results) == sorted(f"v{x * 2}" for x in range(10))
+        assert pipeline.stats()["store"]["done"] == 10
+
+    @pytest.mark.unit
+    def test_none_finishes_a_payload_early(self):
+        seen = []
+        pipeline = StagedPipeline([
+            Stage("filter", lambda x: x if x % 2 else None),
+            Stage("store", seen.append),
+        ])
+        _run(pipeline, range(6))
+
+        assert sorted(seen) == [1, 3, 5]
+
+    @pytest.mark.unit
+    def test_bounded_queue_applies_backpressure(self):
+        release = threading.Event()
+        pipeline = StagedPipeline([Stage("slow", lambda x: release.wait(5), queue_size=1)])
+        pipeline.start()
+
+        assert pipeline.submit(1, timeout=1)  # Picked up by the worker
+        time.sleep(0.1)
+        assert pipeline.submit(2, timeout=1)  # Fills the queue
+        assert not pipeline.submit(3, timeout=0.2)
+
+        release.set()
+        pipeline.close()
+        assert pipeline.join(timeout=5)
+
+    @pytest.mark.unit
+    def test_errors_go_to_on_error_and_others_continue(self):
+        errors = []
+        done = []
+
+        def check(x):
+            if x == 2:
+                raise ValueError("bad filing")
+            return x
+
+        pipeline = StagedPipeline(
+            [Stage("check", check, workers=2), Stage("store", done.append)],
+            on_error=lambda stage, payload, error: errors.append((stage, payload, str(error))),
+        )
+        _run(pipeline, range(4))
+
+        assert errors == [("check", 2, "bad filing")]
+        assert sorted(done) == [0, 1, 3]
+
+    @pytest.mark.unit
+    def test_stop_discards_queued_payloads(self):
+        started = threading.Event()
+        release = threading.Event()
+        discarded = []
+        done = []
+
+        def slow(x):
+            started.set()
+            release.wait(5)
+            return x
+
+        pipeline = StagedPipeline(
+            [Stage("slow", slow, queue_size=5), Stage("store", done.append)],
+            on_discard=lambda stage, payload: discarded.append(payload),
+        )
+        pipeline.start()
+        for x in range(4):
+            assert pipeline.submit(x, timeout=1)
+        assert started.wait(5)
+
+        pipeline.stop()
+        release.set()
+        assert pipeline.join(timeout=5)
+
+        # Every payload is accounted for exactly once, and none reached the end
+        assert done == []
+        assert sorted(discarded) == [0, 1, 2, 3]
+        assert not pipeline.submit(99)
+
+
+def _fake_analysis_service():
+    from eon.ui.services.analysis_service import PreparedRun
+
+    service = MagicMock()
+    service.prepare_run.side_effect = lambda ticker, analysis_type, filing_type, **kwargs: PreparedRun(
+        run_id=f"run-{ticker}", ticker=ticker, analysis_type=analysis_type, filing_type=filing_type
+    )
+    service.execute_run.side_effect = lambda prepared, **kwargs: prepared.run_id
+    return service
+
+
+class TestBatchPipelineStages:
+    """Tests for BatchQueueService._run_pipeline()."""
+
+    @pytest.fixture
+    def service(self, db_with_batch):
+        db, batch_id, service = db_with_batch
+        service._prefetch_lookahead = 0  # No SEC downloads
+        service._analysis_service = MagicMock(return_value=_fake_analysis_service())
+        service.api_key_manager = MagicMock()
+        return service, batch_id, db
+
+    @pytest.mark.unit
+    def test_keys_reserved_only_by_llm_stage(self, service, monkeypatch):
+        service, batch_id, db = service
+        # Start with one claimed item; the feeder claims the rest two at a time
+        monkeypatch.setattr(service.config, 'batch_claim_size', 2)
+        reserving_threads = []
+
+        def reserve_key(**kwargs):
+            reserving_threads.append(threading.current_thread().name)
+            return "key_a"
+
+        service.api_key_manager.reserve_key.side_effect = reserve_key
+
+        assert service._run_pipeline(batch_id, service._get_pending_items(batch_id, limit=1), 2)
+
+        assert len(reserving_threads) == 3
+        assert all("-llm-" in name for name in reserving_threads)
+        assert service.api_key_manager.release_key.call_count == 3
+        items = service.get_batch_items(batch_id)
+        assert {item['status'] for item in items} == {'completed'}
+        assert {item['run_id'] for item in items} == {"run-AAPL", "run-MSFT", "run-GOOG"}
+
+    @pytest.mark.unit
+    def test_quota_exhaustion_returns_items_to_pending(self, service):
+        service, batch_id, db = service
+        service.api_key_manager.reserve_key.return_value = None
+        service.api_key_manager.get_available_keys.return_value = []
+
+        assert service._run_pipeline(batch_id, service._get_pending_items(batch_id), 2)
+
+        # Including items still in the feeder's buffer when the pipeline stopped
+        items = service.get_batch_items(batch_id)
+        assert {item['status'] for item in items} == {'pending'}
+        assert {item['attempts'] for item in items} == {0}
+        service._analysis_service().execute_run.assert_not_called()
@@ -9,7 +9,8 @@ Tests cover:
 - Retry semantics (#3)
 - Stale worker PID cleanup (#4)
 - Rate limit reset verification (#5)
-- Database transaction handling (#6, #7, #8)
+- Database transaction handling (#6, #7, #8) and per-thread connections
+- Worker processes sharing a batch (`eon batch worker`)
 """
 
 import os
@@ -156,6 +157,14 @@ class TestAPIKeyRaceCondition:
 # Test: Retry Semantics (Issue #3)
 # =============================================================================
 
+def _lease(test_db, service, item_id):
+    """Claim an item for a service again, as _get_pending_items does on retry."""
+    test_db._execute_with_retry(
+        "UPDATE batch_items SET status = 'running', lease_owner = ? WHERE id = ?",
+        (service.worker_id, item_id)
+    )
+
+
 class TestRetrySemantics:
     """Tests for retry logic in batch processing."""
 
@@ -174,6 +183,7 @@ class TestRetrySemantics:
 
         for attempt in range(max_retries):
             # Handle error (should reset to pending)
+            _lease(test_db, service, item['id'])
             service._handle_item_error(item, f"Error attempt {attempt + 1}", batch_id)
 
             # Check status
@@ -324,6 +334,22 @@ class TestDatabaseBatching:
             else:
                 assert item['status'] == 'pending'
 
+    @pytest.mark.unit
+    def test_get_pending_items_claims_highest_priority_first(self, db_with_batch):
+        """Test that claims follow priority, then insertion order."""
+        test_db, batch_id, service = db_with_batch
+        test_db._execute_with_retry(
+            "UPDATE batch_items SET priority = 5 WHERE batch_id = ? AND ticker = 'GOOG'",
+            (batch_id,)
+        )
+
+        first = service._get_pending_items(batch_id, limit=2)
+        rest = service._get_pending_items(batch_id, limit=2)
+
+        assert [item['ticker'] for item in first] == ['GOOG', 'AAPL']
+        assert [item['ticker'] for item in rest] == ['MSFT']
+        assert service._get_pending_items(batch_id, limit=2) == []
+
     @pytest.mark.unit
     def test_concurrent_get_pending_items_no_duplicates(
         self, test_db, thread_error_collector
@@ -369,6 +395,46 @@ class TestDatabaseBatching:
         # WAL mode improves concurrent read/write performance
         assert result is not None
 
+    @pytest.mark.unit
+    def test_connection_reused_per_thread(self, test_db):
+        """Each thread keeps one connection across queries."""
+        conn = test_db._connect()
+        assert test_db._connect() is conn
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(test_db._connect()))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+
+    @pytest.mark.unit
+    def test_transaction_rolls_back_every_statement(self, db_with_batch):
+        """A failing transaction scope leaves no partial update behind."""
+        test_db, batch_id, service = db_with_batch
+
+        with pytest.raises(RuntimeError):
+            with test_db.transaction():
+                test_db._execute_with_retry(
+                    "UPDATE batch_items SET status = 'completed' WHERE batch_id = ?", (batch_id,)
+                )
+                test_db._execute_with_retry(
+                    "UPDATE batch_jobs SET completed_tickers = 3 WHERE batch_id = ?", (batch_id,)
+                )
+                raise RuntimeError("persist failed")
+
+        assert {item['status'] for item in service.get_batch_items(batch_id)} == {'pending'}
+        assert service.get_batch_status(batch_id)['completed_tickers'] == 0
+
+    @pytest.mark.unit
+    def test_update_returns_rowcount_not_previous_rowid(self, db_with_batch):
+        """UPDATEs on a reused connection report rows changed, not a stale lastrowid."""
+        test_db, batch_id, service = db_with_batch
+
+        updated = test_db._execute_with_retry(
+            "UPDATE batch_items SET priority = 1 WHERE batch_id = ? AND ticker = 'NONE'", (batch_id,)
+        )
+        assert updated == 0
+
 
 # =============================================================================
 # Test: Batch Workflow Integration
@@ -450,6 +516,7 @@ class TestErrorHandling:
 
         # Exhaust retries (max_retries=2)
         for _ in range(3):
+            _lease(test_db, service, item['id'])
             service._handle_item_error(item, "Test error", batch_id)
 
         # Check final status
@@ -538,3 +605,112 @@ class TestQueueState:
         assert state['is_running'] is False
         assert state['worker_pid'] is None
         assert state['current_batch_id'] is None
+
+
+# =============================================================================
+# Test: Worker Processes (`eon batch worker`)
+# =============================================================================
+
+class TestWorkerFleet:
+    """Tests for several worker processes sharing one batch."""
+
+    @pytest.fixture
+    def fleet(self, db_with_batch, mock_api_key_manager):
+        """Two services on the same database, standing in for two processes."""
+        from eon.ui.services.batch_queue import BatchQueueService
+
+        test_db, batch_id, _ = db_with_batch
+        workers = [BatchQueueService(test_db, key_manager=mock_api_key_manager) for _ in range(2)]
+        yield test_db, batch_id, workers
+        for worker in workers:
+            worker._deregister_worker()
+
+    def _kill(self, test_db, worker):
+        """Make a worker's heartbeat look long dead."""
+        stale = (datetime.utcnow() - timedelta(minutes=10)).isoformat()
+        test_db._execute_with_retry(
+            "UPDATE batch_workers SET last_heartbeat_at = ? WHERE worker_id = ?",
+            (stale, worker.worker_id)
+        )
+
+    @pytest.mark.unit
+    def test_workers_take_distinct_shards(self, fleet):
+        test_db, batch_id, (a, b) = fleet
+
+        assert a._register_worker(batch_id, shard_count=2) == 0
+        assert b._register_worker(batch_id, shard_count=2) == 1
+
+        # 5 keys split 3/2 between the shards
+        rows = a.get_batch_workers(batch_id)
+        assert [(w['shard_index'], w['num_keys']) for w in rows] == [(0, 3), (1, 2)]
+
+        from eon.ui.services.batch_queue import BatchQueueService
+        third = BatchQueueService(test_db, key_manager=a.api_key_manager)
+        with pytest.raises(ValueError):
+            third._register_worker(batch_id, shard_count=2)
+
+        # A dead worker's shard can be taken over
+        self._kill(test_db, b)
+        assert third._register_worker(batch_id, shard_count=2) == 1
+        third._deregister_worker()
+
+    @pytest.mark.unit
+    def test_items_of_dead_worker_are_recovered(self, fleet):
+        test_db, batch_id, (a, b) = fleet
+        a._register_worker(batch_id)
+        b._register_worker(batch_id)
+
+        claimed = a._get_pending_items(batch_id, limit=3)
+        assert len(claimed) == 3
+
+        # A live worker keeps its items
+        assert b._get_pending_items(batch_id) == []
+
+        self._kill(test_db, a)
+        recovered = b._get_pending_items(batch_id)
+        assert sorted(item['id'] for item in recovered) == sorted(item['id'] for item in claimed)
+
+    @pytest.mark.unit
+    def test_previous_owner_cannot_write_reclaimed_item(self, fleet):
+        test_db, batch_id, (a, b) = fleet
+        a._register_worker(batch_id)
+        b._register_worker(batch_id)
+
+        item = a._get_pending_items(batch_id, limit=1)[0]
+        self._kill(test_db, a)
+        assert [i['id'] for i in b._get_pending_items(batch_id, limit=1)] == [item['id']]
+
+        # The stalled worker finishes late: none of its writes land
+        assert not a._refresh_item_lease(item['id'])
+        assert not a._mark_item_completed(item['id'], "run-a")
+        a._update_item_year_progress(item['id'], current_year="2024")
+        a._handle_item_error(item, "late failure", batch_id)
+        assert not a._reset_item_to_pending(item['id'])
+
+        row = test_db._execute_with_retry(
+            "SELECT status, lease_owner, attempts, current_year FROM batch_items WHERE id = ?",
+            (item['id'],), fetch_one=True
+        )
+        assert row['status'] == 'running'
+        assert row['lease_owner'] == b.worker_id
+        assert row['current_year'] is None
+        assert row['attempts'] == item['attempts']
+
+        assert b._mark_item_completed(item['id'], "run-b")
+
+    @pytest.mark.unit
+    def test_live_worker_keeps_batch_out_of_stale_list(self, fleet):
+        test_db, batch_id, (a, _) = fleet
+        old = (datetime.utcnow() - timedelta(hours=1)).isoformat()
+        test_db._execute_with_retry(
+            "UPDATE batch_jobs SET status = 'running', last_activity_at = ? WHERE batch_id = ?",
+            (old, batch_id)
+        )
+
+        a._register_worker(batch_id)
+        assert batch_id not in [s['batch_id'] for s in a.get_stale_running_batches(stale_minutes=5)]
+        assert a.get_queue_state()['active_workers'] == 1
+
+        a._deregister_worker()
+        assert batch_id in [s['batch_id'] for s in a.get_stale_running_batches(stale_minutes=5)]
+        assert a.get_queue_state()['active_workers'] == 0
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the shared Chrome browser pool.
+
+Covers:
+- Session reuse, recycling after K pages and replacement of dead browsers
+- Bounded size (callers wait, then time out with ConversionError)
+- Recycling idle browsers without touching ones mid-conversion
+- Readiness polling instead of fixed sleeps
+- SECConverter rendering through the pool
+"""
+
+import base64
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from eon.core import ConversionError
+from eon.data.sources.sec.browser_pool import BrowserPool, wait_until_rendered
+
+
+class FakeDriver:
+    """Minimal stand-in for a Selenium Chrome driver."""
+
+    def __init__(self, ready_after: int = 0):
+        self.alive = True
+        self.quit_called = False
+        self.urls = []
+        self.ready_checks = 0
+        self.ready_after = ready_after
+        self.service = MagicMock()
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        if script == "return 1":
+            return 1
+        self.ready_checks += 1
+        return self.ready_checks > self.ready_after
+
+    def get(self, url):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        self.urls.append(url)
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {'data': base64.b64encode(b"%PDF-1.4 fake").decode()}
+
+    def quit(self):
+        self.quit_called = True
+        self.alive = False
+
+
+@pytest.fixture
+def drivers():
+    return []
+
+
+@pytest.fixture
+def pool(drivers):
+    def factory():
+        driver = FakeDriver()
+        drivers.append(driver)
+        return driver
+
+    pool = BrowserPool(size=2, max_pages_per_session=3, driver_factory=factory)
+    yield pool
+    pool.close()
+
+
+class TestBrowserPool:
+    """Tests for checkout/checkin lifecycle."""
+
+    @pytest.mark.unit
+    def test_reuses_warm_browser(self, pool, drivers):
+        for _ in range(2):
+            with pool.session():
+                pass
+
+        assert len(drivers) == 1
+        assert drivers[0].urls == ["about:blank", "about:blank"]
+
+    @pytest.mark.unit
+    def test_recycles_after_max_pages(self, pool, drivers):
+        for _ in range(4):
+            with pool.session():
+                pass
+
+        assert len(drivers) == 2
+        assert drivers[0].quit_called
+        assert pool.get_stats()['recycled'] == 1
+
+    @pytest.mark.unit
+    def test_replaces_browser_that_fails_health_check(self, pool, drivers):
+        with pool.session():
+            pass
+        drivers[0].alive = False  # Chrome crashed while idle
+
+        with pool.session() as session:
+            assert session.driver is drivers[1]
+        assert pool.get_stats()['unhealthy'] == 1
+
+    @pytest.mark.unit
+    def test_exception_discards_session(self, pool, drivers):
+        with pytest.raises(RuntimeError):
+            with pool.session():
+                raise RuntimeError("render failed")
+
+        assert drivers[0].quit_called
+        assert pool.get_stats()['total'] == 0
+
+    @pytest.mark.unit
+    def test_waits_for_free_browser_then_times_out(self, pool):
+        first, second = pool.checkout(), pool.checkout()
+
+        with pytest.raises(ConversionError):
+            pool.checkout(timeout=0.05)
+
+        released = threading.Timer(0.05, pool.checkin, args=(first,))
+        released.start()
+        try:
+            assert pool.checkout(timeout=5) is first
+        finally:
+            released.join()
+            pool.checkin(first)
+            pool.checkin(second)
+
+    @pytest.mark.unit
+    def test_factory_failure_frees_slot(self):
+        pool = BrowserPool(size=1, driver_factory=MagicMock(side_effect=OSError("no chrome")))
+
+        with pytest.raises(ConversionError):
+            pool.checkout()
+        assert pool.get_stats()['total'] == 0
+
+    @pytest.mark.unit
+    def test_close_quits_idle_and_retires_checked_out(self, pool, drivers):
+        idle, busy = pool.checkout(), pool.checkout()
+        pool.checkin(idle)
+
+        pool.close()
+        assert drivers[0].quit_called
+
+        pool.checkin(busy)
+        assert drivers[1].quit_called
+        assert pool.get_stats()['total'] == 0
+
+    @pytest.mark.unit
+    def test_recycle_idle_keeps_checked_out_browsers(self, pool, drivers):
+        idle, busy = pool.checkout(), pool.checkout()
+        pool.checkin(idle)
+
+        assert pool.recycle_idle() == 1
+        assert drivers[0].quit_called
+        assert pool.get_browser_pids() == [drivers[1].service.process.pid]
+
+        # The busy browser finishes its conversion and goes back to the pool
+        pool.checkin(busy)
+        assert not drivers[1].quit_called
+        assert pool.get_stats()['idle'] == 1
+
+
+class TestWaitUntilRendered:
+    """Tests for readiness polling."""
+
+    @pytest.mark.unit
+    def test_returns_once_ready(self):
+        driver = FakeDriver(ready_after=2)
+
+        assert wait_until_rendered(driver, timeout=5, poll_interval=0.001)
+        assert driver.ready_checks == 3
+
+    @pytest.mark.unit
+    def test_times_out(self):
+        driver = FakeDriver(ready_after=10**6)
+
+        started = time.monotonic()
+        assert not wait_until_rendered(driver, timeout=0.05, poll_interval=0.01)
+        assert time.monotonic() - started < 1
+
+
+class TestConverterUsesPool:
+    """Tests for SECConverter rendering through the pool."""
+
+    @pytest.mark.unit
+    def test_pdf_rendered_with_pooled_browser(self, pool, drivers, temp_dir):
+        from eon.data.sources.sec.converter import SECConverter
+
+        html_path = temp_dir / "primary-document.html"
+        html_path.write_text("<html><body><p>Net sales</p></body></html>")
+
+        converter = SECConverter(browser_pool=pool)
+        for name in ("a.pdf", "b.pdf"):
+            assert converter._convert_html_to_pdf(html_path, temp_dir / name)
+        converter.close()
+
+        assert len(drivers) == 1
+        assert not drivers[0].quit_called  # Shared pool outlives the converter
+        assert (temp_dir / "a.pdf").read_bytes().startswith(b"%PDF")
+
+    @pytest.mark.unit
+    def test_page_load_timeout_replaces_browser(self, pool, drivers, temp_dir):
+        from eon.data.sources.sec.converter import SECConverter
+
+        html_path = temp_dir / "primary-document.html"
+        html_path.write_text("<html></html>")
+
+        def factory():
+            driver = FakeDriver()
+            driver.get = MagicMock(side_effect=RuntimeError("timed out receiving message"))
+            drivers.append(driver)
+            return driver
+        pool._driver_factory = factory
+
+        converter = SECConverter(browser_pool=pool)
+
+        assert not converter._convert_html_to_pdf(html_path, temp_dir / "a.pdf")
+        assert drivers[0].quit_called
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for shared filing context caching.
+
+Covers:
+- One upload per (key, model, filing), reused by later calls and providers
+- Cached tokens reported separately from the full prompt count
+- Inline fallback for small contexts and for caches that disappeared
+- GeminiProvider referencing the cache by name instead of resending it
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from eon.ai.providers import LocalProvider, get_context_cache_registry, reset_context_cache_registry
+
+FILING = "Item 1A. Risk Factors. " * 400  # ~9,200 chars
+
+
+class Answer(BaseModel):
+    answer: str
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    reset_context_cache_registry()
+    yield
+    reset_context_cache_registry()
+
+
+class TestLocalContextCache:
+    """Tests for LocalProvider's offline context cache."""
+
+    @pytest.mark.unit
+    def test_filing_uploaded_once_and_reused(self):
+        provider = LocalProvider(lambda prompt, schema, context: {"answer": prompt})
+
+        context = provider.cache_context(FILING)
+        for step in ("orient", "map", "score"):
+            assert provider.generate_with_retry(step, schema=Answer, context=context).answer == step
+
+        assert context.is_remote
+        assert provider.cache_context(FILING) is context
+        assert LocalProvider().cache_context(FILING) is context  # Same key: shared handle
+        assert provider.get_token_usage()['contexts_created'] == 1
+        assert {call['context'] for call in provider.calls} == {context.name}
+
+    @pytest.mark.unit
+    def test_cached_tokens_are_accounted(self):
+        provider = LocalProvider()
+        context = provider.cache_context(FILING)
+
+        provider.generate("x" * 400, context=context)
+        provider.generate("y" * 400, context=context)
+
+        usage = provider.get_token_usage()
+        assert usage['requests'] == 2
+        assert usage['cached_tokens'] == 2 * context.token_count
+        assert usage['prompt_tokens'] == 2 * (context.token_count + 100)
+
+    @pytest.mark.unit
+    def test_small_context_is_sent_inline(self):
+        seen = []
+        provider = LocalProvider(lambda prompt, schema, context: seen.append(context) or {},
+                                 min_cache_tokens=10_000)
+
+        context = provider.cache_context(FILING)
+        provider.generate("question", context=context)
+
+        assert not context.is_remote
+        assert seen == [context]
+        assert provider.get_token_usage()['cached_tokens'] == 0
+        assert len(get_context_cache_registry()) == 0
+
+    @pytest.mark.unit
+    def test_released_context_falls_back_inline(self):
+        provider = LocalProvider()
+        context = provider.cache_context(FILING)
+        stale = type(context)(**vars(context))
+
+        provider.release_context(context)
+        provider.generate("question", context=stale)
+
+        assert not stale.is_remote
+        assert provider.calls[-1]['cached_tokens'] == 0
+        assert provider.calls[-1]['prompt_tokens'] == provider.count_tokens(f"{FILING}\n\nquestion")
+
+
+class TestGeminiContextCache:
+    """Tests for GeminiProvider's explicit context caches."""
+
+    @pytest.fixture
+    def provider(self, temp_usage_dir):
+        from eon.ai.providers.gemini import GeminiProvider
+        from eon.ai.request_queue import GeminiRequestQueue
+        from eon.ai.token_estimator import TokenEstimator
+
+        queue = GeminiRequestQueue(lock_dir=temp_usage_dir, requests_per_minute=600, tokens_per_minute=10**7)
+        estimator = TokenEstimator(state_file=temp_usage_dir / "token_calibration.json")
+
+        with patch('eon.ai.providers.gemini.genai.Client'), \
+             patch('eon.ai.providers.gemini.get_gemini_request_queue', return_value=queue), \
+             patch('eon.ai.providers.gemini.get_token_estimator', return_value=estimator):
+            provider = GeminiProvider(api_key="test_key", model="gemini-2.5-flash")
+            provider.MIN_CONTEXT_CACHE_TOKENS = 1000
+
+            cache = MagicMock(usage_metadata=None)
+            cache.name = "cachedContents/abc"
+            provider.client.caches.create.return_value = cache
+            response = MagicMock(text='{"answer": "ok"}')
+            response.usage_metadata.prompt_token_count = 2400
+            response.usage_metadata.cached_content_token_count = 2300
+            response.usage_metadata.candidates_token_count = 5
+            provider.client.models.generate_content.return_value = response
+            yield provider
+
+    @pytest.mark.unit
+    def test_calls_reference_cache_by_name(self, provider):
+        context = provider.cache_context(FILING)
+        provider.generate("question", schema=Answer, context=context)
+        provider.generate("another", schema=Answer, context=provider.cache_context(FILING))
+
+        provider.client.caches.create.assert_called_once()
+        call = provider.client.models.generate_content.call_args
+        assert call.kwargs['contents'] == "another"
+        assert call.kwargs['config'].cached_content == "cachedContents/abc"
+        assert provider.get_token_usage()['cached_tokens'] == 4600
+
+        provider.release_context(context)
+        provider.client.caches.delete.assert_called_once_with(name="cachedContents/abc")
+
+    @pytest.mark.unit
+    def test_expired_cache_is_resent_inline(self, provider):
+        context = provider.cache_context(FILING)
+        provider.client.models.generate_content.side_effect = [
+            Exception("404 NOT_FOUND: CachedContent not found (or permission denied)"),
+            provider.client.models.generate_content.return_value,
+        ]
+
+        assert provider.generate("question", schema=Answer, context=context).answer == "ok"
+
+        call = provider.client.models.generate_content.call_args
+        assert call.kwargs['contents'] == f"{FILING}\n\nquestion"
+        assert call.kwargs['config'].cached_content is None
+        assert len(get_context_cache_registry()) == 0
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the asyncio filing prefetcher.
+
+Covers:
+- Concurrent downloads bounded by max_concurrent
+- Pipelined mode keeping at most `lookahead` companies ahead of the consumer
+- Failures recorded per company without stopping the rest
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from eon.data.sources.sec.prefetch import FilingPrefetcher, filings_to_request
+
+
+class FakeDownloader:
+    """Downloader that sleeps instead of calling SEC and tracks concurrency."""
+
+    def __init__(self, delay=0.05, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def download_with_metadata(self, ticker, num_filings=5, filing_type="10-K"):
+        with self._lock:
+            self.calls.append((ticker, num_filings, filing_type))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if ticker in self.fail:
+                raise RuntimeError("SEC unavailable")
+            return Path(f"/filings/{ticker}"), [{'accession_number': f"{ticker}-1"}]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def download_with_metadata_by_cik(self, cik, num_filings=5, filing_type="10-K"):
+        return self.download_with_metadata(cik, num_filings, filing_type)
+
+
+def wait_until_prefetched(prefetcher, identifier, timeout=5):
+    """Poll until the background pipeline has finished an identifier."""
+    deadline = time.monotonic() + timeout
+    while identifier not in prefetcher.get_results():
+        assert time.monotonic() < deadline, f"{identifier} was never prefetched"
+        time.sleep(0.01)
+    return prefetcher.get_results()[identifier]
+
+
+class TestOneShotPrefetch:
+    """Tests for prefetch()."""
+
+    @pytest.mark.unit
+    def test_downloads_concurrently(self):
+        downloader = FakeDownloader(delay=0.1)
+        prefetcher = FilingPrefetcher(downloader, max_concurrent=4)
+
+        started = time.monotonic()
+        results = prefetcher.prefetch(["aapl", "MSFT", "GOOGL", "AMZN", "aapl"])
+
+        assert sorted(results) == ["AAPL", "AMZN", "GOOGL", "MSFT"]
+        assert downloader.peak == 4
+        assert time.monotonic() - started < 0.35  # Sequential would take 0.4s
+        assert all(result.success for result in results.values())
+
+    @pytest.mark.unit
+    def test_failures_are_recorded(self):
+        prefetcher = FilingPrefetcher(FakeDownloader(fail={"BAD"}), max_concurrent=2)
+
+        results = prefetcher.prefetch(["AAPL", "BAD"])
+
+        assert results["AAPL"].success
+        assert not results["BAD"].success
+        assert "SEC unavailable" in results["BAD"].error
+
+    @pytest.mark.unit
+    def test_requests_as_many_filings_as_analysis(self):
+        downloader = FakeDownloader(delay=0)
+        FilingPrefetcher(downloader, filing_type="10-K", num_years=3).prefetch(["AAPL"])
+
+        assert downloader.calls == [("AAPL", 8, "10-K")]
+        assert filings_to_request("10-Q", 5) == 20
+        assert filings_to_request("8-K", 3) == 3
+
+
+class TestPipelinedPrefetch:
+    """Tests for start()/wait_for()/mark_consumed()."""
+
+    @pytest.mark.unit
+    def test_stays_within_lookahead_window(self):
+        downloader = FakeDownloader(delay=0)
+        prefetcher = FilingPrefetcher(downloader, lookahead=2, max_concurrent=2)
+        tickers = ["A", "B", "C", "D", "E"]
+
+        prefetcher.start(tickers)
+        try:
+            assert wait_until_prefetched(prefetcher, "B").success
+            time.sleep(0.1)
+            assert len(downloader.calls) == 2  # Window full until A is consumed
+
+            prefetcher.mark_consumed("A")
+            assert wait_until_prefetched(prefetcher, "C").success
+            assert prefetcher.wait_for("C", timeout=0).success
+            time.sleep(0.1)
+            assert len(downloader.calls) == 3
+        finally:
+            prefetcher.stop()
+
+    @pytest.mark.unit
+    def test_consumed_before_start_is_skipped(self):
+        downloader = FakeDownloader(delay=0)
+        prefetcher = FilingPrefetcher(downloader, lookahead=1)
+
+        prefetcher.mark_consumed("A")  # Consumer got there first
+        prefetcher.start(["A", "B"])
+        try:
+            assert wait_until_prefetched(prefetcher, "B").success
+            assert prefetcher.wait_for("A", timeout=0) is None
+            assert [call[0] for call in downloader.calls] == ["B"]
+        finally:
+            prefetcher.stop()
+
+    @pytest.mark.unit
+    def test_wait_for_unscheduled_returns_immediately(self):
+        prefetcher = FilingPrefetcher(FakeDownloader())
+
+        started = time.monotonic()
+        assert prefetcher.wait_for("NOPE", timeout=5) is None
+        assert time.monotonic() - started < 0.5
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for native HTML/full-submission text extraction.
+
+Covers:
+- HTML and inline XBRL rendering with tables kept as pipe/TSV rows
+- full-submission.txt bundles (HTML and legacy plain-text filings)
+- Text-only conversion never starting Chrome
+- CorpusManager reading cached filings through the extractor
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from eon.core import ExtractionError
+from eon.data.sources.sec.html_extractor import HTMLExtractor, html_to_text
+
+
+FILING_HTML = """<html><head><title>aapl-20240928</title><style>p {margin: 0}</style></head>
+<body>
+<div style="display:none"><ix:header><ix:hidden>dei:HiddenFact</ix:hidden></ix:header></div>
+<p>Item&nbsp;7.   Management&#8217;s Discussion</p>
+<p>Revenue grew.<br/>Margins held.</p>
+<table>
+  <tr><td></td><td>2024</td><td></td><td>2023</td></tr>
+  <tr><td><p>Net sales</p></td><td>$</td><td>391,035</td><td></td><td>$</td><td>383,285</td></tr>
+  <tr><td>Other income</td><td>(</td><td>269</td><td>)</td><td>5.2</td><td>%</td></tr>
+</table>
+<p>Item 8. Financial Statements</p>
+</body></html>"""
+
+SUBMISSION = """<SEC-DOCUMENT>0000320193-24-000123.txt
+<SEC-HEADER>ACCESSION NUMBER: 0000320193-24-000123</SEC-HEADER>
+<DOCUMENT>
+<TYPE>10-K
+<TEXT>
+{body}
+</TEXT>
+</DOCUMENT>
+<DOCUMENT>
+<TYPE>EX-21.1
+<TEXT>
+<html><body><p>Subsidiaries exhibit</p></body></html>
+</TEXT>
+</DOCUMENT>
+</SEC-DOCUMENT>"""
+
+
+class TestHtmlToText:
+    """Tests for HTML rendering."""
+
+    @pytest.mark.unit
+    def test_tables_render_as_pipe_rows(self):
+        text = html_to_text(FILING_HTML)
+
+        assert "2024 | 2023" in text
+        assert "Net sales | $391,035 | $383,285" in text
+        assert "Other income | (269) | 5.2%" in text
+
+    @pytest.mark.unit
+    def test_tables_render_as_tsv(self):
+        text = html_to_text(FILING_HTML, table_format="tsv")
+
+        assert "Net sales\t$391,035\t$383,285" in text
+
+    @pytest.mark.unit
+    def test_drops_head_and_hidden_ixbrl_facts(self):
+        text = html_to_text(FILING_HTML)
+
+        assert "aapl-20240928" not in text
+        assert "margin" not in text
+        assert "HiddenFact" not in text
+
+    @pytest.mark.unit
+    def test_normalizes_entities_and_whitespace(self):
+        lines = html_to_text(FILING_HTML).splitlines()
+
+        assert lines[0] == "Item 7. Management’s Discussion"
+        assert "Revenue grew." in lines
+        assert lines[lines.index("Revenue grew.") + 1] == "Margins held."
+
+    @pytest.mark.unit
+    def test_rejects_unknown_table_format(self):
+        with pytest.raises(ValueError):
+            HTMLExtractor(table_format="csv")
+
+
+class TestHTMLExtractor:
+    """Tests for file-based extraction."""
+
+    @pytest.mark.unit
+    def test_extracts_primary_document_from_submission(self, temp_dir):
+        path = temp_dir / "full-submission.txt"
+        path.write_text(SUBMISSION.format(body=FILING_HTML))
+
+        text = HTMLExtractor().extract_text(path)
+
+        assert "Net sales | $391,035 | $383,285" in text
+        assert "Subsidiaries exhibit" not in text
+        assert "ACCESSION NUMBER" not in text
+
+    @pytest.mark.unit
+    def test_legacy_plain_text_submission_keeps_layout(self, temp_dir):
+        body = "<PAGE>\n<TABLE>\n<S>           <C>\nNet sales     $ 7,983\n</TABLE>"
+        path = temp_dir / "full-submission.txt"
+        path.write_text(SUBMISSION.format(body=body))
+
+        text = HTMLExtractor().extract_text(path)
+
+        assert text == "Net sales     $ 7,983"
+
+    @pytest.mark.unit
+    def test_pdf_paths_are_delegated(self, temp_dir):
+        pdf_extractor = MagicMock()
+        pdf_extractor.extract_text.return_value = "pdf text"
+
+        text = HTMLExtractor(pdf_extractor=pdf_extractor).extract_text(temp_dir / "AAPL.pdf")
+
+        assert text == "pdf text"
+
+    @pytest.mark.unit
+    def test_missing_file_raises(self, temp_dir):
+        with pytest.raises(ExtractionError):
+            HTMLExtractor().extract_text(temp_dir / "missing.html")
+
+
+class TestTextConversion:
+    """Tests for SECConverter text output and CorpusManager reads."""
+
+    @pytest.fixture
+    def filing_dir(self, temp_dir):
+        accession_dir = temp_dir / "10-K" / "0000320193-24-000123"
+        accession_dir.mkdir(parents=True)
+        (accession_dir / "primary-document.html").write_text(FILING_HTML)
+        return accession_dir.parent
+
+    @pytest.mark.unit
+    def test_text_only_conversion_skips_chrome(self, temp_dir, filing_dir):
+        from eon.data.sources.sec.converter import SECConverter
+
+        pool = MagicMock()
+        pool.checkout.side_effect = AssertionError("Chrome started")
+        converter = SECConverter(browser_pool=pool)
+
+        results = converter.convert(
+            "AAPL", filing_dir, temp_dir / "out",
+            cleanup_originals=False,
+            filing_metadata=[{'accession_number': '0000320193-24-000123', 'filing_date': '2024-11-01'}],
+            output_formats=("text",)
+        )
+
+        assert len(results) == 1
+        assert results[0]['file_path'].name == "AAPL_10-K_2024-11-01.txt"
+        assert 'pdf_path' not in results[0]
+        assert "Net sales" in results[0]['file_path'].read_text(encoding='utf-8')
+        pool.checkout.assert_not_called()
+
+    @pytest.mark.unit
+    def test_optional_pdf_failure_keeps_text(self, temp_dir, filing_dir):
+        from eon.data.sources.sec.converter import SECConverter
+
+        converter = SECConverter(conversion_retries=0)
+        converter._convert_html_to_pdf = MagicMock(return_value=False)
+
+        results = converter.convert(
+            "AAPL", filing_dir, temp_dir / "out",
+            cleanup_originals=False, output_formats=("text", "pdf")
+        )
+
+        assert results[0]['text_path'] == results[0]['file_path']
+        assert 'pdf_path' not in results[0]
+
+    @pytest.mark.integration
+    def test_corpus_manager_reads_cached_text(self, test_db, temp_dir):
+        from eon.data.corpus import CorpusManager
+
+        text_path = temp_dir / "AAPL_10-K_2024-11-01.txt"
+        text_path.write_text("Net sales | $391,035", encoding='utf-8')
+        test_db.cache_file("AAPL", 2024, "10-K", str(text_path), filing_date="2024-11-01")
+
+        corpus = CorpusManager(test_db, downloader=MagicMock())
+
+        assert corpus.get_filing_text("aapl", 2024, "10-K") == "Net sales | $391,035"
+        assert corpus.get_filing_text("AAPL", 2020, "10-K") is None
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the map-reduce fallback on filings that exceed the model context.
+
+Covers:
+- Token-bounded chunking on section boundaries
+- Single call when the filing fits, map-reduce when it doesn't
+- Chunks still too long for the model are halved
+- Async path and CustomWorkflow/analyzer integration with an offline provider
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import BaseModel, Field
+
+from eon.ai.providers import LocalProvider
+from eon.ai.token_estimator import TokenEstimator
+from eon.analysis import map_reduce
+from eon.analysis.map_reduce import ChunkNotes, MapReduceAnalyzer, split_filing
+
+
+def _item(key: str, title: str, chars: int) -> str:
+    line = f"{title} paragraph with figures for item {key}.\n"
+    return f"Item {key}. {title}\n" + line * (chars // len(line) + 1)
+
+
+FILING = "FORM 10-K\n" + "".join([
+    _item("1", "Business", 6_000),
+    _item("1A", "Risk Factors", 6_000),
+    _item("7", "Management's Discussion", 30_000),
+    _item("8", "Financial Statements", 6_000),
+])
+
+
+@pytest.fixture(autouse=True)
+def uncalibrated_estimator(temp_dir, monkeypatch):
+    """Size chunks at the default ~4 chars/token regardless of local calibration."""
+    estimator = TokenEstimator(state_file=temp_dir / "token_calibration.json")
+    monkeypatch.setattr(map_reduce, 'get_token_estimator', lambda: estimator)
+
+
+class Verdict(BaseModel):
+    summary: str = Field(description="Summary")
+    parts_read: int = Field(description="Parts the notes came from")
+
+
+def responder(prompt, schema, context):
+    """Offline stand-in: notes per chunk, a verdict from the reduce call."""
+    if schema is ChunkNotes:
+        return ChunkNotes(summary="part", facts=[prompt.rsplit("Part ", 1)[1][:12]])
+    return Verdict(summary="done", parts_read=prompt.count("PART "))
+
+
+class TestSplitFiling:
+    """Tests for split_filing()."""
+
+    @pytest.mark.unit
+    def test_chunks_respect_budget_and_keep_all_text(self):
+        chunks = split_filing(FILING, max_chars=14_000)
+
+        assert all(len(chunk.text) <= 14_000 for chunk in chunks)
+        assert "".join(chunk.text for chunk in chunks) == FILING
+        assert chunks[0].label == "cover, Items 1, 1A"
+        assert chunks[1].label.startswith("Item 7 (part 1 of")
+
+    @pytest.mark.unit
+    def test_unsectioned_text_is_split_on_paragraphs(self):
+        text = "Paragraph of prose.\n\n" * 2_000
+
+        chunks = split_filing(text, max_chars=10_000)
+
+        assert len(chunks) > 1
+        assert all(chunk.text.endswith("\n\n") for chunk in chunks)
+        assert "".join(chunk.text for chunk in chunks) == text
+
+
+class TestMapReduceAnalyzer:
+    """Tests for MapReduceAnalyzer."""
+
+    @pytest.mark.unit
+    def test_single_call_when_filing_fits(self):
+        provider = LocalProvider(responder)
+
+        result = MapReduceAnalyzer(chunk_tokens=5_000).generate(provider, "Analyze.", FILING, Verdict)
+
+        assert result.parts_read == 0
+        assert [call['schema'] for call in provider.calls] == ["Verdict"]
+
+    @pytest.mark.unit
+    def test_falls_back_to_map_reduce_when_too_long(self):
+        provider = LocalProvider(responder, max_input_tokens=6_000)
+
+        result = MapReduceAnalyzer(chunk_tokens=4_000).generate(provider, "Analyze.", FILING, Verdict)
+
+        schemas = [call['schema'] for call in provider.calls]
+        assert schemas.count("ChunkNotes") == result.parts_read > 1
+        assert schemas[-1] == "Verdict"
+        reduce_prompt = provider.calls[-1]['prompt']
+        assert reduce_prompt.startswith("Analyze.")
+        assert "Risk Factors paragraph" not in reduce_prompt
+
+    @pytest.mark.unit
+    def test_chunk_still_too_long_is_halved(self):
+        provider = LocalProvider(responder, max_input_tokens=9_000)
+
+        # Chunks are sized for ~16k tokens, so each is halved once
+        MapReduceAnalyzer(chunk_tokens=16_000).map_reduce(provider, "Analyze.", FILING * 2, Verdict)
+
+        map_calls = [call for call in provider.calls if call['schema'] == "ChunkNotes"]
+        assert map_calls
+        assert all(call['prompt_tokens'] <= 9_000 for call in map_calls)
+
+    @pytest.mark.unit
+    def test_failed_chunk_fails_the_analysis(self):
+        def failing(prompt, schema, context):
+            if schema is ChunkNotes and "part 2 of" in prompt:
+                raise ValueError("boom")
+            return responder(prompt, schema, context)
+
+        provider = LocalProvider(failing, max_input_tokens=6_000)
+
+        with pytest.raises(Exception, match="boom"):
+            MapReduceAnalyzer(chunk_tokens=4_000).generate(provider, "Analyze.", FILING, Verdict)
+
+    @pytest.mark.unit
+    def test_async_map_reduce(self):
+        provider = LocalProvider(responder, max_input_tokens=6_000)
+        analyzer = MapReduceAnalyzer(chunk_tokens=4_000)
+
+        result = asyncio.run(analyzer.generate_async(provider, "Analyze.", FILING, Verdict))
+
+        assert result.parts_read > 1
+
+
+class TestContextErrorNotRetried:
+    """GeminiProvider must surface ContextLengthExceededError so callers can fall back."""
+
+    @pytest.mark.unit
+    def test_generate_with_retry_raises_immediately(self):
+        from eon.ai.providers import GeminiProvider
+        from eon.core.exceptions import ContextLengthExceededError
+
+        with patch('eon.ai.providers.gemini.genai.Client'):
+            provider = GeminiProvider(api_key="test_key", use_response_cache=False)
+        provider.generate = MagicMock(side_effect=ContextLengthExceededError("too long"))
+
+        with patch('eon.ai.providers.gemini.time.sleep') as sleep:
+            with pytest.raises(ContextLengthExceededError):
+                provider.generate_with_retry("x", max_retries=3)
+
+        assert provider.generate.call_count == 1
+        sleep.assert_not_called()
+
+
+class TestIntegration:
+    """Map-reduce from the analyzers that use it."""
+
+    @pytest.mark.unit
+    def test_custom_workflow_survives_oversized_filing(self, monkeypatch):
+        from custom_workflows.base import CustomWorkflow
+
+        monkeypatch.setattr(
+            map_reduce, 'get_config', lambda: SimpleNamespace(map_reduce_chunk_tokens=4_000)
+        )
+
+        class Summary(CustomWorkflow):
+            name = "Summary"
+            prompt_template = "Summarize {ticker} for {year}."
+            schema = Verdict
+
+        provider = LocalProvider(responder, max_input_tokens=6_000)
+        result = Summary().analyze("AAPL", 2024, FILING, provider)
+
+        assert isinstance(result, Verdict)
+        assert result.parts_read > 1
+
+    @pytest.mark.unit
+    def test_perspective_analyzer_uses_fallback(self):
+        from eon.analysis.perspectives.analyzer import PerspectiveAnalyzer
+
+        with patch('eon.analysis.perspectives.analyzer.get_config'):
+            analyzer = PerspectiveAnalyzer(MagicMock(), MagicMock(), api_key="key", extractor=MagicMock())
+        analyzer.map_reducer = MagicMock()
+        analyzer.map_reducer.generate.return_value = "result"
+
+        with patch('eon.analysis.perspectives.analyzer.get_gemini_provider', return_value="provider"):
+            assert analyzer._analyze_with_ai("Prompt", FILING, Verdict) == "result"
+
+        args = analyzer.map_reducer.generate.call_args
+        assert args.args == ("provider", "Prompt", FILING)
+
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for page-sharded PDF text extraction.
+
+Covers:
+- Parallel (process pool) extraction matches serial extraction
+- One bounded pool shared by every extractor
+- Streaming pages and chunked extraction
+- Per-page timings and throughput benchmark
+"""
+
+import pytest
+
+from eon.core import ExtractionError
+from eon.data.sources.sec import extractor as extractor_module
+from eon.data.sources.sec.extractor import MAX_POOL_WORKERS, PDFExtractor
+
+
+def write_text_pdf(path, num_pages):
+    """Write a minimal PDF whose page N contains the text 'Page N'."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for n in range(1, num_pages + 1):
+        stream = f"BT /F1 12 Tf 72 720 Td (Page {n}) Tj ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {num_pages} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+    return path
+
+
+@pytest.fixture
+def pdf_path(temp_dir):
+    return write_text_pdf(temp_dir / "filing.pdf", 12)
+
+
+class TestPDFExtractor:
+    """Tests for PDFExtractor."""
+
+    @pytest.mark.unit
+    def test_parallel_matches_serial(self, pdf_path):
+        serial = PDFExtractor(max_workers=1).extract_text(pdf_path)
+        parallel, stats = PDFExtractor(
+            max_workers=2, pages_per_shard=5, parallel_threshold=2
+        ).extract_with_stats(pdf_path)
+
+        assert parallel == serial
+        assert serial.index("Page 2") < serial.index("Page 11")
+        assert stats.workers == min(2, MAX_POOL_WORKERS)
+
+    @pytest.mark.unit
+    def test_extractors_share_one_pool(self, pdf_path, monkeypatch):
+        created = []
+        real_pool = extractor_module.ProcessPoolExecutor
+
+        def counting_pool(max_workers):
+            created.append(max_workers)
+            return real_pool(max_workers=max_workers)
+
+        extractor_module.shutdown_extraction_pool()
+        monkeypatch.setattr(extractor_module, 'ProcessPoolExecutor', counting_pool)
+
+        for _ in range(3):
+            PDFExtractor(max_workers=2, pages_per_shard=5, parallel_threshold=2).extract_text(pdf_path)
+
+        assert created == [MAX_POOL_WORKERS]
+        extractor_module.shutdown_extraction_pool()
+
+    @pytest.mark.unit
+    def test_small_pdfs_stay_serial(self, pdf_path):
+        _, stats = PDFExtractor(max_workers=4, parallel_threshold=50).extract_with_stats(pdf_path)
+
+        assert stats.workers == 1
+
+    @pytest.mark.unit
+    def test_stats_report_per_page_timings(self, pdf_path):
+        text, stats = PDFExtractor(max_workers=1).extract_with_stats(pdf_path)
+
+        assert stats.num_pages == 12
+        assert len(stats.page_seconds) == 12
+        assert stats.characters == len(text)
+        assert len(stats.slowest_pages) == 5
+
+    @pytest.mark.unit
+    def test_iter_pages_streams_in_order(self, pdf_path):
+        pages = PDFExtractor().iter_pages(pdf_path)
+
+        first = next(pages)
+        assert first.page_number == 1
+        assert "Page 1" in first.text
+        assert [p.page_number for p in pages] == list(range(2, 13))
+
+    @pytest.mark.unit
+    def test_extract_text_chunked(self, pdf_path):
+        chunks = PDFExtractor().extract_text_chunked(pdf_path, chunk_size=5)
+
+        assert len(chunks) == 3
+        assert "Page 6" in chunks[1]
+
+    @pytest.mark.unit
+    def test_benchmark_runs_each_worker_count(self, pdf_path, monkeypatch):
+        # Don't let a 1-CPU host cap the pool below the counts being compared
+        extractor_module.shutdown_extraction_pool()
+        monkeypatch.setattr(extractor_module, 'MAX_POOL_WORKERS', 2)
+        extractor = PDFExtractor(parallel_threshold=50)
+        results = extractor.benchmark(pdf_path, worker_counts=(1, 2))
+
+        assert [r.workers for r in results] == [1, 2]
+        assert all(r.pages_per_second > 0 for r in results)
+        assert extractor.parallel_threshold == 50
+        extractor_module.shutdown_extraction_pool()
+
+    @pytest.mark.unit
+    def test_workers_bound_shards_in_flight(self, pdf_path, monkeypatch):
+        extractor_module.shutdown_extraction_pool()
+        monkeypatch.setattr(extractor_module, 'MAX_POOL_WORKERS', 4)
+        pool = extractor_module.get_extraction_pool()
+        in_flight = []
+        real_submit = pool.submit
+
+        def tracking_submit(*args, **kwargs):
+            future = real_submit(*args, **kwargs)
+            in_flight.append(future)
+            assert sum(not f.done() for f in in_flight) <= 2
+            return future
+
+        monkeypatch.setattr(pool, 'submit', tracking_submit)
+        extractor = PDFExtractor(max_workers=2, pages_per_shard=2, parallel_threshold=1)
+        text, stats = extractor.extract_with_stats(pdf_path)
+
+        assert stats.workers == 2
+        assert len(in_flight) == 6
+        assert "Page 12" in text
+        extractor_module.shutdown_extraction_pool()
+
+    @pytest.mark.unit
+    def test_missing_file_raises(self, temp_dir):
+        with pytest.raises(ExtractionError):
+            PDFExtractor().extract_text(temp_dir / "missing.pdf")
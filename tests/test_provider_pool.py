@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the process-wide Gemini provider pool.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from eon.ai.providers.pool import ProviderPool
+
+
+@pytest.fixture
+def pool():
+    with patch('eon.ai.providers.gemini.genai.Client') as client_cls:
+        pool = ProviderPool(max_size=2)
+        pool.client_cls = client_cls
+        yield pool
+
+
+class TestProviderPool:
+    """Tests for ProviderPool."""
+
+    @pytest.mark.unit
+    def test_same_key_and_config_share_provider(self, pool):
+        first = pool.get("key_a", model="gemini-2.5-flash", thinking_budget=4096)
+        second = pool.get("key_a", model="gemini-2.5-flash", thinking_budget=4096)
+
+        assert first is second
+        assert pool.client_cls.call_count == 1
+        assert pool.get_stats()['hits'] == 1
+
+    @pytest.mark.unit
+    def test_response_cache_follows_config(self, pool):
+        with patch('eon.ai.providers.pool.response_cache_enabled', return_value=True):
+            configured = pool.get("key_a")
+        uncached = pool.get("key_a", use_response_cache=False)
+
+        assert configured.use_response_cache
+        assert not uncached.use_response_cache
+        assert uncached is not configured
+
+    @pytest.mark.unit
+    def test_config_is_part_of_key(self, pool):
+        base = pool.get("key_a", model="gemini-2.5-flash")
+
+        assert pool.get("key_b", model="gemini-2.5-flash") is not base
+        assert pool.get("key_a", model="gemini-2.5-flash", thinking_budget=1024) is not base
+        assert pool.get("key_a", model="gemini-2.5-flash", use_google_search=True) is not base
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self, pool):
+        a = pool.get("key_a")
+        pool.get("key_b")
+        pool.get("key_a")  # key_b is now least recently used
+        pool.get("key_c")
+
+        assert len(pool) == 2
+        assert pool.get("key_a") is a
+        assert pool.get_stats()['evictions'] == 1
+
+    @pytest.mark.unit
+    def test_concurrent_gets_return_one_provider(self, pool):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            providers = list(executor.map(lambda _: pool.get("key_a"), range(32)))
+
+        assert len({id(p) for p in providers}) == 1
+
+    @pytest.mark.unit
+    def test_clear_closes_clients(self, pool):
+        provider = pool.get("key_a")
+        pool.clear()
+
+        provider.client.close.assert_called_once()
+        assert len(pool) == 0
+
+
+class TestProviderForFreeKey:
+    """Tests for provider_for_free_key."""
+
+    @pytest.mark.unit
+    def test_moves_gemini_calls_to_the_free_key(self, pool):
+        from eon.ai.providers import AsyncGeminiProvider, LocalProvider, provider_for_free_key
+
+        key_manager = MagicMock()
+        key_manager.pick_key.return_value = "key_b"
+        provider = pool.get("key_a", thinking_budget=1024, provider_class=AsyncGeminiProvider)
+
+        with patch('eon.ai.providers.pool.get_provider_pool', return_value=pool):
+            moved = provider_for_free_key(provider, key_manager, estimated_tokens=900)
+
+        assert moved.api_key == "key_b"
+        assert isinstance(moved, AsyncGeminiProvider)
+        assert moved.thinking_budget == 1024
+        key_manager.pick_key.assert_called_once_with(estimated_tokens=900)
+
+        local = LocalProvider()
+        assert provider_for_free_key(local, key_manager) is local
+
+    @pytest.mark.unit
+    def test_keeps_provider_when_its_key_is_best(self, pool):
+        from eon.ai.providers import provider_for_free_key
+
+        key_manager = MagicMock()
+        key_manager.pick_key.return_value = "key_a"
+        provider = pool.get("key_a")
+
+        assert provider_for_free_key(provider, key_manager) is provider
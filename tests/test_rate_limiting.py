@@ -3,7 +3,8 @@
 """
 Tests for Gemini API rate limiting and retry mechanisms.
 
-Tests the dynamic retry delay parsing and buffer addition for 429 errors.
+Tests the dynamic retry delay parsing and buffer addition for 429 errors,
+and the per-key RPM/TPM token buckets that schedule Gemini requests.
 """
 
 import time
@@ -295,3 +296,202 @@ class TestRealWorldErrorPatterns:
         delay = mock_provider._parse_retry_delay(Exception(error))
 
         assert delay == 15
+
+
+class TestKeyScheduler:
+    """Tests for per-key RPM/TPM token buckets."""
+
+    @pytest.mark.unit
+    def test_bursts_up_to_requests_per_minute(self, temp_usage_dir):
+        from eon.ai.key_scheduler import KeyScheduler
+
+        scheduler = KeyScheduler(lock_dir=temp_usage_dir, requests_per_minute=3, tokens_per_minute=10_000)
+
+        started = time.monotonic()
+        for _ in range(3):
+            assert scheduler.acquire("key_a", timeout=1)
+
+        assert time.monotonic() - started < 0.5
+        assert not scheduler.acquire("key_a", timeout=0.05)
+        assert scheduler.acquire("key_b", timeout=0)  # Other keys have their own quota
+
+    @pytest.mark.unit
+    def test_tokens_per_minute_limits_large_prompts(self, temp_usage_dir):
+        from eon.ai.key_scheduler import KeyScheduler
+
+        scheduler = KeyScheduler(lock_dir=temp_usage_dir, requests_per_minute=60, tokens_per_minute=1000)
+
+        assert scheduler.acquire("key_a", tokens=800, timeout=0)
+        assert not scheduler.acquire("key_a", tokens=800, timeout=0.05)
+        # 600 more tokens refill at 1000/min: ~36s
+        assert 30 < scheduler.time_until_available("key_a", tokens=800) <= 36
+        assert scheduler.acquire("key_a", tokens=100, timeout=0)
+
+    @pytest.mark.unit
+    def test_buckets_are_shared_through_state_files(self, temp_usage_dir):
+        from eon.ai.key_scheduler import KeyScheduler
+
+        # Two instances stand in for two processes sharing data/api_usage
+        first = KeyScheduler(lock_dir=temp_usage_dir, requests_per_minute=2, tokens_per_minute=10_000)
+        second = KeyScheduler(lock_dir=temp_usage_dir, requests_per_minute=2, tokens_per_minute=10_000)
+
+        assert first.acquire("key_a", timeout=0)
+        assert second.acquire("key_a", timeout=0)
+        assert not first.acquire("key_a", timeout=0.05)
+
+    @pytest.mark.unit
+    def test_pick_key_prefers_earliest_capacity(self, temp_usage_dir):
+        from eon.ai.key_scheduler import KeyScheduler
+
+        scheduler = KeyScheduler(lock_dir=temp_usage_dir, requests_per_minute=1, tokens_per_minute=10_000)
+        scheduler.acquire("key_a")
+
+        assert scheduler.pick_key(["key_a", "key_b"]) == "key_b"
+        assert scheduler.pick_key([]) is None
+
+    @pytest.mark.unit
+    def test_penalize_rests_key(self, temp_usage_dir):
+        from eon.ai.key_scheduler import KeyScheduler
+
+        scheduler = KeyScheduler(lock_dir=temp_usage_dir, requests_per_minute=60, tokens_per_minute=10_000)
+        scheduler.penalize("key_a", 30)
+
+        assert 29 < scheduler.time_until_available("key_a") <= 30
+        assert scheduler.get_stats()["penalties"] == 1
+
+    @pytest.mark.unit
+    def test_keys_lock_independently(self, temp_usage_dir):
+        import threading
+        from eon.ai.key_scheduler import KeyScheduler
+
+        scheduler = KeyScheduler(lock_dir=temp_usage_dir, requests_per_minute=60, tokens_per_minute=10_000)
+        done = threading.Event()
+
+        with scheduler._locked("key_a"):
+            # An update on another key must not wait for key_a's lock
+            worker = threading.Thread(target=lambda: scheduler.acquire("key_b") and done.set())
+            worker.start()
+            assert done.wait(timeout=2)
+        worker.join()
+
+
+class TestGeminiRequestQueue:
+    """Tests for quota-scheduled request execution."""
+
+    @pytest.fixture
+    def queue(self, temp_usage_dir):
+        from eon.ai.request_queue import GeminiRequestQueue
+
+        return GeminiRequestQueue(
+            lock_dir=temp_usage_dir, requests_per_minute=60, tokens_per_minute=1000
+        )
+
+    @pytest.mark.unit
+    def test_does_not_sleep_between_requests(self, queue):
+        request = MagicMock(return_value="ok")
+
+        started = time.monotonic()
+        for _ in range(5):
+            assert queue.execute_with_lock(request, "key_a", contents="hi") == "ok"
+
+        assert time.monotonic() - started < 1
+        request.assert_called_with(contents="hi")
+        assert queue.get_stats()["total_requests"] == 5
+
+    @pytest.mark.unit
+    def test_estimated_tokens_are_charged_to_key(self, queue):
+        queue.execute_with_lock(MagicMock(), "key_a", estimated_tokens=900)
+
+        assert queue.scheduler.time_until_available("key_a", tokens=900) > 0
+        assert queue.pick_key(["key_a", "key_b"], estimated_tokens=900) == "key_b"
+
+    @pytest.mark.unit
+    def test_rate_limit_error_rests_key(self, queue):
+        request = MagicMock(side_effect=RuntimeError("429 RESOURCE_EXHAUSTED {'retryDelay': '20s'}"))
+
+        with pytest.raises(RuntimeError, match="RESOURCE_EXHAUSTED"):
+            queue.execute_with_lock(request, "key_a")
+
+        assert 19 < queue.scheduler.time_until_available("key_a") <= 20
+
+
+class TestCapacityAwareReservation:
+    """Tests for reserving the key whose quota frees up soonest."""
+
+    @pytest.mark.unit
+    def test_reserve_prefers_key_with_capacity(self, mock_usage_tracker):
+        waits = {"key_a": 30.0, "key_b": 0.0, "key_c": 0.0}
+        # key_b is busier today, but key_a has no quota for 30s
+        mock_usage_tracker.record_request("key_b")
+
+        key = mock_usage_tracker.reserve_and_get_key(list(waits), capacity_wait=waits.get)
+
+        assert key == "key_c"  # Free now, least used among free keys
+        assert mock_usage_tracker.reserve_and_get_key(["key_a", "key_b"], capacity_wait=waits.get) == "key_b"
+
+    @pytest.mark.unit
+    def test_capacity_is_snapshotted_outside_the_lock(self, mock_usage_tracker):
+        calls = []
+
+        def capacity_wait(key):
+            # Scheduler reads happen without the reservation lock held
+            assert not mock_usage_tracker._reservation_condition._is_owned()
+            calls.append(key)
+            return 0.0
+
+        keys = ["key_a", "key_b", "key_c"]
+        for _ in range(3):
+            key = mock_usage_tracker.reserve_and_get_key(keys, capacity_wait=capacity_wait)
+            mock_usage_tracker.release_key(key)
+
+        assert sorted(calls) == keys  # One read per key per REFRESH_INTERVAL
+
+
+class TestTokenAdmission:
+    """Tests for calibrated token estimates and TPM settlement."""
+
+    @pytest.mark.unit
+    def test_estimator_calibrates_from_usage_metadata(self, temp_usage_dir):
+        from eon.ai.token_estimator import TokenEstimator
+
+        state_file = temp_usage_dir / "token_calibration.json"
+        estimator = TokenEstimator(state_file=state_file)
+        assert estimator.estimate("x" * 4000, "gemini-2.5-flash") == 1050  # 4 chars/token + margin
+
+        # Filings tokenize denser than the default heuristic
+        estimator.observe("gemini-2.5-flash", chars=3000, prompt_tokens=1000)
+
+        assert estimator.chars_per_token("gemini-2.5-flash") == pytest.approx(3.0)
+        assert estimator.chars_per_token("other-model") == 4.0
+        assert TokenEstimator(state_file=state_file).chars_per_token("gemini-2.5-flash") == pytest.approx(3.0)
+
+    @pytest.mark.unit
+    def test_settle_refunds_over_estimate(self, temp_usage_dir):
+        from eon.ai.request_queue import GeminiRequestQueue
+
+        queue = GeminiRequestQueue(lock_dir=temp_usage_dir, requests_per_minute=60, tokens_per_minute=1000)
+        response = MagicMock()
+        response.usage_metadata.prompt_token_count = 100
+
+        queue.execute_with_lock(MagicMock(return_value=response), "key_a", estimated_tokens=900)
+
+        # Only the 100 real tokens stay charged
+        assert queue.scheduler.time_until_available("key_a", tokens=900) == 0
+
+    @pytest.mark.unit
+    def test_settle_charges_under_estimate(self, temp_usage_dir):
+        from eon.ai.key_scheduler import KeyScheduler
+
+        scheduler = KeyScheduler(lock_dir=temp_usage_dir, requests_per_minute=60, tokens_per_minute=1000)
+        scheduler.acquire("key_a", tokens=100)
+        scheduler.settle("key_a", charged_tokens=100, actual_tokens=900)
+
+        assert scheduler.time_until_available("key_a", tokens=500) > 0
+
+    @pytest.mark.unit
+    def test_tracker_records_tokens(self, mock_usage_tracker):
+        mock_usage_tracker.record_request("key_a", tokens=1200)
+        mock_usage_tracker.record_request("key_a", tokens=300)
+
+        assert mock_usage_tracker.get_usage_today("key_a") == 2
+        assert mock_usage_tracker.get_tokens_today("key_a") == 1500
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the disk-backed LLM response cache.
+
+Covers:
+- Key derivation from model, schema, thinking config, prompt and context
+- LRU eviction under the size budget
+- GeminiProvider serving repeated calls from the cache, and the bypass flag
+- Cache hits recorded in usage stats without touching quotas
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from eon.ai.response_cache import ResponseCache
+from eon.core import AIProviderError
+
+
+class Answer(BaseModel):
+    answer: str
+
+
+class DetailedAnswer(BaseModel):
+    answer: str
+    confidence: float
+
+
+def gemini_response(text='{"answer": "ok"}', total_tokens=1200):
+    response = MagicMock(text=text)
+    response.usage_metadata.prompt_token_count = total_tokens - 5
+    response.usage_metadata.cached_content_token_count = None
+    response.usage_metadata.candidates_token_count = 5
+    response.usage_metadata.total_token_count = total_tokens
+    return response
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    @pytest.mark.unit
+    def test_key_covers_every_input(self):
+        base = dict(model="gemini-2.5-flash", prompt="p", schema=Answer, thinking={'budget': 4096})
+        key = ResponseCache.make_key(**base)
+
+        assert ResponseCache.make_key(**base) == key
+        assert ResponseCache.make_key(**{**base, 'model': "gemini-3-pro-preview"}) != key
+        assert ResponseCache.make_key(**{**base, 'prompt': "q"}) != key
+        assert ResponseCache.make_key(**{**base, 'schema': DetailedAnswer}) != key
+        assert ResponseCache.make_key(**{**base, 'thinking': {'budget': 1024}}) != key
+        assert ResponseCache.make_key(**base, context_hash="abc") != key
+        assert ResponseCache.make_key(**base, params={'temperature': 0.2}) != key
+
+    @pytest.mark.unit
+    def test_disabled_without_app_config(self):
+        from eon.ai.providers.gemini import GeminiProvider
+        from eon.ai.response_cache import response_cache_enabled
+        from eon.core import ConfigurationError
+
+        with patch('eon.ai.response_cache.get_config', side_effect=ConfigurationError("no keys")):
+            assert not response_cache_enabled()
+            with patch('eon.ai.providers.gemini.genai.Client'):
+                # A bare provider never reads the app config
+                assert not GeminiProvider(api_key="test_key").use_response_cache
+
+    @pytest.mark.unit
+    def test_round_trip_and_stats(self, temp_dir):
+        cache = ResponseCache(temp_dir / "responses")
+
+        assert cache.get("ab" * 32) is None
+        cache.put("ab" * 32, {"answer": "ok"}, tokens=900)
+
+        assert cache.get("ab" * 32) == {"result": {"answer": "ok"}, "tokens": 900}
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['writes']) == (1, 1, 1)
+        assert stats['bytes'] > 0
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self, temp_dir):
+        cache = ResponseCache(temp_dir / "responses", max_bytes=10**6)
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, {"answer": os.urandom(200).hex()})
+            # Distinct mtimes regardless of filesystem timestamp resolution
+            os.utime(cache._entry_path(key), (1000 + i, 1000 + i))
+
+        cache.get(keys[0])  # keys[1] is now least recently used
+        cache.max_bytes = cache.get_stats()['bytes'] - 1
+        cache.put("ff" * 32, {"answer": os.urandom(200).hex()})
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get("ff" * 32) is not None
+        assert cache.get_stats()['evictions'] >= 1
+        assert cache.get_stats()['bytes'] <= cache.max_bytes
+
+
+class TestGeminiResponseCaching:
+    """Tests for GeminiProvider's use of the response cache."""
+
+    @pytest.fixture
+    def provider(self, temp_usage_dir, mock_usage_tracker):
+        from eon.ai.providers.gemini import GeminiProvider
+        from eon.ai.request_queue import GeminiRequestQueue
+        from eon.ai.token_estimator import TokenEstimator
+
+        queue = GeminiRequestQueue(lock_dir=temp_usage_dir, requests_per_minute=600, tokens_per_minute=10**6)
+        estimator = TokenEstimator(state_file=temp_usage_dir / "token_calibration.json")
+        rate_limiter = MagicMock(tracker=mock_usage_tracker)
+
+        with patch('eon.ai.providers.gemini.genai.Client'), \
+             patch('eon.ai.providers.gemini.get_gemini_request_queue', return_value=queue), \
+             patch('eon.ai.providers.gemini.get_token_estimator', return_value=estimator):
+            provider = GeminiProvider(
+                api_key="test_key", model="gemini-2.5-flash", rate_limiter=rate_limiter, use_response_cache=True
+            )
+            provider.client.models.generate_content.return_value = gemini_response()
+            yield provider
+
+    @pytest.mark.unit
+    def test_repeated_call_is_served_from_cache(self, provider, mock_usage_tracker):
+        first = provider.generate("question", schema=Answer)
+        second = provider.generate("question", schema=Answer)
+
+        assert first == second == Answer(answer="ok")
+        assert provider.client.models.generate_content.call_count == 1
+        assert provider.get_token_usage()['response_cache_hits'] == 1
+
+        # The hit is visible in usage stats but costs no quota
+        (stats,) = mock_usage_tracker.get_all_usage_stats(["test_key"]).values()
+        assert stats['used_today'] == 1
+        assert stats['tokens_today'] == 1200
+        assert stats['cache_hits_today'] == 1
+        assert stats['tokens_saved_today'] == 1200
+
+    @pytest.mark.unit
+    def test_bypass_flag_skips_cache(self, provider):
+        provider.generate("question", schema=Answer)
+        provider.generate("question", schema=Answer, use_cache=False)
+
+        assert provider.client.models.generate_content.call_count == 2
+        assert 'use_cache' not in str(provider.client.models.generate_content.call_args)
+
+    @pytest.mark.unit
+    def test_different_schema_or_context_misses(self, provider):
+        from eon.ai.providers.context_cache import CachedContext
+
+        provider.client.models.generate_content.return_value = gemini_response(
+            '{"answer": "ok", "confidence": 0.5}'
+        )
+        provider.generate("question", schema=Answer)
+        provider.generate("question", schema=DetailedAnswer)
+        provider.generate("question", schema=Answer, context=CachedContext.inline("filing A", provider.model, 2))
+        provider.generate("question", schema=Answer, context=CachedContext.inline("filing B", provider.model, 2))
+
+        assert provider.client.models.generate_content.call_count == 4
+
+    @pytest.mark.unit
+    def test_failed_calls_are_not_cached(self, provider):
+        provider.client.models.generate_content.return_value = gemini_response("not json")
+
+        with pytest.raises(AIProviderError, match="Failed to parse JSON"):
+            provider.generate("question")
+
+        provider.client.models.generate_content.return_value = gemini_response('{"answer": "ok"}')
+        assert provider.generate("question") == {"answer": "ok"}
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the versioned schema migration runner.
+
+Covers:
+- Each migration applied once and recorded in schema_version
+- Only new migration files applied on later runs
+- Databases created by the old re-run-everything loop
+- Failed migrations rolled back and left unrecorded
+- Statement splitting (strings, comments, triggers)
+"""
+
+import shutil
+import sqlite3
+import threading
+
+import pytest
+
+from eon.ui.database import DatabaseRepository
+from eon.ui.database import schema
+from eon.ui.database.schema import (
+    MIGRATIONS_DIR,
+    apply_migrations,
+    get_schema_version,
+    list_migrations,
+    split_statements,
+)
+
+
+def _objects(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return sorted(conn.execute(
+            "SELECT type, name, sql FROM sqlite_master "
+            "WHERE name NOT LIKE 'sqlite_%' AND name != 'schema_version'"
+        ))
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def migrations_copy(temp_dir):
+    """Copy of the shipped migrations that tests can add files to."""
+    path = temp_dir / "migrations"
+    shutil.copytree(MIGRATIONS_DIR, path)
+    return path
+
+
+class TestApplyMigrations:
+    """Tests for apply_migrations()."""
+
+    @pytest.mark.unit
+    def test_fresh_database_records_every_version(self, temp_db_path):
+        applied = apply_migrations(str(temp_db_path))
+
+        assert applied == [version for version, _ in list_migrations()]
+        assert get_schema_version(str(temp_db_path)) == applied[-1]
+        assert apply_migrations(str(temp_db_path)) == []
+
+    @pytest.mark.unit
+    def test_only_new_migrations_run(self, temp_db_path, migrations_copy):
+        apply_migrations(str(temp_db_path), migrations_copy)
+        (migrations_copy / "v900_extra.sql").write_text(
+            "ALTER TABLE batch_items ADD COLUMN extra TEXT;\n"
+        )
+
+        assert apply_migrations(str(temp_db_path), migrations_copy) == [900]
+        assert get_schema_version(str(temp_db_path)) == 900
+
+    @pytest.mark.unit
+    def test_legacy_database_matches_fresh_schema(self, temp_dir, temp_db_path):
+        # How databases were built before schema_version: every script, every start
+        legacy_path = temp_dir / "legacy.db"
+        for _ in range(2):
+            with sqlite3.connect(legacy_path) as conn:
+                for migration_file in sorted(MIGRATIONS_DIR.glob("v*.sql")):
+                    try:
+                        conn.executescript(migration_file.read_text())
+                    except sqlite3.OperationalError as e:
+                        if "duplicate column" not in str(e).lower():
+                            raise
+
+        apply_migrations(str(legacy_path))
+        apply_migrations(str(temp_db_path))
+
+        assert _objects(legacy_path) == _objects(temp_db_path)
+        assert get_schema_version(str(legacy_path)) == get_schema_version(str(temp_db_path))
+
+    @pytest.mark.unit
+    def test_failed_migration_is_rolled_back(self, temp_db_path, migrations_copy):
+        apply_migrations(str(temp_db_path), migrations_copy)
+        version = get_schema_version(str(temp_db_path))
+        (migrations_copy / "v900_broken.sql").write_text(
+            "CREATE TABLE half_done (id INTEGER);\nCREATE TABLE batch_items (id INTEGER);\n"
+        )
+
+        with pytest.raises(sqlite3.OperationalError):
+            apply_migrations(str(temp_db_path), migrations_copy)
+
+        assert get_schema_version(str(temp_db_path)) == version
+        assert not any(name == "half_done" for _, name, _ in _objects(temp_db_path))
+
+    @pytest.mark.unit
+    def test_concurrent_runners_apply_each_version_once(self, temp_db_path):
+        results = []
+        lock = threading.Lock()
+
+        def run():
+            applied = apply_migrations(str(temp_db_path))
+            with lock:
+                results.extend(applied)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(results) == [version for version, _ in list_migrations()]
+
+    @pytest.mark.unit
+    def test_repository_migrates_once_per_process(self, temp_db_path, monkeypatch):
+        calls = []
+        original = schema.apply_migrations
+        monkeypatch.setattr(schema, "apply_migrations", lambda path: calls.append(path) or original(path))
+
+        DatabaseRepository(str(temp_db_path)).close()
+        DatabaseRepository(str(temp_db_path)).close()
+
+        assert calls == [str(temp_db_path)]
+
+
+class TestSplitStatements:
+    """Tests for split_statements()."""
+
+    @pytest.mark.unit
+    def test_semicolons_in_strings_comments_and_triggers(self):
+        script = (
+            "INSERT INTO t VALUES ('a;b');\n"
+            "-- not the end; of anything\n"
+            "CREATE TRIGGER tr AFTER INSERT ON t BEGIN SELECT 1; SELECT 2; END;\n"
+            "-- trailing comment\n"
+        )
+
+        statements = split_statements(script)
+
+        assert len(statements) == 2
+        assert statements[0] == "INSERT INTO t VALUES ('a;b');"
+        assert statements[1].endswith("SELECT 2; END;")
+
+    @pytest.mark.unit
+    def test_final_statement_without_semicolon(self):
+        assert split_statements("SELECT 1;\nSELECT 2") == ["SELECT 1;", "SELECT 2"]
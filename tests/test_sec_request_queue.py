@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for SEC request rate limiting and filing downloads.
+
+Covers:
+- Token bucket bursts, refill timing and state shared across instances
+- SECRequestQueue routing requests through one pooled session
+- SECDownloader fetching filing documents without sec_edgar_downloader
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from eon.core import DownloadError
+from eon.data.sources.sec.rate_limiter import SECRateLimiter
+from eon.data.sources.sec.request_queue import SECRequestQueue
+from eon.data.sources.sec.submissions_cache import SubmissionsCache
+from eon.data.sources.sec.ticker_index import TickerIndex
+
+
+class TestSECRateLimiter:
+    """Tests for the cross-process token bucket."""
+
+    @pytest.mark.unit
+    def test_burst_is_not_delayed(self, temp_dir):
+        limiter = SECRateLimiter(requests_per_second=2, burst=5, lock_dir=temp_dir)
+
+        started = time.monotonic()
+        for _ in range(5):
+            assert limiter.acquire(timeout=1)
+
+        assert time.monotonic() - started < 0.5
+        assert limiter.get_stats()["waits"] == 0
+
+    @pytest.mark.unit
+    def test_waits_for_refill_when_empty(self, temp_dir):
+        limiter = SECRateLimiter(requests_per_second=20, burst=1, lock_dir=temp_dir)
+        limiter.acquire()
+
+        started = time.monotonic()
+        assert limiter.acquire(timeout=1)
+
+        assert time.monotonic() - started >= 0.03
+        assert limiter.get_stats()["waits"] == 1
+
+    @pytest.mark.unit
+    def test_times_out(self, temp_dir):
+        limiter = SECRateLimiter(requests_per_second=0.1, burst=1, lock_dir=temp_dir)
+        limiter.acquire()
+
+        assert not limiter.acquire(timeout=0.05)
+
+    @pytest.mark.unit
+    def test_bucket_is_shared_through_state_file(self, temp_dir):
+        # Two instances stand in for two processes sharing data/api_usage
+        first = SECRateLimiter(requests_per_second=0.1, burst=2, lock_dir=temp_dir)
+        second = SECRateLimiter(requests_per_second=0.1, burst=2, lock_dir=temp_dir)
+
+        assert first.acquire(timeout=0)
+        assert second.acquire(timeout=0)
+        assert not first.acquire(timeout=0.05)
+
+
+class TestSECRequestQueue:
+    """Tests for the pooled, rate-limited request queue."""
+
+    @pytest.mark.unit
+    def test_get_uses_pooled_session(self, temp_dir):
+        session = MagicMock()
+        queue = SECRequestQueue(lock_dir=temp_dir, requests_per_second=100, session=session)
+
+        queue.get("https://data.sec.gov/x", headers={"User-Agent": "t t@example.com"})
+        queue.get("https://data.sec.gov/y")
+
+        assert session.get.call_count == 2
+        assert queue.get_stats()["total_requests"] == 2
+
+    @pytest.mark.unit
+    def test_errors_are_counted_and_raised(self, temp_dir):
+        session = MagicMock()
+        session.get.side_effect = ConnectionError("reset")
+        queue = SECRequestQueue(lock_dir=temp_dir, requests_per_second=100, session=session)
+
+        with pytest.raises(ConnectionError):
+            queue.get("https://data.sec.gov/x")
+        assert queue.get_stats()["total_errors"] == 1
+
+    @pytest.mark.unit
+    def test_limiter_timeout_raises_without_sending(self, temp_dir):
+        session = MagicMock()
+        limiter = MagicMock(requests_per_second=10, burst=1)
+        limiter.acquire.return_value = False
+        queue = SECRequestQueue(lock_dir=temp_dir, rate_limiter=limiter, session=session)
+
+        with pytest.raises(DownloadError):
+            queue.get("https://data.sec.gov/x")
+        session.get.assert_not_called()
+
+    @pytest.mark.unit
+    def test_throttled_responses_retry_with_a_token_each(self, temp_dir):
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "0"})
+        ok = MagicMock(status_code=200, headers={})
+        session = MagicMock()
+        session.get.side_effect = [throttled, throttled, ok]
+        limiter = MagicMock(requests_per_second=10, burst=1)
+        limiter.acquire.return_value = True
+        queue = SECRequestQueue(lock_dir=temp_dir, rate_limiter=limiter, session=session)
+
+        assert queue.get("https://data.sec.gov/x") is ok
+        assert limiter.acquire.call_count == 3
+
+    @pytest.mark.unit
+    def test_gives_up_after_max_retries(self, temp_dir):
+        unavailable = MagicMock(status_code=503, headers={})
+        session = MagicMock()
+        session.get.return_value = unavailable
+        queue = SECRequestQueue(
+            lock_dir=temp_dir, requests_per_second=100, session=session,
+            max_retries=2, backoff_factor=0
+        )
+
+        assert queue.get("https://data.sec.gov/x") is unavailable
+        assert session.get.call_count == 3
+
+
+SUBMISSIONS = {
+    "fiscalYearEnd": "0930",
+    "filings": {
+        "recent": {
+            "form": ["10-K/A", "10-K", "10-K"],
+            "filingDate": ["2025-01-10", "2024-11-01", "2001-12-20"],
+            "reportDate": ["2024-09-28", "2024-09-28", "2001-09-29"],
+            "accessionNumber": ["0000320193-25-000001", "0000320193-24-000123", "0000320193-01-000050"],
+            "primaryDocument": ["ka.htm", "aapl-20240928.htm", ""],
+        },
+    },
+}
+
+
+class TestFilingDownload:
+    """Tests for SECDownloader document fetching."""
+
+    @pytest.fixture
+    def downloader(self, temp_dir):
+        from eon.data.sources.sec.downloader import SECDownloader
+
+        index = TickerIndex()
+        index.ensure_loaded(lambda: {"0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."}})
+
+        submissions = MagicMock(spec=SubmissionsCache)
+        submissions.get.return_value = SUBMISSIONS
+        submissions.iter_filing_tables.return_value = iter([SUBMISSIONS["filings"]["recent"]])
+
+        downloader = SECDownloader(base_path=temp_dir, ticker_index=index, submissions_cache=submissions)
+        downloader._make_sec_request = MagicMock(
+            side_effect=lambda url, headers, timeout=10: MagicMock(content=url.encode())
+        )
+        return downloader
+
+    @pytest.mark.unit
+    def test_downloads_primary_documents(self, downloader, temp_dir):
+        path = downloader.download("AAPL", num_filings=2)
+
+        assert path == temp_dir / "sec-edgar-filings" / "AAPL" / "10-K"
+        recent = path / "0000320193-24-000123" / "primary-document.html"
+        assert recent.read_text() == (
+            "https://www.sec.gov/Archives/edgar/data/320193/"
+            "000032019324000123/aapl-20240928.htm"
+        )
+        # Amendments are skipped, as before
+        assert not (path / "0000320193-25-000001").exists()
+
+    @pytest.mark.unit
+    def test_falls_back_to_full_submission_without_primary_document(self, downloader):
+        path = downloader.download("AAPL", num_filings=2)
+
+        legacy = path / "0000320193-01-000050" / "full-submission.txt"
+        assert legacy.read_text().endswith("/000032019301000050/0000320193-01-000050.txt")
+
+    @pytest.mark.unit
+    def test_existing_documents_are_not_refetched(self, downloader):
+        downloader.download("AAPL", num_filings=2)
+        downloader.submissions.iter_filing_tables.return_value = iter([SUBMISSIONS["filings"]["recent"]])
+        downloader._make_sec_request.reset_mock()
+
+        downloader.download("AAPL", num_filings=2)
+
+        downloader._make_sec_request.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("primary, saved", [
+        ("aapl-20240928.HTM", "primary-document.html"),
+        ("aapl-20240928.html", "primary-document.html"),
+        ("aapl-20240928.xml", "primary-document.xml"),
+        ("aapl-20240928", "primary-document.html"),
+    ])
+    def test_primary_document_suffix(self, downloader, primary, saved):
+        recent = dict(SUBMISSIONS["filings"]["recent"], primaryDocument=["ka.htm", primary, ""])
+        downloader.submissions.iter_filing_tables.return_value = iter([recent])
+
+        path = downloader.download("AAPL", num_filings=1)
+
+        assert (path / "0000320193-24-000123" / saved).exists()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the item-level filing section parser.
+
+Covers:
+- Table-of-contents entries vs. real section headings
+- 10-Q part-qualified items and 20-F name mapping
+- Selecting sections by name, cross-referenced Item 8
+- Pass-through for unsegmentable text
+- Offset caching (memory and disk)
+- Section declarations on CustomWorkflow and perspectives
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import BaseModel, Field
+
+from eon.data.sources.sec.sections import (
+    SectionCache,
+    detect_form_type,
+    parse_sections,
+    select_sections,
+)
+
+
+def _body(label: str, chars: int = 3000) -> str:
+    line = f"{label} discussion text for this item.\n"
+    return line * (chars // len(line) + 1)
+
+
+@pytest.fixture
+def ten_k() -> str:
+    toc = (
+        "UNITED STATES SECURITIES AND EXCHANGE COMMISSION\n"
+        "FORM 10-K\n"
+        "TABLE OF CONTENTS\n"
+        "Item 1. | Business | 3\n"
+        "Item 1A. | Risk Factors | 10\n"
+        "Item 7. | Management's Discussion and Analysis | 30\n"
+        "Item 7A. | Quantitative and Qualitative Disclosures About Market Risk | 45\n"
+        "Item 8. | Financial Statements and Supplementary Data | 46\n"
+        "Item 15. | Exhibits and Financial Statement Schedules | 80\n"
+    )
+    return (
+        toc
+        + "PART I\nItem 1. Business\n" + _body("Business")
+        + "Item 1A. Risk Factors\n" + _body("Risk")
+        + "PART II\nITEM 7. MANAGEMENT'S DISCUSSION AND ANALYSIS\n" + _body("MDNA")
+        + "Item 7A. Quantitative and Qualitative Disclosures About Market Risk\n" + _body("Rates")
+        + "Item 8. Financial Statements\nSee the statements following Item 15.\n"
+        + "PART IV\nItem 15. Exhibits and Financial Statement Schedules\n" + _body("Statements")
+    )
+
+
+class TestParseSections:
+    """Tests for parse_sections()."""
+
+    @pytest.mark.unit
+    def test_finds_sections_past_table_of_contents(self, ten_k):
+        index = parse_sections(ten_k)
+
+        assert index.form_type == "10-K"
+        assert [s.key for s in index.sections] == ["1", "1A", "7", "7A", "8", "15"]
+        risk = index.find("1A")
+        assert ten_k[risk.start:].startswith("Item 1A. Risk Factors\nRisk")
+        assert risk.title == "Risk Factors"
+        assert index.sections[-1].end == len(ten_k)
+
+    @pytest.mark.unit
+    def test_ignores_prose_mentioning_items(self):
+        text = "FORM 10-K\nItem 1. Business\n" + _body("Business") + (
+            "As discussed in Item 7, revenue grew.\n"
+        )
+        assert [s.key for s in parse_sections(text).sections] == ["1"]
+
+    @pytest.mark.unit
+    def test_10q_items_carry_part(self):
+        text = (
+            "FORM 10-Q\nPART I - FINANCIAL INFORMATION\n"
+            "Item 1. Financial Statements\n" + _body("Statements")
+            + "Item 2. Management's Discussion and Analysis\n" + _body("MDNA")
+            + "PART II - OTHER INFORMATION\n"
+            + "Item 1. Legal Proceedings\n" + _body("Legal")
+            + "Item 1A. Risk Factors\n" + _body("Risk")
+        )
+        index = parse_sections(text)
+
+        assert [s.key for s in index.sections] == ["I-1", "I-2", "II-1", "II-1A"]
+        assert index.find("risk_factors").key == "II-1A"
+        assert index.find("mdna").key == "I-2"
+
+    @pytest.mark.unit
+    def test_20f_names_map_to_20f_items(self):
+        index = parse_sections(
+            "FORM 20-F\nItem 3. Key Information\n" + _body("Key")
+            + "Item 5. Operating and Financial Review and Prospects\n" + _body("Review")
+        )
+        assert index.find("risk_factors").key == "3"
+        assert index.find("mdna").key == "5"
+
+    @pytest.mark.unit
+    def test_detect_form_type(self):
+        assert detect_form_type("Annual report on Form 20-F") == "20-F"
+        assert detect_form_type("SCHEDULE 14A proxy statement") is None
+
+
+class TestSelectSections:
+    """Tests for select_sections()."""
+
+    @pytest.mark.unit
+    def test_keeps_only_requested_sections(self, ten_k):
+        text = select_sections(ten_k, ("risk_factors", "7A"))
+
+        assert text.startswith("Item 1A. Risk Factors")
+        assert "Rates discussion" in text
+        assert "Business discussion" not in text
+        assert "MDNA discussion" not in text
+        assert "TABLE OF CONTENTS" not in text
+
+    @pytest.mark.unit
+    def test_cross_referenced_item_8_brings_statements(self, ten_k):
+        text = select_sections(ten_k, ("financial_statements",))
+
+        assert text.startswith("Item 8. Financial Statements")
+        assert "Statements discussion" in text
+
+    @pytest.mark.unit
+    def test_passes_through_when_nothing_matches(self, ten_k):
+        proxy = "DEF 14A proxy statement\n" + _body("Proxy")
+
+        assert select_sections(proxy, ("risk_factors",)) == proxy
+        assert select_sections(ten_k, ("cybersecurity",)) == ten_k
+        assert select_sections(ten_k, None) == ten_k
+
+
+class TestSectionCache:
+    """Tests for SectionCache."""
+
+    @pytest.mark.unit
+    def test_parses_once_per_text(self, ten_k):
+        cache = SectionCache()
+
+        first = cache.get_index(ten_k)
+        second = cache.get_index(ten_k)
+
+        assert first is second
+        assert cache.get_stats() == {'hits': 1, 'misses': 1}
+
+    @pytest.mark.unit
+    def test_offsets_persist_on_disk(self, temp_dir, ten_k):
+        SectionCache(temp_dir).get_index(ten_k)
+
+        fresh = SectionCache(temp_dir)
+        index = fresh.get_index(ten_k)
+
+        assert fresh.get_stats() == {'hits': 1, 'misses': 0}
+        assert index.find("7").title == "MANAGEMENT'S DISCUSSION AND ANALYSIS"
+
+
+class _Result(BaseModel):
+    summary: str = Field(description="Summary")
+
+
+class TestDeclaredSections:
+    """Tests for section declarations on workflows and perspectives."""
+
+    @pytest.mark.unit
+    def test_workflow_sends_only_declared_sections(self, ten_k):
+        from custom_workflows.base import CustomWorkflow
+
+        class RiskWorkflow(CustomWorkflow):
+            name = "Risk Only"
+            sections = ("risk_factors",)
+            prompt_template = "Assess {ticker} risks for {year}."
+            schema = _Result
+
+        provider = MagicMock()
+        RiskWorkflow().analyze("AAPL", 2024, ten_k, provider)
+
+        prompt = provider.generate_with_retry.call_args.kwargs['prompt']
+        assert "Risk discussion" in prompt
+        assert "MDNA discussion" not in prompt
+
+    @pytest.mark.unit
+    def test_workflow_warns_about_unknown_sections(self):
+        from custom_workflows.base import CustomWorkflow
+
+        class BadSections(CustomWorkflow):
+            name = "Bad Sections"
+            sections = ("risk_factors", "7A", "footnotes")
+            prompt_template = "Assess {ticker} for {year}. " * 10
+            schema = _Result
+
+        warnings = BadSections().validate_workflow()
+        assert any("['footnotes']" in w for w in warnings)
+
+    @pytest.mark.unit
+    def test_perspective_prompt_uses_its_sections(self, ten_k):
+        from eon.ai.prompts.perspectives import TALEB_PROMPT, PERSPECTIVE_SECTIONS
+        from eon.analysis.perspectives.analyzer import PerspectiveAnalyzer
+
+        with patch('eon.analysis.perspectives.analyzer.get_config'):
+            analyzer = PerspectiveAnalyzer(MagicMock(), MagicMock(), extractor=MagicMock())
+        _, text = analyzer._prepare_inputs(
+            ten_k, TALEB_PROMPT, "AAPL", 2024, sections=PERSPECTIVE_SECTIONS['taleb']
+        )
+
+        assert "Rates discussion" in text
+        assert "TABLE OF CONTENTS" not in text
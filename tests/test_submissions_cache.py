@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the SEC submissions JSON cache.
+
+Covers:
+- One SEC round-trip shared across all SECDownloader metadata methods
+- Disk persistence and conditional revalidation (ETag / Last-Modified)
+- Lazy paging through filings.files history shards
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from eon.data.sources.sec.submissions_cache import SubmissionsCache
+from eon.data.sources.sec.ticker_index import TickerIndex
+
+
+SUBMISSIONS = {
+    "cik": "320193",
+    "name": "Apple Inc.",
+    "sic": "3571",
+    "fiscalYearEnd": "0930",
+    "filings": {
+        "recent": {
+            "form": ["10-Q", "10-K", "8-K", "10-K"],
+            "filingDate": ["2025-01-31", "2024-11-01", "2024-10-30", "2023-11-03"],
+            "reportDate": ["2024-12-28", "2024-09-28", "2024-10-30", "2023-09-30"],
+            "accessionNumber": ["a-4", "a-3", "a-2", "a-1"],
+            "primaryDocument": ["q.htm", "k24.htm", "8k.htm", "k23.htm"],
+        },
+        "files": [
+            {"name": "CIK0000320193-submissions-001.json", "filingCount": 1},
+        ],
+    },
+}
+
+SHARD = {
+    "form": ["10-K"],
+    "filingDate": ["2000-12-14"],
+    "reportDate": ["2000-09-30"],
+    "accessionNumber": ["a-0"],
+    "primaryDocument": ["k00.txt"],
+}
+
+
+def make_response(status_code=200, payload=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload
+    response.raise_for_status.return_value = None
+    return response
+
+
+@pytest.fixture
+def fake_sec():
+    """Request function that serves SUBMISSIONS and SHARD and records calls."""
+    calls = []
+
+    def request(url, headers):
+        calls.append((url, dict(headers)))
+        if url.endswith("submissions-001.json"):
+            return make_response(payload=SHARD)
+        if "If-None-Match" in headers:
+            return make_response(status_code=304)
+        return make_response(payload=SUBMISSIONS, headers={"ETag": '"v1"'})
+
+    request.calls = calls
+    return request
+
+
+class TestSubmissionsCache:
+    """Tests for SubmissionsCache."""
+
+    @pytest.mark.unit
+    def test_memoizes_within_max_age(self, temp_dir, fake_sec):
+        cache = SubmissionsCache(temp_dir, fake_sec, headers={})
+
+        assert cache.get("320193")["name"] == "Apple Inc."
+        cache.get("0000320193")
+
+        assert len(fake_sec.calls) == 1
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.unit
+    def test_persists_to_disk_across_instances(self, temp_dir, fake_sec):
+        SubmissionsCache(temp_dir, fake_sec, headers={}).get("320193")
+        other = SubmissionsCache(temp_dir, fake_sec, headers={})
+
+        assert other.get("320193")["fiscalYearEnd"] == "0930"
+        assert len(fake_sec.calls) == 1
+
+    @pytest.mark.unit
+    def test_revalidates_with_etag_when_expired(self, temp_dir, fake_sec):
+        cache = SubmissionsCache(temp_dir, fake_sec, headers={}, max_age_seconds=0)
+        cache.get("320193")
+        data = cache.get("320193")
+
+        assert data["name"] == "Apple Inc."
+        assert fake_sec.calls[1][1]["If-None-Match"] == '"v1"'
+        assert cache.get_stats()["revalidated"] == 1
+
+    @pytest.mark.unit
+    def test_returns_none_for_unknown_cik(self, temp_dir):
+        cache = SubmissionsCache(temp_dir, lambda url, headers: make_response(404), headers={})
+
+        assert cache.get("999") is None
+
+    @pytest.mark.unit
+    def test_history_shards_are_lazy(self, temp_dir, fake_sec):
+        cache = SubmissionsCache(temp_dir, fake_sec, headers={})
+
+        tables = cache.iter_filing_tables("320193")
+        next(tables)
+        assert len(fake_sec.calls) == 1
+
+        assert next(tables)["form"] == ["10-K"]
+        assert len(fake_sec.calls) == 2
+
+
+class TestDownloaderSharesSubmissions:
+    """Tests that SECDownloader metadata methods share one fetch."""
+
+    @pytest.fixture
+    def downloader(self, temp_dir, fake_sec):
+        from eon.data.sources.sec.downloader import SECDownloader
+
+        index = TickerIndex()
+        index.ensure_loaded(lambda: {"0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."}})
+        return SECDownloader(
+            base_path=temp_dir,
+            ticker_index=index,
+            submissions_cache=SubmissionsCache(temp_dir / "submissions", fake_sec, headers={}),
+        )
+
+    @pytest.mark.unit
+    def test_one_round_trip_per_company(self, downloader, fake_sec):
+        assert downloader.get_available_filing_types("AAPL")[0] == "10-K"
+        assert downloader.get_fiscal_year_end("AAPL") == "0930"
+        assert downloader.get_company_info_from_cik("320193")["sic_code"] == "3571"
+        assert len(downloader.get_available_filings("AAPL", "10-K", limit=2)) == 2
+        assert downloader.get_available_filings_by_cik("320193", "10-Q", limit=1)[0]["fiscal_quarter"] == 1
+
+        assert len(fake_sec.calls) == 1
+
+    @pytest.mark.unit
+    def test_pages_into_history_when_limit_not_reached(self, downloader, fake_sec):
+        filings = downloader.get_available_filings("AAPL", "10-K", limit=10)
+
+        assert [f["fiscal_year"] for f in filings] == [2024, 2023, 2000]
+        assert len(fake_sec.calls) == 2
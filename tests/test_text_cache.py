@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the content-addressed extracted-text cache.
+
+Covers:
+- Extract once, serve every later read from the compressed cache
+- Persistence across cache instances (other processes / later runs)
+- Reuse and backfill of file_cache.file_hash, re-hashing re-downloaded files
+- Separate entries per extractor class, version and table format
+- Corrupt entries and concurrent readers
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from eon.data.sources.sec.text_cache import CachingExtractor, TextCache, compute_file_hash
+
+
+@pytest.fixture
+def filing(temp_dir):
+    path = temp_dir / "AAPL_10-K_2024-11-01.pdf"
+    path.write_bytes(b"%PDF-1.4 fake filing bytes")
+    return path
+
+
+@pytest.fixture
+def extractor():
+    inner = MagicMock()
+    inner.extract_text.return_value = "Net sales | $391,035\n" * 1000
+    return inner
+
+
+class TestTextCache:
+    """Tests for TextCache."""
+
+    @pytest.mark.unit
+    def test_extracts_once_then_hits(self, temp_dir, filing, extractor):
+        cache = TextCache(temp_dir / "text")
+
+        first = cache.get_or_extract(filing, extractor.extract_text)
+        second = cache.get_or_extract(filing, extractor.extract_text)
+
+        assert first == second
+        assert extractor.extract_text.call_count == 1
+        assert cache.get_stats() == {'hits': 1, 'misses': 1}
+
+    @pytest.mark.unit
+    def test_persists_across_instances(self, temp_dir, filing, extractor):
+        TextCache(temp_dir / "text").get_or_extract(filing, extractor.extract_text)
+        text = TextCache(temp_dir / "text").get_or_extract(filing, extractor.extract_text)
+
+        assert text.startswith("Net sales")
+        assert extractor.extract_text.call_count == 1
+
+    @pytest.mark.unit
+    def test_entries_are_compressed_and_content_addressed(self, temp_dir, filing, extractor):
+        cache = TextCache(temp_dir / "text", codec="zlib")
+        cache.get_or_extract(filing, extractor.extract_text)
+
+        file_hash = compute_file_hash(filing)
+        entry = temp_dir / "text" / file_hash[:2] / f"{file_hash}.zz"
+        assert entry.exists()
+        assert entry.stat().st_size < len(extractor.extract_text.return_value) / 10
+
+    @pytest.mark.unit
+    def test_corrupt_entry_is_a_miss(self, temp_dir, filing, extractor):
+        cache = TextCache(temp_dir / "text", codec="zlib")
+        file_hash = compute_file_hash(filing)
+        entry = temp_dir / "text" / file_hash[:2] / f"{file_hash}.zz"
+        entry.parent.mkdir(parents=True)
+        entry.write_bytes(b"")
+
+        assert cache.get_or_extract(filing, extractor.extract_text).startswith("Net sales")
+        assert extractor.extract_text.call_count == 1
+
+    @pytest.mark.unit
+    def test_empty_extraction_is_not_cached(self, temp_dir, filing):
+        cache = TextCache(temp_dir / "text")
+
+        assert cache.get_or_extract(filing, lambda path: None) is None
+        assert cache.get(compute_file_hash(filing)) is None
+
+    @pytest.mark.unit
+    def test_concurrent_readers_extract_once(self, temp_dir, filing, extractor):
+        cache = TextCache(temp_dir / "text")
+        threads = [
+            threading.Thread(target=cache.get_or_extract, args=(filing, extractor.extract_text))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert extractor.extract_text.call_count == 1
+
+    @pytest.mark.unit
+    def test_variants_are_cached_separately(self, temp_dir, filing, extractor):
+        cache = TextCache(temp_dir / "text")
+        file_hash = compute_file_hash(filing)
+
+        cache.get_or_extract(filing, extractor.extract_text, variant="pipe")
+        cache.get_or_extract(filing, extractor.extract_text, variant="tsv")
+        cache.get_or_extract(filing, extractor.extract_text, variant="pipe")
+        assert extractor.extract_text.call_count == 2
+
+        cache.invalidate(file_hash)
+        assert cache.get(file_hash, "pipe") is None
+        assert cache.get(file_hash, "tsv") is None
+
+    @pytest.mark.unit
+    def test_unknown_codec_rejected(self, temp_dir):
+        with pytest.raises(ValueError):
+            TextCache(temp_dir / "text", codec="brotli")
+
+
+class TestCachingExtractor:
+    """Tests for CachingExtractor with the file_cache table."""
+
+    @pytest.mark.integration
+    def test_five_workflows_parse_once(self, test_db, temp_dir, filing, extractor):
+        test_db.cache_file("AAPL", 2024, "10-K", str(filing), filing_date="2024-11-01")
+        cache = TextCache(temp_dir / "text")
+
+        for _ in range(5):
+            CachingExtractor(extractor, cache=cache, db=test_db).extract_text(filing)
+
+        assert extractor.extract_text.call_count == 1
+
+    @pytest.mark.integration
+    def test_backfills_file_hash(self, test_db, temp_dir, filing, extractor):
+        test_db.cache_file("AAPL", 2024, "10-K", str(filing))
+
+        CachingExtractor(extractor, cache=TextCache(temp_dir / "text"), db=test_db).extract_text(filing)
+
+        assert test_db.get_file_hash(str(filing)) == compute_file_hash(filing)
+
+    @pytest.mark.unit
+    def test_missing_file_is_delegated(self, temp_dir, extractor):
+        caching = CachingExtractor(extractor, cache=TextCache(temp_dir / "text"))
+
+        caching.extract_text(temp_dir / "missing.pdf")
+
+        extractor.extract_text.assert_called_once()
+
+    @pytest.mark.unit
+    def test_extractor_settings_are_part_of_the_key(self, temp_dir, filing):
+        class TableExtractor:
+            VERSION = 1
+
+            def __init__(self, table_format):
+                self.table_format = table_format
+
+            def extract_text(self, path):
+                return f"rendered as {self.table_format}"
+
+        class NewTableExtractor(TableExtractor):
+            VERSION = 2
+
+        cache = TextCache(temp_dir / "text")
+
+        assert CachingExtractor(TableExtractor("pipe"), cache=cache).extract_text(filing) == "rendered as pipe"
+        assert CachingExtractor(TableExtractor("tsv"), cache=cache).extract_text(filing) == "rendered as tsv"
+        assert cache.get_stats() == {'hits': 0, 'misses': 2}
+
+        CachingExtractor(NewTableExtractor("pipe"), cache=cache).extract_text(filing)
+        assert cache.get_stats() == {'hits': 0, 'misses': 3}
+
+    @pytest.mark.integration
+    def test_redownloaded_file_is_rehashed(self, test_db, temp_dir, filing, extractor):
+        test_db.cache_file("AAPL", 2024, "10-K", str(filing))
+        cache = TextCache(temp_dir / "text")
+        CachingExtractor(extractor, cache=cache, db=test_db).extract_text(filing)
+
+        # Same path, new contents - the stored hash no longer applies
+        filing.write_bytes(b"%PDF-1.4 amended filing bytes, longer than before")
+        extractor.extract_text.return_value = "Net sales | $394,328\n"
+
+        text = CachingExtractor(extractor, cache=cache, db=test_db).extract_text(filing)
+
+        assert text == "Net sales | $394,328\n"
+        assert test_db.get_file_hash(str(filing)) == compute_file_hash(filing)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the persistent ticker -> CIK index.
+
+Covers:
+- O(1) lookups and multi-ticker CIKs
+- Fuzzy company name search
+- Loading once per TTL (no repeated company_tickers.json downloads)
+- Persistence to the database so other processes skip the SEC download
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from eon.data.sources.sec.ticker_index import TickerIndex, normalize_company_name
+
+
+COMPANY_TICKERS = {
+    "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+    "1": {"cik_str": 1652044, "ticker": "GOOGL", "title": "Alphabet Inc."},
+    "2": {"cik_str": 1652044, "ticker": "GOOG", "title": "Alphabet Inc."},
+    "3": {"cik_str": 1067983, "ticker": "BRK-B", "title": "BERKSHIRE HATHAWAY INC"},
+    "4": {"cik_str": 789019, "ticker": "MSFT", "title": "MICROSOFT CORP"},
+}
+
+
+@pytest.fixture
+def fetch_counter():
+    """Fetch function that counts how often SEC would be hit."""
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return COMPANY_TICKERS
+
+    fetch.calls = calls
+    return fetch
+
+
+class TestTickerIndexLookups:
+    """Tests for in-memory lookups and search."""
+
+    @pytest.mark.unit
+    def test_get_cik_is_case_insensitive_and_padded(self, fetch_counter):
+        index = TickerIndex()
+        index.ensure_loaded(fetch_counter)
+
+        assert index.get_cik("aapl") == "0000320193"
+        assert index.get_cik("UNKNOWN") is None
+
+    @pytest.mark.unit
+    def test_multiple_tickers_per_cik(self, fetch_counter):
+        index = TickerIndex()
+        index.ensure_loaded(fetch_counter)
+
+        assert set(index.get_tickers_for_cik("1652044")) == {"GOOG", "GOOGL"}
+
+    @pytest.mark.unit
+    def test_search_by_name_prefix_and_typo(self, fetch_counter):
+        index = TickerIndex()
+        index.ensure_loaded(fetch_counter)
+
+        assert index.search("berkshire")[0]["ticker"] == "BRK-B"
+        assert index.search("Microsoft Corporation")[0]["cik"] == "0000789019"
+        assert index.search("aple")[0]["ticker"] == "AAPL"
+
+    @pytest.mark.unit
+    def test_search_exact_ticker_ranks_first(self, fetch_counter):
+        index = TickerIndex()
+        index.ensure_loaded(fetch_counter)
+
+        assert index.search("msft")[0]["ticker"] == "MSFT"
+
+    @pytest.mark.unit
+    def test_normalize_company_name(self):
+        assert normalize_company_name("Apple Inc.") == "apple"
+        assert normalize_company_name("The Coca-Cola Company") == "coca cola"
+
+
+class TestTickerIndexLoading:
+    """Tests for TTL and load-once behaviour."""
+
+    @pytest.mark.unit
+    def test_loads_once_for_many_lookups(self, fetch_counter):
+        index = TickerIndex()
+
+        for _ in range(1000):
+            index.ensure_loaded(fetch_counter)
+            index.get_cik("AAPL")
+
+        assert len(fetch_counter.calls) == 1
+
+    @pytest.mark.unit
+    def test_concurrent_threads_load_once(self, fetch_counter):
+        index = TickerIndex()
+        threads = [
+            threading.Thread(target=index.ensure_loaded, args=(fetch_counter,))
+            for _ in range(20)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(fetch_counter.calls) == 1
+
+    @pytest.mark.unit
+    def test_reloads_after_ttl(self, fetch_counter):
+        index = TickerIndex(ttl_hours=0)
+        index.ensure_loaded(fetch_counter)
+        index._loaded_at -= 1
+        index.ensure_loaded(fetch_counter)
+
+        assert len(fetch_counter.calls) == 2
+
+    @pytest.mark.unit
+    def test_keeps_stale_index_when_refresh_empty(self, fetch_counter):
+        index = TickerIndex()
+        index.ensure_loaded(fetch_counter)
+        index.invalidate()
+        index.ensure_loaded(lambda: {})
+
+        assert index.get_cik("AAPL") == "0000320193"
+
+    @pytest.mark.unit
+    def test_keeps_stale_index_when_refresh_fails(self, fetch_counter):
+        index = TickerIndex()
+        index.ensure_loaded(fetch_counter)
+        index.invalidate()
+
+        def failing_fetch():
+            raise ConnectionError("SEC unavailable")
+
+        index.ensure_loaded(failing_fetch)
+
+        assert index.get_cik("AAPL") == "0000320193"
+        with pytest.raises(ConnectionError):
+            TickerIndex().ensure_loaded(failing_fetch)
+
+
+class TestTickerIndexPersistence:
+    """Tests for database-backed persistence."""
+
+    @pytest.mark.integration
+    def test_second_process_loads_from_db(self, test_db, fetch_counter):
+        TickerIndex(db=test_db).ensure_loaded(fetch_counter)
+        other = TickerIndex(db=test_db)
+        other.ensure_loaded(fetch_counter)
+
+        assert len(fetch_counter.calls) == 1
+        assert other.get_cik("BRK-B") == "0001067983"
+
+    @pytest.mark.integration
+    def test_seeds_cik_company_cache(self, test_db, fetch_counter):
+        test_db.cache_cik_company("320193", "Apple Inc.", sic_code="3571")
+        TickerIndex(db=test_db).ensure_loaded(fetch_counter)
+
+        # Existing, richer record is preserved
+        assert test_db.get_cached_cik_company("320193")["sic_code"] == "3571"
+        # New CIKs get a name-only record
+        assert test_db.get_cached_cik_company("789019")["company_name"] == "MICROSOFT CORP"
+
+    @pytest.mark.integration
+    def test_stale_db_copy_is_ignored(self, test_db, fetch_counter):
+        TickerIndex(db=test_db).ensure_loaded(fetch_counter)
+        test_db._execute_with_retry(
+            "UPDATE sec_ticker_index SET indexed_at = '2000-01-01T00:00:00'"
+        )
+        TickerIndex(db=test_db).ensure_loaded(fetch_counter)
+
+        assert len(fetch_counter.calls) == 2
+
+
+class TestDownloaderUsesIndex:
+    """Tests that SECDownloader resolves CIKs through the index."""
+
+    @pytest.mark.unit
+    def test_get_cik_from_ticker_fetches_once(self, temp_dir):
+        from eon.data.sources.sec.downloader import SECDownloader
+
+        downloader = SECDownloader(base_path=temp_dir, ticker_index=TickerIndex())
+        response = MagicMock()
+        response.json.return_value = COMPANY_TICKERS
+        downloader._make_sec_request = MagicMock(return_value=response)
+
+        assert downloader._get_cik_from_ticker("AAPL") == "0000320193"
+        assert downloader._get_cik_from_ticker("MSFT") == "0000789019"
+        assert downloader._get_cik_from_ticker("NOPE") is None
+        assert downloader._make_sec_request.call_count == 1
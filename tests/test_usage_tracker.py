@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the SQLite-backed API usage tracker.
+
+Covers:
+- Counters shared between tracker instances (stand-ins for processes)
+- Heap-based key selection: least used first, reserved and exhausted keys skipped
+- Import of legacy per-key JSON usage files
+- Cleanup and reset
+"""
+
+import json
+
+import pytest
+
+from eon.ai.usage_tracker import APIUsageTracker
+
+
+@pytest.fixture
+def tracker(temp_usage_dir):
+    tracker = APIUsageTracker(usage_dir=temp_usage_dir)
+    tracker.REFRESH_INTERVAL = 0  # Always see other instances' writes
+    return tracker
+
+
+class TestUsageStore:
+    """Tests for persistence in data/api_usage/usage.db."""
+
+    @pytest.mark.unit
+    def test_usage_is_shared_between_instances(self, tracker, temp_usage_dir):
+        # Two instances stand in for two processes sharing data/api_usage
+        other = APIUsageTracker(usage_dir=temp_usage_dir)
+        other.record_request("key_a", tokens=100)
+        other.record_request("key_a", error=True)
+
+        assert tracker.get_usage_today("key_a") == 2
+        (stats,) = tracker.get_all_usage_stats(["key_a"]).values()
+        assert stats['errors_today'] == 1
+        assert stats['tokens_today'] == 100
+        assert stats['total_requests'] == 2
+
+    @pytest.mark.unit
+    def test_cache_hit_does_not_count_as_request(self, tracker):
+        tracker.record_cache_hit("key_a", tokens_saved=500)
+
+        assert tracker.get_usage_today("key_a") == 0
+        (stats,) = tracker.get_all_usage_stats(["key_a"]).values()
+        assert stats['cache_hits_today'] == 1
+        assert stats['tokens_saved_today'] == 500
+
+    @pytest.mark.unit
+    def test_imports_legacy_json_files(self, temp_usage_dir):
+        probe = APIUsageTracker(usage_dir=temp_usage_dir)
+        today = probe._get_today()
+        legacy = temp_usage_dir / "usage_legacy.json"
+        legacy.write_text(json.dumps({
+            'key_id': 'abcd',
+            'key_hash': probe._get_key_hash("legacy_key"),
+            'created_at': '2025-01-01T00:00:00',
+            'daily_usage': {today: {'date': today, 'request_count': 7, 'timestamps': [], 'tokens': 900}},
+            'total_requests': 50,
+        }))
+
+        tracker = APIUsageTracker(usage_dir=temp_usage_dir)
+
+        assert tracker.get_usage_today("legacy_key") == 7
+        assert tracker.get_tokens_today("legacy_key") == 900
+        assert not legacy.exists()
+        assert (temp_usage_dir / "usage_legacy.json.migrated").exists()
+        # Imported once - a restart doesn't double the counts
+        assert APIUsageTracker(usage_dir=temp_usage_dir).get_usage_today("legacy_key") == 7
+
+    @pytest.mark.unit
+    def test_reset_and_cleanup(self, tracker):
+        tracker.record_request("key_a")
+        tracker.record_request("key_b")
+
+        tracker.cleanup_old_records(days=90)
+        assert tracker.get_usage_today("key_a") == 1
+
+        tracker.reset_key_usage("key_a")
+        assert tracker.get_usage_today("key_a") == 0
+        assert tracker.get_usage_today("key_b") == 1
+
+        tracker.reset_all_usage()
+        assert tracker.get_usage_today("key_b") == 0
+
+
+class TestKeySelection:
+    """Tests for reserve_and_get_key() over the in-memory key heap."""
+
+    @pytest.mark.unit
+    def test_reserves_least_used_first(self, tracker):
+        tracker.record_request("key_a")
+        tracker.record_request("key_a")
+        tracker.record_request("key_b")
+
+        order = [tracker.reserve_and_get_key(["key_a", "key_b", "key_c"]) for _ in range(3)]
+
+        assert order == ["key_c", "key_b", "key_a"]
+        assert tracker.reserve_and_get_key(["key_a", "key_b", "key_c"]) is None
+
+    @pytest.mark.unit
+    def test_released_key_is_ranked_by_new_usage(self, tracker):
+        key = tracker.reserve_and_get_key(["key_a", "key_b"])
+        assert key == "key_a"  # Tie - first listed wins
+        tracker.record_request("key_a")
+        tracker.release_key("key_a")
+
+        assert tracker.reserve_and_get_key(["key_a", "key_b"]) == "key_b"
+
+    @pytest.mark.unit
+    def test_sees_usage_recorded_elsewhere(self, tracker, temp_usage_dir):
+        tracker.reserve_and_get_key(["key_a"])
+        tracker.release_key("key_a")
+
+        other = APIUsageTracker(usage_dir=temp_usage_dir)
+        for _ in range(tracker.limits.DAILY_LIMIT_PER_KEY):
+            other.record_request("key_a")
+
+        assert tracker.reserve_and_get_key(["key_a", "key_b"]) == "key_b"
+        assert tracker.reserve_and_get_key(["key_a"]) is None
+
+    @pytest.mark.unit
+    def test_subset_of_keys(self, tracker):
+        tracker.record_request("key_b")
+
+        assert tracker.reserve_and_get_key(["key_b"]) == "key_b"
+        # key_a and key_c stay on the heap for later callers
+        assert tracker.reserve_and_get_key(["key_c", "key_a"]) == "key_c"
+        assert tracker.reserve_and_get_key(["key_a", "key_b"]) == "key_a"
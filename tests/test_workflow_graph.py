@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for dependency-graph execution of multi-call workflows.
+
+Covers:
+- Step ordering, cycle and unknown-input detection
+- Independent steps running concurrently, dependents receiving outputs
+- Conditions, failed steps and the shared filing context
+- CustomWorkflow.build_steps()/merge_steps() integration
+- Step checkpoints: a retry only reruns the steps that did not complete
+"""
+
+import threading
+
+import pytest
+from pydantic import BaseModel, Field
+
+from custom_workflows.base import CustomWorkflow, WorkflowValidationError
+from eon.ai.providers import LocalProvider
+from eon.analysis.workflow_graph import (
+    StepCheckpoint,
+    WorkflowStep,
+    WorkflowGraphExecutor,
+    validate_steps,
+)
+
+
+class Note(BaseModel):
+    text: str = Field(description="Note text")
+
+
+def _step(name, inputs=(), **kwargs):
+    def prompt(up):
+        seen = ",".join(f"{k}={v.text if v else None}" for k, v in sorted(up.items()))
+        return f"STEP {name} [{seen}]"
+    return WorkflowStep(name, Note, prompt, inputs=inputs, **kwargs)
+
+
+def echo(prompt, schema, context):
+    """Answer each step with its own name and what it saw."""
+    return Note(text=prompt.split("STEP ", 1)[1])
+
+
+class TestValidateSteps:
+    """Tests for validate_steps()."""
+
+    @pytest.mark.unit
+    def test_orders_by_dependency(self):
+        steps = [_step("C", ("A", "B")), _step("A"), _step("B", ("A",))]
+
+        assert [s.name for s in validate_steps(steps)] == ["A", "B", "C"]
+
+    @pytest.mark.unit
+    def test_rejects_unknown_input(self):
+        with pytest.raises(ValueError, match="unknown"):
+            validate_steps([_step("A", ("MISSING",))])
+
+    @pytest.mark.unit
+    def test_rejects_cycle(self):
+        with pytest.raises(ValueError, match="cycle"):
+            validate_steps([_step("A", ("B",)), _step("B", ("A",))])
+
+
+class TestWorkflowGraphExecutor:
+    """Tests for WorkflowGraphExecutor.run()."""
+
+    @pytest.mark.unit
+    def test_passes_upstream_outputs(self):
+        provider = LocalProvider(responder=echo)
+        steps = [_step("A"), _step("B", ("A",))]
+
+        result = WorkflowGraphExecutor().run(provider, steps)
+
+        assert result.get("B").text == "B [A=A []]"
+        assert result.errors == {}
+
+    @pytest.mark.unit
+    def test_independent_steps_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def responder(prompt, schema, context):
+            if prompt.startswith("STEP A") or prompt.startswith("STEP B"):
+                barrier.wait()  # Deadlocks unless A and B run at the same time
+            return echo(prompt, schema, context)
+
+        steps = [_step("A"), _step("B"), _step("C", ("A", "B"))]
+        result = WorkflowGraphExecutor().run(LocalProvider(responder=responder), steps)
+
+        assert result.get("C").text == "C [A=A [],B=B []]"
+
+    @pytest.mark.unit
+    def test_failed_step_gives_none_and_dependents_still_run(self):
+        def responder(prompt, schema, context):
+            if prompt.startswith("STEP A"):
+                raise RuntimeError("quota")
+            return echo(prompt, schema, context)
+
+        steps = [_step("A"), _step("B", ("A",))]
+        result = WorkflowGraphExecutor().run(LocalProvider(responder=responder), steps)
+
+        assert result.get("A") is None
+        assert "quota" in result.errors["A"]
+        assert result.get("B").text == "B [A=None]"
+
+    @pytest.mark.unit
+    def test_condition_skips_step(self):
+        provider = LocalProvider(responder=echo)
+        steps = [
+            _step("A"),
+            _step("B", ("A",), condition=lambda up: False),
+            _step("C", ("B",)),
+        ]
+
+        result = WorkflowGraphExecutor().run(provider, steps)
+
+        assert result.skipped == ["B"]
+        assert "B" not in result.errors
+        assert result.get("C").text == "C [B=None]"
+        assert len(provider.calls) == 2
+
+    @pytest.mark.unit
+    def test_context_shared_and_released(self):
+        seen = []
+
+        def responder(prompt, schema, context):
+            seen.append(context.text if context else None)
+            return echo(prompt, schema, context)
+
+        provider = LocalProvider(responder=responder)
+        steps = [_step("A"), _step("B", ("A",)), _step("C", use_context=False)]
+
+        WorkflowGraphExecutor().run(provider, steps, context_text="FILING")
+
+        assert sorted(seen, key=str) == ["FILING", "FILING", None]
+        assert not provider._live
+
+
+class GraphWorkflow(CustomWorkflow):
+    name = "Graph Test"
+    description = "Two facts and a verdict"
+
+    @property
+    def prompt_template(self):
+        return "Analyze {ticker} for {year}. " + "Details. " * 20
+
+    @property
+    def schema(self):
+        return Note
+
+    def build_steps(self, ticker, year):
+        return [_step("FACTS"), _step("RISKS"), _step("VERDICT", ("FACTS", "RISKS"))]
+
+    def merge_steps(self, ticker, year, result):
+        return Note(text=f"{ticker}: {result.get('VERDICT').text}")
+
+
+class TestCustomWorkflowSteps:
+    """Tests for CustomWorkflow step graphs."""
+
+    @pytest.mark.unit
+    def test_analyze_runs_graph_and_merges(self):
+        provider = LocalProvider(responder=echo)
+
+        result = GraphWorkflow().analyze("AAPL", 2024, "FORM 10-K\nfiling text", provider)
+
+        assert result.text == "AAPL: VERDICT [FACTS=FACTS [],RISKS=RISKS []]"
+        assert len(provider.calls) == 3
+
+    @pytest.mark.unit
+    def test_validate_workflow_rejects_cycle(self):
+        class Cyclic(GraphWorkflow):
+            def build_steps(self, ticker, year):
+                return [_step("A", ("B",)), _step("B", ("A",))]
+
+        with pytest.raises(WorkflowValidationError, match="cycle"):
+            Cyclic().validate_workflow()
+
+    @pytest.mark.unit
+    def test_validate_workflow_requires_merge(self):
+        class NoMerge(CustomWorkflow):
+            name = "No Merge"
+
+            @property
+            def prompt_template(self):
+                return GraphWorkflow().prompt_template
+
+            @property
+            def schema(self):
+                return Note
+
+            def build_steps(self, ticker, year):
+                return [_step("A")]
+
+        with pytest.raises(WorkflowValidationError, match="merge_steps"):
+            NoMerge().validate_workflow()
+
+
+class TestStepCheckpoint:
+    """Tests for checkpointing step outputs in workflow_step_outputs."""
+
+    STEPS = [_step("ORIENT"), _step("MAP", ("ORIENT",)), _step("SYNTHESIZE", ("ORIENT", "MAP"))]
+
+    def _checkpoint(self, db, text="filing"):
+        checkpoint_id = StepCheckpoint.make_id("cspp", "AAPL", 2024, "local", text)
+        return StepCheckpoint(db, checkpoint_id, "cspp")
+
+    @pytest.mark.unit
+    def test_retry_reruns_only_missing_steps(self, test_db):
+        def failing(prompt, schema, context):
+            if prompt.startswith("STEP SYNTHESIZE"):
+                raise RuntimeError("quota")
+            return echo(prompt, schema, context)
+
+        first = LocalProvider(responder=failing)
+        result = WorkflowGraphExecutor().run(first, self.STEPS, checkpoint=self._checkpoint(test_db))
+        assert "SYNTHESIZE" in result.errors
+
+        retry = LocalProvider(responder=echo)
+        result = WorkflowGraphExecutor().run(retry, self.STEPS, checkpoint=self._checkpoint(test_db))
+
+        assert [call['prompt'].split()[1] for call in retry.calls] == ["SYNTHESIZE"]
+        assert result.get("SYNTHESIZE").text == "SYNTHESIZE [MAP=MAP [ORIENT=ORIENT []],ORIENT=ORIENT []]"
+        assert result.errors == {}
+
+    @pytest.mark.unit
+    def test_checkpoint_records_run_and_logs(self, test_db):
+        def failing(prompt, schema, context):
+            if prompt.startswith("STEP MAP"):
+                raise RuntimeError("quota")
+            return echo(prompt, schema, context)
+
+        checkpoint = self._checkpoint(test_db)
+        WorkflowGraphExecutor().run(LocalProvider(responder=failing), self.STEPS, checkpoint=checkpoint)
+
+        outputs = test_db.get_workflow_step_outputs(checkpoint.checkpoint_id)
+        assert set(outputs) == {"ORIENT", "SYNTHESIZE"}
+        run = test_db._execute_with_retry(
+            "SELECT status, total_steps, current_step_index FROM workflow_runs WHERE id = ?",
+            (checkpoint.checkpoint_id,), fetch_one=True
+        )
+        assert run == {"status": "failed", "total_steps": 3, "current_step_index": 2}
+        logs = test_db._execute_with_retry(
+            "SELECT step_id, log_level FROM workflow_step_logs WHERE workflow_run_id = ?",
+            (checkpoint.checkpoint_id,), fetch_all=True
+        )
+        assert logs == [{"step_id": "MAP", "log_level": "ERROR"}]
+
+    @pytest.mark.unit
+    def test_different_filing_starts_clean(self, test_db):
+        WorkflowGraphExecutor().run(
+            LocalProvider(responder=echo), self.STEPS, checkpoint=self._checkpoint(test_db, "FY2024 v1")
+        )
+
+        provider = LocalProvider(responder=echo)
+        WorkflowGraphExecutor().run(
+            provider, self.STEPS, checkpoint=self._checkpoint(test_db, "FY2024 amended")
+        )
+
+        assert len(provider.calls) == 3
+
+    @pytest.mark.unit
+    def test_invalid_saved_output_is_rerun(self, test_db):
+        checkpoint = self._checkpoint(test_db)
+        checkpoint.load(self.STEPS)
+        test_db.save_workflow_step_output(checkpoint.checkpoint_id, "ORIENT", '{"unexpected": 1}')
+
+        provider = LocalProvider(responder=echo)
+        WorkflowGraphExecutor().run(provider, self.STEPS, checkpoint=checkpoint)
+
+        assert len(provider.calls) == 3
+
+    @pytest.mark.unit
+    def test_workflow_analyze_uses_checkpoint(self, test_db):
+        checkpoint = self._checkpoint(test_db)
+        GraphWorkflow().analyze("AAPL", 2024, "filing", LocalProvider(responder=echo), checkpoint=checkpoint)
+
+        provider = LocalProvider(responder=echo)
+        result = GraphWorkflow().analyze("AAPL", 2024, "filing", provider, checkpoint=checkpoint)
+
+        assert provider.calls == []
+        assert result.text.startswith("AAPL: VERDICT")
@@ -0,0 +1,332 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for year-parallel analysis within a single company run.
+
+AnalysisService._run_years fans a company's years out across free API keys
+when EON_YEAR_CONCURRENCY > 1 and must keep the serial contract: incremental
+store_result writes, a completed count of 1..total in the progress callback,
+and cancellation through the run's CancellationToken. Analyses with an async
+variant fan out on AsyncAnalysisEngine under the same contract.
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from eon.ui.services.analysis_service import AnalysisService
+from eon.ui.services.cancellation import (
+    AnalysisCancelledException,
+    get_cancellation_registry,
+)
+
+
+class _Result:
+    """Minimal stand-in for a pydantic analysis result."""
+
+    def __init__(self, year):
+        self.year = year
+
+    def model_dump(self):
+        return {"year": self.year}
+
+
+def _make_service(year_concurrency, free_keys=("key-b", "key-c")):
+    config = MagicMock()
+    config.year_concurrency = year_concurrency
+    config.enable_caching = False
+
+    key_manager = MagicMock()
+    remaining = list(free_keys)
+    key_manager.reserve_key.side_effect = lambda *a, **kw: remaining.pop(0) if remaining else None
+
+    return AnalysisService(
+        MagicMock(),
+        config=config,
+        key_manager=key_manager,
+        rate_limiter=MagicMock(),
+        downloader=MagicMock(),
+        extractor=MagicMock(),
+    )
+
+
+PDF_PATHS = {2024: Path("a.html"), 2023: Path("b.html"), 2022: Path("c.html")}
+
+
+@pytest.mark.unit
+class TestSerialYears:
+    """year_concurrency=1 keeps the original one-after-another loop."""
+
+    def test_runs_in_order_on_given_key(self):
+        service = _make_service(1)
+        seen = []
+
+        def analyze(year, path, key):
+            seen.append((year, key))
+            return _Result(year)
+
+        calls = []
+        results = service._run_years(
+            "AAPL", PDF_PATHS, "run-serial", "Fundamental", analyze,
+            api_key="key-a",
+            year_progress_callback=lambda *args: calls.append(args),
+            filing_type="10-K",
+        )
+
+        assert seen == [(2024, "key-a"), (2023, "key-a"), (2022, "key-a")]
+        assert calls == [(2024, 1, 3), (2023, 2, 3), (2022, 3, 3)]
+        assert set(results) == {2024, 2023, 2022}
+        assert service.db.store_result.call_count == 3
+        service.api_key_manager.reserve_key.assert_not_called()
+
+
+@pytest.mark.unit
+class TestParallelYears:
+    """year_concurrency>1 fans years out across reserved keys."""
+
+    def test_years_overlap_on_distinct_keys(self):
+        service = _make_service(3)
+        barrier = threading.Barrier(3, timeout=5)
+        keys = {}
+
+        def analyze(year, path, key):
+            keys[year] = key
+            barrier.wait()  # Deadlocks unless all three years run at once
+            return _Result(year)
+
+        calls = []
+        results = service._run_years(
+            "AAPL", PDF_PATHS, "run-parallel", "Fundamental", analyze,
+            api_key="key-a",
+            year_progress_callback=lambda *args: calls.append(args),
+            filing_type="10-K",
+        )
+
+        assert set(keys.values()) == {"key-a", "key-b", "key-c"}
+        assert set(results) == {2024, 2023, 2022}
+        assert [c[1] for c in calls] == [1, 2, 3]
+        assert all(c[2] == 3 for c in calls)
+        assert service.db.store_result.call_count == 3
+        released = [c.args[0] for c in service.api_key_manager.release_key.call_args_list]
+        assert sorted(released) == ["key-b", "key-c"]
+
+    def test_no_incremental_store_without_filing_type(self):
+        service = _make_service(2)
+        service._run_years(
+            "AAPL", PDF_PATHS, "run-nostore", "Custom",
+            lambda year, path, key: _Result(year),
+            api_key="key-a",
+        )
+        service.db.store_result.assert_not_called()
+
+    def test_on_error_records_and_continues(self):
+        service = _make_service(2)
+        errors = {}
+
+        def analyze(year, path, key):
+            if year == 2023:
+                raise RuntimeError("bad filing")
+            return _Result(year)
+
+        calls = []
+        results = service._run_years(
+            "AAPL", PDF_PATHS, "run-errors", "Custom", analyze,
+            api_key="key-a",
+            year_progress_callback=lambda *args: calls.append(args),
+            on_error=lambda year, e: errors.__setitem__(year, str(e)),
+        )
+
+        assert set(results) == {2024, 2022}
+        assert errors == {2023: "bad filing"}
+        # Failed years still count towards completion but skip the callback
+        assert sorted(c[0] for c in calls) == [2022, 2024]
+
+    def test_error_without_handler_is_raised_and_keys_released(self):
+        service = _make_service(3)
+
+        def analyze(year, path, key):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            service._run_years(
+                "AAPL", PDF_PATHS, "run-raise", "Fundamental", analyze,
+                api_key="key-a",
+            )
+        assert service.api_key_manager.release_key.call_count == 2
+
+    def test_cancellation_stops_remaining_years(self):
+        service = _make_service(2, free_keys=())
+        registry = get_cancellation_registry()
+        token = registry.create_token("run-cancel")
+        started = []
+
+        def analyze(year, path, key):
+            started.append(year)
+            token.cancel()
+            time.sleep(0.05)
+            return _Result(year)
+
+        try:
+            with pytest.raises(AnalysisCancelledException):
+                service._run_years(
+                    "AAPL", PDF_PATHS, "run-cancel", "Fundamental", analyze,
+                    api_key="key-a",
+                    filing_type="10-K",
+                )
+        finally:
+            registry.cleanup_token("run-cancel")
+
+        # Only one key is available, so the year after the cancel never starts
+        assert started == [2024]
+
+
+@pytest.mark.unit
+class TestAsyncYears:
+    """year_concurrency>1 with analyze_year_async runs the years on one event loop."""
+
+    @pytest.fixture(autouse=True)
+    def providers(self):
+        with patch(
+            "eon.analysis.async_engine.get_async_gemini_provider",
+            side_effect=lambda api_key, **kwargs: MagicMock(api_key=api_key),
+        ):
+            yield
+
+    def _service(self):
+        service = _make_service(3)
+        service.api_key_manager.pick_key.return_value = "key-a"
+        return service
+
+    def test_years_overlap_on_one_loop(self):
+        service = self._service()
+        caller = threading.get_ident()
+        started = []
+
+        async def analyze_async(year, path, provider):
+            started.append(year)
+            while len(started) < 3:  # Never finishes unless all three are in flight
+                await asyncio.sleep(0.01)
+            assert threading.get_ident() == caller
+            return _Result(year)
+
+        calls = []
+        results = service._run_years(
+            "AAPL", PDF_PATHS, "run-async", "Buffett Lens",
+            lambda year, path, key: pytest.fail("threaded path used"),
+            api_key="key-a",
+            year_progress_callback=lambda *args: calls.append(args),
+            filing_type="10-K",
+            analyze_year_async=analyze_async,
+        )
+
+        assert set(results) == {2024, 2023, 2022}
+        assert [c[1] for c in calls] == [1, 2, 3]
+        assert service.db.store_result.call_count == 3
+
+    def test_years_run_on_reserved_keys(self):
+        service = self._service()
+        written_on = []
+
+        async def analyze_async(year, path, provider):
+            return _Result(year)
+
+        service.db.update_run_progress.side_effect = (
+            lambda *args, **kwargs: written_on.append(threading.get_ident())
+        )
+        service._run_years(
+            "AAPL", PDF_PATHS, "run-async-keys", "Fundamental",
+            lambda year, path, key: pytest.fail("threaded path used"),
+            api_key="key-a",
+            analyze_year_async=analyze_async,
+        )
+
+        # The batch's key plus the free extras, never the unreserved pool
+        for call in service.api_key_manager.pick_key.call_args_list:
+            assert call.kwargs["keys"] == ["key-a", "key-b", "key-c"]
+        released = [c.args[0] for c in service.api_key_manager.release_key.call_args_list]
+        assert sorted(released) == ["key-b", "key-c"]
+        # Progress writes ran on worker threads; asyncio.run used this one
+        assert len(written_on) == 3 and threading.get_ident() not in written_on
+
+    def test_on_error_records_and_continues(self):
+        service = self._service()
+        errors = {}
+
+        async def analyze_async(year, path, provider):
+            if year == 2023:
+                raise RuntimeError("bad filing")
+            return _Result(year)
+
+        results = service._run_years(
+            "AAPL", PDF_PATHS, "run-async-errors", "Custom",
+            lambda year, path, key: None,
+            on_error=lambda year, e: errors.__setitem__(year, str(e)),
+            analyze_year_async=analyze_async,
+        )
+
+        assert set(results) == {2024, 2022}
+        assert errors == {2023: "bad filing"}
+
+    def test_cancellation_stops_remaining_years(self):
+        service = self._service()
+        registry = get_cancellation_registry()
+        token = registry.create_token("run-async-cancel")
+        finished = []
+
+        async def analyze_async(year, path, provider):
+            if year == 2024:
+                token.cancel()
+                return _Result(year)
+            await asyncio.sleep(5)
+            finished.append(year)
+            return _Result(year)
+
+        try:
+            with pytest.raises(AnalysisCancelledException):
+                service._run_years(
+                    "AAPL", PDF_PATHS, "run-async-cancel", "Custom",
+                    lambda year, path, key: None,
+                    filing_type="10-K",
+                    analyze_year_async=analyze_async,
+                )
+        finally:
+            registry.cleanup_token("run-async-cancel")
+
+        assert finished == []
+
+
+@pytest.mark.unit
+class TestQuotaExhaustion:
+    """Every mode raises KeyQuotaExhaustedError instead of recording a failed year."""
+
+    @pytest.mark.parametrize("concurrency, use_async", [(1, False), (2, False), (2, True)])
+    def test_quota_error_is_raised_despite_on_error(self, concurrency, use_async):
+        from eon.core.exceptions import KeyQuotaExhaustedError
+
+        service = _make_service(concurrency)
+        service.api_key_manager.pick_key.return_value = "key-a"
+        errors = {}
+
+        def analyze(year, path, key):
+            raise KeyQuotaExhaustedError("all keys exhausted")
+
+        async def analyze_async(year, path, provider):
+            analyze(year, path, provider.api_key)
+
+        with patch(
+            "eon.analysis.async_engine.get_async_gemini_provider",
+            side_effect=lambda api_key, **kwargs: MagicMock(api_key=api_key),
+        ):
+            with pytest.raises(KeyQuotaExhaustedError):
+                service._run_years(
+                    "AAPL", PDF_PATHS, "run-quota", "Custom", analyze,
+                    api_key="key-a",
+                    on_error=lambda year, e: errors.__setitem__(year, e),
+                    analyze_year_async=analyze_async if use_async else None,
+                )
+
+        assert errors == {}